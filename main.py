@@ -2,113 +2,426 @@
 
 import os
 import sys
+
+# Modo sin interfaz (--cli): se despacha antes de importar PySide6
+if __name__ == "__main__" and sys.argv[1:2] == ["--cli"]:
+    from resources.cli import main as cli_main
+    sys.exit(cli_main(sys.argv[2:]))
+
+# Asistente privilegiado (--helper), lanzado por la propia interfaz con pkexec
+if __name__ == "__main__" and sys.argv[1:2] == ["--helper"]:
+    from resources.helper import main as helper_main
+    sys.exit(helper_main(sys.argv[2:]))
+
+from resources.startup_profiler import StartupProfiler
+
+# Con --profile-startup se imprime la duración de cada fase del arranque
+PROFILER = StartupProfiler("--profile-startup" in sys.argv)
+
+import codecs
+import glob
 import json
+import re
+import shlex
+import socket
+import tempfile
+import time
 import importlib.util
-from subprocess import Popen, PIPE
+from string import Template
+from collections import OrderedDict, deque
+PROFILER.mark("importaciones (stdlib)")
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                              QTabWidget, QGroupBox, QPushButton, QLabel, QTextEdit,
-                              QMessageBox, QListWidget, QDialog, QFormLayout, QLineEdit,
-                              QFrame, QSizePolicy, QMenu, QGraphicsDropShadowEffect, QInputDialog,
-                              QStackedWidget, QGridLayout, QListWidgetItem, QComboBox, QDialogButtonBox,
-                              QProgressBar)
-from PySide6.QtGui import QIcon, QColor, QPalette, QPainter, QRegion, QCursor, QPainterPath, QDesktopServices, QTextCursor
-from PySide6.QtCore import Qt, Signal, QObject, QPoint, QSize, QRect, QDir, QUrl, QTimer, QProcess, QTranslator, QLibraryInfo
+                              QGroupBox, QPushButton, QLabel, QMessageBox, QListWidget, QDialog,
+                              QFrame, QStackedWidget, QListWidgetItem, QComboBox, QProgressBar,
+                              QPlainTextEdit)
+from PySide6.QtGui import QRegion, QPainterPath, QPalette, QColor
+from PySide6.QtCore import (Qt, Signal, QObject, QRect, QTimer, QProcess, QTranslator, QLibraryInfo,
+                           QFileSystemWatcher, QEvent, QCoreApplication, QSocketNotifier)
+from resources.icons import ICONS
+from resources.commands import build_full_command, run_command
+from resources.parsers import ERROR_SEPARATOR
+from resources.diffentry import DiffEntry
+PROFILER.mark("importaciones (PySide6)")
 
 os.environ['QT_QPA_PLATFORM_PLUGIN_PATH'] = os.path.join(
     os.path.dirname(sys.executable), 'plugins'
 )
 
-def setup_translator(app):
-    translator = QTranslator(app)
-    
-    qt_translations_path = QLibraryInfo.path(QLibraryInfo.TranslationsPath)
-    if translator.load("qt_es", qt_translations_path):
-        app.installTranslator(translator)
-    
-    app_translator = QTranslator(app)
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    translations_dir = os.path.join(current_dir, "resources", "langs")
-    
-    if not os.path.exists(translations_dir):
-        os.makedirs(translations_dir)
-    
-    config = ConfigManager.load_config()
-    language = config.get("language", "system")  
-    
-    if language == "system":
-        system_language = os.environ.get('LANG', '').split('.')[0] or 'es'
-        lang_code = system_language.split('_')[0] if '_' in system_language else system_language
-    else:
-        lang_code = language
-    
-    translation_file = f"immutable-deepin-tools_{lang_code}.qm"
-    translation_path = os.path.join(translations_dir, translation_file)
-    
-    if os.path.exists(translation_path) and app_translator.load(translation_path):
-        app.installTranslator(app_translator)
-    elif lang_code != "en": 
-        translation_file = "immutable-deepin-tools_es.qm"
-        translation_path = os.path.join(translations_dir, translation_file)
-        if os.path.exists(translation_path) and app_translator.load(translation_path):
-            app.installTranslator(app_translator)
-    
-    return lang_code
+class TranslationManager:
+    """Traductores de la aplicación, intercambiables sin reiniciar.
+
+    Cada .qm se carga una sola vez y se guarda; cambiar de idioma es quitar
+    el QTranslator actual e instalar el del nuevo idioma. Qt envía entonces
+    QEvent.LanguageChange a todos los widgets, que vuelven a poner sus textos
+    en retranslate_ui().
+    """
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = TranslationManager(QCoreApplication.instance())
+        return cls._instance
+
+    def __init__(self, app):
+        self.app = app
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.translations_dir = os.path.join(current_dir, "resources", "langs")
+        if not os.path.exists(self.translations_dir):
+            os.makedirs(self.translations_dir)
+        # Código de idioma -> QTranslator cargado (None si no hay .qm)
+        self.translators = {}
+        self.current = None
+        self.lang_code = None
+
+        qt_translator = QTranslator(app)
+        qt_translations_path = QLibraryInfo.path(QLibraryInfo.TranslationsPath)
+        if qt_translator.load("qt_es", qt_translations_path):
+            app.installTranslator(qt_translator)
 
-class ConfigManager:
     @staticmethod
-    def get_config_path():
-        home_dir = os.path.expanduser("~")
-        config_dir = os.path.join(home_dir, ".config", "immutable-deepin-tools")
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-        return os.path.join(config_dir, "config.json")
+    def resolve_language(language):
+        if language == "system":
+            system_language = os.environ.get('LANG', '').split('.')[0] or 'es'
+            return system_language.split('_')[0] if '_' in system_language else system_language
+        return language
+
+    def translator_for(self, lang_code):
+        if lang_code not in self.translators:
+            translator = QTranslator(self.app)
+            translation_path = os.path.join(self.translations_dir, f"immutable-deepin-tools_{lang_code}.qm")
+            if not (os.path.exists(translation_path) and translator.load(translation_path)):
+                translator = None
+                if lang_code != "en":
+                    translator = self.translator_for("es")
+            self.translators[lang_code] = translator
+        return self.translators[lang_code]
+
+    def set_language(self, language):
+        """Activa el idioma ("system" o un código) y devuelve el código resuelto"""
+        lang_code = self.resolve_language(language)
+        translator = self.translator_for(lang_code)
+        if self.lang_code is None or translator is not self.current:
+            if self.current is not None:
+                self.app.removeTranslator(self.current)
+            if translator is not None:
+                self.app.installTranslator(translator)
+            self.current = translator
+        self.lang_code = lang_code
+        return lang_code
+
+
+def setup_translator(app):
+    return TranslationManager.instance().set_language(ConfigManager.instance().get("language"))
+
+class ConfigManager(QObject):
+    """Configuración de la aplicación, compartida por todo el proceso.
+
+    El fichero se lee una sola vez; las lecturas se sirven desde memoria y
+    las escrituras se agrupan en una sola escritura atómica (fichero temporal
+    y rename) tras WRITE_DELAY_MS sin cambios. Los cambios hechos desde fuera
+    se recogen con un QFileSystemWatcher y se notifican con valueChanged.
+
+    Cada clave tiene un tipo, un valor por defecto y una versión. Un valor
+    guardado con otro tipo u otra versión de la clave se ignora, así que un
+    subsistema puede cambiar el formato de su clave subiendo la versión.
+    """
+    valueChanged = Signal(str, object)
+
+    WRITE_DELAY_MS = 500
+    # Clave del fichero con la versión con la que se guardó cada clave
+    VERSIONS_KEY = "_versions"
+
+    # Nombre -> (tipo, valor por defecto, versión)
+    KEYS = {
+        "dark_mode": (bool, True, 1),
+        "language": (str, "system", 1),
+        # Una sola autenticación por sesión para los comandos de root (resources/helper.py)
+        "privileged_helper": (bool, False, 1),
+        # Política de retención de snapshots (resources/retention.py) y snapshots protegidos
+        "retention_policy": (dict, {}, 1),
+        "retention_pinned": (list, [], 1),
+        "retention_auto": (bool, False, 1),
+    }
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = ConfigManager()
+        return cls._instance
+
+    @classmethod
+    def register_key(cls, name, value_type, default, version=1):
+        cls.KEYS[name] = (value_type, default, version)
 
     @staticmethod
-    def load_config():
-        config_path = ConfigManager.get_config_path()
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading config: {e}")
-        return {"dark_mode": True, "language": "system"}  # Valores por defecto
+    def get_config_dir():
+        return os.path.join(os.path.expanduser("~"), ".config", "immutable-deepin-tools")
 
     @staticmethod
-    def save_config(config):
+    def get_config_path():
+        return os.path.join(ConfigManager.get_config_dir(), "config.json")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = self.get_config_path()
+        # Valores tal como están en el fichero, incluidas claves que esta versión no conoce
+        self.values = {}
+        self.versions = {}
+        # Claves cambiadas en memoria y aún no escritas
+        self.pending = set()
+        # mtime de nuestra última escritura, para no tomarla por un cambio externo
+        self.written_mtime = None
+        self.watcher = None
+
+        self.write_timer = QTimer(self)
+        self.write_timer.setSingleShot(True)
+        self.write_timer.setInterval(self.WRITE_DELAY_MS)
+        self.write_timer.timeout.connect(self.flush)
+
+        self.values, self.versions = self.read()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+            # Fuera del camino de arranque
+            QTimer.singleShot(0, self.watch)
+
+    def read(self):
         try:
-            with open(ConfigManager.get_config_path(), 'w') as f:
-                json.dump(config, f)
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                versions = data.pop(self.VERSIONS_KEY, {})
+                return data, versions if isinstance(versions, dict) else {}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading config: {e}")
+        return {}, {}
+
+    def get(self, name):
+        value_type, default, version = self.KEYS[name]
+        value = self.values.get(name)
+        if self.versions.get(name, 1) != version:
+            return default
+        if value_type is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, value_type) or (value_type is int and isinstance(value, bool)):
+            return default
+        return value
+
+    def set(self, name, value):
+        value_type, default, version = self.KEYS[name]
+        if not isinstance(value, value_type):
+            raise TypeError(f"{name}: se esperaba {value_type.__name__}, no {type(value).__name__}")
+        if self.get(name) == value and name in self.values:
+            return
+        self.values[name] = value
+        if version != 1:
+            self.versions[name] = version
+        else:
+            self.versions.pop(name, None)
+        self.pending.add(name)
+        self.write_timer.start()
+        self.valueChanged.emit(name, value)
+
+    def flush(self):
+        """Escribe ya los cambios pendientes"""
+        self.write_timer.stop()
+        if not self.pending:
+            return
+        data = dict(self.values)
+        if self.versions:
+            data[self.VERSIONS_KEY] = self.versions
+        try:
+            os.makedirs(self.get_config_dir(), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.get_config_dir(), prefix=".config-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self.written_mtime = os.stat(self.path).st_mtime_ns
+            self.pending.clear()
         except Exception as e:
             print(f"Error saving config: {e}")
+        self.watch()
+
+    def watch(self):
+        if self.watcher is None:
+            self.watcher = QFileSystemWatcher(self)
+            self.watcher.fileChanged.connect(self.handle_file_changed)
+            # El rename de una escritura atómica sustituye el fichero: se vigila también el directorio
+            self.watcher.directoryChanged.connect(self.handle_file_changed)
+        paths = [path for path in (self.get_config_dir(), self.path)
+                 if os.path.exists(path) and path not in self.watcher.files() + self.watcher.directories()]
+        if paths:
+            self.watcher.addPaths(paths)
+
+    def handle_file_changed(self, path):
+        self.watch()
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self.written_mtime:
+            return
+        self.written_mtime = mtime
+
+        old = {name: self.get(name) for name in self.KEYS}
+        values, versions = self.read()
+        # Lo cambiado aquí y aún no escrito prevalece sobre el fichero
+        for name in self.pending:
+            values[name] = self.values.get(name)
+            if name in self.versions:
+                versions[name] = self.versions[name]
+            else:
+                versions.pop(name, None)
+        self.values, self.versions = values, versions
+        for name, value in old.items():
+            new_value = self.get(name)
+            if new_value != value:
+                self.valueChanged.emit(name, new_value)
 
 class ThemeManager:
-    @staticmethod
-    def dark_theme():
-        return """
+    """Genera las hojas de estilo de los temas a partir de una única plantilla.
+
+    Cada tema es un diccionario de colores (PALETTES) que se sustituye en
+    TEMPLATE. Las hojas resultantes y las QPalette se construyen una sola vez
+    y se aplican únicamente a QApplication: los widgets no tienen hojas
+    propias que dependan del tema, sino nombres de objeto y propiedades
+    dinámicas (variant, accent, tile, role, state) que la hoja compartida ya
+    contempla.
+    """
+    PALETTES = {
+        "dark": {
+            "text": "#BEBEBE",
+            "window": "#252525",
+            "title_bar": "#262626",
+            "title_border": "#333333",
+            "window_button_hover": "#4A4A4A",
+            "window_button_pressed": "#323232",
+            "close_hover": "#E81123",
+            "close_pressed": "#8C0A1A",
+            "content": "#2D2D2D",
+            "nav": "#252525",
+            "nav_border": "#333333",
+            "nav_hover": "#3A3A3A",
+            "accent": "#0081FF",
+            "accent_hover": "#006BB3",
+            "accent_pressed": "#004A77",
+            "group": "#3A3A3A",
+            "border": "#444444",
+            "border_hover": "#555555",
+            "input": "#2D2D2D",
+            "list": "#3A3A3A",
+            "list_item_border": "#444444",
+            "list_hover": "#4A4A4A",
+            "control": "#4A4A4A",
+            "link": "#66b3ff",
+            "link_hover": "#0081FF",
+            "dialog": "#2D2D2D",
+            "dialog_group": "#3A3A3A",
+            "scroll": "#2a2a2a",
+            "scroll_handle": "#4a4a4a",
+            "scroll_handle_hover": "#5a5a5a",
+            "menu": "#3A3A3A",
+            "disabled_text": "#777777",
+            "separator": "#444444",
+            "info_dialog": "#3A3A3A",
+            "info_dialog_border": "#555555",
+            "info_title": "#FFFFFF",
+            "info_label": "#BEBEBE",
+            "info_value": "#E0E0E0",
+            "info_value_background": "#2D2D2D",
+            "info_value_border": "#444444",
+            "info_frame": "#555555",
+        },
+        "light": {
+            "text": "#333333",
+            "window": "#F5F5F5",
+            "title_bar": "#F0F0F0",
+            "title_border": "#DDDDDD",
+            "window_button_hover": "#E0E0E0",
+            "window_button_pressed": "#D0D0D0",
+            "close_hover": "#FF5C5C",
+            "close_pressed": "#E04A4A",
+            "content": "#FFFFFF",
+            "nav": "#F0F0F0",
+            "nav_border": "#E0E0E0",
+            "nav_hover": "#E5E5E5",
+            "accent": "#2ca7f8",
+            "accent_hover": "#1d8dd8",
+            "accent_pressed": "#0a70b9",
+            "group": "#F0F0F0",
+            "border": "#E0E0E0",
+            "border_hover": "#C0C0C0",
+            "input": "#FFFFFF",
+            "list": "#FFFFFF",
+            "list_item_border": "#F0F0F0",
+            "list_hover": "#A6A6A6",
+            "control": "#F0F0F0",
+            "link": "#2ca7f8",
+            "link_hover": "#1d8dd8",
+            "dialog": "#F5F5F5",
+            "dialog_group": "#FFFFFF",
+            "scroll": "#f0f0f0",
+            "scroll_handle": "#c0c0c0",
+            "scroll_handle_hover": "#a0a0a0",
+            "menu": "#FFFFFF",
+            "disabled_text": "#AAAAAA",
+            "separator": "#DDDDDD",
+            "info_dialog": "#FFFFFF",
+            "info_dialog_border": "#E0E0E0",
+            "info_title": "#333333",
+            "info_label": "#333333",
+            "info_value": "#333333",
+            "info_value_background": "#F8F8F8",
+            "info_value_border": "#E0E0E0",
+            "info_frame": "#E0E0E0",
+        },
+    }
+
+    # Colores de acento de los botones de AdminTab (propiedad "accent")
+    ACCENT_COLORS = ("#3498db", "#2ecc71", "#f39c12", "#e74c3c", "#9b59b6")
+
+    TEMPLATE = Template("""
         /* General */
         * {
             font-family: 'Noto Sans', sans-serif;
-            color: #BEBEBE;
+            color: $text;
         }
 
         /* Ventana principal */
         QMainWindow {
-            background-color: #252525;
-            color: #BEBEBE;
+            background-color: $window;
+            color: $text;
+        }
+        #main_widget {
+            background-color: $content;
+            border-radius: 8px;
+        }
+        #main_widget QListWidget::item, #main_widget QListView#snapshot_list::item {
+            padding: 8px 15px;
         }
 
         /* Barra de título principal */
         #title_bar {
-            background-color: #262626;
-            border-bottom: 1px solid #333333;
+            background-color: $title_bar;
+            border-bottom: 1px solid $title_border;
             border-top-left-radius: 8px;
             border-top-right-radius: 8px;
         }
 
         /* Barra de título - texto */
         #title_label {
-            color: #BEBEBE;
+            color: $text;
             font-size: 14px;
             font-weight: bold;
             padding-left: 8px;
@@ -123,23 +436,25 @@ class ThemeManager:
             width: 24px;
             height: 24px;
             border-radius: 0px;
+            color: $text;
         }
         #window_button:hover {
-            background-color: #4A4A4A;
+            background-color: $window_button_hover;
         }
         #window_button:pressed {
-            background-color: #323232;
+            background-color: $window_button_pressed;
         }
         #close_button:hover {
-            background-color: #E81123;
+            background-color: $close_hover;
+            color: white;
         }
         #close_button:pressed {
-            background-color: #8C0A1A;
+            background-color: $close_pressed;
         }
 
         /* Contenido principal de la ventana principal */
         #content_widget {
-            background-color: #2D2D2D;
+            background-color: $content;
             border-bottom-left-radius: 8px;
             border-bottom-right-radius: 8px;
         }
@@ -147,44 +462,44 @@ class ThemeManager:
         /* Lista de navegación lateral */
         #nav_list {
             border: none;
-            background-color: #252525;
-            color: #BEBEBE;
+            background-color: $nav;
+            color: $text;
             padding: 5px;
         }
         #nav_list::item {
             padding: 12px 15px;
-            border-bottom: 1px solid #333333;
+            border-bottom: 1px solid $nav_border;
             background-color: transparent;
             border-radius: 5px;
             margin-bottom: 2px;
         }
         #nav_list::item:hover {
-            background-color: #3A3A3A;
+            background-color: $nav_hover;
         }
         #nav_list::item:selected {
-            background-color: #0081FF;
+            background-color: $accent;
             color: #FFFFFF;
         }
         #nav_list::item:selected:hover {
-            background-color: #006BB3;  /* Un azul más oscuro para el hover en seleccionado */
+            background-color: $accent_hover;  /* Un azul más oscuro para el hover en seleccionado */
             color: #FFFFFF;
         }
 
         /* Grupos (QGroupBox) */
         QGroupBox {
-            background-color: #3A3A3A;
-            border: 1px solid #444444;
+            background-color: $group;
+            border: 1px solid $border;
             border-radius: 10px;
             margin-top: 25px;
             padding-top: 25px;
-            color: #BEBEBE;
+            color: $text;
         }
         QGroupBox::title {
             subcontrol-origin: margin;
             subcontrol-position: top center;
             padding: 0 5px;
             background-color: transparent;
-            color: #BEBEBE;
+            color: $text;
             border-radius: 0px;
             font-weight: bold;
             font-size: 14px;
@@ -193,6 +508,12 @@ class ThemeManager:
             margin-right: 10px;
         }
 
+        /* Separadores */
+        QFrame#separator {
+            background-color: $separator;
+            border: none;
+        }
+
         /* Botones generales */
         QPushButton {
             background-color: #2ca7f8;
@@ -216,461 +537,78 @@ class ThemeManager:
             color: #777777;
         }
 
-        /* Botones de comandos comunes */
-        #common_command_button {
+        /* Botones de acción (propiedad "variant") */
+        QPushButton[variant="danger"] {
             background-color: #E74C3C;
-            min-width: 80px;
-            padding: 8px;
-            font-size: 12px;
+            color: white;
         }
-        #common_command_button:hover {
+        QPushButton[variant="danger"]:hover {
             background-color: #C0392B;
         }
-        #common_command_button:pressed {
+        QPushButton[variant="danger"]:pressed {
             background-color: #A93226;
         }
-
-        /* Botones específicos para el tab de Snapshots */
-        QPushButton#btn_create_snapshot {
+        QPushButton[variant="success"] {
             background-color: #2ECC71;
-            min-width: 100px;
+            color: white;
         }
-        QPushButton#btn_create_snapshot:hover {
+        QPushButton[variant="success"]:hover {
             background-color: #27AE60;
         }
-        QPushButton#btn_create_snapshot:pressed {
+        QPushButton[variant="success"]:pressed {
             background-color: #1E8449;
         }
-
-        QPushButton#btn_delete_snapshot {
-            background-color: #E74C3C;
-            min-width: 100px;
-        }
-        QPushButton#btn_delete_snapshot:hover {
-            background-color: #C0392B;
-        }
-        QPushButton#btn_delete_snapshot:pressed {
-            background-color: #A93226;
-        }
-
-        QPushButton#btn_modify_snapshot {
-            background-color: #F39C12;
-            min-width: 40px;
-            max-width: 40px;
-            padding: 8px;
-        }
-        QPushButton#btn_modify_snapshot:hover {
-            background-color: #D68910;
-        }
-        QPushButton#btn_modify_snapshot:pressed {
-            background-color: #B9770E;
+        QPushButton[variant="danger"]:disabled, QPushButton[variant="success"]:disabled {
+            background-color: #555555;
+            color: #777777;
         }
 
-        QPushButton#btn_show_snapshot, QPushButton#btn_refresh_list {
-            background-color: #0081FF;
-            min-width: 40px;
-            max-width: 40px;
+        /* Botones de comandos comunes */
+        #common_command_button {
+            background-color: #E74C3C;
+            min-width: 80px;
             padding: 8px;
-        }
-        QPushButton#btn_show_snapshot:hover, QPushButton#btn_refresh_list:hover {
-            background-color: #006BB3;
-        }
-        QPushButton#btn_show_snapshot:pressed, QPushButton#btn_refresh_list:pressed {
-            background-color: #004A77;
-        }
-
-        /* Área de texto */
-        QTextEdit {
-            border: 1px solid #444444;
-            border-radius: 8px;
-            padding: 10px;
-            background-color: #2D2D2D;
-            color: #BEBEBE;
-            font-family: 'Cascadia Code', 'Consolas', monospace;
             font-size: 12px;
         }
-
-        /* Lista */
-        QListWidget {
-            border: 1px solid #444444;
-            border-radius: 8px;
-            background-color: #3A3A3A;
-            color: #BEBEBE;
-            padding: 5px;
-        }
-        QListWidget::item {
-            padding: 10px;
-            border-bottom: 1px solid #444444;
-            background-color: #3A3A3A;
-            border-radius: 5px;
-            margin-bottom: 2px;
-        }
-        QListWidget::item:hover {
-            background-color: #4A4A4A;
-        }
-        QListWidget::item:selected {
-            background-color: #0081FF;
-            color: #FFFFFF;
-        }
-
-        /* Campos de entrada */
-        QLineEdit {
-            border: 1px solid #444444;
-            border-radius: 6px;
-            padding: 8px;
-            background-color: #2D2D2D;
-            color: #BEBEBE;
-        }
-
-        /* Etiquetas de estado */
-        QLabel#status_label {
-            font-weight: bold;
-            font-size: 15px;
-            padding: 5px;
-        }
-
-        /* Enlaces */
-        QLabel a {
-            color: #66b3ff;
-            text-decoration: underline;
-        }
-        QLabel a:hover {
-            color: #0081FF;
-        }
-        
-        /* Barra de Progreso */
-        QProgressBar {
-            border: 1px solid #444444;
-            border-radius: 6px;
-            background-color: #2D2D2D;
-            text-align: center;
-            color: #BEBEBE;
-            height: 25px;
-        }
-        QProgressBar::chunk {
-            background-color: #0081FF;
-            border-radius: 5px;
-        }
-
-        /* Diálogos (Pop-ups) */
-        QDialog {
-            background-color: #2D2D2D;
-            color: #BEBEBE;
-        }
-        QDialog QGroupBox {
-            background-color: #3A3A3A;
-            color: #BEBEBE;
-        }
-        QDialog QLabel {
-            color: #BEBEBE;
-        }
-        QDialog QLineEdit {
-            background-color: #2D2D2D;
-            color: #BEBEBE;
-        }
-        QDialog QTextEdit {
-            background-color: #2D2D2D;
-            color: #BEBEBE;
-        }
-        /* Botón de cerrar en consola */
-        QDialog #close_button {
-            background-color: #0081FF;
-            color: white;
-            padding: 8px 16px;
-            min-width: 80px;
-            margin: 10px;
-        }
-        QDialog #close_button:hover {
-            background-color: #006BB3;
-        }
-        QDialog #close_button:pressed {
-            background-color: #004A77;
-        }
-        /* Botones de reinicio */
-        QDialog #reboot_button {
-            padding: 8px 16px;
-            min-width: 120px;
-            margin: 10px;
-        }
-        QDialog #reboot_button:nth-child(1) {  # Reiniciar Ahora
-            background-color: #2ECC71;
-            color: white;
-        }
-        QDialog #reboot_button:nth-child(1):hover {
-            background-color: #27AE60;
-        }
-        QDialog #reboot_button:nth-child(1):pressed {
-            background-color: #1E8449;
-        }
-        QDialog #reboot_button:nth-child(2) {  # Más Tarde
-            background-color: #E74C3C;
-            color: white;
-        }
-        QDialog #reboot_button:nth-child(2):hover {
+        #common_command_button:hover {
             background-color: #C0392B;
         }
-        QDialog #reboot_button:nth-child(2):pressed {
+        #common_command_button:pressed {
             background-color: #A93226;
         }
-        /* Diálogo Acerca de */
-        QDialog QLabel {
-            margin: 5px;
-        }
-        QDialog QLabel[accessibleName="link"] {
-            color: #0081FF;
-        }
-        QDialog QLabel[accessibleName="link"]:hover {
-            color: #006BB3;
-            text-decoration: underline;
-        }
-        QDialog QPushButton {
-            min-width: 100px;
-            padding: 8px;
-            margin-top: 15px;
-        }
-        /* Scrollbars */
-        QScrollBar:vertical {
-            border: none;
-            background: #2a2a2a;
-            width: 12px;
-            margin: 0;
-        }
-        QScrollBar::handle:vertical {
-            background: #4a4a4a;
-            min-height: 30px;
-            border-radius: 6px;
-        }
-        QScrollBar::handle:vertical:hover {
-            background: #5a5a5a;
-        }
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-            height: 0;
-            background: none;
-        }
-        QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-            background: none;
-        }
-
-        QScrollBar:horizontal {
-            border: none;
-            background: #2a2a2a;
-            height: 12px;
-            margin: 0;
-        }
-        QScrollBar::handle:horizontal {
-            background: #4a4a4a;
-            min-width: 30px;
-            border-radius: 6px;
-        }
-        QScrollBar::handle:horizontal:hover {
-            background: #5a5a5a;
-        }
-        QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-            width: 0;
-            background: none;
-        }
-        QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {
-            background: none;
-        }
-        /* Menú desplegable */
-        QMenu {
-            background-color: #3A3A3A;
-            border: 1px solid #444444;
-            border-radius: 6px;
-            padding: 5px;
-        }
-
-        QMenu::item {
-            background-color: transparent;
-            padding: 8px 25px 8px 20px;
-            margin: 2px;
-            border-radius: 4px;
-        }
 
-        QMenu::item:selected {
-            background-color: #0081FF;
-            color: #FFFFFF;
-        }
-
-        QMenu::item:disabled {
-            color: #777777;
-        }
-
-        QMenu::separator {
-            height: 1px;
-            background-color: #444444;
-            margin: 5px 0;
-        }
-        """
-
-    @staticmethod
-    def light_theme():
-        return """
-        /* General */
-        * {
-            font-family: 'Noto Sans', sans-serif;
-            color: #333333;
-        }
-
-        /* Ventana principal */
-        QMainWindow {
-            background-color: #F5F5F5;
-            color: #333333;
-        }
-
-        /* Barra de título principal (Customizada) */
-
-        /* Botones de la barra de título en tema claro */
-        #window_button {
-            color: #333333;
-        }
-        #window_button:hover {
-            background-color: #E0E0E0;
-            color: #333333;
-        }
-        #window_button:pressed {
-            background-color: #D0D0D0;
-        }
-        #close_button:hover {
-            background-color: #FF5C5C;
-            color: white;
-        }
-        #close_button:pressed {
-            background-color: #E04A4A;
-        }
-
-        /* Barra de título principal */
-        #title_bar {
-            background-color: #F0F0F0;
-            border-bottom: 1px solid #DDDDDD;
-            border-top-left-radius: 8px;
-            border-top-right-radius: 8px;
-        }
-
-        /* Barra de título - texto */
-        #title_label {
-            color: #333333;
-            font-size: 14px;
-            font-weight: bold;
-            padding-left: 8px;
-        }
-
-        /* Botones de la barra de título */
-        #window_button {
-            background-color: transparent;
-            border: none;
-            padding: 0px;
-            margin: 0px;
-            width: 24px;
-            height: 24px;
-            border-radius: 0px;
-        }
-        #window_button:hover {
-            background-color: #E0E0E0;
-        }
-        #window_button:pressed {
-            background-color: #D0D0D0;
-        }
-        #close_button:hover {
-            background-color: #FF5C5C;
-        }
-        #close_button:pressed {
-            background-color: #E04A4A;
-        }
-
-        /* Contenido principal de la ventana principal */
-        #content_widget {
-            background-color: #FFFFFF;
-            border-bottom-left-radius: 8px;
-            border-bottom-right-radius: 8px;
-        }
-
-        /* Lista de navegación lateral */
-        #nav_list {
-            border: none;
-            background-color: #F0F0F0;
-            color: #333333;
+        /* Botones con icono y descripción de AdminTab (propiedad "tile") */
+        QPushButton[tile="large"] {
+            border: 2px solid;
+            border-radius: 15px;
             padding: 5px;
         }
-        #nav_list::item {
-            padding: 12px 15px;
-            border-bottom: 1px solid #E0E0E0;
-            background-color: transparent;
-            border-radius: 5px;
-            margin-bottom: 2px;
-        }
-        #nav_list::item:hover {
-            background-color: #E5E5E5;
-        }
-        #nav_list::item:selected {
-            background-color: #2ca7f8;
-            color: #FFFFFF;
-        }
-        #nav_list::item:selected:hover {
-            background-color: #1d8dd8;  /* Un azul más oscuro para el hover en seleccionado */
-            color: #FFFFFF;
-        }
-
-        /* Grupos */
-        QGroupBox {
-            background-color: #F0F0F0;
-            border: 1px solid #E0E0E0;
+        QPushButton[tile="small"] {
+            border: 1px solid;
             border-radius: 10px;
-            margin-top: 25px;
-            padding-top: 25px;
-            color: #333333;
+            padding: 5px;
         }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            subcontrol-position: top center;
-            padding: 0 5px;
-            background-color: transparent;
-            color: #333333;
-            border-radius: 0px;
+        QPushButton[tile="large"] QLabel#tile_title {
             font-weight: bold;
             font-size: 14px;
-            top: 5px;
-            margin-left: 10px;
-            margin-right: 10px;
+            margin-top: 5px;
         }
-
-        /* Botones generales */
-        QPushButton {
-            background-color: #2ca7f8;
-            color: white;
-            border: none;
-            border-radius: 8px;
-            padding: 10px 20px;
-            min-width: 120px;
-            font-size: 13px;
+        QPushButton[tile="small"] QLabel#tile_title {
             font-weight: bold;
-            text-align: center;
-        }
-        QPushButton:hover {
-            background-color: #1d8dd8;
-        }
-        QPushButton:pressed {
-            background-color: #0a70b9;
+            font-size: 13px;
+            margin-top: 3px;
         }
-        QPushButton:disabled {
-            background-color: #CCCCCC;
-            color: #777777;
+        QPushButton[tile="large"] QLabel#tile_description {
+            font-size: 11px;
+            color: #777;
+            margin-top: 5px;
         }
-
-        /* Botones de comandos comunes */
-        #common_command_button {
-            background-color: #E74C3C;
-            min-width: 80px;
-            padding: 8px;
-            font-size: 12px;
+        QPushButton[tile="small"] QLabel#tile_description {
+            font-size: 10px;
+            color: #555;
+            margin-top: 3px;
         }
-        #common_command_button:hover {
-            background-color: #C0392B;
-        }
-        #common_command_button:pressed {
-            background-color: #A93226;
-        }
-
+$accent_rules
         /* Botones específicos para el tab de Snapshots */
         QPushButton#btn_create_snapshot {
             background-color: #2ECC71;
@@ -694,11 +632,18 @@ class ThemeManager:
             background-color: #A93226;
         }
 
+        /* Botones pequeños con iconos */
+        QPushButton#btn_show_snapshot, QPushButton#btn_modify_snapshot, QPushButton#btn_refresh_list {
+            min-width: 32px;
+            max-width: 32px;
+            min-height: 32px;
+            max-height: 32px;
+            padding: 0px;
+            margin: 0px;
+        }
+
         QPushButton#btn_modify_snapshot {
             background-color: #F39C12;
-            min-width: 40px;
-            max-width: 40px;
-            padding: 8px;
         }
         QPushButton#btn_modify_snapshot:hover {
             background-color: #D68910;
@@ -708,59 +653,114 @@ class ThemeManager:
         }
 
         QPushButton#btn_show_snapshot, QPushButton#btn_refresh_list {
-            background-color: #2ca7f8;
-            min-width: 40px;
-            max-width: 40px;
-            padding: 8px;
+            background-color: $accent;
         }
         QPushButton#btn_show_snapshot:hover, QPushButton#btn_refresh_list:hover {
-            background-color: #1d8dd8;
+            background-color: $accent_hover;
         }
         QPushButton#btn_show_snapshot:pressed, QPushButton#btn_refresh_list:pressed {
-            background-color: #0a70b9;
+            background-color: $accent_pressed;
+        }
+
+        QPushButton#btn_create_snapshot:disabled, QPushButton#btn_delete_snapshot:disabled,
+        QPushButton#btn_show_snapshot:disabled, QPushButton#btn_modify_snapshot:disabled,
+        QPushButton#btn_refresh_list:disabled {
+            background-color: #CCCCCC;
+            color: #777777;
         }
 
         /* Área de texto */
-        QTextEdit {
-            border: 1px solid #E0E0E0;
+        QTextEdit, QPlainTextEdit {
+            border: 1px solid $border;
             border-radius: 8px;
             padding: 10px;
-            background-color: #FFFFFF;
-            color: #333333;
+            background-color: $input;
+            color: $text;
             font-family: 'Cascadia Code', 'Consolas', monospace;
             font-size: 12px;
         }
 
         /* Lista */
-        QListWidget {
-            border: 1px solid #E0E0E0;
+        QListWidget, QListView#snapshot_list {
+            border: 1px solid $border;
             border-radius: 8px;
-            background-color: #FFFFFF;
-            color: #333333;
+            background-color: $list;
+            color: $text;
             padding: 5px;
         }
-        QListWidget::item {
+        QListWidget::item, QListView#snapshot_list::item {
             padding: 10px;
-            border-bottom: 1px solid #F0F0F0;
-            background-color: #FFFFFF;
+            border-bottom: 1px solid $list_item_border;
+            background-color: $list;
             border-radius: 5px;
             margin-bottom: 2px;
         }
-        QListWidget::item:hover {
-            background-color: #A6A6A6;
+        QListWidget::item:hover, QListView#snapshot_list::item:hover {
+            background-color: $list_hover;
         }
-        QListWidget::item:selected {
-            background-color: #2ca7f8;
+        QListWidget::item:selected, QListView#snapshot_list::item:selected {
+            background-color: $accent;
             color: #FFFFFF;
         }
 
         /* Campos de entrada */
         QLineEdit {
-            border: 1px solid #E0E0E0;
+            border: 1px solid $border;
             border-radius: 6px;
             padding: 8px;
-            background-color: #FFFFFF;
-            color: #333333;
+            background-color: $input;
+            color: $text;
+        }
+
+        /* Listas desplegables */
+        QComboBox {
+            border: 1px solid $border;
+            border-radius: 6px;
+            padding: 8px;
+            background-color: $list;
+            color: $text;
+            min-height: 25px;
+        }
+        QComboBox:hover {
+            border: 1px solid $border_hover;
+        }
+        QComboBox::drop-down {
+            subcontrol-origin: padding;
+            subcontrol-position: top right;
+            width: 25px;
+            border-left-width: 1px;
+            border-left-color: $border;
+            border-left-style: solid;
+            border-top-right-radius: 6px;
+            border-bottom-right-radius: 6px;
+            background-color: $control;
+        }
+        QComboBox::down-arrow {
+            image: none;
+            border-left: 4px solid none;
+            border-right: 4px solid none;
+            border-top: 5px solid $text;
+            margin-right: 8px;
+        }
+        QComboBox QAbstractItemView {
+            border: 1px solid $border;
+            border-radius: 6px;
+            background-color: $list;
+            color: $text;
+            selection-background-color: $accent;
+            selection-color: white;
+            outline: 0px;
+        }
+        QComboBox QAbstractItemView::item {
+            padding: 8px;
+            border-radius: 3px;
+        }
+        QComboBox QAbstractItemView::item:hover {
+            background-color: $control;
+        }
+        QComboBox QAbstractItemView::item:selected {
+            background-color: $accent;
+            color: white;
         }
 
         /* Etiquetas de estado */
@@ -769,49 +769,66 @@ class ThemeManager:
             font-size: 15px;
             padding: 5px;
         }
+        QLabel#status_label[state="immutable"] {
+            color: #2ECC71;
+        }
+        QLabel#status_label[state="writable"] {
+            color: #E74C3C;
+        }
+
+        /* Cabecera de Acerca de */
+        QLabel#about_title {
+            font-size: 24px;
+            font-weight: bold;
+        }
+        QLabel#about_subtitle {
+            font-size: 17px;
+            font-weight: bold;
+            color: #3D60E3;
+        }
 
         /* Enlaces */
         QLabel a {
-            color: #2ca7f8;
+            color: $link;
             text-decoration: underline;
         }
         QLabel a:hover {
-            color: #1d8dd8;
+            color: $link_hover;
         }
         
         /* Barra de Progreso */
         QProgressBar {
-            border: 1px solid #E0E0E0;
+            border: 1px solid $border;
             border-radius: 6px;
-            background-color: #FFFFFF;
+            background-color: $input;
             text-align: center;
-            color: #333333;
+            color: $text;
             height: 25px;
         }
         QProgressBar::chunk {
-            background-color: #2ca7f8;
+            background-color: $accent;
             border-radius: 5px;
         }
 
         /* Diálogos (Pop-ups) */
         QDialog {
-            background-color: #F5F5F5;
-            color: #333333;
+            background-color: $dialog;
+            color: $text;
         }
         QDialog QGroupBox {
-            background-color: #FFFFFF;
-            color: #333333;
+            background-color: $dialog_group;
+            color: $text;
         }
         QDialog QLabel {
-            color: #333333;
+            color: $text;
         }
         QDialog QLineEdit {
-            background-color: #FFFFFF;
-            color: #333333;
+            background-color: $input;
+            color: $text;
         }
-        QDialog QTextEdit {
-            background-color: #FFFFFF;
-            color: #333333;
+        QDialog QTextEdit, QDialog QPlainTextEdit {
+            background-color: $input;
+            color: $text;
         }
         /* Botón de cerrar en consola */
         QDialog #close_button {
@@ -833,24 +850,24 @@ class ThemeManager:
             min-width: 120px;
             margin: 10px;
         }
-        QDialog #reboot_button:nth-child(1) {  # Reiniciar Ahora
+        QDialog #reboot_button[role="now"] {  /* Reiniciar Ahora */
             background-color: #2ECC71;
             color: white;
         }
-        QDialog #reboot_button:nth-child(1):hover {
+        QDialog #reboot_button[role="now"]:hover {
             background-color: #27AE60;
         }
-        QDialog #reboot_button:nth-child(1):pressed {
+        QDialog #reboot_button[role="now"]:pressed {
             background-color: #1E8449;
         }
-        QDialog #reboot_button:nth-child(2) {  # Más Tarde
+        QDialog #reboot_button[role="later"] {  /* Más Tarde */
             background-color: #E74C3C;
             color: white;
         }
-        QDialog #reboot_button:nth-child(2):hover {
+        QDialog #reboot_button[role="later"]:hover {
             background-color: #C0392B;
         }
-        QDialog #reboot_button:nth-child(2):pressed {
+        QDialog #reboot_button[role="later"]:pressed {
             background-color: #A93226;
         }
         /* Diálogo Acerca de */
@@ -869,20 +886,69 @@ class ThemeManager:
             padding: 8px;
             margin-top: 15px;
         }
+        /* Diálogo de idioma */
+        #language_dialog QPushButton {
+            padding: 10px 20px;
+            min-width: 80px;
+        }
+        /* Diálogo de información de snapshot */
+        #info_dialog {
+            background-color: $info_dialog;
+            border: 1px solid $info_dialog_border;
+            border-radius: 8px;
+        }
+        #info_dialog QFrame {
+            background-color: $info_frame;
+        }
+        #info_dialog #dialog_title {
+            color: $info_title;
+            font-size: 18px;
+            font-weight: bold;
+            padding: 10px;
+            background-color: transparent;
+        }
+        #info_dialog #field_label {
+            font-weight: bold;
+            color: $info_label;
+            font-size: 13px;
+            background-color: transparent;
+        }
+        #info_dialog #field_value {
+            color: $info_value;
+            font-size: 13px;
+            background-color: $info_value_background;
+            padding: 6px 10px;
+            border-radius: 4px;
+            border: 1px solid $info_value_border;
+        }
+        #info_dialog #close_button {
+            background-color: #2ca7f8;
+            color: white;
+            border: none;
+            border-radius: 6px;
+            font-size: 13px;
+            font-weight: bold;
+        }
+        #info_dialog #close_button:hover {
+            background-color: #1d8dd8;
+        }
+        #info_dialog #close_button:pressed {
+            background-color: #0a70b9;
+        }
         /* Scrollbars */
         QScrollBar:vertical {
             border: none;
-            background: #f0f0f0;
+            background: $scroll;
             width: 12px;
             margin: 0;
         }
         QScrollBar::handle:vertical {
-            background: #c0c0c0;
+            background: $scroll_handle;
             min-height: 30px;
             border-radius: 6px;
         }
         QScrollBar::handle:vertical:hover {
-            background: #a0a0a0;
+            background: $scroll_handle_hover;
         }
         QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
             height: 0;
@@ -894,17 +960,17 @@ class ThemeManager:
 
         QScrollBar:horizontal {
             border: none;
-            background: #f0f0f0;
+            background: $scroll;
             height: 12px;
             margin: 0;
         }
         QScrollBar::handle:horizontal {
-            background: #c0c0c0;
+            background: $scroll_handle;
             min-width: 30px;
             border-radius: 6px;
         }
         QScrollBar::handle:horizontal:hover {
-            background: #a0a0a0;
+            background: $scroll_handle_hover;
         }
         QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
             width: 0;
@@ -915,8 +981,8 @@ class ThemeManager:
         }
         /* Menú desplegable */
         QMenu {
-            background-color: #FFFFFF;
-            border: 1px solid #E0E0E0;
+            background-color: $menu;
+            border: 1px solid $border;
             border-radius: 6px;
             padding: 5px;
         }
@@ -926,24 +992,104 @@ class ThemeManager:
             padding: 8px 25px 8px 20px;
             margin: 2px;
             border-radius: 4px;
-            color: #333333;
+            color: $text;
         }
 
         QMenu::item:selected {
-            background-color: #2ca7f8;
+            background-color: $accent;
             color: #FFFFFF;
         }
 
         QMenu::item:disabled {
-            color: #AAAAAA;
+            color: $disabled_text;
         }
 
         QMenu::separator {
             height: 1px;
-            background-color: #E0E0E0;
+            background-color: $border;
             margin: 5px 0;
         }
-        """
+        """)
+
+    ACCENT_TEMPLATE = Template("""
+        QPushButton[accent="$color"] {
+            border-color: $color;
+            background-color: rgba($rgb, 0.1);
+        }
+        QPushButton[accent="$color"]:hover {
+            background-color: rgba($rgb, 0.2);
+        }
+        QPushButton[accent="$color"]:pressed {
+            background-color: rgba($rgb, 0.3);
+        }
+        QPushButton[accent="$color"] QLabel#tile_title {
+            color: $color;
+        }
+""")
+
+    # Tema -> hoja de estilo / QPalette ya construidas
+    _stylesheets = {}
+    _palettes = {}
+
+    @staticmethod
+    def theme_name(dark_mode):
+        return "dark" if dark_mode else "light"
+
+    @classmethod
+    def stylesheet(cls, theme):
+        sheet = cls._stylesheets.get(theme)
+        if sheet is None:
+            accent_rules = "".join(
+                cls.ACCENT_TEMPLATE.substitute(
+                    color=color,
+                    rgb=", ".join(str(int(color[i:i + 2], 16)) for i in (1, 3, 5))
+                )
+                for color in cls.ACCENT_COLORS
+            )
+            sheet = cls.TEMPLATE.substitute(cls.PALETTES[theme], accent_rules=accent_rules)
+            cls._stylesheets[theme] = sheet
+        return sheet
+
+    @classmethod
+    def palette(cls, theme):
+        """QPalette equivalente, para lo que Qt pinta sin pasar por la hoja de estilo"""
+        palette = cls._palettes.get(theme)
+        if palette is None:
+            colors = cls.PALETTES[theme]
+            palette = QPalette()
+            for role, key in (
+                (QPalette.ColorRole.Window, "window"),
+                (QPalette.ColorRole.WindowText, "text"),
+                (QPalette.ColorRole.Base, "input"),
+                (QPalette.ColorRole.AlternateBase, "list"),
+                (QPalette.ColorRole.Text, "text"),
+                (QPalette.ColorRole.Button, "group"),
+                (QPalette.ColorRole.ButtonText, "text"),
+                (QPalette.ColorRole.ToolTipBase, "menu"),
+                (QPalette.ColorRole.ToolTipText, "text"),
+                (QPalette.ColorRole.PlaceholderText, "disabled_text"),
+                (QPalette.ColorRole.Highlight, "accent"),
+                (QPalette.ColorRole.Link, "link"),
+            ):
+                palette.setColor(role, QColor(colors[key]))
+            palette.setColor(QPalette.ColorRole.HighlightedText, QColor("#FFFFFF"))
+            cls._palettes[theme] = palette
+        return palette
+
+    @classmethod
+    def apply(cls, app, dark_mode):
+        """Aplica el tema a toda la aplicación con un único cambio de hoja"""
+        theme = cls.theme_name(dark_mode)
+        app.setPalette(cls.palette(theme))
+        app.setStyleSheet(cls.stylesheet(theme))
+
+    @classmethod
+    def dark_theme(cls):
+        return cls.stylesheet("dark")
+
+    @classmethod
+    def light_theme(cls):
+        return cls.stylesheet("light")
 
 class CustomTitleBar(QWidget):
     def __init__(self, parent):
@@ -958,15 +1104,10 @@ class CustomTitleBar(QWidget):
 
         self.icon_label = QLabel()
         self.icon_label.setFixedSize(24, 24)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        icon_path = os.path.join(current_dir, "resources", "icon.png")
-        if os.path.exists(icon_path):
-            self.icon_label.setPixmap(QIcon(icon_path).pixmap(24, 24))
-        else:
-            self.icon_label.setPixmap(QIcon.fromTheme("system-run").pixmap(24, 24))
+        self.icon_label.setPixmap(ICONS.pixmap("icon", 24))
         layout.addWidget(self.icon_label)
 
-        self.title = QLabel(self.tr("Immutable Deepin Tools"))
+        self.title = QLabel()
         self.title.setObjectName("title_label")
         layout.addWidget(self.title, 1, Qt.AlignLeft | Qt.AlignVCenter)
 
@@ -974,16 +1115,7 @@ class CustomTitleBar(QWidget):
         self.language_button = QPushButton()
         self.language_button.setObjectName("window_button")
         self.language_button.setFixedSize(24, 24)
-        
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        language_icon_path = os.path.join(current_dir, "resources", "language-button.png")
-        
-        if os.path.exists(language_icon_path):
-            self.language_button.setIcon(QIcon(language_icon_path))
-        else:
-            self.language_button.setIcon(QIcon.fromTheme("preferences-desktop-locale"))
-            
-        self.language_button.setToolTip(self.tr("Cambiar idioma"))
+        self.language_button.setIcon(ICONS.icon("language-button"))
         self.language_button.clicked.connect(self.parent.show_language_dialog)
         layout.addWidget(self.language_button, 0, Qt.AlignRight | Qt.AlignVCenter)
 
@@ -992,8 +1124,6 @@ class CustomTitleBar(QWidget):
         self.theme_button.setFixedSize(24, 24)
         
         self.update_theme_icon()
-        
-        self.theme_button.setToolTip(self.tr("Cambiar tema claro/oscuro"))
         self.theme_button.clicked.connect(self.parent.toggle_theme)
         layout.addWidget(self.theme_button, 0, Qt.AlignRight | Qt.AlignVCenter)
 
@@ -1020,20 +1150,23 @@ class CustomTitleBar(QWidget):
         self.close_btn.clicked.connect(self.parent.close)
         layout.addWidget(self.close_btn, 0, Qt.AlignRight | Qt.AlignVCenter)
 
+        self.retranslate_ui()
+
+    def retranslate_ui(self):
+        self.title.setText(self.tr("Immutable Deepin Tools"))
+        self.language_button.setToolTip(self.tr("Cambiar idioma"))
+        self.theme_button.setToolTip(self.tr("Cambiar tema claro/oscuro"))
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
     def update_theme_icon(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
         if hasattr(self.parent, 'dark_mode') and self.parent.dark_mode:
-            icon_path = os.path.join(current_dir, "resources", "sun-mode.png")  
-        else:
-            icon_path = os.path.join(current_dir, "resources", "black-mode.png") 
-        
-        if os.path.exists(icon_path):
-            self.theme_button.setIcon(QIcon(icon_path))
+            self.theme_button.setIcon(ICONS.icon("sun-mode"))
         else:
-            if hasattr(self.parent, 'dark_mode') and self.parent.dark_mode:
-                self.theme_button.setIcon(QIcon.fromTheme("weather-clear"))
-            else:
-                self.theme_button.setIcon(QIcon.fromTheme("weather-clear-night"))
+            self.theme_button.setIcon(ICONS.icon("black-mode"))
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -1056,12 +1189,7 @@ class RoundedWindow(QMainWindow):
         
         self.setProperty("WM_CLASS", "immutable-deepin-tools") 
 
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        icon_path = os.path.join(current_dir, "resources", "icon.png")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-        else:
-            self.setWindowIcon(QIcon.fromTheme("system-run"))
+        self.setWindowIcon(ICONS.icon("icon"))
 
         self.main_widget = QWidget()
         self.main_widget.setObjectName("main_widget")
@@ -1086,34 +1214,124 @@ class RoundedWindow(QMainWindow):
         self.setMask(region)
         super().resizeEvent(event)
 
+class OutputClassifier:
+    """Clasifica la salida de un comando a medida que llega.
+
+    Un único patrón compilado busca todas las marcas conocidas en cada
+    fragmento nuevo. Se conserva la cola del texto anterior para detectar las
+    marcas que quedan partidas entre dos lecturas, de modo que el coste es
+    proporcional solo a los bytes nuevos.
+    """
+    MARKERS = {
+        "permission_denied": [
+            "Request dismissed",
+            "Authentication failed",
+            "Not authorized",
+            "Error executing command as another user",
+            "polkit-agent-helper-1: error",
+            "contraseña incorrecta",
+            "password incorrect",
+        ],
+        "reboot_required": [
+            "reboot required",
+            "please reboot",
+            "reboot to take effect",
+            "reboot the system",
+        ],
+    }
+    ERROR_CODE_PATTERN = r"(?:exit code|exit status|error code)[:=\s]+(\d+)"
+
+    # Marca en minúsculas -> atributo que activa
+    FLAGS = {marker.lower(): flag for flag, markers in MARKERS.items() for marker in markers}
+    # Se compila en minúsculas y sin grupos con nombre: re.IGNORECASE y los
+    # grupos por marca desactivan el salto rápido por primer carácter y hacen
+    # la búsqueda varias veces más lenta
+    PATTERN = re.compile("|".join(re.escape(marker) for marker in FLAGS) + "|" + ERROR_CODE_PATTERN)
+    TAIL_SIZE = max(len(marker) for markers in MARKERS.values() for marker in markers) + 24
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.tail = ""
+        self.permission_denied = False
+        self.reboot_required = False
+        self.error_codes = set()
+
+    def feed(self, text):
+        buffer = self.tail + text.lower()
+        self._scan(buffer, final=False)
+        self.tail = buffer[-self.TAIL_SIZE:]
+
+    def finish(self):
+        """Procesa lo que quedaba pendiente al final del flujo"""
+        self._scan(self.tail, final=True)
+        self.tail = ""
+
+    def _scan(self, buffer, final):
+        for match in self.PATTERN.finditer(buffer):
+            error_code = match.group(1)
+            if error_code is not None:
+                # Un código al final del búfer puede continuar en el siguiente fragmento
+                if match.end() == len(buffer) and not final:
+                    continue
+                self.error_codes.add(int(error_code))
+            else:
+                setattr(self, self.FLAGS[match.group(0)], True)
+
 class ConsoleOutputDialog(QDialog):
+    # Intervalo mínimo entre repintados de la salida (~30 fps)
+    FLUSH_INTERVAL_MS = 33
+    # Líneas visibles como máximo; el registro completo se guarda aparte
+    MAX_VISIBLE_LINES = 5000
+    # A partir de este tamaño el registro completo pasa de memoria a disco
+    LOG_SPOOL_BYTES = 4 * 1024 * 1024
+    # Resolución de la barra y refresco del tiempo restante entre salidas
+    PROGRESS_STEPS = 1000
+    PROGRESS_INTERVAL_MS = 1000
+
     def __init__(self, parent=None, title_text=None, controller=None):
         super().__init__(parent)
         
         self.main_window = parent 
         
-        title_text = title_text or self.tr("Salida de Comandos")
-        self.setWindowTitle(title_text)
+        # Título propio; sin él se usa el título traducido por defecto
+        self.title_text = title_text
         self.setFixedSize(600, 500)  
         
         self.requires_reboot = False
         self.current_command = ""
         self.controller = controller
         self.exit_code = 0
-        self.output_text = ""
+        # Fragmentos recibidos pendientes de pintar y registro completo
+        self.pending_chunks = []
+        self.output_log = None
+        # Marcas detectadas en la salida (permisos, cancelación, reinicio...)
+        self.classifier = OutputClassifier()
+        # Fases del comando en curso (resources/progress.py); None si no tiene perfil
+        self.tracker = None
+        self.progress_history = None
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(self.PROGRESS_INTERVAL_MS)
+        self.progress_timer.timeout.connect(self.update_progress)
+        
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush_output)
         
         layout = QVBoxLayout(self)
         
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 0)
         self.progress_bar.setTextVisible(True)
-        self.progress_bar.setFormat(self.tr("Ejecutando tarea..."))
         self.progress_bar.setAlignment(Qt.AlignCenter)
         self.progress_bar.hide()
         layout.addWidget(self.progress_bar)
         
-        self.output_area = QTextEdit()
+        self.output_area = QPlainTextEdit()
         self.output_area.setReadOnly(True)
+        self.output_area.setMaximumBlockCount(self.MAX_VISIBLE_LINES)
         layout.addWidget(self.output_area, 1)
 
         self.clear_output()
@@ -1122,36 +1340,50 @@ class ConsoleOutputDialog(QDialog):
         self.button_layout = QHBoxLayout(self.button_box)
         self.button_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.cancel_button = QPushButton(self.tr("Forzar Cancelación"))
-        self.cancel_button.setStyleSheet("""
-            QPushButton { background-color: #E74C3C; color: white; }
-            QPushButton:hover { background-color: #C0392B; }
-            QPushButton:pressed { background-color: #A93226; }
-        """)
+        self.cancel_button = QPushButton()
+        self.cancel_button.setProperty("variant", "danger")
         self.cancel_button.clicked.connect(self.prompt_cancel)
         self.cancel_button.hide()
         self.button_layout.addWidget(self.cancel_button)
         
-        self.close_button = QPushButton(self.tr("Cerrar"))
+        self.close_button = QPushButton()
         self.close_button.setObjectName("close_button")
         self.close_button.clicked.connect(self.close)
         self.close_button.hide()
         self.button_layout.addWidget(self.close_button)
         
-        self.reboot_now_button = QPushButton(self.tr("Reiniciar Ahora"))
+        self.reboot_now_button = QPushButton()
         self.reboot_now_button.setObjectName("reboot_button")
+        self.reboot_now_button.setProperty("role", "now")
         self.reboot_now_button.clicked.connect(self.reboot_system)
         self.reboot_now_button.hide()
         self.button_layout.addWidget(self.reboot_now_button)
         
-        self.reboot_later_button = QPushButton(self.tr("Más Tarde"))
+        self.reboot_later_button = QPushButton()
         self.reboot_later_button.setObjectName("reboot_button")
+        self.reboot_later_button.setProperty("role", "later")
         self.reboot_later_button.clicked.connect(self.close)
         self.reboot_later_button.hide()
         self.button_layout.addWidget(self.reboot_later_button)
         
         layout.addWidget(self.button_box)
 
+        self.retranslate_ui()
+
+    def retranslate_ui(self):
+        # La salida ya mostrada se queda en el idioma en que se escribió
+        self.setWindowTitle(self.title_text or self.tr("Salida de Comandos"))
+        self.update_progress()
+        self.cancel_button.setText(self.tr("Forzar Cancelación"))
+        self.close_button.setText(self.tr("Cerrar"))
+        self.reboot_now_button.setText(self.tr("Reiniciar Ahora"))
+        self.reboot_later_button.setText(self.tr("Más Tarde"))
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
     def command_started(self, command):
         self.clear_output()
         self.progress_bar.show()
@@ -1162,8 +1394,58 @@ class ConsoleOutputDialog(QDialog):
         self.reboot_later_button.hide()
         
         self.current_command = command
-        self.output_text = ""
         self.requires_reboot = False
+        self.start_progress(command)
+
+    def start_progress(self, command):
+        """Barra por fases si el comando tiene perfil; si no, indeterminada como siempre"""
+        # Aquí y no al arrancar: solo hace falta cuando la consola sigue un comando
+        from resources import progress
+        profile = progress.profile_for(command)
+        if profile is None:
+            self.tracker = None
+            self.progress_timer.stop()
+            self.progress_bar.setRange(0, 0)
+        else:
+            if self.progress_history is None:
+                self.progress_history = progress.load_history()
+            self.tracker = progress.ProgressTracker(profile, time.monotonic(), self.progress_history)
+            self.progress_bar.setRange(0, self.PROGRESS_STEPS)
+            self.progress_timer.start()
+        self.update_progress()
+
+    def stop_progress(self, successful=False):
+        """Al terminar bien, guarda lo que duró cada fase para las próximas estimaciones"""
+        self.progress_timer.stop()
+        tracker, self.tracker = self.tracker, None
+        if tracker is not None and successful:
+            from resources import progress
+            now = time.monotonic()
+            tracker.finish(now)
+            progress.record_durations(self.progress_history, tracker.profile, tracker.durations(now))
+
+    def update_progress(self):
+        if self.tracker is None:
+            self.progress_bar.setFormat(self.tr("Ejecutando tarea..."))
+            return
+        state = self.tracker.state(time.monotonic())
+        self.progress_bar.setValue(round(state.fraction * self.PROGRESS_STEPS))
+        text = self.tr("{0} ({1}/{2}) · %p%").format(self.phase_text(state.phase), state.index + 1, state.count)
+        if state.remaining is not None and state.remaining >= 1:
+            from resources.deployestimate import format_duration
+            text += " · " + self.tr("quedan ~{0}").format(format_duration(state.remaining))
+        self.progress_bar.setFormat(text)
+
+    def phase_text(self, phase):
+        texts = {
+            "prepare": self.tr("Preparando"),
+            "commit": self.tr("Guardando cambios"),
+            "checkout": self.tr("Creando despliegue"),
+            "etc": self.tr("Fusionando /etc"),
+            "bootloader": self.tr("Actualizando arranque"),
+            "cleanup": self.tr("Limpiando"),
+        }
+        return texts.get(phase, phase)
         
     def prompt_cancel(self):
         msg_box = QMessageBox(self)
@@ -1180,53 +1462,89 @@ class ConsoleOutputDialog(QDialog):
             QPushButton:pressed { background-color: #A93226; }
         """)
         
-        current_style = QApplication.instance().styleSheet()
-        if "background-color: #F5F5F5" in current_style: 
-            back_button.setStyleSheet("""
-                QPushButton { background-color: #2ca7f8; color: white; border-radius: 8px; padding: 10px 20px; min-width: 100px; }
-                QPushButton:hover { background-color: #1d8dd8; }
-                QPushButton:pressed { background-color: #0a70b9; }
-            """)
-        else:
-             back_button.setStyleSheet("""
-                QPushButton { background-color: #2ca7f8; color: white; border-radius: 8px; padding: 10px 20px; min-width: 100px; }
-                QPushButton:hover { background-color: #1d8dd8; }
-                QPushButton:pressed { background-color: #0a70b9; }
-            """)
+        back_button.setStyleSheet("""
+            QPushButton { background-color: #2ca7f8; color: white; border-radius: 8px; padding: 10px 20px; min-width: 100px; }
+            QPushButton:hover { background-color: #1d8dd8; }
+            QPushButton:pressed { background-color: #0a70b9; }
+        """)
 
         msg_box.exec()
         
         if msg_box.clickedButton() == force_button:
             if self.controller:
                 self.controller.cancel_command()
+            self.stop_progress()
             self.close()
             
+    @property
+    def output_text(self):
+        """Registro completo de la salida del comando actual"""
+        self.output_log.seek(0)
+        text = self.output_log.read()
+        self.output_log.seek(0, os.SEEK_END)
+        return text
+
     def clear_output(self):
+        self.flush_timer.stop()
+        self.pending_chunks = []
         self.output_area.clear()
-        self.output_text = ""
+        self.classifier.reset()
+        if self.output_log is not None:
+            self.output_log.close()
+        self.output_log = tempfile.SpooledTemporaryFile(
+            max_size=self.LOG_SPOOL_BYTES, mode='w+', encoding='utf-8')
 
     def append_output(self, text):
         if text == "": 
             self.clear_output()
             return
             
-        self.output_text += text + "\n"
-        
-        self.output_area.append(text)
-        cursor = self.output_area.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.output_area.setTextCursor(cursor)
-        self.output_area.ensureCursorVisible()
+        # Se acumula y se pinta por lotes para no maquetar en cada fragmento
+        self.output_log.write(text + "\n")
+        self.classifier.feed(text + "\n")
+        if self.tracker is not None and self.tracker.feed(text + "\n", time.monotonic()):
+            self.update_progress()
+        self.pending_chunks.append(text)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_output(self):
+        if not self.pending_chunks:
+            return
+        # Solo se pintan las líneas que van a quedar visibles tras el recorte
+        chunks = []
+        line_count = 0
+        for chunk in reversed(self.pending_chunks):
+            chunks.append(chunk)
+            line_count += chunk.count("\n") + 1
+            if line_count >= self.MAX_VISIBLE_LINES:
+                break
+        text = "\n".join(reversed(chunks))
+        self.pending_chunks = []
+
+        scroll_bar = self.output_area.verticalScrollBar()
+        follow_output = scroll_bar.value() >= scroll_bar.maximum() - 2
+        if line_count >= self.MAX_VISIBLE_LINES:
+            # El lote desplaza todo lo visible: reemplazar es mucho más barato
+            # que añadir y dejar que el documento recorte bloque a bloque
+            self.output_area.setPlainText(text)
+        else:
+            self.output_area.appendPlainText(text)
+        if follow_output:
+            scroll_bar.setValue(scroll_bar.maximum())
 
-    def command_finished(self, exit_code):
+    def command_finished(self, exit_code, was_cancelled=False):
         self.progress_bar.hide()
         self.cancel_button.hide()
     
         self.exit_code = exit_code
         
-        has_permission_error = self._detect_permission_error()
-        was_cancelled = "PROCESO CANCELADO" in self.output_text
+        self.classifier.finish()
+        has_permission_error = self.classifier.permission_denied
+        if self.classifier.reboot_required:
+            self.requires_reboot = True
         command_successful = exit_code == 0 and not has_permission_error and not was_cancelled
+        self.stop_progress(command_successful)
         
         if command_successful:
             self.append_output(f"\n{self.tr('✅ Comando ejecutado con éxito')}")
@@ -1249,118 +1567,970 @@ class ConsoleOutputDialog(QDialog):
             self.reboot_now_button.hide()
             self.reboot_later_button.hide()
 
-        if command_successful:
-            if hasattr(self.main_window, '_update_ui_after_command'):
-                self.main_window._update_ui_after_command(self.current_command)
-        
         if not self.isVisible():
             self.show()
             self.raise_()
 
-    def _detect_permission_error(self):
-        permission_errors = [
-            "Request dismissed",
-            "Authentication failed",
-            "Not authorized",
-            "Error executing command as another user",
-            "polkit-agent-helper-1: error",
-            "contraseña incorrecta",
-            "password incorrect"
-        ]
-        
-        output_lower = self.output_text.lower()
-        for error in permission_errors:
-            if error.lower() in output_lower:
-                return True
-        return False
-
     def reboot_system(self):
         self.append_output(f"\n{self.tr('🔄 Iniciando reinicio del sistema...')}")
         QTimer.singleShot(1000, lambda: self.controller.execute_command("systemctl reboot", show_in_console=False))
         self.close()
 
+class QueryCache:
+    """Caché LRU con caducidad por comando para las consultas de solo lectura.
+
+    Las claves son los comandos normalizados (tokens sin el prefijo pkexec).
+    Los comandos que modifican el sistema invalidan solo las consultas que
+    pueden verse afectadas, según INVALIDATIONS.
+    """
+    WRITABLE_STATUS = ("deepin-immutable-writable", "status")
+    IMMUTABLE_STATUS = ("deepin-immutable-ctl", "--immutable-status")
+    SNAPSHOT_LIST = ("deepin-immutable-ctl", "snapshot", "list")
+    SNAPSHOT_SHOW = ("deepin-immutable-ctl", "snapshot", "show")
+
+    # Prefijo de consulta -> segundos de validez
+    TTLS = {
+        WRITABLE_STATUS: 5,
+        IMMUTABLE_STATUS: 5,
+        SNAPSHOT_LIST: 30,
+        SNAPSHOT_SHOW: 300,
+    }
+
+    # Prefijo de comando mutable -> consultas afectadas. La cadena "{id}" se
+    # sustituye por el primer argumento del comando (el ID del snapshot).
+    INVALIDATIONS = {
+        ("deepin-immutable-ctl", "snapshot", "create"): [SNAPSHOT_LIST],
+        ("deepin-immutable-ctl", "snapshot", "delete"): [SNAPSHOT_LIST, SNAPSHOT_SHOW + ("{id}",)],
+        ("deepin-immutable-ctl", "snapshot", "modify"): [SNAPSHOT_LIST, SNAPSHOT_SHOW + ("{id}",)],
+        ("deepin-immutable-ctl", "snapshot", "rollback"): [SNAPSHOT_LIST, WRITABLE_STATUS, IMMUTABLE_STATUS],
+        ("deepin-immutable-ctl", "admin", "deploy"): [SNAPSHOT_LIST, WRITABLE_STATUS, IMMUTABLE_STATUS],
+        ("deepin-immutable-ctl", "admin", "rollback"): [SNAPSHOT_LIST, WRITABLE_STATUS, IMMUTABLE_STATUS],
+        ("deepin-immutable-ctl", "admin", "file-op"): [],
+        ("deepin-immutable-writable", "enable"): [WRITABLE_STATUS, IMMUTABLE_STATUS],
+        ("deepin-immutable-writable", "disable"): [WRITABLE_STATUS, IMMUTABLE_STATUS],
+    }
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(command):
+        try:
+            tokens = shlex.split(command)
+        except ValueError:
+            tokens = command.split()
+        if tokens and tokens[0] == "pkexec":
+            tokens = tokens[1:]
+        return tuple(tokens)
+
+    @staticmethod
+    def _match_prefix(key, prefixes):
+        for prefix in prefixes:
+            if key[:len(prefix)] == prefix:
+                return prefix
+        return None
+
+    def ttl_for(self, command):
+        prefix = self._match_prefix(self.normalize(command), self.TTLS)
+        return self.TTLS[prefix] if prefix else None
+
+    def get(self, command):
+        key = self.normalize(command)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, command, output):
+        ttl = self.ttl_for(command)
+        if ttl is None:
+            return
+        key = self.normalize(command)
+        self.entries[key] = (time.monotonic() + ttl, output)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate_for(self, command):
+        """Invalida las consultas afectadas por un comando mutable.
+
+        Devuelve los prefijos de consulta invalidados. Un comando que no se
+        reconoce invalida toda la caché por precaución.
+        """
+        key = self.normalize(command)
+        if self._match_prefix(key, self.TTLS):
+            return []
+
+        mutation = self._match_prefix(key, self.INVALIDATIONS)
+        if mutation is None:
+            self.entries.clear()
+            return list(self.TTLS)
+
+        argument = key[len(mutation)] if len(key) > len(mutation) else ""
+        affected = [tuple(argument if token == "{id}" else token for token in prefix)
+                    for prefix in self.INVALIDATIONS[mutation]]
+        for cached_key in list(self.entries):
+            if self._match_prefix(cached_key, affected):
+                del self.entries[cached_key]
+        return affected
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
+
+class PrivilegedHelper(QObject):
+    """Asistente privilegiado de resources/helper.py visto desde la interfaz.
+
+    Se lanza con pkexec la primera vez que hace falta (una sola autenticación)
+    y se considera listo cuando responde a un ping. Si ya hay uno en marcha
+    para este usuario, o SOCKET_ENV apunta a uno, se usa sin lanzar otro.
+    Los pings no bloquean: la respuesta se lee con un QSocketNotifier.
+    """
+    POLL_INTERVAL_MS = 100
+    PING_TIMEOUT_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # resources.helper (subprocess, argparse, signal...) se carga al activar
+        # el asistente o al lanzar el primer comando, no al arrancar
+        from resources.helper import SOCKET_ENV, HelperClient, socket_path
+        self.path = socket_path()
+        self.client = HelperClient(self.path, timeout=1)
+        self.external = bool(os.environ.get(SOCKET_ENV))
+        self.ready = False
+        self.process = None
+        # Callbacks a la espera de que el asistente responda; reciben un mensaje de error o ""
+        self.waiting = []
+        # Ping en curso: (socket, notifier, callback)
+        self.pending_ping = None
+        self.ping_timer = QTimer(self)
+        self.ping_timer.setSingleShot(True)
+        self.ping_timer.setInterval(self.PING_TIMEOUT_MS)
+        self.ping_timer.timeout.connect(lambda: self.finish_ping(False))
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def when_ready(self, callback):
+        if self.ready:
+            callback("")
+            return
+        self.waiting.append(callback)
+        if self.poll_timer.isActive() or self.pending_ping is not None:
+            return
+        self.ping(self.handle_first_ping)
+
+    def handle_first_ping(self, ok):
+        if ok:
+            self.resolve("")
+            return
+        if self.external:
+            self.resolve(self.tr("El asistente privilegiado no responde en {0}").format(self.path))
+            return
+
+        if self.process is None or self.process.state() == QProcess.ProcessState.NotRunning:
+            from resources.helper import launch_command
+            program, *args = launch_command(os.path.abspath(__file__))
+            self.process = QProcess(self)
+            self.process.finished.connect(self.handle_process_finished)
+            self.process.start(program, args)
+        self.poll_timer.start()
+
+    def poll(self):
+        if self.pending_ping is None:
+            self.ping(lambda ok: ok and self.resolve(""))
+
+    def ping(self, callback):
+        """Pregunta al asistente si responde sin esperar; callback(True/False) con el resultado"""
+        from resources.helper import MessageReader, encode
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.setblocking(False)
+        try:
+            conn.connect(self.path)
+            conn.sendall(encode({"op": "ping", "args": {}}))
+        except OSError:
+            # Sin socket todavía, o nadie escuchando en él
+            conn.close()
+            callback(False)
+            return
+        notifier = QSocketNotifier(conn.fileno(), QSocketNotifier.Type.Read, self)
+        reader = MessageReader()
+        notifier.activated.connect(lambda: self.read_ping(conn, reader))
+        self.pending_ping = (conn, notifier, callback)
+        self.ping_timer.start()
+
+    def read_ping(self, conn, reader):
+        from resources.helper import CHUNK_SIZE
+        try:
+            data = conn.recv(CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.finish_ping(False)
+            return
+        for message in reader.feed(data):
+            if "exit_code" in message or "error" in message:
+                self.finish_ping(message.get("exit_code") == 0)
+                return
+
+    def finish_ping(self, ok):
+        if self.pending_ping is None:
+            return
+        conn, notifier, callback = self.pending_ping
+        self.pending_ping = None
+        self.ping_timer.stop()
+        notifier.setEnabled(False)
+        notifier.deleteLater()
+        conn.close()
+        callback(ok)
+
+    def handle_process_finished(self, exit_code, exit_status):
+        self.ready = False
+        # Autenticación cancelada o fallida: pkexec termina sin crear el socket
+        if self.waiting:
+            self.resolve(self.tr("No se pudo iniciar el asistente privilegiado (código {0})").format(exit_code))
+
+    def resolve(self, error):
+        self.poll_timer.stop()
+        self.ready = not error
+        waiting, self.waiting = self.waiting, []
+        for callback in waiting:
+            callback(error)
+
+    def stop(self):
+        """Cierra el asistente lanzado por esta sesión"""
+        if self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning:
+            self.client.shutdown()
+            self.process.waitForFinished(1000)
+        self.ready = False
+
+class HelperCall(QObject):
+    """Una operación ejecutada por el asistente privilegiado.
+
+    JobScheduler la usa en lugar de un QProcess: emite la salida según llega
+    y termina con finished(código) o failed(mensaje). kill() cierra la
+    conexión, y el asistente mata entonces el comando.
+    """
+    stdoutReceived = Signal(str)
+    stderrReceived = Signal(str)
+    finished = Signal(int)
+    failed = Signal(str)
+
+    def __init__(self, privileged_helper, operation, parent=None):
+        super().__init__(parent)
+        self.helper = privileged_helper
+        self.op, self.args = operation
+        self.conn = None
+        self.notifier = None
+        from resources.helper import MessageReader
+        self.reader = MessageReader()
+        self.killed = False
+        self.retried = False
+
+    def start(self):
+        self.helper.when_ready(self.send)
+
+    def send(self, error):
+        if self.killed:
+            return
+        if error:
+            self.failed.emit(error)
+            return
+        from resources.helper import encode
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            conn.connect(self.helper.path)
+            conn.sendall(encode({"op": self.op, "args": self.args}))
+        except OSError as e:
+            conn.close()
+            # El asistente pudo terminar por inactividad: se relanza una vez
+            if not self.retried:
+                self.retried = True
+                self.helper.ready = False
+                self.helper.when_ready(self.send)
+            else:
+                self.failed.emit(str(e))
+            return
+        conn.setblocking(False)
+        self.conn = conn
+        self.notifier = QSocketNotifier(conn.fileno(), QSocketNotifier.Type.Read, self)
+        self.notifier.activated.connect(self.read)
+
+    def read(self):
+        from resources.helper import CHUNK_SIZE, encode
+        messages = []
+        closed = False
+        try:
+            while True:
+                data = self.conn.recv(CHUNK_SIZE)
+                if not data:
+                    closed = True
+                    break
+                messages.extend(self.reader.feed(data))
+        except BlockingIOError:
+            pass
+        except OSError:
+            closed = True
+
+        for message in messages:
+            if "item" in message:
+                # Progreso de un lote: llega a BatchJob como una línea JSON más de stdout
+                self.stdoutReceived.emit(encode(message).decode("utf-8"))
+            elif "stdout" in message:
+                self.stdoutReceived.emit(message["stdout"])
+            elif "stderr" in message:
+                self.stderrReceived.emit(message["stderr"])
+            elif "error" in message:
+                self.close()
+                self.failed.emit(message["error"])
+                return
+            elif "exit_code" in message:
+                self.close()
+                self.finished.emit(message["exit_code"])
+                return
+        if closed:
+            self.close()
+            self.failed.emit(self.tr("El asistente privilegiado cerró la conexión"))
+
+    def close(self):
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+            self.notifier = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def kill(self):
+        # El asistente mata el comando en cuanto ve la conexión cerrada; no
+        # hay proceso que esperar, así que se avisa ya
+        if self.killed:
+            return
+        self.killed = True
+        self.close()
+        self.failed.emit(self.tr("Cancelado"))
+
+class Job(QObject):
+    """Un comando lanzado a través de JobScheduler.
+
+    Cada trabajo tiene su ID, su propio QProcess y su salida, y pasa por los
+    estados queued -> running -> finished/failed, o cancelled si se cancela
+    en cola, en ejecución o porque falló un trabajo del que depende.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    DONE_STATES = (FINISHED, FAILED, CANCELLED)
+
+    started = Signal(object)
+    # Fragmentos ya decodificados de stdout y stderr (solo si no se captura la salida)
+    stdoutReceived = Signal(str)
+    stderrReceived = Signal(str)
+    finished = Signal(object)
+
+    def __init__(self, scheduler, job_id, command, lane, priority, depends_on=(), env=None, capture=False,
+                 operation=None, stdin=None):
+        # Sin padre: el trabajo se libera cuando nadie guarda ya una referencia
+        super().__init__()
+        self.scheduler = scheduler
+        self.id = job_id
+        self.command = command
+        self.lane = lane
+        self.priority = priority
+        self.depends_on = tuple(depends_on)
+        self.env = env
+        # Con capture la salida se guarda entera en stdout/stderr en lugar de emitirse
+        self.capture = capture
+        # (op, args) para el asistente privilegiado, si el comando equivale a una operación suya
+        self.operation = operation
+        # Bytes que se escriben en la entrada del proceso (no con el asistente, que recibe la operación)
+        self.stdin = stdin
+        self.state = Job.QUEUED
+        # Cancelado en ejecución: termina como CANCELLED cuando el proceso acabe
+        self.cancel_requested = False
+        self.exit_code = None
+        self.error_string = ""
+        self.stdout = b""
+        self.stderr = b""
+        self.process = None
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.state in Job.DONE_STATES
+
+    @property
+    def wait_time(self):
+        """Segundos en cola (hasta ahora si aún no ha arrancado)"""
+        return (self.started_at or time.monotonic()) - self.submitted_at
+
+    def cancel(self):
+        self.scheduler.cancel(self)
+
+class JobScheduler(QObject):
+    """Planificador de comandos con prioridades y dependencias.
+
+    Hay dos carriles: los comandos que modifican el sistema (snapshots,
+    despliegues, file-op...) se ejecutan de uno en uno, y las consultas de
+    solo lectura en paralelo hasta CONCURRENCY. En cada carril arranca antes
+    el trabajo de mayor prioridad cuyas dependencias ya terminaron bien; si
+    una dependencia falla o se cancela, el trabajo se cancela también.
+    """
+    LANE_MUTATION = "mutation"
+    LANE_QUERY = "query"
+    CONCURRENCY = {LANE_MUTATION: 1, LANE_QUERY: 4}
+
+    PRIORITY_HIGH = 10
+    PRIORITY_NORMAL = 0
+    PRIORITY_LOW = -10
+
+    # Esperas recientes por carril que se usan para las métricas
+    WAIT_SAMPLES = 100
+
+    jobQueued = Signal(object)
+    jobStarted = Signal(object)
+    jobFinished = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.next_id = 1
+        # ID -> Job aún no terminado
+        self.jobs = {}
+        # ID -> estado final, para resolver dependencias de trabajos ya terminados
+        self.results = {}
+        self.queues = {lane: [] for lane in self.CONCURRENCY}
+        self.running = {lane: set() for lane in self.CONCURRENCY}
+        self.wait_times = {lane: deque(maxlen=self.WAIT_SAMPLES) for lane in self.CONCURRENCY}
+        self.completed = {lane: 0 for lane in self.CONCURRENCY}
+        self.schedule_pending = False
+        # PrivilegedHelper por el que pasan los trabajos con operación; None para usar pkexec
+        self.helper = None
+
+    def submit(self, command, lane=LANE_MUTATION, priority=PRIORITY_NORMAL, depends_on=(), env=None,
+               capture=False, operation=None, stdin=None):
+        """Encola un comando ya completo (con pkexec si hace falta) y devuelve su Job.
+
+        El trabajo arranca en la siguiente vuelta del bucle de eventos, así que
+        da tiempo a conectar sus señales.
+        """
+        job = Job(self, self.next_id, command, lane, priority, depends_on, env, capture, operation, stdin)
+        self.next_id += 1
+        self.jobs[job.id] = job
+        self.queues[lane].append(job)
+        self.jobQueued.emit(job)
+        self.request_schedule()
+        return job
+
+    def job(self, job_id):
+        return self.jobs.get(job_id)
+
+    def request_schedule(self):
+        if not self.schedule_pending:
+            self.schedule_pending = True
+            QTimer.singleShot(0, self.schedule)
+
+    def dependency_state(self, job):
+        """True si puede arrancar, False si debe esperar y None si una dependencia falló"""
+        for job_id in job.depends_on:
+            dependency = self.jobs.get(job_id)
+            state = dependency.state if dependency else self.results.get(job_id, Job.FINISHED)
+            if state in (Job.FAILED, Job.CANCELLED):
+                return None
+            if state != Job.FINISHED:
+                return False
+        return True
+
+    def schedule(self):
+        self.schedule_pending = False
+        for lane, queue in self.queues.items():
+            # Mayor prioridad primero y, a igualdad, por orden de llegada
+            queue.sort(key=lambda job: (-job.priority, job.id))
+            for job in list(queue):
+                if job.state != Job.QUEUED:
+                    continue
+                ready = self.dependency_state(job)
+                if ready is None:
+                    self.finish(job, Job.CANCELLED)
+                elif ready and len(self.running[lane]) < self.CONCURRENCY[lane]:
+                    queue.remove(job)
+                    self.start(job)
+
+    def start(self, job):
+        job.state = Job.RUNNING
+        job.started_at = time.monotonic()
+        self.running[job.lane].add(job.id)
+        self.wait_times[job.lane].append(job.wait_time)
+        if job.operation is not None and self.helper is not None and not job.capture:
+            self.start_helper_call(job)
+        else:
+            self.start_process(job)
+
+    def start_helper_call(self, job):
+        call = HelperCall(self.helper, job.operation, self)
+        call.stdoutReceived.connect(job.stdoutReceived)
+        call.stderrReceived.connect(job.stderrReceived)
+        call.finished.connect(lambda exit_code: self.handle_finished(job, exit_code, QProcess.ExitStatus.NormalExit))
+        call.failed.connect(lambda message: self.handle_helper_failed(job, message))
+        job.process = call
+
+        self.jobStarted.emit(job)
+        job.started.emit(job)
+        call.start()
+
+    def start_process(self, job):
+        process = QProcess(self)
+        if job.env:
+            process_env = process.processEnvironment()
+            for name, value in job.env.items():
+                process_env.insert(name, value)
+            process.setProcessEnvironment(process_env)
+        if not job.capture:
+            # Decodificadores incrementales: un carácter UTF-8 puede llegar partido
+            stdout_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            stderr_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            process.readyReadStandardOutput.connect(
+                lambda: job.stdoutReceived.emit(stdout_decoder.decode(bytes(process.readAllStandardOutput()))))
+            process.readyReadStandardError.connect(
+                lambda: job.stderrReceived.emit(stderr_decoder.decode(bytes(process.readAllStandardError()))))
+        process.finished.connect(lambda exit_code, exit_status: self.handle_finished(job, exit_code, exit_status))
+        process.errorOccurred.connect(lambda error: self.handle_error(job, error))
+        job.process = process
+
+        self.jobStarted.emit(job)
+        job.started.emit(job)
+        process.start("/bin/bash", ["-c", job.command])
+        if job.stdin is not None:
+            process.write(job.stdin)
+            process.closeWriteChannel()
+
+    def handle_finished(self, job, exit_code, exit_status):
+        if job.done:
+            return
+        job.exit_code = exit_code
+        if job.capture:
+            job.stdout = bytes(job.process.readAllStandardOutput())
+            job.stderr = bytes(job.process.readAllStandardError())
+        normal_exit = exit_status == QProcess.ExitStatus.NormalExit
+        if job.cancel_requested:
+            self.finish(job, Job.CANCELLED)
+        else:
+            self.finish(job, Job.FINISHED if normal_exit and exit_code == 0 else Job.FAILED)
+
+    def handle_error(self, job, error):
+        # Si el proceso no llega a arrancar, finished nunca se emite
+        if error != QProcess.ProcessError.FailedToStart or job.done:
+            return
+        job.error_string = job.process.errorString()
+        self.finish(job, Job.CANCELLED if job.cancel_requested else Job.FAILED)
+
+    def handle_helper_failed(self, job, message):
+        if job.done:
+            return
+        if job.cancel_requested:
+            self.finish(job, Job.CANCELLED)
+            return
+        job.error_string = message
+        self.finish(job, Job.FAILED)
+
+    def finish(self, job, state):
+        job.state = state
+        job.finished_at = time.monotonic()
+        if job in self.queues[job.lane]:
+            self.queues[job.lane].remove(job)
+        if job.id in self.running[job.lane]:
+            self.running[job.lane].discard(job.id)
+            self.completed[job.lane] += 1
+        self.jobs.pop(job.id, None)
+        self.results[job.id] = state
+        if job.process is not None:
+            job.process.deleteLater()
+        job.finished.emit(job)
+        self.jobFinished.emit(job)
+        # Pueden quedar libres un hueco o las dependencias de otros trabajos
+        self.request_schedule()
+
+    def cancel(self, job):
+        if job.done:
+            return
+        if job.state == Job.QUEUED:
+            self.finish(job, Job.CANCELLED)
+            return
+        # Sin esperar aquí a que muera: termina como cancelado cuando lo
+        # notifique su señal finished (handle_finished)
+        job.cancel_requested = True
+        job.process.kill()
+
+    def cancel_all(self, lane=None):
+        for job in list(self.jobs.values()):
+            if lane is None or job.lane == lane:
+                self.cancel(job)
+
+    def pending(self, lane=LANE_MUTATION):
+        """Trabajos del carril en cola o en ejecución"""
+        return [job for job in self.jobs.values() if job.lane == lane]
+
+    def metrics(self):
+        """Profundidad de cola y tiempos de espera (ms) por carril"""
+        now = time.monotonic()
+        metrics = {}
+        for lane, queue in self.queues.items():
+            waits = self.wait_times[lane]
+            metrics[lane] = {
+                "queued": len(queue),
+                "running": len(self.running[lane]),
+                "completed": self.completed[lane],
+                "wait_avg_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                "wait_max_ms": round(max(waits) * 1000, 1) if waits else 0.0,
+                # Espera acumulada del trabajo más antiguo que sigue en cola
+                "oldest_queued_ms": round(max((now - job.submitted_at for job in queue), default=0) * 1000, 1),
+            }
+        return metrics
+
+class BatchJob(QObject):
+    """Progreso de un lote de operaciones ejecutado como un único trabajo.
+
+    Lee los mensajes por elemento que escribe el lote (resources/helper.py)
+    y guarda el resultado de cada uno en `results`: None mientras no ha
+    terminado, o un dict con exit_code, output y error.
+    """
+    itemStarted = Signal(int)
+    itemFinished = Signal(int, object)
+    finished = Signal(object)
+
+    def __init__(self, job, operations, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.operations = operations
+        self.results = [None] * len(operations)
+        # Salida que no es un mensaje del lote (p. ej. un error de pkexec)
+        self.error = ""
+        self.buffer = ""
+        job.stdoutReceived.connect(self.feed)
+        job.stderrReceived.connect(self.add_error)
+        job.finished.connect(self.handle_finished)
+
+    @property
+    def completed(self):
+        return sum(result is not None for result in self.results)
+
+    @property
+    def failed(self):
+        """Índices de los elementos que terminaron con error"""
+        return [index for index, result in enumerate(self.results) if result and result["exit_code"] != 0]
+
+    @property
+    def cancelled(self):
+        return self.job.state == Job.CANCELLED
+
+    def cancel(self):
+        self.job.cancel()
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        *lines, self.buffer = self.buffer.split("\n")
+        for line in lines:
+            self.handle_line(line)
+
+    def handle_line(self, line):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            self.add_error(line)
+            return
+        if "error" in message and "item" not in message:
+            self.add_error(message["error"])
+            return
+        index = message.get("item")
+        if not isinstance(index, int) or not 0 <= index < len(self.results):
+            return
+        if message.get("state") == "running":
+            self.itemStarted.emit(index)
+        elif "exit_code" in message:
+            self.results[index] = message
+            self.itemFinished.emit(index, message)
+
+    def add_error(self, text):
+        text = text.strip()
+        if text:
+            self.error = f"{self.error}\n{text}" if self.error else text
+
+    def handle_finished(self, job):
+        if self.buffer:
+            self.handle_line(self.buffer)
+            self.buffer = ""
+        if job.error_string:
+            self.add_error(job.error_string)
+        self.finished.emit(self)
+
+class DiffJob(QObject):
+    """Diferencias entre dos árboles (--cli diff --json) según las va encontrando el proceso.
+
+    Cada trozo de salida se convierte en una lista de DiffEntry; al terminar,
+    `summary` trae los totales o queda en None si el proceso no acabó bien.
+    """
+    entriesReceived = Signal(list)
+    finished = Signal(object)
+
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.summary = None
+        self.error = ""
+        self.buffer = ""
+        job.stdoutReceived.connect(self.feed)
+        job.stderrReceived.connect(self.add_error)
+        job.finished.connect(self.handle_finished)
+
+    @property
+    def cancelled(self):
+        return self.job.state == Job.CANCELLED
+
+    def cancel(self):
+        self.job.cancel()
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        *lines, self.buffer = self.buffer.split("\n")
+        self.handle_lines(lines)
+
+    def handle_lines(self, lines):
+        entries = []
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                self.add_error(line)
+            elif "kind" in message:
+                entries.append(DiffEntry.from_dict(message))
+            elif message.get("done"):
+                self.summary = message
+            elif "error" in message:
+                self.add_error(message["error"])
+        if entries:
+            self.entriesReceived.emit(entries)
+
+    def add_error(self, text):
+        text = text.strip()
+        if text:
+            self.error = f"{self.error}\n{text}" if self.error else text
+
+    def handle_finished(self, job):
+        if self.buffer:
+            self.handle_lines([self.buffer])
+            self.buffer = ""
+        if job.error_string:
+            self.add_error(job.error_string)
+        self.finished.emit(self)
+
 class ImmutableController(QObject):
     commandStarted = Signal(str)  
     commandOutput = Signal(str)   
-    commandFinished = Signal(int) 
+    # Código de salida y si lo canceló el usuario
+    commandFinished = Signal(int, bool)
+    # Prefijos (tuplas de tokens) de las consultas invalidadas por un comando
+    queriesInvalidated = Signal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.process = None
-        self.current_command = ""
+        # Los comandos que modifican el sistema van en serie; las consultas, en paralelo
+        self.scheduler = JobScheduler(self)
+        self.set_helper_enabled(ConfigManager.instance().get("privileged_helper"))
+        # Consultas asíncronas en curso: clave -> (Job, [callbacks])
+        self.pending_queries = {}
+        self.query_cache = QueryCache()
+        # Última estimación previa al despliegue y despliegues anteriores (se cargan al usarse)
+        self.deploy_estimate = None
+        self.deploy_history = None
 
     def cancel_command(self):
-        if self.process and self.process.state() == QProcess.ProcessState.Running:
-            self.commandOutput.emit(f"\n{self.tr('--- PROCESO CANCELADO POR EL USUARIO ---')}\n")
-            
-            # --- INICIO DE LA MODIFICACIÓN ---
-            # Desconectar señales ANTES de matar el proceso para evitar el RuntimeError
-            try:
-                self.process.readyReadStandardOutput.disconnect(self.handle_stdout)
-                self.process.readyReadStandardError.disconnect(self.handle_stderr)
-                self.process.finished.disconnect(self.handle_finished)
-            except RuntimeError:
-                pass # Ignorar si ya estaban desconectadas
-            # --- FIN DE LA MODIFICACIÓN ---
-
-            self.process.kill()
-            self.process.waitForFinished(1000)
-            self.process = None # Marcar como nulo inmediatamente
+        """Cancela el comando en ejecución; los que dependían de él se cancelan también"""
+        for job in self.scheduler.pending(JobScheduler.LANE_MUTATION):
+            if job.state == Job.RUNNING:
+                job.cancel()
+
+    def cancel_all_jobs(self):
+        self.scheduler.cancel_all(JobScheduler.LANE_MUTATION)
+
+    def has_pending_jobs(self):
+        """True si hay comandos en ejecución o esperando en la cola"""
+        return bool(self.scheduler.pending(JobScheduler.LANE_MUTATION))
+
+    def set_helper_enabled(self, enabled):
+        """Enruta los comandos de root por el asistente privilegiado en lugar de un pkexec por comando"""
+        if enabled and self.scheduler.helper is None:
+            self.scheduler.helper = PrivilegedHelper(self)
+        elif not enabled and self.scheduler.helper is not None:
+            self.scheduler.helper.stop()
+            self.scheduler.helper = None
+
+    def stop_helper(self):
+        if self.scheduler.helper is not None:
+            self.scheduler.helper.stop()
+
+    def job_metrics(self):
+        """Profundidad de las colas y tiempos de espera, por carril"""
+        return self.scheduler.metrics()
+
+    def build_full_command(self, command):
+        """Antepone pkexec a los comandos que requieren privilegios de root"""
+        return build_full_command(command)
+
+    def submit_command(self, command, priority=JobScheduler.PRIORITY_NORMAL, depends_on=(), env=None,
+                       show_in_console=True):
+        """Encola un comando que modifica el sistema y devuelve su Job.
+
+        Los comandos se ejecutan de uno en uno por orden de prioridad. Con
+        show_in_console su salida se envía a la consola cuando arranca.
+        """
+        from resources.helper import parse_operation
+        # Con entorno propio no se puede usar el asistente: ejecuta con el suyo
+        operation = parse_operation(command) if not env else None
+        job = self.scheduler.submit(self.build_full_command(command), JobScheduler.LANE_MUTATION,
+                                    priority, depends_on, env, operation=operation)
+        if show_in_console:
+            job.started.connect(lambda job, command=command: self.handle_job_started(job, command))
+            job.stdoutReceived.connect(self.handle_stdout)
+            job.stderrReceived.connect(self.handle_stderr)
+        job.finished.connect(lambda job: self.handle_job_finished(job, show_in_console))
+        deploy = parse_operation(command)
+        if deploy and deploy[0] == "admin.deploy" and not deploy[1].get("finalize"):
+            self.track_deploy(job, deploy[1])
+        return job
+
+    def cli_command(self, *args):
+        """Argumentos para ejecutar esta misma aplicación en modo --cli"""
+        from resources.helper import program
+        return program(os.path.abspath(__file__)) + ["--cli", *args]
+
+    def estimate_deploy(self, callback, dirs=None):
+        """Estimación previa de un despliegue (resources/deployestimate.py) en un proceso aparte.
+
+        El callback recibe (DeployEstimate o None, texto de error). La última
+        estimación se guarda para el historial de duraciones del despliegue
+        que se lance a continuación.
+        """
+        command = self.cli_command("deploy-estimate", "--json")
+        for path in dirs or ():
+            command += ["--dir", path]
+        self.query_async(shlex.join(command), lambda output: self.handle_deploy_estimate(output, callback),
+                         use_cache=False)
+
+    def handle_deploy_estimate(self, output, callback):
+        # Aquí y no al arrancar: la estimación se calcula en el subproceso y la
+        # interfaz solo necesita el módulo cuando abre el diálogo de despliegue
+        from resources.deployestimate import DeployEstimate
+        output, _, error = output.partition(ERROR_SEPARATOR)
+        try:
+            estimate = DeployEstimate.from_dict(json.loads(output))
+        except (ValueError, TypeError, AttributeError):
+            callback(None, error.strip() or output.strip())
+            return
+        self.deploy_estimate = estimate
+        callback(estimate, error.strip())
+
+    def predict_deploy_duration(self, size, options):
+        """DurationPrediction a partir de los despliegues anteriores, o None sin historial"""
+        from resources.deployestimate import load_history, predict_duration
+        if self.deploy_history is None:
+            self.deploy_history = load_history()
+        return predict_duration(self.deploy_history, size, options)
+
+    def track_deploy(self, job, options):
+        """Registra la duración del despliegue si termina bien, con la estimación que lo precedió.
+
+        Se mide desde que arranca el proceso, así que incluye la espera a la
+        autenticación de pkexec si la hay.
+        """
+        estimate, self.deploy_estimate = self.deploy_estimate, None
+        job.finished.connect(lambda job: self.handle_deploy_finished(job, options, estimate))
+
+    def handle_deploy_finished(self, job, options, estimate):
+        if job.state != Job.FINISHED or job.exit_code != 0 or job.started_at is None:
+            return
+        from resources.deployestimate import record_deploy
+        self.deploy_history = record_deploy(job.finished_at - job.started_at, options,
+                                            estimate.size if estimate else None,
+                                            estimate.files if estimate else None)
+
+    def analyze_disk_usage(self, callback):
+        """Uso de disco de ostree (resources/diskusage.py) en un proceso aparte, sin pkexec.
+
+        El recorrido puede tardar segundos; así no bloquea la interfaz. El
+        callback recibe el JSON de --cli disk-usage como cualquier consulta.
+        """
+        command = shlex.join(self.cli_command("disk-usage", "--json"))
+        self.query_async(command, callback, use_cache=False)
+
+    def diff_trees(self, old, new="live"):
+        """Diferencias entre dos árboles (ID de snapshot, directorio o "live") en un proceso aparte.
+
+        Devuelve un DiffJob que va emitiendo las diferencias según llegan.
+        """
+        command = shlex.join(self.cli_command("diff", old, new, "--json"))
+        return DiffJob(self.scheduler.submit(command, JobScheduler.LANE_QUERY), self)
+
+    def scan_overlay(self, dirs=None):
+        """Cambios pendientes en las capas escribibles (resources/overlay.py) en un proceso aparte.
+
+        Con `dirs`, solo los overlays montados en esas rutas. Devuelve un
+        DiffJob como diff_trees; el resumen final trae los errores por montaje.
+        """
+        command = self.cli_command("overlay-changes", "--json")
+        for path in dirs or ():
+            command += ["--dir", path]
+        return DiffJob(self.scheduler.submit(shlex.join(command), JobScheduler.LANE_QUERY), self)
+
+    def submit_batch(self, operations, priority=JobScheduler.PRIORITY_NORMAL):
+        """Ejecuta un lote de operaciones tipadas ([(op, args), ...]) con una sola autenticación.
+
+        Se valida entero antes de encolarlo (ValueError si algún elemento no
+        vale). Un fallo no detiene el resto, y la caché se invalida una sola
+        vez al final. Devuelve un BatchJob con el progreso por elemento.
+        """
+        from resources.helper import batch_command, batch_input, batch_operations
+        operations = [[op, args] for op, args in operations]
+        commands = [shlex.join(argv) for argv in batch_operations(operations)]
+        # El lote va por stdin: con miles de elementos no cabe en un argumento (E2BIG)
+        job = self.scheduler.submit(shlex.join(batch_command(os.path.abspath(__file__))),
+                                    JobScheduler.LANE_MUTATION, priority,
+                                    operation=("batch", {"operations": operations}), stdin=batch_input(operations))
+        batch = BatchJob(job, operations, self)
+        job.finished.connect(lambda job: self.handle_job_finished(job, False, commands))
+        return batch
 
     def execute_command(self, command, show_in_console=True, env=None):
         try:
             if show_in_console:
-                self.commandOutput.emit(f"$ {command}\n")
-                self.commandOutput.emit("="*80 + "\n")
-
-            no_root_commands = [
-                "deepin-immutable-ctl --immutable-status",
-                "deepin-immutable-ctl snapshot list",
-                "deepin-immutable-ctl snapshot show",
-                "deepin-immutable-writable status"
-            ]
-            
-            needs_root = True
-            for cmd in no_root_commands:
-                if cmd in command:
-                    needs_root = False
-                    break
-                    
-            if needs_root and not command.startswith("pkexec"):
-                full_command = f"pkexec {command}"
-            else:
-                full_command = command
-
-            if not show_in_console:
-                process_env = os.environ.copy()
-                if env:
-                    process_env.update(env)
-                    
-                process = Popen(full_command, shell=True, stdout=PIPE, stderr=PIPE, env=process_env)
-                stdout, stderr = process.communicate()
-                output = stdout.decode('utf-8')
-                error = stderr.decode('utf-8')
-
-                if error:
-                    output += "\n\nERROR:\n" + error
-                return output
-
-            self.current_command = full_command
-            self.process = QProcess()
-            self.process.readyReadStandardOutput.connect(self.handle_stdout)
-            self.process.readyReadStandardError.connect(self.handle_stderr)
-            self.process.finished.connect(self.handle_finished)
-            
-            if env:
-                process_env = self.process.processEnvironment()
-                for key, value in env.items():
-                    process_env.insert(key, value)
-                self.process.setProcessEnvironment(process_env)
-            
-            self.commandStarted.emit(full_command)
-            
-            self.process.start("/bin/bash", ["-c", full_command])
-            return ""
+                self.submit_command(command, env=env)
+                return ""
+
+            full_command = self.build_full_command(command)
+            if not env:
+                cached = self.query_cache.get(full_command)
+                if cached is not None:
+                    return cached
+
+            returncode, output = run_command(full_command, env)
+            if returncode == 0 and not env:
+                self.query_cache.put(full_command, output)
+            self.invalidate_queries(full_command)
+            return output
 
         except Exception as e:
             error_msg = f"{self.tr('Error ejecutando comando:')} {str(e)}"
@@ -1368,101 +2538,219 @@ class ImmutableController(QObject):
                 self.commandOutput.emit(error_msg)
             return error_msg
 
-    def handle_stdout(self):
-        # --- INICIO DE LA MODIFICACIÓN ---
-        # Añadir comprobación para evitar el RuntimeError
-        if self.process:
-        # --- FIN DE LA MODIFICACIÓN ---
-            data = self.process.readAllStandardOutput()
-            stdout = bytes(data).decode("utf8")
-            self.commandOutput.emit(stdout.strip())
-
-    def handle_stderr(self):
-        # --- INICIO DE LA MODIFICACIÓN ---
-        # Añadir comprobación para evitar el RuntimeError
-        if self.process:
-        # --- FIN DE LA MODIFICACIÓN ---
-            data = self.process.readAllStandardError()
-            stderr = bytes(data).decode("utf8")
-            if "terminated" not in stderr.lower() and "killed" not in stderr.lower():
-                self.commandOutput.emit(f"ERROR: {stderr.strip()}")
-
-    def handle_finished(self, exit_code):
+    def query_async(self, command, callback, env=None, use_cache=True):
+        """Ejecuta una consulta sin bloquear el hilo de la interfaz.
+
+        El callback recibe la salida con el mismo formato que
+        execute_command(show_in_console=False). Si ya hay una consulta idéntica
+        en curso, el callback se añade a ella en lugar de lanzar otro proceso.
+        Con use_cache=False se ignora la caché y se fuerza una consulta nueva.
+        """
+        full_command = self.build_full_command(command)
+
+        if use_cache and not env:
+            cached = self.query_cache.get(full_command)
+            if cached is not None:
+                self._dispatch_query_result([callback], cached)
+                return
+
+        key = (full_command, tuple(sorted(env.items())) if env else ())
+
+        pending = self.pending_queries.get(key)
+        if pending:
+            pending[1].append(callback)
+            return
+
+        job = self.scheduler.submit(full_command, JobScheduler.LANE_QUERY, env=env, capture=True)
+        self.pending_queries[key] = (job, [callback])
+        job.finished.connect(lambda job, key=key: self.handle_query_finished(key, job))
+
+    def handle_query_finished(self, key, job):
+        pending = self.pending_queries.get(key)
+        # Una consulta cancelada termina más tarde, quizá con otra igual ya en curso
+        if not pending or pending[0] is not job:
+            return
+        del self.pending_queries[key]
+        callbacks = pending[1]
+
+        if job.error_string:
+            self._dispatch_query_result(callbacks, f"{self.tr('Error ejecutando comando:')} {job.error_string}")
+            return
+
+        output = job.stdout.decode('utf-8', errors='replace')
+        error = job.stderr.decode('utf-8', errors='replace')
+        if error:
+            output += ERROR_SEPARATOR + error
+
+        full_command, env_items = key
+        if not env_items and job.state == Job.FINISHED:
+            self.query_cache.put(full_command, output)
+
+        self._dispatch_query_result(callbacks, output)
+
+    def _dispatch_query_result(self, callbacks, output):
+        for callback in callbacks:
+            try:
+                callback(output)
+            except Exception as e:
+                print(f"Error procesando resultado de consulta: {e}")
+
+    def invalidate_queries(self, command):
+        """Invalida la caché tras un comando mutable y avisa de las consultas afectadas"""
+        self.invalidate_commands([command])
+
+    def invalidate_commands(self, commands):
+        """Como invalidate_queries para varios comandos, con un único aviso"""
+        affected = []
+        for command in commands:
+            for prefix in self.query_cache.invalidate_for(command):
+                if prefix not in affected:
+                    affected.append(prefix)
+        if affected:
+            self.queriesInvalidated.emit(affected)
+
+    def cache_stats(self):
+        """Aciertos y fallos de la caché de consultas (un fallo implica un fork)"""
+        return self.query_cache.stats()
+
+    def cancel_queries(self):
+        """Mata las consultas asíncronas pendientes (p. ej. al cerrar la ventana)"""
+        pending_queries = list(self.pending_queries.values())
+        # Vaciar antes de cancelar: así handle_query_finished no llama a los callbacks
+        self.pending_queries.clear()
+        for job, _ in pending_queries:
+            job.cancel()
+
+    def handle_job_started(self, job, command):
+        # commandStarted limpia la consola, así que va antes de la cabecera
+        self.commandStarted.emit(job.command)
+        self.commandOutput.emit(f"$ {command}\n")
+        self.commandOutput.emit("="*80 + "\n")
+
+    def handle_stdout(self, stdout):
+        stdout = stdout.strip()
+        # Una cadena vacía limpiaría la consola (p. ej. un carácter a medias)
+        if stdout:
+            self.commandOutput.emit(stdout)
+
+    def handle_stderr(self, stderr):
+        if "terminated" not in stderr.lower() and "killed" not in stderr.lower():
+            self.commandOutput.emit(f"ERROR: {stderr.strip()}")
+
+    def handle_job_finished(self, job, show_in_console, commands=None):
+        # Invalidar antes de avisar para que los refrescos lean datos nuevos;
+        # un comando cancelado pudo dejar el sistema a medio modificar
+        if job.started_at is not None:
+            self.invalidate_commands(commands or [job.command])
+        if not show_in_console:
+            return
+        cancelled = job.state == Job.CANCELLED
+        if cancelled:
+            # Cancelado en cola: nunca llegó a la consola
+            if job.started_at is None:
+                return
+            self.commandOutput.emit(f"\n{self.tr('--- PROCESO CANCELADO POR EL USUARIO ---')}\n")
+        elif job.error_string:
+            self.commandOutput.emit(f"{self.tr('Error ejecutando comando:')} {job.error_string}")
         self.commandOutput.emit("\n" + "="*80 + "\n")
-        self.commandFinished.emit(exit_code)
-        self.process = None
+        self.commandFinished.emit(-1 if job.exit_code is None else job.exit_code, cancelled)
+
+class StatusMonitor(QObject):
+    """Avisa cuando el estado del sistema inmutable puede haber cambiado.
+
+    Vigila con inotify (QFileSystemWatcher) los ficheros de estado de
+    deepin-immutable-writable y los directorios de despliegue de ostree, y
+    agrupa ráfagas de eventos en un único aviso. Un sondeo de respaldo poco
+    frecuente cubre los cambios que no se reflejan en ningún fichero vigilado.
+    """
+    statusChanged = Signal()
+
+    # Directorios cuyo contenido (ficheros de primer nivel) se vigila
+    STATE_DIRS = [
+        "/etc/deepin-immutable-writable",
+        "/var/lib/deepin-immutable-writable",
+    ]
+    # Directorios en los que solo interesa la creación o borrado de entradas
+    DEPLOY_DIRS = [
+        "/ostree",
+        "/ostree/deploy/*/deploy",
+        "/sysroot/ostree/deploy/*/deploy",
+        "/boot/loader/entries",
+    ]
+
+    DEBOUNCE_MS = 500
+    FALLBACK_POLL_MS = 120000
+    UNWATCHED_POLL_MS = 30000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.handle_path_changed)
+        self.watcher.directoryChanged.connect(self.handle_path_changed)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.statusChanged.emit)
+
+        self.fallback_timer = QTimer(self)
+        self.fallback_timer.timeout.connect(self.statusChanged.emit)
+
+    def start(self):
+        self.update_watched_paths()
+        if self.watcher.directories() or self.watcher.files():
+            self.fallback_timer.setInterval(self.FALLBACK_POLL_MS)
+        else:
+            self.fallback_timer.setInterval(self.UNWATCHED_POLL_MS)
+        self.fallback_timer.start()
+
+    def stop(self):
+        self.debounce_timer.stop()
+        self.fallback_timer.stop()
+
+    def update_watched_paths(self):
+        """Añade al watcher las rutas que existan y aún no estén vigiladas"""
+        directories = []
+        files = []
+        for state_dir in self.STATE_DIRS:
+            if os.path.isdir(state_dir):
+                directories.append(state_dir)
+                files.extend(path for path in glob.glob(os.path.join(state_dir, "*"))
+                             if os.path.isfile(path))
+        for pattern in self.DEPLOY_DIRS:
+            directories.extend(path for path in glob.glob(pattern) if os.path.isdir(path))
+
+        watched = set(self.watcher.directories()) | set(self.watcher.files())
+        new_paths = [path for path in directories + files
+                     if path not in watched and os.access(path, os.R_OK)]
+        if new_paths:
+            self.watcher.addPaths(new_paths)
+
+    def handle_path_changed(self, path):
+        # Los ficheros reemplazados por rename dejan de estar vigilados y
+        # pueden aparecer directorios de despliegue nuevos: se vuelven a añadir
+        self.update_watched_paths()
+        self.debounce_timer.start()
 
 class LanguageDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle(self.tr("Seleccionar idioma"))
+        self.setObjectName("language_dialog")
         self.setFixedSize(400, 150)
         
         layout = QVBoxLayout(self)
         
-        layout.addWidget(QLabel(self.tr("Seleccione su idioma preferido:")))
+        self.prompt_label = QLabel()
+        layout.addWidget(self.prompt_label)
         
         self.language_combo = QComboBox()
-        self.language_combo.addItem(self.tr("Sistema (predeterminado)"), "system")
+        self.language_combo.addItem("", "system")
         self.language_combo.addItem("English", "en")
         self.language_combo.addItem("Español", "es")
         self.language_combo.addItem("Português", "pt")
         self.language_combo.addItem("Chinese", "zh_CN")
 
-        self.language_combo.setStyleSheet("""
-            QComboBox {
-                border: 1px solid #444444;
-                border-radius: 6px;
-                padding: 8px;
-                background-color: #3A3A3A;
-                color: #BEBEBE;
-                min-height: 25px;
-            }
-            QComboBox:hover {
-                border: 1px solid #555555;
-            }
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 25px;
-                border-left-width: 1px;
-                border-left-color: #444444;
-                border-left-style: solid;
-                border-top-right-radius: 6px;
-                border-bottom-right-radius: 6px;
-                background-color: #4A4A4A;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 4px solid none;
-                border-right: 4px solid none;
-                border-top: 5px solid #BEBEBE;
-                margin-right: 8px;
-            }
-            QComboBox QAbstractItemView {
-                border: 1px solid #444444;
-                border-radius: 6px;
-                background-color: #3A3A3A;
-                color: #BEBEBE;
-                selection-background-color: #0081FF;
-                selection-color: white;
-                outline: 0px;
-            }
-            QComboBox QAbstractItemView::item {
-                padding: 8px;
-                border-radius: 3px;
-            }
-            QComboBox QAbstractItemView::item:hover {
-                background-color: #4A4A4A;
-            }
-            QComboBox QAbstractItemView::item:selected {
-                background-color: #0081FF;
-                color: white;
-            }
-        """)
-        
-        config = ConfigManager.load_config()
-        current_language = config.get("language", "system")
+        current_language = ConfigManager.instance().get("language")
         index = self.language_combo.findData(current_language)
         if index >= 0:
             self.language_combo.setCurrentIndex(index)
@@ -1473,48 +2761,42 @@ class LanguageDialog(QDialog):
         button_layout = QHBoxLayout(button_container)
         button_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.cancel_button = QPushButton(self.tr("Cancelar"))
+        self.cancel_button = QPushButton()
+        self.cancel_button.setProperty("variant", "danger")
         self.cancel_button.clicked.connect(self.reject)
         button_layout.addWidget(self.cancel_button, 0, Qt.AlignLeft)
         
         button_layout.addStretch(1)
         
-        self.ok_button = QPushButton(self.tr("Aceptar"))
+        self.ok_button = QPushButton()
         self.ok_button.clicked.connect(self.accept)
         button_layout.addWidget(self.ok_button, 0, Qt.AlignRight)
         
         layout.addWidget(button_container)
-        
-        button_style = """
-            QPushButton {
-                background-color: #2ca7f8;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                min-width: 80px;
-                font-size: 13px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1d8dd8;
-            }
-            QPushButton:pressed {
-                background-color: #0a70b9;
-            }
-        """
-        
-        self.ok_button.setStyleSheet(button_style)
-        self.cancel_button.setStyleSheet(button_style.replace("#2ca7f8", "#E74C3C")
-                                            .replace("#1d8dd8", "#C0392B")
-                                            .replace("#0a70b9", "#A93226"))
-        
-        self.setStyleSheet(QApplication.instance().styleSheet())
+
+        self.retranslate_ui()
+
+    def retranslate_ui(self):
+        self.setWindowTitle(self.tr("Seleccionar idioma"))
+        self.prompt_label.setText(self.tr("Seleccione su idioma preferido:"))
+        self.language_combo.setItemText(0, self.tr("Sistema (predeterminado)"))
+        self.cancel_button.setText(self.tr("Cancelar"))
+        self.ok_button.setText(self.tr("Aceptar"))
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
 
     def selected_language(self):
         return self.language_combo.currentData()
 
 class MainWindow(RoundedWindow):
+    # Posición de cada página en nav_list y content_stack
+    TAB_STATUS, TAB_ADMIN, TAB_SNAPSHOTS, TAB_ABOUT = range(4)
+    # Margen tras el primer pintado antes de construir las pestañas restantes
+    IDLE_TAB_LOAD_DELAY_MS = 300
+
     def __init__(self):
         super().__init__()
         self.controller = ImmutableController()
@@ -1522,105 +2804,78 @@ class MainWindow(RoundedWindow):
 
         self.snapshots_tab = None
         self.status_tab = None 
+        self.admin_tab = None
 
-        config = ConfigManager.load_config()
-        self.dark_mode = config.get("dark_mode", True)
+        self.config = ConfigManager.instance()
+        self.config.valueChanged.connect(self.handle_config_changed)
+        self.dark_mode = self.config.get("dark_mode")
         
-        if self.dark_mode:
-            self.apply_theme(ThemeManager.dark_theme())
-        else:
-            self.apply_theme(ThemeManager.light_theme())
+        with PROFILER.phase("ThemeManager"):
+            self.apply_theme()
 
-        self.console_dialog = ConsoleOutputDialog(self, title_text=self.tr("Salida de Comandos"), controller=self.controller)
+        self.console_dialog = ConsoleOutputDialog(self, controller=self.controller)
         
         self.controller.commandStarted.connect(self.console_dialog.command_started)
         self.controller.commandOutput.connect(self.console_dialog.append_output)
         self.controller.commandFinished.connect(self.console_dialog.command_finished)
+        self.controller.queriesInvalidated.connect(self._update_ui_after_invalidation)
 
         self.create_ui()
 
-        self.status_timer = QTimer(self)
-        self.status_timer.setInterval(10000)
-        self.status_timer.timeout.connect(self.check_immutable_status_external) 
-        self.status_timer.start()
+        # Estado pendiente de refrescar mientras la ventana está minimizada
+        self.status_dirty = False
+
+        self.status_monitor = StatusMonitor(self)
+        self.status_monitor.statusChanged.connect(self.check_immutable_status_external)
+        # Fuera del camino de arranque: primero se pinta la ventana
+        QTimer.singleShot(0, self.status_monitor.start)
+        QTimer.singleShot(self.IDLE_TAB_LOAD_DELAY_MS, self.load_pending_tabs)
 
     def check_immutable_status_external(self):
+        if self.isMinimized() or not self.isVisible():
+            self.status_dirty = True
+            return
         if hasattr(self, 'status_tab') and self.status_tab is not None:
-            self.status_tab.check_immutable_status()
+            # El monitor solo avisa cuando el estado puede haber cambiado
+            self.status_tab.check_immutable_status(use_cache=False)
 
-    def add_nav_item(self, text, icon_name):
-        item = QListWidgetItem(self.tr(text))
-        
-        icon_path = os.path.join(self.current_dir, "resources", icon_name)
-        
-        if os.path.exists(icon_path):
-            item.setIcon(QIcon(icon_path))
-        else:
-            icon_mapping = {
-                "Estado": "dialog-information",
-                "Administración": "system-run",
-                "Snapshots": "document-save",
-                "Acerca de": "help-about"
-            }
-            default_icon = icon_mapping.get(text, "")
-            if default_icon:
-                item.setIcon(QIcon.fromTheme(default_icon))
-        
-        self.nav_list.addItem(item)
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        if event.type() == QEvent.Type.WindowStateChange and not self.isMinimized() and self.status_dirty:
+            self.status_dirty = False
+            self.check_immutable_status_external()
+        super().changeEvent(event)
 
     def show_language_dialog(self):
         dialog = LanguageDialog(self)
         if dialog.exec() == QDialog.Accepted:
-            new_language = dialog.selected_language()
-            
-            config = ConfigManager.load_config()
-            config["language"] = new_language
-            ConfigManager.save_config(config)
-            
-            QMessageBox.information(
-                self, 
-                self.tr("Idioma cambiado"), 
-                self.tr("El cambio de idioma se aplicará la próxima vez que inicie la aplicación.")
-            )
+            # handle_config_changed cambia el idioma en caliente
+            self.config.set("language", dialog.selected_language())
 
     def toggle_theme(self):
         self.dark_mode = not self.dark_mode
-        if self.dark_mode:
-            self.apply_theme(ThemeManager.dark_theme())
-        else:
-            self.apply_theme(ThemeManager.light_theme())
+        self.apply_theme()
         
-        config = ConfigManager.load_config()
-        config["dark_mode"] = self.dark_mode
-        ConfigManager.save_config(config)
+        # Varios cambios seguidos acaban en una sola escritura del fichero
+        self.config.set("dark_mode", self.dark_mode)
         
         if hasattr(self, 'title_bar') and hasattr(self.title_bar, 'update_theme_icon'):
             self.title_bar.update_theme_icon()
+
+    def handle_config_changed(self, name, value):
+        # Tema cambiado desde fuera (otra instancia o edición del fichero)
+        if name == "dark_mode" and value != self.dark_mode:
+            self.toggle_theme()
+        elif name == "language":
+            TranslationManager.instance().set_language(value)
+        elif name == "privileged_helper":
+            self.controller.set_helper_enabled(value)
             
-    def apply_theme(self, stylesheet):
-        self.setStyleSheet(stylesheet)
-        QApplication.instance().setStyleSheet(stylesheet)
-        
-        if self.dark_mode:
-            self.main_widget.setStyleSheet("""
-                #main_widget {
-                    background-color: #2D2D2D;
-                    border-radius: 8px;
-                }
-                QListWidget::item {
-                    padding: 8px 15px;
-                }
-            """)
-        else:
-            self.main_widget.setStyleSheet("""
-                #main_widget {
-                    background-color: #FFFFFF;
-                    border-radius: 8px;
-                }
-                QListWidget::item {
-                    padding: 8px 15px;
-                }
-            """)
+    def apply_theme(self):
+        # Una sola hoja para toda la aplicación: los widgets no tienen hojas propias
+        # que dependan del tema, así que Qt solo repule una vez por cambio
+        ThemeManager.apply(QApplication.instance(), self.dark_mode)
 
     def run_command(self, command, show_in_console=True):
         self.controller.execute_command(command, show_in_console=show_in_console)
@@ -1636,7 +2891,6 @@ class MainWindow(RoundedWindow):
         no_button = msg_box.addButton(self.tr("No"), QMessageBox.ButtonRole.NoRole)
         
         msg_box.setDefaultButton(no_button)
-        msg_box.setStyleSheet(QApplication.instance().styleSheet())
 
         reply = msg_box.exec()
 
@@ -1651,19 +2905,13 @@ class MainWindow(RoundedWindow):
             
             else:
                 output = self.controller.execute_command(command, show_in_console=False)
-                self._update_ui_after_command(command)
-            
-    def _update_ui_after_command(self, command):
-        if not command:
-            return
             
-        if "snapshot" in command:
+    def _update_ui_after_invalidation(self, affected):
+        """Refresca las pestañas cuyas consultas invalidó un comando mutable"""
+        if QueryCache.SNAPSHOT_LIST in affected:
             if hasattr(self, 'snapshots_tab') and self.snapshots_tab is not None:
                 self.snapshots_tab.refresh_snapshots()
-        elif "immutable-status" not in command and ("deploy" in command or "rollback" in command):
-            if hasattr(self, 'status_tab') and self.status_tab is not None:
-                self.status_tab.check_immutable_status()
-        elif "immutable-writable" in command:
+        if QueryCache.WRITABLE_STATUS in affected:
             if hasattr(self, 'status_tab') and self.status_tab is not None:
                 self.status_tab.check_immutable_status()
 
@@ -1676,50 +2924,86 @@ class MainWindow(RoundedWindow):
         self.nav_list.setObjectName("nav_list")
         self.nav_list.setFixedWidth(200)
         
-        self.add_nav_item("status", "status.png")
-        self.add_nav_item("admin", "admin.png")
-        self.add_nav_item("snapshots", "snapshot.png")
-        self.add_nav_item("about", "about.png")
+        self.add_nav_item("status", "status")
+        self.add_nav_item("admin", "admin")
+        self.add_nav_item("snapshots", "snapshot")
+        self.add_nav_item("about", "about")
         self.nav_list.setCurrentRow(0)
         main_content_layout.addWidget(self.nav_list)
 
         self.content_stack = QStackedWidget()
         main_content_layout.addWidget(self.content_stack, 1)
 
-        self.load_status_tab()  
-        self.load_admin_tab()
-        self.load_snapshots_tab()
-        self.create_about_page() 
-
-        self.nav_list.currentRowChanged.connect(self.content_stack.setCurrentIndex)
-
-    def add_nav_item(self, text_id, icon_name):
+        # Solo la pestaña de estado se construye al arrancar. El resto ocupa
+        # una página vacía hasta que se navega a ella o la aplicación está ociosa
+        self.tab_loaders = {
+            self.TAB_ADMIN: self.load_admin_tab,
+            self.TAB_SNAPSHOTS: self.load_snapshots_tab,
+            self.TAB_ABOUT: self.create_about_page,
+        }
+        with PROFILER.phase("load_status_tab"):
+            self.load_status_tab()
+        for index in sorted(self.tab_loaders):
+            self.content_stack.addWidget(QWidget())
+
+        self.nav_list.currentRowChanged.connect(self.show_tab)
+
+    def show_tab(self, index):
+        self.ensure_tab_loaded(index)
+        self.content_stack.setCurrentIndex(index)
+
+    def ensure_tab_loaded(self, index):
+        loader = self.tab_loaders.pop(index, None)
+        if loader:
+            with PROFILER.phase(loader.__name__):
+                loader()
+
+    def load_pending_tabs(self):
+        """Construye en segundo plano una pestaña pendiente por vuelta del bucle de eventos"""
+        if not self.tab_loaders:
+            # Con todas las pestañas construidas el arranque ha terminado
+            PROFILER.report()
+            return
+        self.ensure_tab_loaded(min(self.tab_loaders))
+        QTimer.singleShot(0, self.load_pending_tabs)
+
+    def set_tab_page(self, index, page):
+        """Coloca la página de una pestaña en su posición de content_stack"""
+        placeholder = self.content_stack.widget(index)
+        is_current = self.content_stack.currentIndex() == index
+        self.content_stack.insertWidget(index, page)
+        if is_current:
+            self.content_stack.setCurrentIndex(index)
+        if placeholder is not None:
+            self.content_stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+
+    def nav_item_text(self, text_id):
         translations = {
             "status": self.tr("Estado"),
             "admin": self.tr("Administración"),
             "snapshots": self.tr("Snapshots"),
             "about": self.tr("Acerca de")
         }
-        
-        item = QListWidgetItem(translations.get(text_id, text_id))
-        
-        icon_path = os.path.join(self.current_dir, "resources", icon_name)
-        
-        if os.path.exists(icon_path):
-            item.setIcon(QIcon(icon_path))
-        else:
-            icon_mapping = {
-                "status": "dialog-information",
-                "admin": "system-run",
-                "snapshots": "document-save",
-                "about": "help-about"
-            }
-            default_icon = icon_mapping.get(text_id, "")
-            if default_icon:
-                item.setIcon(QIcon.fromTheme(default_icon))
+        return translations.get(text_id, text_id)
+
+    def add_nav_item(self, text_id, icon_name):
+        item = QListWidgetItem(self.nav_item_text(text_id))
+        item.setData(Qt.UserRole, text_id)
+        item.setIcon(ICONS.icon(icon_name))
         
         self.nav_list.addItem(item)
 
+    def retranslate_ui(self):
+        # Las pestañas y diálogos reciben su propio LanguageChange
+        self.setWindowTitle(self.tr("Immutable Deepin Tools"))
+        for row in range(self.nav_list.count()):
+            item = self.nav_list.item(row)
+            item.setText(self.nav_item_text(item.data(Qt.UserRole)))
+        # La página Acerca de solo tiene texto fijo: se vuelve a construir si ya existe
+        if self.TAB_ABOUT not in self.tab_loaders:
+            self.create_about_page()
+
     def create_about_page(self):
         page = QWidget()
         layout = QVBoxLayout(page)
@@ -1733,15 +3017,9 @@ class MainWindow(RoundedWindow):
         header_layout = QHBoxLayout()
         header_layout.setSpacing(15)
         
-        icon_path = os.path.join(self.current_dir, "resources", "icon.png")
-        if os.path.exists(icon_path):
-            icon_label = QLabel()
-            icon_label.setPixmap(QIcon(icon_path).pixmap(64, 64))
-            header_layout.addWidget(icon_label)
-        else:
-            icon_label = QLabel()
-            icon_label.setPixmap(QIcon.fromTheme("system-run").pixmap(64, 64))
-            header_layout.addWidget(icon_label)
+        icon_label = QLabel()
+        icon_label.setPixmap(ICONS.pixmap("icon", 64))
+        header_layout.addWidget(icon_label)
         
         title_container = QWidget()
         title_layout = QVBoxLayout(title_container)
@@ -1749,23 +3027,12 @@ class MainWindow(RoundedWindow):
         title_layout.setSpacing(5)
         
         title = QLabel(self.tr("Immutable Deepin Tools"))
-        title.setStyleSheet("""
-            QLabel {
-                font-size: 24px;
-                font-weight: bold;
-            }
-        """)
+        title.setObjectName("about_title")
         title.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
         title_layout.addWidget(title, 0, Qt.AlignVCenter)
         
         subtitle = QLabel(self.tr("Desarrollado por la comunidad de Deepin en Español."))
-        subtitle.setStyleSheet("""
-            QLabel {
-                font-size: 17px;
-                font-weight: bold;
-                color: #3D60E3;
-            }
-        """)
+        subtitle.setObjectName("about_subtitle")
         subtitle.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
         title_layout.addWidget(subtitle, 0, Qt.AlignVCenter)
         
@@ -1844,7 +3111,7 @@ class MainWindow(RoundedWindow):
         layout.addWidget(about_group)
         layout.addStretch(1)
         
-        self.content_stack.addWidget(page)
+        self.set_tab_page(self.TAB_ABOUT, page)
 
     def load_status_tab(self):
         try:
@@ -1857,17 +3124,17 @@ class MainWindow(RoundedWindow):
                 
                 status_tab = status_module.StatusTab(self.controller, self)
                 self.status_tab = status_tab 
-                self.content_stack.addWidget(status_tab)
+                self.set_tab_page(self.TAB_STATUS, status_tab)
             else:
                 print(f"Advertencia: No se encontró el módulo status.py en {status_path}")
                 placeholder = QLabel(self.tr("Módulo de estado no encontrado"))
                 placeholder.setAlignment(Qt.AlignCenter)
-                self.content_stack.addWidget(placeholder)
+                self.set_tab_page(self.TAB_STATUS, placeholder)
         except Exception as e:
             print(f"Error al cargar el módulo de estado: {str(e)}")
             error_widget = QLabel(self.tr(f"Error al cargar el estado:\n{str(e)}"))
             error_widget.setAlignment(Qt.AlignCenter)
-            self.content_stack.addWidget(error_widget)
+            self.set_tab_page(self.TAB_STATUS, error_widget)
 
     def load_admin_tab(self):
         try:
@@ -1879,17 +3146,18 @@ class MainWindow(RoundedWindow):
                 spec.loader.exec_module(admin_module)
                 
                 admin_tab = admin_module.AdminTab(self.controller, self)
-                self.content_stack.addWidget(admin_tab)
+                self.admin_tab = admin_tab
+                self.set_tab_page(self.TAB_ADMIN, admin_tab)
             else:
                 print(f"Advertencia: No se encontró el módulo admin.py en {admin_path}")
                 placeholder = QLabel(self.tr("Módulo de administración no encontrado"))
                 placeholder.setAlignment(Qt.AlignCenter)
-                self.content_stack.addWidget(placeholder)
+                self.set_tab_page(self.TAB_ADMIN, placeholder)
         except Exception as e:
             print(f"Error al cargar el módulo de administración: {str(e)}")
             error_widget = QLabel(self.tr(f"Error al cargar la administración:\n{str(e)}"))
             error_widget.setAlignment(Qt.AlignCenter)
-            self.content_stack.addWidget(error_widget)
+            self.set_tab_page(self.TAB_ADMIN, error_widget)
 
     def load_snapshots_tab(self):
         try:
@@ -1902,44 +3170,59 @@ class MainWindow(RoundedWindow):
                 
                 snapshots_tab = snapshots_module.SnapshotsTab(self.controller, self)
                 self.snapshots_tab = snapshots_tab 
-                self.content_stack.addWidget(snapshots_tab)
+                self.set_tab_page(self.TAB_SNAPSHOTS, snapshots_tab)
             else:
                 print(f"Advertencia: No se encontró el módulo snapshots.py en {snapshots_path}")
                 placeholder = QLabel(self.tr("Módulo de Snapshots no encontrado"))
                 placeholder.setAlignment(Qt.AlignCenter)
-                self.content_stack.addWidget(placeholder)
+                self.set_tab_page(self.TAB_SNAPSHOTS, placeholder)
         except Exception as e:
             print(f"Error al cargar el módulo de Snapshots: {str(e)}")
             error_widget = QLabel(self.tr(f"Error al cargar Snapshots:\n{str(e)}"))
             error_widget.setAlignment(Qt.AlignCenter)
-            self.content_stack.addWidget(error_widget)
+            self.set_tab_page(self.TAB_SNAPSHOTS, error_widget)
 
     def create_separator(self):
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)
         separator.setFrameShadow(QFrame.Sunken)
         separator.setFixedHeight(2)
-        if self.dark_mode:
-            separator.setStyleSheet("background-color: #444444; border: none;")
-        else:
-            separator.setStyleSheet("background-color: #DDDDDD; border: none;")
+        separator.setObjectName("separator")
         return separator
 
     # --- INICIO DE LA MODIFICACIÓN ---
     # Añadir este método para manejar el cierre de la ventana
     def closeEvent(self, event):
         """Asegura que el proceso hijo se mate al cerrar la ventana."""
-        if self.controller.process and self.controller.process.state() == QProcess.ProcessState.Running:
+        if self.controller.has_pending_jobs():
             print("Cerrando... Matando proceso en curso.")
-            self.controller.cancel_command()
+            self.controller.cancel_all_jobs()
+        self.controller.cancel_queries()
+        self.controller.stop_helper()
+        self.status_monitor.stop()
         event.accept()
     # --- FIN DE LA MODIFICACIÓN ---
 
+class FirstPaintProbe(QObject):
+    """Anota en el perfil de arranque el primer pintado de la interfaz"""
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            PROFILER.mark("primer pintado")
+            QApplication.instance().removeEventFilter(self)
+        return False
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    PROFILER.mark("QApplication")
     
-    current_language = setup_translator(app)
+    with PROFILER.phase("setup_translator"):
+        current_language = setup_translator(app)
     
-    window = MainWindow()
-    window.show()
+    with PROFILER.phase("MainWindow"):
+        window = MainWindow()
+    if PROFILER.enabled:
+        first_paint_probe = FirstPaintProbe(app)
+        app.installEventFilter(first_paint_probe)
+    with PROFILER.phase("show"):
+        window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,38 +1,92 @@
 # -*- mode: python ; coding: utf-8 -*-
+#
+# Uso: pyinstaller main.spec               (un solo ejecutable, como hasta ahora)
+#      pyinstaller main.spec -- --onedir   (directorio: arranca sin desempaquetar en /tmp)
 
+import argparse
+import glob
+import os
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--onedir", action="store_true")
+options = parser.parse_args()
+
+# Módulos que PyInstaller arrastra por dependencias y la aplicación no usa
+excludes = [
+    'tkinter', 'unittest', 'pydoc', 'doctest', 'pdb',
+    'PySide6.QtNetwork', 'PySide6.QtQml', 'PySide6.QtQuick', 'PySide6.QtQuickWidgets',
+    'PySide6.QtOpenGL', 'PySide6.QtOpenGLWidgets', 'PySide6.QtPdf',
+    'PySide6.QtMultimedia', 'PySide6.QtWebEngineCore', 'PySide6.QtWebEngineWidgets',
+    'PySide6.QtCharts', 'PySide6.QtDataVisualization', 'PySide6.Qt3DCore',
+]
+
+# Con resources/icons.rcc (./update_icons.sh) los PNG sueltos no hacen falta en el paquete
+datas = [('resources/langs', 'resources/langs')]
+for path in glob.glob('resources/*'):
+    if os.path.isfile(path) and not (path.endswith('.png') and os.path.exists('resources/icons.rcc')):
+        datas.append((path, 'resources'))
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('resources', 'resources')],
+    datas=datas,
     hiddenimports=['PySide6.QtCore', 'PySide6.QtGui', 'PySide6.QtWidgets'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=excludes,
     noarchive=False,
-    optimize=0,
+    # Bytecode precompilado sin asserts; los docstrings se mantienen
+    optimize=1,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='main',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
+if options.onedir:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        name='main',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        # UPX ahorra disco pero obliga a descomprimir las bibliotecas de Qt en cada arranque
+        upx=False,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
@@ -1,12 +1,21 @@
 import os
-from subprocess import Popen, PIPE
+from subprocess import Popen
 import tempfile  # <-- Importación para el script temporal
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, 
                               QGroupBox, QPushButton, QLabel, QMessageBox, 
                               QDialog, QSizePolicy, QLineEdit, QFormLayout, 
-                              QCheckBox, QStackedWidget, QTextEdit)
-from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtCore import Qt, QSize
+                              QCheckBox, QStackedWidget)
+from PySide6.QtCore import Qt, QEvent
+from resources.icons import ICONS
+from resources.commands import build_full_command, deploy_command
+from resources.diskusage import format_size
+
+# Operaciones de ejemplo de la vista de archivos, en el orden de sus descripciones
+EXAMPLE_COMMANDS = (
+    "chattr /ruta/al/archivo +i",
+    "rmxattr /ruta/al/archivo user.key",
+    "setxattr /ruta/al/archivo user.key=value",
+)
 
 
 class AdminTab(QWidget):
@@ -29,8 +38,10 @@ class AdminTab(QWidget):
         self.btn_file_op = None
         self.cmd_input = None
         self.file_op_input = None
+        self.estimate_label = None
         
         self.setup_ui()
+        self.retranslate_ui()
         self.connect_signals()
 
     def setup_ui(self):
@@ -62,33 +73,23 @@ class AdminTab(QWidget):
         top_buttons_layout.setSpacing(15)
         
         # Botón Ejecutar Comando
-        self.btn_exec = self.create_modern_button(
-            self.tr("Ejecutar Comando"),
-            "admin-run",
-            self.tr("Ejecutar comandos sin la desactivación de la capa inmutable"),
-            "#3498db"
-        )
+        self.btn_exec = self.create_modern_button("admin-run", "#3498db")
         top_buttons_layout.addWidget(self.btn_exec, 1)
         
         # Botón Operación de Archivos
-        self.btn_file_op = self.create_modern_button(
-            self.tr("Manipular Archivos"),
-            "file-operation",
-            self.tr("Realizar operaciones avanzadas en archivos"),
-            "#2ecc71"
-        )
+        self.btn_file_op = self.create_modern_button("file-operation", "#2ecc71")
         top_buttons_layout.addWidget(self.btn_file_op, 1)
         
         layout.addLayout(top_buttons_layout)
 
         # Sección media: Acciones de despliegue
-        deploy_group = QGroupBox(self.tr("Opciones de Despliegue"))
-        deploy_layout = QGridLayout(deploy_group)
+        self.deploy_group = QGroupBox()
+        deploy_layout = QGridLayout(self.deploy_group)
         
         # Botones de despliegue con nuevo diseño
-        self.btn_deploy = self.create_small_button(self.tr("Desplegar"), "deploy-save", "#f39c12")
-        self.btn_finalize = self.create_small_button(self.tr("Finalizar"), "deploy-finalize", "#e74c3c")
-        self.btn_rollback = self.create_small_button(self.tr("Revertir"), "deploy-rollback", "#9b59b6")
+        self.btn_deploy = self.create_small_button("deploy-save", "#f39c12")
+        self.btn_finalize = self.create_small_button("deploy-finalize", "#e74c3c")
+        self.btn_rollback = self.create_small_button("deploy-rollback", "#9b59b6")
         
         deploy_layout.addWidget(self.btn_deploy, 0, 0)
         deploy_layout.addWidget(self.btn_finalize, 0, 1)
@@ -102,7 +103,7 @@ class AdminTab(QWidget):
         for i in range(3):
             deploy_layout.setColumnStretch(i, 1)
         
-        layout.addWidget(deploy_group)
+        layout.addWidget(self.deploy_group)
         layout.addStretch(1)
         
         self.stacked_widget.addWidget(self.main_widget)
@@ -119,21 +120,12 @@ class AdminTab(QWidget):
         btn_back_layout.setContentsMargins(5, 5, 10, 5)
         btn_back_layout.setSpacing(5)
         
-        # Cargar icono desde resources
-        icon_path = os.path.join(self.parent.current_dir, "resources", "back-btn.png")
-        if os.path.exists(icon_path):
-            icon_label = QLabel()
-            icon_pixmap = QPixmap(icon_path).scaled(16, 16, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            icon_label.setPixmap(icon_pixmap)
-            btn_back_layout.addWidget(icon_label)
-        else:
-            # Fallback a icono del sistema si no existe el PNG
-            icon_label = QLabel()
-            icon_label.setPixmap(QIcon.fromTheme("go-previous").pixmap(16, 16))
-            btn_back_layout.addWidget(icon_label)
+        icon_label = QLabel()
+        icon_label.setPixmap(ICONS.pixmap("back-btn", 16))
+        btn_back_layout.addWidget(icon_label)
 
-        text_label = QLabel(self.tr("Volver"))
-        btn_back_layout.addWidget(text_label)
+        self.cmd_back_label = QLabel()
+        btn_back_layout.addWidget(self.cmd_back_label)
         
         btn_back.setStyleSheet("""
             QPushButton {
@@ -151,39 +143,27 @@ class AdminTab(QWidget):
         layout.addWidget(btn_back, alignment=Qt.AlignLeft)
         
         # Descripción del proceso
-        description_text = self.tr("""Esta herramienta ejecutará el comando bajo <code>deepin-immutable-ctl admin exec</code>, 
-lo que permite realizar cambios temporales en el sistema inmutable.
-
-<b>Advertencias:</b>
-<ul>
-<li>Manipular archivos del sistema puede causar inestabilidad</li>
-<li>Los cambios pueden perderse al reiniciar si no se consolidan</li>
-<li>Algunas operaciones pueden requerir reinicio para aplicar cambios</li>
-</ul>
-
-<b>Se recomienda que realice una copia de seguridad para cambios importantes.</b>""")
-        
-        description = QLabel(description_text)
-        description.setStyleSheet("""
+        self.cmd_description = QLabel()
+        self.cmd_description.setStyleSheet("""
             QLabel {
                 border: 1px solid #ddd;
                 border-radius: 5px;
                 margin-bottom: 15px;
             }
         """)
-        description.setWordWrap(True)
-        layout.addWidget(description)
+        self.cmd_description.setWordWrap(True)
+        layout.addWidget(self.cmd_description)
         
         # Título
-        title = QLabel(self.tr("Ejecutar Comando (admin)"))
-        title.setStyleSheet("""
+        self.cmd_title = QLabel()
+        self.cmd_title.setStyleSheet("""
             QLabel {
                 font-size: 18px;
                 font-weight: bold;
                 margin-bottom: 15px;
             }
         """)
-        layout.addWidget(title, alignment=Qt.AlignCenter)
+        layout.addWidget(self.cmd_title, alignment=Qt.AlignCenter)
         
         # Contenedor horizontal para el campo de entrada y el botón
         input_container = QHBoxLayout()
@@ -191,7 +171,6 @@ lo que permite realizar cambios temporales en el sistema inmutable.
         
         # Campo de entrada de comandos
         self.cmd_input = QLineEdit()
-        self.cmd_input.setPlaceholderText(self.tr("Ingresa el comando ej: apt update && apt upgrade -y"))
         input_container.addWidget(self.cmd_input, stretch=1)  # El campo de entrada ocupa todo el espacio disponible
         
         # Botón de ejecución con icono y texto
@@ -206,17 +185,13 @@ lo que permite realizar cambios temporales en el sistema inmutable.
         # Icono de ejecución
         execute_icon = QLabel()
         icon_size = 16
-        icon_path = os.path.join(self.parent.current_dir, "resources", "run-command.png")
-        if os.path.exists(icon_path):
-            execute_icon.setPixmap(QIcon(icon_path).pixmap(icon_size, icon_size))
-        else:
-            execute_icon.setPixmap(QIcon.fromTheme("system-run").pixmap(icon_size, icon_size))
+        execute_icon.setPixmap(ICONS.pixmap("run-command", icon_size))
         btn_layout.addWidget(execute_icon)
         
         # Texto del botón
-        execute_text = QLabel(self.tr("Ejecutar"))
-        execute_text.setStyleSheet("font-weight: bold;")
-        btn_layout.addWidget(execute_text)
+        self.cmd_execute_text = QLabel()
+        self.cmd_execute_text.setStyleSheet("font-weight: bold;")
+        btn_layout.addWidget(self.cmd_execute_text)
         
         # Estilo del botón
         btn_execute.setStyleSheet("""
@@ -237,8 +212,8 @@ lo que permite realizar cambios temporales en el sistema inmutable.
         layout.addLayout(input_container)
 
         # Sección de comandos comunes
-        common_commands_group = QGroupBox(self.tr("Comandos comunes"))
-        common_commands_layout = QGridLayout(common_commands_group)
+        self.common_commands_group = QGroupBox()
+        common_commands_layout = QGridLayout(self.common_commands_group)
         
         common_commands = [
             ("ls", "ls -la"),
@@ -260,7 +235,7 @@ lo que permite realizar cambios temporales en el sistema inmutable.
                 col = 0
                 row += 1
         
-        layout.addWidget(common_commands_group)
+        layout.addWidget(self.common_commands_group)
         
         self.stacked_widget.addWidget(self.command_widget)
 
@@ -276,19 +251,12 @@ lo que permite realizar cambios temporales en el sistema inmutable.
         btn_back_layout.setContentsMargins(5, 5, 10, 5)
         btn_back_layout.setSpacing(5)
         
-        icon_path = os.path.join(self.parent.current_dir, "resources", "back-btn.png")
-        if os.path.exists(icon_path):
-            icon_label = QLabel()
-            icon_pixmap = QPixmap(icon_path).scaled(16, 16, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            icon_label.setPixmap(icon_pixmap)
-            btn_back_layout.addWidget(icon_label)
-        else:
-            icon_label = QLabel()
-            icon_label.setPixmap(QIcon.fromTheme("go-previous").pixmap(16, 16))
-            btn_back_layout.addWidget(icon_label)
+        icon_label = QLabel()
+        icon_label.setPixmap(ICONS.pixmap("back-btn", 16))
+        btn_back_layout.addWidget(icon_label)
 
-        text_label = QLabel(self.tr("Volver"))
-        btn_back_layout.addWidget(text_label)
+        self.file_op_back_label = QLabel()
+        btn_back_layout.addWidget(self.file_op_back_label)
         
         btn_back.setStyleSheet("""
             QPushButton {
@@ -306,18 +274,8 @@ lo que permite realizar cambios temporales en el sistema inmutable.
         layout.addWidget(btn_back, alignment=Qt.AlignLeft)
         
         # Descripción del proceso
-        description_text = self.tr("""Esta herramienta permite realizar operaciones en archivos del sistema 
-usando deepin-immutable-ctl admin file-op.
-
-Operaciones disponibles:
-Establecer atributos extendidos (ej: setxattr /ruta/al/archivo user.key=value)
-Eliminar atributos extendidos (ej: rmxattr /ruta/al/archivo user.key)
-Cambiar atributos de archivo (ej: chattr /ruta/al/archivo +i)
-
-Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
-        
-        description = QLabel(description_text)
-        description.setStyleSheet("""
+        self.file_op_description = QLabel()
+        self.file_op_description.setStyleSheet("""
             QLabel {
                 border: 1px solid #ddd;
                 border-radius: 5px;
@@ -325,19 +283,19 @@ Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
                 padding: 10px;
             }
         """)
-        description.setWordWrap(True)
-        layout.addWidget(description)
+        self.file_op_description.setWordWrap(True)
+        layout.addWidget(self.file_op_description)
         
         # Título
-        title = QLabel(self.tr("Operaciones de Archivos"))
-        title.setStyleSheet("""
+        self.file_op_title = QLabel()
+        self.file_op_title.setStyleSheet("""
             QLabel {
                 font-size: 18px;
                 font-weight: bold;
                 margin-bottom: 15px;
             }
         """)
-        layout.addWidget(title, alignment=Qt.AlignCenter)
+        layout.addWidget(self.file_op_title, alignment=Qt.AlignCenter)
         
         # Contenedor horizontal para el campo de entrada y el botón
         input_container = QHBoxLayout()
@@ -345,7 +303,6 @@ Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
         
         # Campo de entrada para la operación
         self.file_op_input = QLineEdit()
-        self.file_op_input.setPlaceholderText(self.tr("Ingrese la operación de archivo (ej: setxattr /ruta/al/archivo user.key=value)"))
         input_container.addWidget(self.file_op_input, stretch=1)  # El campo de entrada ocupa todo el espacio disponible
         
         # Botón de ejecución con icono y texto (igual que en comandos)
@@ -360,17 +317,13 @@ Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
         # Icono de ejecución
         execute_icon = QLabel()
         icon_size = 16
-        icon_path = os.path.join(self.parent.current_dir, "resources", "run-command.png")
-        if os.path.exists(icon_path):
-            execute_icon.setPixmap(QIcon(icon_path).pixmap(icon_size, icon_size))
-        else:
-            execute_icon.setPixmap(QIcon.fromTheme("system-run").pixmap(icon_size, icon_size))
+        execute_icon.setPixmap(ICONS.pixmap("run-command", icon_size))
         btn_layout.addWidget(execute_icon)
         
         # Texto del botón
-        execute_text = QLabel(self.tr("Ejecutar"))
-        execute_text.setStyleSheet("font-weight: bold;")
-        btn_layout.addWidget(execute_text)
+        self.file_op_execute_text = QLabel()
+        self.file_op_execute_text.setStyleSheet("font-weight: bold;")
+        btn_layout.addWidget(self.file_op_execute_text)
         
         # Estilo del botón (igual que en comandos)
         btn_execute.setStyleSheet("""
@@ -399,17 +352,13 @@ Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
         layout.addLayout(input_container)
 
         # Ejemplos de comandos
-        examples_group = QGroupBox(self.tr("Ejemplos de Operaciones"))
-        examples_layout = QVBoxLayout(examples_group)
+        self.examples_group = QGroupBox()
+        examples_layout = QVBoxLayout(self.examples_group)
         
-        examples = [
-            (self.tr("Cambiar atributos"), "chattr /ruta/al/archivo +i"),
-            (self.tr("Eliminar atributos"), "rmxattr /ruta/al/archivo user.key"),
-            (self.tr("Establecer atributos"), "setxattr /ruta/al/archivo user.key=value"),
-        ]
-        
-        for desc, cmd in examples:
-            example_btn = QPushButton(f"{desc}: {cmd}")
+        # El texto de cada ejemplo lo pone retranslate_ui
+        self.example_buttons = []
+        for cmd in EXAMPLE_COMMANDS:
+            example_btn = QPushButton()
             example_btn.setStyleSheet("""
                 QPushButton {
                     min-width: 55px;
@@ -429,18 +378,18 @@ Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
             """)
             example_btn.clicked.connect(lambda _, c=cmd: self.file_op_input.setText(c))
             examples_layout.addWidget(example_btn)
+            self.example_buttons.append(example_btn)
         
-        layout.addWidget(examples_group)
+        layout.addWidget(self.examples_group)
         layout.addStretch(1)
         
         self.stacked_widget.addWidget(self.file_op_widget)
 
-    def create_modern_button(self, text, icon_name, tooltip, color):
+    def create_modern_button(self, icon_name, color):
         """Crea un botón cuadrado grande con icono y texto"""
         btn = QPushButton()
         btn.setMinimumSize(160, 160)  # Tamaño mínimo cuadrado
         btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        btn.setToolTip(tooltip)
         
         # Layout interno vertical
         layout = QVBoxLayout(btn)
@@ -451,62 +400,31 @@ Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
         icon_label = QLabel()
         icon_size = 48  # Tamaño del icono
         
-        # Buscar icono en recursos primero
-        icon_path = os.path.join(self.parent.current_dir, "resources", f"{icon_name}.png")
-        if os.path.exists(icon_path):
-            icon_label.setPixmap(QIcon(icon_path).pixmap(icon_size, icon_size))
-        else:
-            icon_label.setPixmap(QIcon.fromTheme(icon_name).pixmap(icon_size, icon_size))
+        icon_label.setPixmap(ICONS.pixmap(icon_name, icon_size))
         
         icon_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(icon_label)
         
         # Texto principal
-        title_label = QLabel(text)
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet(f"""
-            QLabel {{
-                font-weight: bold;
-                font-size: 14px;
-                color: {color};
-                margin-top: 5px;
-            }}
-        """)
-        layout.addWidget(title_label)
+        btn.title_label = QLabel()
+        btn.title_label.setAlignment(Qt.AlignCenter)
+        btn.title_label.setObjectName("tile_title")
+        layout.addWidget(btn.title_label)
         
         # Descripción
-        desc_label = QLabel(tooltip)
-        desc_label.setAlignment(Qt.AlignCenter)
-        desc_label.setWordWrap(True)
-        desc_label.setStyleSheet("""
-            QLabel {
-                font-size: 11px;
-                color: #777;
-                margin-top: 5px;
-            }
-        """)
-        layout.addWidget(desc_label)
+        btn.desc_label = QLabel()
+        btn.desc_label.setAlignment(Qt.AlignCenter)
+        btn.desc_label.setWordWrap(True)
+        btn.desc_label.setObjectName("tile_description")
+        layout.addWidget(btn.desc_label)
         
-        # Estilo del botón
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                border: 2px solid {color};
-                border-radius: 15px;
-                background-color: rgba({color[1:]}, 0.1);
-                padding: 5px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba({color[1:]}, 0.2);
-                border: 2px solid {color};
-            }}
-            QPushButton:pressed {{
-                background-color: rgba({color[1:]}, 0.3);
-            }}
-        """)
+        # Estilo del botón: la hoja del tema lo resuelve por las propiedades
+        btn.setProperty("tile", "large")
+        btn.setProperty("accent", color)
         
         return btn
 
-    def create_small_button(self, text, icon_name, color):
+    def create_small_button(self, icon_name, color):
         """Crea un botón con icono, texto y descripción para las opciones de deploy"""
         btn = QPushButton()
         btn.setMinimumHeight(80)  # Aumentamos la altura para acomodar más contenido
@@ -521,69 +439,90 @@ Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
         icon_label = QLabel()
         icon_size = 24  # Tamaño del icono más pequeño que en los botones grandes
         
-        # Buscar icono en recursos
-        icon_path = os.path.join(self.parent.current_dir, "resources", f"{icon_name}.png")
-        if os.path.exists(icon_path):
-            icon_label.setPixmap(QIcon(icon_path).pixmap(icon_size, icon_size))
-        else:
-            icon_label.setPixmap(QIcon.fromTheme(icon_name).pixmap(icon_size, icon_size))
+        icon_label.setPixmap(ICONS.pixmap(icon_name, icon_size))
         
         icon_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(icon_label)
         
         # Texto principal
-        title_label = QLabel(text)
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet(f"""
-            QLabel {{
-                font-weight: bold;
-                font-size: 13px;
-                color: {color};
-                margin-top: 3px;
-            }}
-        """)
-        layout.addWidget(title_label)
-        
-        # Descripción (diferente según el botón)
-        desc_text = ""
-        if text == self.tr("Desplegar"):
-            desc_text = self.tr("Crear nueva versión con cambios")
-        elif text == self.tr("Finalizar"):
-            desc_text = self.tr("Consolidar cambios en el sistema")
-        elif text == self.tr("Revertir"):
-            desc_text = self.tr("Volver a la versión anterior")
-        
-        desc_label = QLabel(desc_text)
-        desc_label.setAlignment(Qt.AlignCenter)
-        desc_label.setWordWrap(True)
-        desc_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: 10px;
-                color: #555;
-                margin-top: 3px;
-            }}
-        """)
-        layout.addWidget(desc_label)
-        
-        # Estilo del botón
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                border: 1px solid {color};
-                border-radius: 10px;
-                padding: 5px;
-                background-color: rgba({color[1:]}, 0.1);
-            }}
-            QPushButton:hover {{
-                background-color: rgba({color[1:]}, 0.2);
-                border: 1px solid {color};
-            }}
-            QPushButton:pressed {{
-                background-color: rgba({color[1:]}, 0.3);
-            }}
-        """)
+        btn.title_label = QLabel()
+        btn.title_label.setAlignment(Qt.AlignCenter)
+        btn.title_label.setObjectName("tile_title")
+        layout.addWidget(btn.title_label)
+        
+        # Descripción (diferente según el botón, la pone retranslate_ui)
+        btn.desc_label = QLabel()
+        btn.desc_label.setAlignment(Qt.AlignCenter)
+        btn.desc_label.setWordWrap(True)
+        btn.desc_label.setObjectName("tile_description")
+        layout.addWidget(btn.desc_label)
+        
+        # Estilo del botón: la hoja del tema lo resuelve por las propiedades
+        btn.setProperty("tile", "small")
+        btn.setProperty("accent", color)
         
         return btn
 
+    def set_tile_text(self, btn, title, description):
+        btn.title_label.setText(title)
+        btn.desc_label.setText(description)
+
+    def retranslate_ui(self):
+        """Pone los textos de las tres vistas en el idioma actual"""
+        self.set_tile_text(self.btn_exec, self.tr("Ejecutar Comando"),
+                           self.tr("Ejecutar comandos sin la desactivación de la capa inmutable"))
+        self.btn_exec.setToolTip(self.btn_exec.desc_label.text())
+        self.set_tile_text(self.btn_file_op, self.tr("Manipular Archivos"),
+                           self.tr("Realizar operaciones avanzadas en archivos"))
+        self.btn_file_op.setToolTip(self.btn_file_op.desc_label.text())
+
+        self.deploy_group.setTitle(self.tr("Opciones de Despliegue"))
+        self.set_tile_text(self.btn_deploy, self.tr("Desplegar"), self.tr("Crear nueva versión con cambios"))
+        self.set_tile_text(self.btn_finalize, self.tr("Finalizar"), self.tr("Consolidar cambios en el sistema"))
+        self.set_tile_text(self.btn_rollback, self.tr("Revertir"), self.tr("Volver a la versión anterior"))
+
+        # Vista de comandos
+        self.cmd_back_label.setText(self.tr("Volver"))
+        self.cmd_description.setText(self.tr("""Esta herramienta ejecutará el comando bajo <code>deepin-immutable-ctl admin exec</code>, 
+lo que permite realizar cambios temporales en el sistema inmutable.
+
+<b>Advertencias:</b>
+<ul>
+<li>Manipular archivos del sistema puede causar inestabilidad</li>
+<li>Los cambios pueden perderse al reiniciar si no se consolidan</li>
+<li>Algunas operaciones pueden requerir reinicio para aplicar cambios</li>
+</ul>
+
+<b>Se recomienda que realice una copia de seguridad para cambios importantes.</b>"""))
+        self.cmd_title.setText(self.tr("Ejecutar Comando (admin)"))
+        self.cmd_input.setPlaceholderText(self.tr("Ingresa el comando ej: apt update && apt upgrade -y"))
+        self.cmd_execute_text.setText(self.tr("Ejecutar"))
+        self.common_commands_group.setTitle(self.tr("Comandos comunes"))
+
+        # Vista de operaciones de archivos
+        self.file_op_back_label.setText(self.tr("Volver"))
+        self.file_op_description.setText(self.tr("""Esta herramienta permite realizar operaciones en archivos del sistema 
+usando deepin-immutable-ctl admin file-op.
+
+Operaciones disponibles:
+Establecer atributos extendidos (ej: setxattr /ruta/al/archivo user.key=value)
+Eliminar atributos extendidos (ej: rmxattr /ruta/al/archivo user.key)
+Cambiar atributos de archivo (ej: chattr /ruta/al/archivo +i)
+
+Advertencia: Estas operaciones afectan directamente al sistema de archivos."""))
+        self.file_op_title.setText(self.tr("Operaciones de Archivos"))
+        self.file_op_input.setPlaceholderText(self.tr("Ingrese la operación de archivo (ej: setxattr /ruta/al/archivo user.key=value)"))
+        self.file_op_execute_text.setText(self.tr("Ejecutar"))
+        self.examples_group.setTitle(self.tr("Ejemplos de Operaciones"))
+        descriptions = (self.tr("Cambiar atributos"), self.tr("Eliminar atributos"), self.tr("Establecer atributos"))
+        for button, desc, cmd in zip(self.example_buttons, descriptions, EXAMPLE_COMMANDS):
+            button.setText(f"{desc}: {cmd}")
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
     def show_main_view(self):
         """Muestra la vista principal"""
         self.stacked_widget.setCurrentWidget(self.main_widget)
@@ -679,7 +618,7 @@ Advertencia: Estas operaciones afectan directamente al sistema de archivos.""")
         """Muestra un diálogo para seleccionar opciones de deploy con explicación detallada"""
         dialog = QDialog(self)
         dialog.setWindowTitle(self.tr("Desplegar Cambios en el Sistema"))
-        dialog.setFixedSize(500, 330)
+        dialog.setFixedSize(500, 450)
         
         layout = QVBoxLayout(dialog)
         layout.setSpacing(10)
@@ -717,6 +656,21 @@ Seleccione las opciones adicionales:""")
         layout.addWidget(self.backup_check)
         layout.addWidget(self.refresh_check)
         layout.addWidget(self.append_check)
+
+        # La estimación llega en segundo plano: el diálogo se abre sin esperarla
+        estimate_group = QGroupBox(self.tr("Estimación"))
+        estimate_layout = QVBoxLayout(estimate_group)
+        self.estimate_label = QLabel(self.tr("Calculando lo pendiente en overlay..."))
+        self.estimate_label.setWordWrap(True)
+        estimate_layout.addWidget(self.estimate_label)
+        layout.addWidget(estimate_group)
+        self.deploy_estimate = None
+        self.deploy_estimate_error = ""
+        for check in (self.backup_check, self.refresh_check, self.append_check):
+            check.toggled.connect(self.update_deploy_estimate)
+        status_tab = getattr(self.parent, "status_tab", None)
+        self.controller.estimate_deploy(self.handle_deploy_estimate,
+                                        status_tab.overlay_dirs() if status_tab is not None else None)
         
         # Botones
         btn_box = QHBoxLayout()
@@ -730,17 +684,59 @@ Seleccione las opciones adicionales:""")
         layout.addLayout(btn_box)
         
         dialog.exec()
+        # Una estimación que llegue tarde ya no tiene dónde mostrarse
+        self.estimate_label = None
+
+    def handle_deploy_estimate(self, estimate, error):
+        self.deploy_estimate = estimate
+        self.deploy_estimate_error = error
+        self.update_deploy_estimate()
+
+    def deploy_options(self):
+        return {"backup": self.backup_check.isChecked(), "refresh": self.refresh_check.isChecked(),
+                "append": self.append_check.isChecked()}
+
+    def update_deploy_estimate(self):
+        """Pendiente en overlay, espacio libre y duración prevista con las opciones marcadas"""
+        if self.estimate_label is None:
+            return
+        estimate = self.deploy_estimate
+        if estimate is None:
+            if self.deploy_estimate_error:
+                self.estimate_label.setText(self.tr("No se pudo calcular la estimación: {0}").format(
+                    self.deploy_estimate_error))
+            return
+
+        lines = []
+        if estimate.files or estimate.removed:
+            lines.append(self.tr("Pendiente en overlay: {0} en {1} ficheros, {2} eliminados").format(
+                format_size(estimate.size), estimate.files, estimate.removed))
+        elif estimate.mounts:
+            lines.append(self.tr("No hay cambios pendientes en overlay"))
+        else:
+            lines.append(self.tr("No hay ningún overlay escribible montado"))
+        if estimate.free_bytes is not None:
+            lines.append(self.tr("Espacio libre en {0}: {1}").format(estimate.free_path,
+                                                                     format_size(estimate.free_bytes)))
+            if estimate.free_bytes < estimate.size:
+                lines.append(self.tr("⚠ El espacio libre no basta para lo pendiente"))
+
+        prediction = self.controller.predict_deploy_duration(estimate.size, self.deploy_options())
+        if prediction is None:
+            lines.append(self.tr("Duración estimada: sin datos (aún no hay despliegues registrados)"))
+        else:
+            from resources.deployestimate import format_duration
+            text = self.tr("Duración estimada: {0}").format(format_duration(prediction.seconds))
+            if prediction.spread is not None:
+                text += f" (± {format_duration(prediction.spread)})"
+            lines.append(text + " · " + self.tr("{0} despliegues anteriores").format(prediction.samples))
+        if estimate.errors:
+            lines.append(self.tr("No se pudo leer: {0}").format("; ".join(estimate.errors)))
+        self.estimate_label.setText("\n".join(lines))
 
     def execute_deploy(self, dialog):
         """Construye y ejecuta el comando deploy con las opciones seleccionadas"""
-        command = "pkexec deepin-immutable-ctl admin deploy"
-        
-        if self.backup_check.isChecked():
-            command += " --backup"
-        if self.refresh_check.isChecked():
-            command += " --refresh"
-        if self.append_check.isChecked():
-            command += " --append"
+        command = build_full_command(deploy_command(**self.deploy_options()))
         
         dialog.accept()
         self.confirm_action(
@@ -775,7 +771,7 @@ Advertencia:
             self.parent.confirm_action(
                 self.tr("Finalizar Despliegue"),
                 self.tr("¿Confirmas que deseas finalizar el despliegue?"),
-                "pkexec deepin-immutable-ctl admin deploy --finalize",
+                build_full_command(deploy_command(finalize=True)),
                 show_console=True,
                 requires_reboot=True
             )
@@ -0,0 +1,36 @@
+"""Directorio de caché de la aplicación y escritura atómica de sus ficheros JSON.
+
+Sin dependencias fuera de la biblioteca estándar, para que el catálogo, los
+analizadores y los historiales puedan usarlo sin importarse entre sí.
+"""
+import json
+import os
+import tempfile
+
+
+def get_cache_dir():
+    """Directorio de caché de la aplicación (XDG_CACHE_HOME o ~/.cache)"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "immutable-deepin-tools")
+
+
+def write_json(path, data, **options):
+    """Guarda `data` como JSON de forma atómica, como ConfigManager.
+
+    Un temporal propio en el mismo directorio (dos procesos que guardan a la
+    vez no se pisan), fsync y os.replace: tras un corte queda el fichero
+    anterior o el nuevo, nunca uno a medias. Crea el directorio si falta.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    f = tempfile.NamedTemporaryFile('w', dir=directory, prefix=f".{os.path.basename(path)}-", suffix=".tmp",
+                                    delete=False)
+    try:
+        with f:
+            json.dump(data, f, **options)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
@@ -0,0 +1,347 @@
+"""Modo sin interfaz: immutable-deepin-tools --cli <subcomando> [--json].
+
+No importa PySide6, así que arranca en decenas de milisegundos y se puede
+llamar desde scripts, cron o unidades de systemd. Usa los mismos comandos
+(resources.commands) y parsers (resources.parsers) que la interfaz. Los
+analizadores (diskusage, treediff, overlay, deployestimate) se importan
+dentro de su subcomando, para que status o snapshot list no los carguen.
+
+Códigos de salida: 0 si todo fue bien, 1 si el comando de deepin falló o su
+salida no se pudo interpretar, 2 si los argumentos no son válidos.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from subprocess import call
+
+from resources.commands import (STATUS_COMMAND, SNAPSHOT_LIST_COMMAND, DEPLOYMENT_STATUS_COMMAND,
+                                build_full_command, deploy_command, run_command, snapshot_command)
+from resources.diffentry import ADDED, MODIFIED, REMOVED
+from resources.parsers import (ERROR_SEPARATOR, parse_deployments, parse_snapshot_details,
+                               parse_snapshot_list, parse_status)
+
+
+def full_command(command):
+    # Como root (cron, systemd) pkexec sobra y sin agente de polkit fallaría
+    if os.geteuid() == 0:
+        return command
+    return build_full_command(command)
+
+
+def split_error(output):
+    output, _, error = output.partition(ERROR_SEPARATOR)
+    return output, error.strip()
+
+
+def emit(args, data, text):
+    """Escribe `data` como JSON con --json o `text` en formato legible"""
+    if args.json:
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def fail(args, command, returncode, output):
+    _, error = split_error(output)
+    message = error or output.strip() or f"exit code {returncode}"
+    if args.json:
+        emit(args, {"ok": False, "command": command, "exit_code": returncode, "error": message}, "")
+    else:
+        print(message, file=sys.stderr)
+    return 1
+
+
+def cmd_status(args):
+    command = full_command(STATUS_COMMAND)
+    returncode, output = run_command(command)
+    status = parse_status(output)
+    if returncode != 0 or status is None:
+        return fail(args, command, returncode, output)
+
+    status = status.to_dict()
+    emit(args, status, "\n".join(f"{key}: {value}" for key, value in status.items()))
+    return 0
+
+
+def cmd_snapshot_list(args):
+    command = full_command(SNAPSHOT_LIST_COMMAND)
+    returncode, output = run_command(command)
+    records = parse_snapshot_list(output)
+    if returncode != 0 or records is None:
+        return fail(args, command, returncode, output)
+
+    lines = [f"{record.id}\t{record.name}\t{record.time}\t{record.desc}" for record in records]
+    emit(args, [record.to_dict() for record in records], "\n".join(lines))
+    return 0
+
+
+def cmd_snapshot_show(args):
+    command = full_command(snapshot_command("show", args.id))
+    returncode, output = run_command(command)
+    details = parse_snapshot_details(output)
+    if returncode != 0 or details is None:
+        return fail(args, command, returncode, output)
+
+    details = details.to_dict()
+    emit(args, details, "\n".join(f"{key}: {value}" for key, value in details.items()))
+    return 0
+
+
+def cmd_deployments(args):
+    command = full_command(DEPLOYMENT_STATUS_COMMAND)
+    returncode, output = run_command(command)
+    deployments = parse_deployments(output)
+    if returncode != 0 or deployments is None:
+        return fail(args, command, returncode, output)
+
+    lines = []
+    for deployment in deployments:
+        flags = [name for name in ("booted", "pending", "rollback", "staged", "pinned") if getattr(deployment, name)]
+        lines.append(f"{deployment.osname}\t{deployment.checksum}.{deployment.serial}\t"
+                     f"{deployment.version}\t{','.join(flags)}")
+    emit(args, [deployment.to_dict() for deployment in deployments], "\n".join(lines))
+    return 0
+
+
+def cmd_disk_usage(args):
+    from resources import diskusage
+    # Sin pkexec: como usuario normal no se cuenta lo que no se puede leer
+    report = diskusage.analyze(args.root or None, use_cache=not args.no_cache, workers=args.workers)
+    lines = [f"{root.name}\t{diskusage.format_size(root.exclusive)}\t{diskusage.format_size(root.shared)}\t"
+             f"{root.files}\t{root.path}" for root in report.roots]
+    lines.append(f"total\t{diskusage.format_size(report.total)}")
+    emit(args, report.to_dict(), "\n".join(lines))
+    return 0
+
+
+def diff_tree(value):
+    """Árbol de un argumento de diff: "live" (el /usr en uso), un directorio o un ID de snapshot"""
+    if value == "live":
+        return "/usr"
+    if os.path.isdir(value):
+        return value
+    from resources.treediff import snapshot_tree
+    return snapshot_tree(value)
+
+
+def cmd_diff(args):
+    from resources.treediff import diff_trees
+    old, new = diff_tree(args.old), diff_tree(args.new)
+    missing = [value for value, tree in ((args.old, old), (args.new, new)) if tree is None]
+    if missing:
+        message = f"No se encuentra en disco el despliegue de: {', '.join(missing)}"
+        if args.json:
+            # En una sola línea, como el resto de la salida de diff que lee la interfaz
+            sys.stdout.write(json.dumps({"ok": False, "error": message}, ensure_ascii=False) + "\n")
+        else:
+            print(message, file=sys.stderr)
+        return 1
+
+    # Con --json, una línea JSON por diferencia según se encuentran y un resumen al final
+    marks = {ADDED: "A", REMOVED: "D", MODIFIED: "M"}
+    counts = dict.fromkeys(marks, 0)
+    started = last_flush = time.monotonic()
+    for entry in diff_trees(old, new, workers=args.workers):
+        counts[entry.kind] += 1
+        if args.json:
+            sys.stdout.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+        else:
+            sys.stdout.write(f"{marks[entry.kind]}\t{entry.path}" + (f"\t({entry.detail})" if entry.detail else "") + "\n")
+        now = time.monotonic()
+        if now - last_flush > 0.1:
+            sys.stdout.flush()
+            last_flush = now
+    summary = dict(counts, done=True, elapsed_ms=round((time.monotonic() - started) * 1000))
+    if args.json:
+        sys.stdout.write(json.dumps(summary) + "\n")
+    return 0
+
+
+def cmd_overlay_changes(args):
+    from resources import overlay
+    if args.upper:
+        mounts = [overlay.OverlayMount(args.target or args.upper, args.upper, args.lower or [])]
+    else:
+        mounts = overlay.overlay_mounts(args.dir)
+
+    scanner = overlay.OverlayScanner(None if args.no_cache else overlay.default_index_path())
+    scanner.load_index()
+    marks = {ADDED: "A", REMOVED: "D", MODIFIED: "M"}
+    counts = dict.fromkeys(marks, 0)
+    size = 0
+    errors = []
+    started = last_flush = time.monotonic()
+    # Como diff: con --json, una línea por cambio según se encuentran y un resumen al final
+    for mount in mounts:
+        try:
+            for entry in scanner.scan(mount):
+                counts[entry.kind] += 1
+                size += entry.size or 0
+                if args.json:
+                    sys.stdout.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+                else:
+                    sys.stdout.write(f"{marks[entry.kind]}\t{entry.path}"
+                                     + (f"\t{entry.size}" if entry.size is not None else "")
+                                     + (f"\t({entry.detail})" if entry.detail else "") + "\n")
+                now = time.monotonic()
+                if now - last_flush > 0.1:
+                    sys.stdout.flush()
+                    last_flush = now
+        except OSError as e:
+            errors.append(f"{mount.target} ({mount.upper}): {e.strerror or e}")
+    scanner.save_index()
+
+    summary = dict(counts, done=True, size=size, mounts=[mount.to_dict() for mount in mounts], errors=errors,
+                   scanned_dirs=scanner.scanned_dirs, cached_dirs=scanner.cached_dirs,
+                   elapsed_ms=round((time.monotonic() - started) * 1000))
+    if args.json:
+        sys.stdout.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    for error in errors:
+        print(f"No se pudo leer la capa escribible de {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def cmd_deploy_estimate(args):
+    from resources.deployestimate import estimate
+    from resources.diskusage import format_size
+    result = estimate(args.dir, use_cache=not args.no_cache)
+    free = format_size(result.free_bytes) if result.free_bytes is not None else "?"
+    emit(args, result.to_dict(), f"pendiente\t{format_size(result.size)}\t{result.files} ficheros\t"
+                                 f"{result.removed} eliminados\nlibre\t{free}\t{result.free_path}")
+    for error in result.errors:
+        print(f"No se pudo leer la capa escribible de {error}", file=sys.stderr)
+    return 1 if result.errors else 0
+
+
+def root_argument(value):
+    name, sep, path = value.partition("=")
+    if not sep or not name or not path:
+        raise argparse.ArgumentTypeError(f"se esperaba NOMBRE=RUTA: {value}")
+    return name, path
+
+
+def run_mutation(args, command):
+    """Ejecuta un comando que modifica el sistema y devuelve su código de salida.
+
+    En modo legible la salida pasa tal cual a la terminal; con --json se
+    recoge y se devuelve en un único objeto.
+    """
+    command = full_command(command)
+    if not args.json:
+        # shell=True como en run_command, sin capturar para ver el progreso
+        return 0 if call(command, shell=True) == 0 else 1
+
+    returncode, output = run_command(command)
+    stdout, error = split_error(output)
+    emit(args, {"ok": returncode == 0, "command": command, "exit_code": returncode,
+                "output": stdout, "error": error}, "")
+    return 0 if returncode == 0 else 1
+
+
+def cmd_snapshot_create(args):
+    command = snapshot_command("create", *[arg for arg in (args.name, args.desc) if arg])
+    # deepin-immutable-ctl los toma de forma posicional: una descripción sin nombre sería el nombre
+    if args.desc and not args.name:
+        return fail(args, command, 2, "--desc necesita --name")
+    return run_mutation(args, command)
+
+
+def cmd_snapshot_delete(args):
+    return run_mutation(args, snapshot_command("delete", args.id))
+
+
+def cmd_snapshot_rollback(args):
+    return run_mutation(args, snapshot_command("rollback", args.id))
+
+
+def cmd_deploy(args):
+    return run_mutation(args, deploy_command(backup=args.backup, refresh=args.refresh,
+                                             append=args.append, finalize=args.finalize))
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    # SUPPRESS: así --json vale tanto antes como después del subcomando
+    common.add_argument("--json", action="store_true", default=argparse.SUPPRESS, help="salida en JSON")
+
+    parser = argparse.ArgumentParser(prog="immutable-deepin-tools --cli", parents=[common],
+                                     description="Gestión del modo inmutable de Deepin sin interfaz gráfica.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    status = commands.add_parser("status", parents=[common], help="estado del modo inmutable")
+    status.set_defaults(func=cmd_status)
+
+    snapshot = commands.add_parser("snapshot", help="gestión de snapshots")
+    actions = snapshot.add_subparsers(dest="action", required=True)
+    action = actions.add_parser("list", parents=[common], help="lista los snapshots")
+    action.set_defaults(func=cmd_snapshot_list)
+    action = actions.add_parser("show", parents=[common], help="detalles de un snapshot")
+    action.add_argument("id")
+    action.set_defaults(func=cmd_snapshot_show)
+    action = actions.add_parser("create", parents=[common], help="crea un snapshot")
+    action.add_argument("--name", default="")
+    action.add_argument("--desc", default="")
+    action.set_defaults(func=cmd_snapshot_create)
+    action = actions.add_parser("delete", parents=[common], help="elimina un snapshot")
+    action.add_argument("id")
+    action.set_defaults(func=cmd_snapshot_delete)
+    action = actions.add_parser("rollback", parents=[common], help="revierte el sistema a un snapshot")
+    action.add_argument("id")
+    action.set_defaults(func=cmd_snapshot_rollback)
+
+    deployments = commands.add_parser("deployments", parents=[common], help="despliegues de ostree")
+    deployments.set_defaults(func=cmd_deployments)
+
+    disk_usage = commands.add_parser("disk-usage", parents=[common],
+                                     help="espacio exclusivo y compartido del repositorio y de cada despliegue")
+    disk_usage.add_argument("--root", action="append", type=root_argument, metavar="NOMBRE=RUTA",
+                            help="analiza esta ruta en lugar de las de ostree (se puede repetir)")
+    disk_usage.add_argument("--workers", type=int, default=None, help="hilos del recorrido")
+    disk_usage.add_argument("--no-cache", action="store_true", help="ignora la caché de directorios")
+    disk_usage.set_defaults(func=cmd_disk_usage)
+
+    diff = commands.add_parser("diff", parents=[common],
+                               help="ficheros añadidos, eliminados y modificados entre dos árboles")
+    diff.add_argument("old", help="ID de snapshot, directorio o \"live\" (el /usr en uso)")
+    diff.add_argument("new", nargs="?", default="live", help="como OLD; por defecto, live")
+    diff.add_argument("--workers", type=int, default=None, help="procesos para comparar contenidos")
+    diff.set_defaults(func=cmd_diff)
+
+    changes = commands.add_parser("overlay-changes", parents=[common],
+                                  help="cambios pendientes en las capas escribibles de los overlays")
+    changes.add_argument("--dir", action="append", metavar="RUTA",
+                         help="solo el overlay montado en esta ruta (se puede repetir)")
+    changes.add_argument("--upper", help="analiza esta capa superior en lugar de las montadas")
+    changes.add_argument("--lower", action="append", metavar="RUTA", help="capa inferior de --upper (se puede repetir)")
+    changes.add_argument("--target", help="punto de montaje de --upper, para las rutas mostradas")
+    changes.add_argument("--no-cache", action="store_true", help="ignora el índice de directorios")
+    changes.set_defaults(func=cmd_overlay_changes)
+
+    estimate = commands.add_parser("deploy-estimate", parents=[common],
+                                   help="lo pendiente en overlay y el espacio libre antes de desplegar")
+    estimate.add_argument("--dir", action="append", metavar="RUTA",
+                          help="solo el overlay montado en esta ruta (se puede repetir)")
+    estimate.add_argument("--no-cache", action="store_true", help="ignora el índice de directorios")
+    estimate.set_defaults(func=cmd_deploy_estimate)
+
+    deploy = commands.add_parser("deploy", parents=[common], help="despliega los cambios del sistema")
+    deploy.add_argument("--backup", action="store_true")
+    deploy.add_argument("--refresh", action="store_true")
+    deploy.add_argument("--append", action="store_true")
+    deploy.add_argument("--finalize", action="store_true",
+                        help="finaliza el despliegue (ignora las demás opciones)")
+    deploy.set_defaults(func=cmd_deploy)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.json = getattr(args, "json", False)
+    try:
+        return args.func(args)
+    except OSError as e:
+        print(f"Error ejecutando comando: {e}", file=sys.stderr)
+        return 1
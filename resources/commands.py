@@ -0,0 +1,74 @@
+"""Comandos de deepin-immutable-ctl/-writable y su ejecución, sin depender de Qt.
+
+El controlador de la interfaz y el modo --cli construyen aquí los mismos
+comandos y deciden igual cuáles necesitan pkexec.
+"""
+import os
+import shlex
+from subprocess import Popen, PIPE
+
+from resources.parsers import ERROR_SEPARATOR
+
+STATUS_COMMAND = "deepin-immutable-writable status"
+SNAPSHOT_LIST_COMMAND = "deepin-immutable-ctl snapshot list"
+DEPLOYMENT_STATUS_COMMAND = "ostree admin status"
+
+# Consultas de solo lectura que no necesitan privilegios de root
+NO_ROOT_COMMANDS = (
+    "deepin-immutable-ctl --immutable-status",
+    "deepin-immutable-ctl snapshot list",
+    "deepin-immutable-ctl snapshot show",
+    "deepin-immutable-writable status",
+    "ostree admin status",
+    "--cli disk-usage",
+    "--cli deploy-estimate",
+)
+
+
+def snapshot_command(action, *args):
+    """`deepin-immutable-ctl snapshot <action>` con los argumentos entrecomillados"""
+    return " ".join(["deepin-immutable-ctl", "snapshot", action] + [shlex.quote(arg) for arg in args])
+
+
+def deploy_command(backup=False, refresh=False, append=False, finalize=False):
+    command = "deepin-immutable-ctl admin deploy"
+    if finalize:
+        return command + " --finalize"
+    if backup:
+        command += " --backup"
+    if refresh:
+        command += " --refresh"
+    if append:
+        command += " --append"
+    return command
+
+
+def needs_root(command):
+    return not any(cmd in command for cmd in NO_ROOT_COMMANDS)
+
+
+def build_full_command(command):
+    """Antepone pkexec a los comandos que requieren privilegios de root"""
+    if needs_root(command) and not command.startswith("pkexec"):
+        return f"pkexec {command}"
+    return command
+
+
+def run_command(command, env=None):
+    """Ejecuta un comando ya completo y espera a que termine.
+
+    Devuelve (código de salida, salida). La salida de error se añade tras
+    ERROR_SEPARATOR, con el mismo formato que las consultas de la interfaz.
+    """
+    process_env = None
+    if env:
+        process_env = os.environ.copy()
+        process_env.update(env)
+
+    process = Popen(command, shell=True, stdout=PIPE, stderr=PIPE, env=process_env)
+    stdout, stderr = process.communicate()
+    output = stdout.decode('utf-8', errors='replace')
+    error = stderr.decode('utf-8', errors='replace')
+    if error:
+        output += ERROR_SEPARATOR + error
+    return process.returncode, output
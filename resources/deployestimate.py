@@ -0,0 +1,182 @@
+"""Estimación previa de un despliegue: lo pendiente en overlay, el espacio libre y la duración, sin depender de Qt.
+
+Los bytes y ficheros pendientes salen del análisis de las capas escribibles
+(resources/overlay.py) con su índice persistente, así que con el índice al
+día solo se leen los directorios que cambiaron. El espacio libre es el del
+sistema de ficheros de ostree, donde el despliegue escribe el nuevo commit.
+
+La duración se predice con una regresión lineal (mínimos cuadrados) de los
+segundos frente a los bytes pendientes sobre los despliegues anteriores en
+esta máquina, guardados en el historial. Se usan los de las mismas opciones
+si hay suficientes; si no, todos. Sin bytes que comparar (o con una pendiente
+negativa, que solo puede ser ruido) se usa la mediana.
+"""
+import json
+import os
+import statistics
+import time
+
+from resources import overlay
+from resources.cache import get_cache_dir, write_json
+from resources.diffentry import REMOVED
+from resources.diskusage import OSTREE_DIRS
+
+HISTORY_VERSION = 1
+# Despliegues que se guardan; los más antiguos se descartan
+HISTORY_LIMIT = 50
+# Mínimo de despliegues con las mismas opciones para ajustar solo con ellos
+MIN_SAMPLES = 2
+DEPLOY_OPTIONS = ("backup", "refresh", "append")
+
+
+class DeployEstimate:
+    """Lo que se sabe de un despliegue antes de lanzarlo"""
+    __slots__ = ("size", "files", "removed", "mounts", "errors", "free_bytes", "free_path",
+                 "scanned_dirs", "cached_dirs", "elapsed_ms")
+
+    def __init__(self, size=0, files=0, removed=0, mounts=(), errors=(), free_bytes=None, free_path="",
+                 scanned_dirs=0, cached_dirs=0, elapsed_ms=0):
+        # Tamaño y número de ficheros nuevos o modificados en las capas escribibles
+        self.size = size
+        self.files = files
+        self.removed = removed
+        self.mounts = list(mounts)
+        self.errors = list(errors)
+        # None si no se pudo consultar
+        self.free_bytes = free_bytes
+        self.free_path = free_path
+        self.scanned_dirs = scanned_dirs
+        self.cached_dirs = cached_dirs
+        self.elapsed_ms = elapsed_ms
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+
+class DurationPrediction:
+    """Duración prevista en segundos, con su margen (None si no hay datos para calcularlo)"""
+    __slots__ = ("seconds", "spread", "samples", "method")
+
+    def __init__(self, seconds, spread=None, samples=0, method="median"):
+        self.seconds = seconds
+        self.spread = spread
+        # Despliegues usados y cómo: "regression" o "median"
+        self.samples = samples
+        self.method = method
+
+
+def free_space(path=None):
+    """(bytes libres para un usuario sin privilegios, ruta consultada) del sistema de ficheros de ostree"""
+    if path is None:
+        path = next((path for path in OSTREE_DIRS if os.path.isdir(path)), "/")
+    try:
+        st = os.statvfs(path)
+    except OSError:
+        return None, path
+    return st.f_bavail * st.f_frsize, path
+
+
+def estimate(dirs=None, use_cache=True, free_path=None):
+    """Estimación con los overlays montados (solo los de `dirs` si se indican); es lo que ejecuta --cli deploy-estimate"""
+    started = time.monotonic()
+    scanner = overlay.OverlayScanner(overlay.default_index_path() if use_cache else None)
+    scanner.load_index()
+    result = DeployEstimate()
+    mounts = overlay.overlay_mounts(dirs)
+    for mount in mounts:
+        try:
+            for entry in scanner.scan(mount):
+                if entry.kind == REMOVED:
+                    result.removed += 1
+                elif entry.size is not None:
+                    result.files += 1
+                    result.size += entry.size
+        except OSError as e:
+            result.errors.append(f"{mount.target} ({mount.upper}): {e.strerror or e}")
+    scanner.save_index()
+    result.mounts = [mount.target for mount in mounts]
+    result.free_bytes, result.free_path = free_space(free_path)
+    result.scanned_dirs, result.cached_dirs = scanner.scanned_dirs, scanner.cached_dirs
+    result.elapsed_ms = round((time.monotonic() - started) * 1000)
+    return result
+
+
+def default_history_path():
+    return os.path.join(get_cache_dir(), "deploy-history.json")
+
+
+def load_history(path=None):
+    """Despliegues registrados, del más antiguo al más reciente"""
+    try:
+        with open(path or default_history_path()) as f:
+            data = json.load(f)
+        if data.get("version") == HISTORY_VERSION:
+            return [record for record in data.get("deploys", []) if isinstance(record, dict)]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading deploy history: {e}")
+    return []
+
+
+def record_deploy(seconds, options, size=None, files=None, path=None):
+    """Añade un despliegue terminado al historial y lo devuelve entero.
+
+    `size` (bytes) y `files` son los de la estimación previa, o None si no la hubo.
+    """
+    path = path or default_history_path()
+    history = load_history(path)
+    history.append({"time": time.time(), "seconds": round(seconds, 3), "size": size, "files": files,
+                    "options": {name: bool(options.get(name)) for name in DEPLOY_OPTIONS}})
+    history = history[-HISTORY_LIMIT:]
+    try:
+        write_json(path, {"version": HISTORY_VERSION, "deploys": history})
+    except Exception as e:
+        print(f"Error saving deploy history: {e}")
+    return history
+
+
+def predict_duration(history, size, options):
+    """DurationPrediction para un despliegue de `size` bytes con `options`, o None sin historial"""
+    options = {name: bool(options.get(name)) for name in DEPLOY_OPTIONS}
+    records = [record for record in history if isinstance(record.get("seconds"), (int, float))]
+    same = [record for record in records if record.get("options") == options]
+    if len(same) >= MIN_SAMPLES:
+        records = same
+    if not records:
+        return None
+
+    points = [(record["size"], record["seconds"]) for record in records
+              if isinstance(record.get("size"), int) and size is not None]
+    if len(points) >= 2:
+        mean_x = statistics.fmean(x for x, _ in points)
+        mean_y = statistics.fmean(y for _, y in points)
+        sxx = sum((x - mean_x) ** 2 for x, _ in points)
+        if sxx > 0:
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+            if slope >= 0:
+                intercept = mean_y - slope * mean_x
+                spread = None
+                if len(points) > 2:
+                    residuals = sum((y - intercept - slope * x) ** 2 for x, y in points)
+                    spread = (residuals / (len(points) - 2)) ** 0.5
+                return DurationPrediction(max(intercept + slope * size, 0.0), spread, len(points), "regression")
+
+    seconds = [record["seconds"] for record in records]
+    spread = statistics.stdev(seconds) if len(seconds) > 1 else None
+    return DurationPrediction(statistics.median(seconds), spread, len(seconds), "median")
+
+
+def format_duration(seconds):
+    seconds = round(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds:02d} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes:02d} min"
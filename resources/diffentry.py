@@ -0,0 +1,42 @@
+"""Tipos de las diferencias entre árboles, sin dependencias.
+
+Los comparten treediff, el escáner de overlays y la interfaz, que solo lee
+las diferencias que le llegan de `--cli diff`; así importarlos no arrastra
+el pool de procesos de treediff.
+"""
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+
+
+class DiffEntry:
+    """Una diferencia. `detail` dice qué cambió en las modificadas:
+    type, metadata, target (enlace simbólico), content, unreadable u opaque
+    (directorio de overlay que oculta el de abajo). `size`, si se conoce,
+    es el tamaño en bytes de la versión nueva."""
+    __slots__ = ("kind", "path", "detail", "size")
+
+    def __init__(self, kind, path, detail="", size=None):
+        self.kind = kind
+        self.path = path
+        self.detail = detail
+        self.size = size
+
+    def __eq__(self, other):
+        if not isinstance(other, DiffEntry):
+            return NotImplemented
+        return (self.kind, self.path, self.detail, self.size) == (other.kind, other.path, other.detail, other.size)
+
+    def __repr__(self):
+        return f"DiffEntry({self.kind!r}, {self.path!r}, {self.detail!r}, {self.size!r})"
+
+    def to_dict(self):
+        data = {"kind": self.kind, "path": self.path, "detail": self.detail}
+        if self.size is not None:
+            data["size"] = self.size
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("kind", ""), data.get("path", ""), data.get("detail", ""), data.get("size"))
@@ -0,0 +1,308 @@
+"""Uso de disco del repositorio ostree y de los despliegues, sin depender de Qt.
+
+Los despliegues de ostree son copias con enlaces duros a los objetos del
+repositorio, así que sumar tamaños por directorio cuenta lo mismo varias
+veces. Aquí cada fichero se identifica por (dispositivo, inodo) y se cuenta
+una sola vez: para cada raíz analizada se separan los bytes exclusivos (solo
+los usa esa raíz; es lo que se libera al borrarla) de los compartidos con
+otras raíces. Se cuentan bloques ocupados (st_blocks), no el tamaño aparente.
+
+El recorrido es en anchura con varios hilos (os.scandir y stat sueltan el
+GIL). El contenido de cada directorio se guarda en caché junto a su mtime:
+en un nuevo análisis, un directorio cuyo mtime no ha cambiado no se vuelve a
+leer ni se hace stat de sus ficheros, aunque sí se baja a sus subdirectorios.
+Cambiar el contenido de un fichero no cambia el mtime de su directorio, pero
+los objetos de ostree y los despliegues no se modifican nunca en el sitio.
+"""
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from resources.cache import get_cache_dir, write_json
+
+# Raíz de ostree; en Deepin /ostree suele ser un enlace a /sysroot/ostree
+OSTREE_DIRS = ("/sysroot/ostree", "/ostree")
+CACHE_VERSION = 1
+# Un directorio modificado hace menos de esto no se guarda en caché: otro
+# cambio dentro del mismo tic de mtime pasaría desapercibido
+RACY_SECONDS = 2
+
+
+def default_workers():
+    return min(16, (os.cpu_count() or 1) * 2)
+
+
+def default_roots(ostree_dir=None):
+    """(nombre, ruta) del repositorio y de cada despliegue de ostree.
+
+    Cada despliegue se llama como su directorio: <checksum>.<serie>.
+    """
+    if ostree_dir is None:
+        ostree_dir = next((path for path in OSTREE_DIRS if os.path.isdir(path)), OSTREE_DIRS[-1])
+    roots = [("repo", os.path.join(ostree_dir, "repo"))]
+    for path in sorted(glob.glob(os.path.join(ostree_dir, "deploy", "*", "deploy", "*"))):
+        if os.path.isdir(path) and not os.path.islink(path):
+            roots.append((os.path.basename(path), path))
+    return roots
+
+
+def matches_snapshot(root_name, snapshot_id):
+    """Si una raíz es la de un snapshot: el checksum del despliegue empieza por su ID (o al revés)"""
+    checksum = root_name.partition(".")[0]
+    if len(snapshot_id) < 8 or len(checksum) < 8:
+        return False
+    return checksum.startswith(snapshot_id) or snapshot_id.startswith(checksum)
+
+
+def find_snapshot_root(snapshot_id, ostree_dir=None):
+    """Ruta del despliegue de un snapshot, o None si no tiene ninguno en disco"""
+    for name, path in default_roots(ostree_dir)[1:]:
+        if matches_snapshot(name, snapshot_id):
+            return path
+    return None
+
+
+class RootUsage:
+    """Uso de disco de una raíz analizada"""
+    __slots__ = ("name", "path", "exclusive", "shared", "files")
+
+    def __init__(self, name, path, exclusive=0, shared=0, files=0):
+        self.name = name
+        self.path = path
+        # Bytes que solo usa esta raíz
+        self.exclusive = exclusive
+        # Bytes que también usa alguna otra raíz
+        self.shared = shared
+        # Inodos distintos (ficheros, directorios, enlaces simbólicos...) bajo la raíz
+        self.files = files
+
+    @property
+    def total(self):
+        return self.exclusive + self.shared
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("name", ""), data.get("path", ""), data.get("exclusive", 0),
+                   data.get("shared", 0), data.get("files", 0))
+
+
+class DiskUsageReport:
+    """Resultado de un análisis: uso por raíz, total sin duplicados y estadísticas"""
+    __slots__ = ("roots", "total", "scanned_dirs", "cached_dirs", "elapsed_ms")
+
+    def __init__(self, roots, total=0, scanned_dirs=0, cached_dirs=0, elapsed_ms=0):
+        self.roots = roots
+        # Bytes distintos entre todas las raíces
+        self.total = total
+        # Directorios leídos con scandir y directorios tomados de la caché
+        self.scanned_dirs = scanned_dirs
+        self.cached_dirs = cached_dirs
+        self.elapsed_ms = elapsed_ms
+
+    def get(self, name):
+        return next((root for root in self.roots if root.name == name), None)
+
+    def match_snapshot(self, snapshot_id):
+        """Raíz analizada de un snapshot (ver matches_snapshot)"""
+        return next((root for root in self.roots if matches_snapshot(root.name, snapshot_id)), None)
+
+    def snapshot_sizes(self, snapshot_ids):
+        """ID -> bytes exclusivos del despliegue, para los snapshots que tienen uno analizado.
+
+        Es lo que se liberaría al eliminar cada uno; lo usa max_total_size de
+        la política de retención.
+        """
+        sizes = {}
+        for snapshot_id in snapshot_ids:
+            root = self.match_snapshot(snapshot_id)
+            if root is not None:
+                sizes[snapshot_id] = root.exclusive
+        return sizes
+
+    def to_dict(self):
+        return {"roots": [root.to_dict() for root in self.roots], "total": self.total,
+                "scanned_dirs": self.scanned_dirs, "cached_dirs": self.cached_dirs,
+                "elapsed_ms": self.elapsed_ms}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([RootUsage.from_dict(root) for root in data.get("roots", [])], data.get("total", 0),
+                   data.get("scanned_dirs", 0), data.get("cached_dirs", 0), data.get("elapsed_ms", 0))
+
+
+def scan_directory(path, cached, racy_before, known):
+    """Lee un directorio: (entrada, reutilizada, cacheable), o (None, False, False) si no se puede.
+
+    La entrada es [mtime_ns, dispositivo, inodos, subdirectorios], con los
+    inodos como lista plana [inodo, bytes, inodo, bytes, ...] para que la
+    caché ocupe poco. El primero es el propio directorio. `known` guarda los
+    bytes de los inodos ya vistos en este análisis, así que un fichero con
+    varios enlaces duros solo necesita un stat.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None, False, False
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_dev:
+        return cached, True, True
+
+    files = [st.st_ino, st.st_blocks * 512]
+    subdirs = []
+    base = st.st_dev << 64
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    else:
+                        # inode() sale de la propia entrada; el tamaño necesita stat
+                        inode = entry.inode()
+                        size = known.get(base | inode)
+                        if size is None:
+                            size = known[base | inode] = entry.stat(follow_symlinks=False).st_blocks * 512
+                        files.append(inode)
+                        files.append(size)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return [st.st_mtime_ns, st.st_dev, files, subdirs], False, st.st_mtime_ns < racy_before
+
+
+class DiskUsageAnalyzer:
+    """Analiza varias raíces a la vez y mantiene la caché por directorio"""
+
+    def __init__(self, cache_path=None, workers=None):
+        self.cache_path = cache_path
+        self.workers = workers or default_workers()
+        # Ruta de directorio -> entrada de scan_directory
+        self.cache = {}
+        # Último recuento (DiskUsageReport.to_dict()) de lo que hay en la caché
+        self.report = None
+
+    def load_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.cache = data.get("dirs", {})
+                self.report = data.get("report")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading disk usage cache: {e}")
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            write_json(self.cache_path, {"version": CACHE_VERSION, "dirs": self.cache, "report": self.report},
+                       separators=(",", ":"))
+        except Exception as e:
+            print(f"Error saving disk usage cache: {e}")
+
+    def walk(self, roots):
+        """Recorre las raíces por niveles. Devuelve, por raíz, la lista de entradas de sus directorios."""
+        racy_before = time.time_ns() - RACY_SECONDS * 1_000_000_000
+        previous = self.cache
+        cache = {}
+        known = {}
+        entries = [[] for _ in roots]
+        scanned = reused = 0
+        # Todas las raíces comparten la misma cola para repartir mejor el trabajo
+        frontier = [(index, path) for index, (_, path) in enumerate(roots)]
+        with ThreadPoolExecutor(self.workers) as pool:
+            while frontier:
+                results = pool.map(lambda item: scan_directory(item[1], previous.get(item[1]), racy_before, known),
+                                   frontier)
+                next_frontier = []
+                for (index, path), (entry, was_cached, cacheable) in zip(frontier, results):
+                    if entry is None:
+                        continue
+                    if was_cached:
+                        reused += 1
+                    else:
+                        scanned += 1
+                    if cacheable:
+                        cache[path] = entry
+                    entries[index].append(entry)
+                    next_frontier.extend((index, os.path.join(path, name)) for name in entry[3])
+                frontier = next_frontier
+        # Los directorios que ya no existen desaparecen de la caché
+        self.cache = cache
+        return entries, scanned, reused
+
+    def analyze(self, roots):
+        """Analiza [(nombre, ruta)] y devuelve un DiskUsageReport"""
+        started = time.monotonic()
+        previous = len(self.cache)
+        entries, scanned, reused = self.walk(roots)
+        # Nada ha cambiado (ni un directorio leído ni uno desaparecido): vale el último recuento
+        if (not scanned and reused == previous and self.report is not None
+                and [[root["name"], root["path"]] for root in self.report["roots"]] == [list(root) for root in roots]):
+            report = DiskUsageReport.from_dict(self.report)
+            report.scanned_dirs, report.cached_dirs = scanned, reused
+            report.elapsed_ms = round((time.monotonic() - started) * 1000)
+            return report
+
+        # Inodo (dispositivo e inodo en un solo entero) -> máscara de raíces que lo usan
+        owners = {}
+        sizes = {}
+        for index, root_entries in enumerate(entries):
+            bit = 1 << index
+            for _, dev, files, _ in root_entries:
+                base = dev << 64
+                for position in range(0, len(files), 2):
+                    key = base | files[position]
+                    owners[key] = owners.get(key, 0) | bit
+                    sizes[key] = files[position + 1]
+
+        usage = [RootUsage(name, path) for name, path in roots]
+        total = 0
+        for key, mask in owners.items():
+            size = sizes[key]
+            total += size
+            if not mask & (mask - 1):
+                root = usage[mask.bit_length() - 1]
+                root.exclusive += size
+                root.files += 1
+                continue
+            while mask:
+                lowest = mask & -mask
+                root = usage[lowest.bit_length() - 1]
+                root.shared += size
+                root.files += 1
+                mask ^= lowest
+
+        report = DiskUsageReport(usage, total, scanned, reused)
+        self.report = report.to_dict()
+        report.elapsed_ms = round((time.monotonic() - started) * 1000)
+        return report
+
+
+def analyze(roots=None, use_cache=True, workers=None):
+    """Análisis completo con la caché de la aplicación; es lo que ejecuta --cli disk-usage"""
+    cache_path = os.path.join(get_cache_dir(), "disk-usage.json")
+    analyzer = DiskUsageAnalyzer(cache_path, workers)
+    if use_cache:
+        analyzer.load_cache()
+    report = analyzer.analyze(roots if roots is not None else default_roots())
+    analyzer.save_cache()
+    return report
+
+
+def format_size(size):
+    size = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
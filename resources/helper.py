@@ -0,0 +1,518 @@
+"""Asistente privilegiado: immutable-deepin-tools --helper [--socket RUTA] [--idle-timeout S].
+
+Se lanza una vez con pkexec y atiende por un socket Unix las operaciones de
+la interfaz durante el resto de la sesión, así que una serie de comandos de
+root pide una sola autenticación y no arranca un pkexec por comando. Termina
+tras IDLE_TIMEOUT segundos sin peticiones o al recibir "shutdown".
+
+Solo acepta las operaciones tipadas de OPERATIONS, nunca una línea de shell:
+cada una construye aquí su argv. Las conexiones de un usuario distinto del
+que lo lanzó (PKEXEC_UID) se rechazan.
+
+Protocolo: una petición JSON por conexión, {"op": ..., "args": {...}}, y
+como respuesta líneas JSON {"stdout": ...} y {"stderr": ...} con la salida
+según llega, terminadas en {"exit_code": N} o {"error": mensaje}. Si el
+cliente cierra la conexión, el comando en curso se mata.
+
+Un lote ({"op": "batch", "args": {"operations": [[op, args], ...]}}) se
+valida entero antes de ejecutar nada y responde con un mensaje por elemento
+({"item": i, "state": "running"} y {"item": i, "exit_code": N, "output": ...,
+"error": ...}); un fallo no detiene el resto. Sin asistente en marcha, el
+mismo lote se ejecuta con una sola llamada a pkexec: --helper --batch -
+lo lee de stdin (miles de elementos no caben en un argumento) y escribe
+esos mensajes en stdout.
+
+No importa Qt: sin privilegios (p. ej. con --socket en /tmp) sirve como
+sustituto para probar la interfaz contra comandos falsos.
+"""
+import argparse
+import codecs
+import json
+import os
+import select
+import selectors
+import shlex
+import signal
+import socket
+import struct
+import sys
+from subprocess import Popen, PIPE, DEVNULL
+
+from resources.parsers import ERROR_SEPARATOR
+
+SOCKET_DIR = "/run/immutable-deepin-tools"
+# Ruta del socket de un asistente ya en marcha; la interfaz no lanza el suyo
+SOCKET_ENV = "IMMUTABLE_DEEPIN_TOOLS_HELPER"
+IDLE_TIMEOUT = 300
+# Tiempo máximo para recibir la petición una vez abierta la conexión
+REQUEST_TIMEOUT = 10
+CHUNK_SIZE = 65536
+
+
+def default_socket_path(uid=None):
+    return os.path.join(SOCKET_DIR, f"helper-{os.getuid() if uid is None else uid}.sock")
+
+
+def socket_path():
+    """Socket que usa la interfaz: el de SOCKET_ENV o el del usuario actual"""
+    return os.environ.get(SOCKET_ENV) or default_socket_path()
+
+
+def program(script):
+    # Empaquetado con PyInstaller el ejecutable ya es la aplicación
+    return [sys.executable] if getattr(sys, "frozen", False) else [sys.executable, os.path.abspath(script)]
+
+
+def launch_command(script, idle_timeout=IDLE_TIMEOUT):
+    """Comando para lanzar el asistente con pkexec desde la interfaz"""
+    return ["pkexec"] + program(script) + ["--helper", "--idle-timeout", str(idle_timeout)]
+
+
+def batch_command(script):
+    """Comando que ejecuta un lote con una sola autenticación, sin asistente en marcha; el lote va por stdin"""
+    return ["pkexec"] + program(script) + ["--helper", "--batch", "-"]
+
+
+def batch_input(operations):
+    """Lo que batch_command espera en stdin"""
+    return json.dumps(operations, ensure_ascii=False).encode("utf-8")
+
+
+def text(value):
+    if not isinstance(value, str) or "\0" in value:
+        raise ValueError(f"valor no válido: {value!r}")
+    return value
+
+
+def identifier(value):
+    # Un id que empiece por "-" se tomaría por una opción
+    if not text(value) or value.startswith("-"):
+        raise ValueError(f"identificador no válido: {value!r}")
+    return value
+
+
+def flag(value):
+    if not isinstance(value, bool):
+        raise ValueError(f"valor no válido: {value!r}")
+    return value
+
+
+def optional(*values):
+    """Argumentos posicionales opcionales: se quitan los vacíos del final.
+
+    Uno vacío antes de otro que no lo es no se acepta: el comando lo tomaría
+    por ausente y correría los siguientes (una descripción sin nombre
+    acabaría como nombre).
+    """
+    values = [text(value) for value in values]
+    while values and not values[-1]:
+        values.pop()
+    if not all(values):
+        raise ValueError(f"argumento vacío antes de otro: {values!r}")
+    return values
+
+
+def snapshot_create(name="", desc=""):
+    return ["deepin-immutable-ctl", "snapshot", "create"] + optional(name, desc)
+
+
+def snapshot_modify(id, name="", desc=""):
+    return ["deepin-immutable-ctl", "snapshot", "modify", identifier(id)] + optional(name, desc)
+
+
+def snapshot_delete(id):
+    return ["deepin-immutable-ctl", "snapshot", "delete", identifier(id)]
+
+
+def snapshot_rollback(id):
+    return ["deepin-immutable-ctl", "snapshot", "rollback", identifier(id)]
+
+
+def admin_deploy(backup=False, refresh=False, append=False, finalize=False):
+    argv = ["deepin-immutable-ctl", "admin", "deploy"]
+    if flag(finalize):
+        return argv + ["--finalize"]
+    return argv + [option for option, value in (("--backup", backup), ("--refresh", refresh),
+                                                ("--append", append)) if flag(value)]
+
+
+def admin_rollback():
+    return ["deepin-immutable-ctl", "admin", "rollback"]
+
+
+def admin_file_op(argv):
+    if not isinstance(argv, list) or not argv:
+        raise ValueError("file-op necesita argumentos")
+    return ["deepin-immutable-ctl", "admin", "file-op"] + [text(arg) for arg in argv]
+
+
+def writable_enable(directory):
+    return ["deepin-immutable-writable", "enable", "-d", identifier(directory), "-y"]
+
+
+def writable_disable():
+    return ["deepin-immutable-writable", "disable", "-y"]
+
+
+# Operaciones permitidas -> constructor de su argv
+OPERATIONS = {
+    "snapshot.create": snapshot_create,
+    "snapshot.modify": snapshot_modify,
+    "snapshot.delete": snapshot_delete,
+    "snapshot.rollback": snapshot_rollback,
+    "admin.deploy": admin_deploy,
+    "admin.rollback": admin_rollback,
+    "admin.file-op": admin_file_op,
+    "writable.enable": writable_enable,
+    "writable.disable": writable_disable,
+}
+
+
+def operation_argv(op, args=None):
+    """argv de una operación. ValueError si no está permitida o sus argumentos no valen."""
+    builder = OPERATIONS.get(op)
+    if builder is None:
+        raise ValueError(f"operación no permitida: {op!r}")
+    if not isinstance(args or {}, dict):
+        raise ValueError("los argumentos deben ser un objeto")
+    try:
+        return builder(**(args or {}))
+    except TypeError as e:
+        raise ValueError(f"argumentos no válidos para {op}: {e}") from None
+
+
+def batch_operations(operations):
+    """Valida un lote entero y devuelve el argv de cada operación. ValueError si alguna no vale."""
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("el lote está vacío")
+    argvs = []
+    for index, item in enumerate(operations):
+        if not isinstance(item, (list, tuple)) or len(item) != 2:
+            raise ValueError(f"elemento {index} del lote no válido")
+        try:
+            argvs.append(operation_argv(*item))
+        except ValueError as e:
+            raise ValueError(f"elemento {index} del lote: {e}") from None
+    return argvs
+
+
+def run_batch(argvs, emit, cancelled=None):
+    """Ejecuta un lote ya validado, uno tras otro, avisando con emit(mensaje).
+
+    Devuelve el número de elementos fallidos, o None si se canceló antes de
+    terminar (cancelled() se consulta entre elemento y elemento).
+    """
+    failures = 0
+    for index, argv in enumerate(argvs):
+        if cancelled is not None and cancelled():
+            return None
+        emit({"item": index, "state": "running"})
+        try:
+            process = Popen(argv, stdin=DEVNULL, stdout=PIPE, stderr=PIPE)
+            stdout, stderr = process.communicate()
+            exit_code = process.returncode
+            output = stdout.decode("utf-8", errors="replace")
+            error = stderr.decode("utf-8", errors="replace")
+        except OSError as e:
+            exit_code, output, error = 127, "", f"Error ejecutando comando: {e}"
+        if exit_code != 0:
+            failures += 1
+        emit({"item": index, "exit_code": exit_code, "output": output, "error": error})
+    return failures
+
+
+def parse_operation(command):
+    """Operación tipada equivalente a un comando de la interfaz, o None.
+
+    Los comandos que no corresponden a ninguna operación (p. ej. admin exec)
+    siguen ejecutándose con pkexec, uno a uno.
+    """
+    try:
+        tokens = shlex.split(command)
+    except ValueError:
+        return None
+    if tokens and tokens[0] == "pkexec":
+        tokens = tokens[1:]
+
+    tool, rest = (tokens[0], tokens[1:]) if tokens else ("", [])
+    if tool == "deepin-immutable-writable":
+        if rest == ["disable", "-y"]:
+            return "writable.disable", {}
+        if len(rest) == 4 and rest[0] == "enable" and rest[1] == "-d" and rest[3] == "-y":
+            return "writable.enable", {"directory": rest[2]}
+        return None
+    if tool != "deepin-immutable-ctl" or len(rest) < 2:
+        return None
+
+    group, action, rest = rest[0], rest[1], rest[2:]
+    if group == "snapshot":
+        if action == "create" and len(rest) <= 2:
+            return "snapshot.create", dict(zip(("name", "desc"), rest))
+        if action == "modify" and 1 <= len(rest) <= 3:
+            return "snapshot.modify", dict(zip(("id", "name", "desc"), rest))
+        if action in ("delete", "rollback") and len(rest) == 1:
+            return f"snapshot.{action}", {"id": rest[0]}
+    elif group == "admin":
+        if action == "deploy":
+            options = {"--backup": "backup", "--refresh": "refresh", "--append": "append", "--finalize": "finalize"}
+            if all(option in options for option in rest) and ("--finalize" not in rest or len(rest) == 1):
+                return "admin.deploy", {options[option]: True for option in rest}
+        elif action == "rollback" and not rest:
+            return "admin.rollback", {}
+        elif action == "file-op" and rest:
+            return "admin.file-op", {"argv": rest}
+    return None
+
+
+def encode(message):
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class MessageReader:
+    """Separa en mensajes JSON los bytes que llegan por el socket"""
+    __slots__ = ("buffer",)
+
+    def __init__(self):
+        self.buffer = b""
+
+    def feed(self, data):
+        self.buffer += data
+        *lines, self.buffer = self.buffer.split(b"\n")
+        return [json.loads(line) for line in lines if line]
+
+
+def peer_uid(conn):
+    _, uid, _ = struct.unpack("3i", conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")))
+    return uid
+
+
+def read_request(conn):
+    reader = MessageReader()
+    conn.settimeout(REQUEST_TIMEOUT)
+    while True:
+        data = conn.recv(CHUNK_SIZE)
+        if not data:
+            return None
+        messages = reader.feed(data)
+        if messages:
+            return messages[0]
+
+
+def run_operation(conn, argv):
+    """Ejecuta argv enviando su salida al cliente. Devuelve el código de salida o None si se canceló."""
+    # Grupo de procesos propio para poder matar también a los hijos del comando
+    process = Popen(argv, stdin=DEVNULL, stdout=PIPE, stderr=PIPE, start_new_session=True)
+    decoders = {process.stdout.fileno(): ("stdout", codecs.getincrementaldecoder("utf-8")(errors="replace")),
+                process.stderr.fileno(): ("stderr", codecs.getincrementaldecoder("utf-8")(errors="replace"))}
+    conn.setblocking(False)
+    with selectors.DefaultSelector() as selector:
+        for fd in decoders:
+            selector.register(fd, selectors.EVENT_READ)
+        selector.register(conn, selectors.EVENT_READ)
+        open_streams = len(decoders)
+        try:
+            while open_streams:
+                for key, _ in selector.select():
+                    if key.fileobj is conn:
+                        # El cliente no envía nada más: datos o EOF significan que canceló
+                        raise ConnectionAbortedError
+                    data = os.read(key.fd, CHUNK_SIZE)
+                    if not data:
+                        selector.unregister(key.fd)
+                        open_streams -= 1
+                        continue
+                    stream, decoder = decoders[key.fd]
+                    chunk = decoder.decode(data)
+                    if chunk:
+                        conn.setblocking(True)
+                        conn.sendall(encode({stream: chunk}))
+                        conn.setblocking(False)
+        except (ConnectionAbortedError, BrokenPipeError, ConnectionResetError):
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+            return None
+        finally:
+            process.stdout.close()
+            process.stderr.close()
+    conn.setblocking(True)
+    return process.wait()
+
+
+def handle_connection(conn, owner):
+    """Atiende una petición. Devuelve False si hay que terminar."""
+    if peer_uid(conn) not in (owner, 0):
+        conn.sendall(encode({"error": "usuario no autorizado"}))
+        return True
+    try:
+        request = read_request(conn)
+    except (socket.timeout, ValueError):
+        return True
+    if not isinstance(request, dict):
+        return True
+
+    op = request.get("op")
+    if op == "ping":
+        conn.sendall(encode({"exit_code": 0, "pid": os.getpid()}))
+        return True
+    if op == "shutdown":
+        conn.sendall(encode({"exit_code": 0}))
+        return False
+
+    if op == "batch":
+        try:
+            argvs = batch_operations((request.get("args") or {}).get("operations"))
+        except (ValueError, AttributeError) as e:
+            conn.sendall(encode({"error": str(e)}))
+            return True
+        # El cliente no envía nada más: si la conexión se puede leer, es que la cerró
+        failures = run_batch(argvs, lambda message: conn.sendall(encode(message)),
+                             lambda: bool(select.select([conn], [], [], 0)[0]))
+        if failures is not None:
+            conn.sendall(encode({"exit_code": 1 if failures else 0}))
+        return True
+
+    try:
+        argv = operation_argv(op, request.get("args"))
+    except ValueError as e:
+        conn.sendall(encode({"error": str(e)}))
+        return True
+    try:
+        exit_code = run_operation(conn, argv)
+    except OSError as e:
+        conn.sendall(encode({"error": f"Error ejecutando comando: {e}"}))
+        return True
+    if exit_code is not None:
+        conn.sendall(encode({"exit_code": exit_code}))
+    return True
+
+
+def serve(path, owner, idle_timeout=IDLE_TIMEOUT):
+    os.makedirs(os.path.dirname(path), mode=0o755, exist_ok=True)
+    if os.path.exists(path):
+        os.unlink(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Solo el usuario que lanzó el asistente puede conectarse
+    previous_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(previous_umask)
+    if os.geteuid() == 0:
+        os.chown(path, owner, -1)
+    server.listen(8)
+    server.settimeout(idle_timeout)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                return
+            with conn:
+                try:
+                    if not handle_connection(conn, owner):
+                        return
+                except OSError:
+                    # El cliente se fue a mitad de respuesta
+                    pass
+    finally:
+        server.close()
+        os.unlink(path)
+
+
+class HelperClient:
+    """Cliente bloqueante, para scripts y para comprobar si el asistente está activo"""
+
+    def __init__(self, path=None, timeout=None):
+        self.path = path or socket_path()
+        self.timeout = timeout
+
+    def request(self, op, args=None):
+        """Envía una petición y devuelve sus mensajes, uno a uno, según llegan"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(self.timeout)
+            conn.connect(self.path)
+            conn.sendall(encode({"op": op, "args": args or {}}))
+            reader = MessageReader()
+            while True:
+                data = conn.recv(CHUNK_SIZE)
+                if not data:
+                    return
+                for message in reader.feed(data):
+                    yield message
+                    # Los mensajes por elemento de un lote también llevan exit_code y error
+                    if ("exit_code" in message or "error" in message) and "item" not in message:
+                        return
+
+    def run(self, op, args=None):
+        """Ejecuta una operación y devuelve (código de salida, salida) como run_command"""
+        stdout, stderr = [], []
+        for message in self.request(op, args):
+            if "stdout" in message:
+                stdout.append(message["stdout"])
+            elif "stderr" in message:
+                stderr.append(message["stderr"])
+            elif "error" in message:
+                return 1, message["error"]
+            else:
+                output = "".join(stdout)
+                if stderr:
+                    output += ERROR_SEPARATOR + "".join(stderr)
+                return message["exit_code"], output
+        return 1, "conexión cerrada por el asistente"
+
+    def ping(self):
+        try:
+            return any(message.get("exit_code") == 0 for message in self.request("ping"))
+        except OSError:
+            return False
+
+    def shutdown(self):
+        try:
+            list(self.request("shutdown"))
+        except OSError:
+            pass
+
+
+def run_batch_once(operations):
+    """--batch: el lote en JSON, o "-" para leerlo de stdin"""
+    try:
+        if operations == "-":
+            operations = sys.stdin.buffer.read()
+        argvs = batch_operations(json.loads(operations))
+    except ValueError as e:
+        sys.stdout.buffer.write(encode({"error": str(e)}))
+        return 2
+
+    def emit(message):
+        sys.stdout.buffer.write(encode(message))
+        sys.stdout.buffer.flush()
+
+    try:
+        failures = run_batch(argvs, emit)
+    except BrokenPipeError:
+        # La interfaz canceló el lote y cerró la salida: se para tras el elemento en curso
+        return 1
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="immutable-deepin-tools --helper")
+    parser.add_argument("--socket", help="ruta del socket (se ignora si se lanza con pkexec)")
+    parser.add_argument("--idle-timeout", type=int, default=IDLE_TIMEOUT)
+    parser.add_argument("--batch", metavar="JSON", help="ejecuta un lote de operaciones (- para leerlo de stdin) y termina")
+    args = parser.parse_args(argv)
+
+    if args.batch is not None:
+        return run_batch_once(args.batch)
+
+    # Lanzado con pkexec: el usuario real es PKEXEC_UID y la ruta es siempre la fija
+    if "PKEXEC_UID" in os.environ:
+        owner = int(os.environ["PKEXEC_UID"])
+        path = default_socket_path(owner)
+    else:
+        owner = os.getuid()
+        path = args.socket or socket_path()
+    serve(path, owner, args.idle_timeout)
+    return 0
@@ -0,0 +1,77 @@
+import os
+from PySide6.QtCore import QFile, QResource, QSize
+from PySide6.QtGui import QGuiApplication, QIcon, QPixmap, QPixmapCache
+
+RESOURCES_DIR = os.path.dirname(os.path.abspath(__file__))
+# Paquete generado con ./update_icons.sh a partir de icons.qrc
+BUNDLE_PATH = os.path.join(RESOURCES_DIR, "icons.rcc")
+BUNDLE_PREFIX = ":/icons"
+
+# Icono del tema del sistema si el PNG no existe. Sin entrada se usa el propio nombre.
+THEME_FALLBACKS = {
+    "icon": "system-run",
+    "language-button": "preferences-desktop-locale",
+    "sun-mode": "weather-clear",
+    "black-mode": "weather-clear-night",
+    "status": "dialog-information",
+    "admin": "system-run",
+    "snapshot": "document-save",
+    "about": "help-about",
+    "back-btn": "go-previous",
+    "run-command": "system-run",
+    "btn-info-snapshot": "dialog-information",
+    "btn-modify-snapshot": "document-edit",
+    "btn-refresh-snapshot": "view-refresh",
+}
+
+
+class IconRegistry:
+    """Punto único de acceso a los iconos de la aplicación.
+
+    Los PNG se leen del paquete compilado icons.rcc (se mapea en memoria, sin
+    un stat por icono) y, si no existe, de los ficheros sueltos de resources/.
+    Cada nombre se resuelve una sola vez, incluido el icono de reserva del
+    tema, y los pixmaps escalados quedan en QPixmapCache por tamaño y escala.
+    """
+
+    def __init__(self, bundle_path=BUNDLE_PATH):
+        self.bundle_path = bundle_path
+        self.base = None
+        # Nombre -> QIcon ya resuelto
+        self.icons = {}
+
+    def ensure_bundle(self):
+        if self.base is None:
+            if os.path.exists(self.bundle_path) and QResource.registerResource(self.bundle_path):
+                self.base = BUNDLE_PREFIX
+            else:
+                self.base = RESOURCES_DIR
+        return self.base
+
+    def path(self, name):
+        return f"{self.ensure_bundle()}/{name}.png"
+
+    def icon(self, name):
+        icon = self.icons.get(name)
+        if icon is None:
+            path = self.path(name)
+            if QFile.exists(path):
+                icon = QIcon(path)
+            else:
+                icon = QIcon.fromTheme(THEME_FALLBACKS.get(name, name))
+            self.icons[name] = icon
+        return icon
+
+    def pixmap(self, name, size, device_pixel_ratio=None):
+        """Pixmap cuadrado de `size` píxeles lógicos, escalado una sola vez"""
+        if device_pixel_ratio is None:
+            device_pixel_ratio = QGuiApplication.instance().devicePixelRatio()
+        key = f"icon:{name}:{size}@{device_pixel_ratio}"
+        pixmap = QPixmap()
+        if not QPixmapCache.find(key, pixmap):
+            pixmap = self.icon(name).pixmap(QSize(size, size), device_pixel_ratio)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+
+ICONS = IconRegistry()
@@ -0,0 +1,244 @@
+"""Cambios pendientes en las capas escribibles (upperdir) de los overlays, sin depender de Qt.
+
+Con la escritura habilitada, deepin-immutable-writable monta overlayfs sobre
+los directorios de OverlayDirs y todo lo escrito va a la capa superior. Aquí
+se recorre esa capa y se clasifica cada entrada como hace overlayfs:
+
+- un dispositivo de caracteres 0:0 es un whiteout: el fichero de las capas
+  inferiores se ha eliminado;
+- un directorio con el atributo overlay.opaque=y es opaco: sustituye entero
+  al de abajo, y todo lo que contiene es nuevo;
+- el resto es un añadido si no existe en ninguna capa inferior, o una
+  modificación si existe; los directorios que existen abajo y no son opacos
+  solo están ahí para contener cambios (copy-up) y no cuentan como cambio.
+
+Leer los atributos trusted.* requiere root: sin permisos no se detectan los
+directorios opacos, y sus entradas se comparan con las capas inferiores.
+
+La clasificación de cada directorio se guarda en un índice persistente junto
+a su mtime e inodo; en un nuevo análisis, los directorios sin cambios no se
+vuelven a leer ni a comparar con las capas inferiores. El tamaño de un
+fichero reescrito en el sitio (sin crear uno nuevo) no se actualiza hasta que
+cambia su directorio.
+"""
+import json
+import os
+import re
+import stat
+import time
+
+from resources.cache import get_cache_dir, write_json
+from resources.diffentry import ADDED, MODIFIED, REMOVED, DiffEntry
+
+MOUNTINFO = "/proc/self/mountinfo"
+INDEX_VERSION = 1
+# Como en resources/diskusage.py: lo modificado hace menos de esto no se indexa
+RACY_SECONDS = 2
+OPAQUE_XATTRS = ("trusted.overlay.opaque", "user.overlay.opaque")
+
+# Contexto de un directorio: existe abajo, o es nuevo u opaco (sus entradas son todas añadidos)
+MERGED = 0
+NEW = 1
+
+
+class OverlayMount:
+    """Un overlay con capa escribible, tal como aparece en /proc/self/mountinfo"""
+    __slots__ = ("target", "upper", "lowers")
+
+    def __init__(self, target, upper, lowers):
+        self.target = target
+        self.upper = upper
+        self.lowers = lowers
+
+    def __repr__(self):
+        return f"OverlayMount({self.target!r}, {self.upper!r}, {self.lowers!r})"
+
+    def to_dict(self):
+        return {"target": self.target, "upper": self.upper, "lowers": self.lowers}
+
+
+def unescape(value):
+    # mountinfo escribe espacios, comas, tabuladores y barras como \\ooo
+    return re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), value)
+
+
+def parse_mountinfo(text):
+    """Overlays con upperdir de un /proc/self/mountinfo"""
+    mounts = []
+    for line in text.splitlines():
+        before, sep, after = line.partition(" - ")
+        if not sep:
+            continue
+        fields = before.split()
+        fstype, _, options = (after.split(" ", 2) + ["", ""])[:3]
+        if fstype != "overlay" or len(fields) < 5:
+            continue
+        values = {}
+        for option in options.split(","):
+            key, _, value = option.partition("=")
+            values[key] = value
+        if not values.get("upperdir"):
+            continue
+        # Las capas inferiores van separadas por ":" (escapado como "\:" dentro de una ruta)
+        lowers = [unescape(lower).replace("\\:", ":")
+                  for lower in re.split(r"(?<!\\):", values.get("lowerdir", "")) if lower]
+        mounts.append(OverlayMount(unescape(fields[4]), unescape(values["upperdir"]), lowers))
+    return mounts
+
+
+def overlay_mounts(targets=None, mountinfo=MOUNTINFO):
+    """Overlays escribibles montados; con `targets`, solo los montados en esas rutas"""
+    try:
+        with open(mountinfo) as f:
+            mounts = parse_mountinfo(f.read())
+    except OSError:
+        return []
+    if targets:
+        targets = {os.path.normpath(target) for target in targets}
+        mounts = [mount for mount in mounts if os.path.normpath(mount.target) in targets]
+    return mounts
+
+
+def split_overlay_dirs(value):
+    """Rutas del campo OverlayDirs de `deepin-immutable-writable status`"""
+    return [path for path in re.split(r"[\s,;:]+", value) if path.startswith("/")]
+
+
+def is_opaque(path):
+    for name in OPAQUE_XATTRS:
+        try:
+            if os.getxattr(path, name, follow_symlinks=False) == b"y":
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def in_lowers(lowers, relative):
+    for lower in lowers:
+        try:
+            os.lstat(os.path.join(lower, relative))
+            return True
+        except OSError:
+            continue
+    return False
+
+
+def classify_directory(upper, lowers, relative, context):
+    """Clasifica las entradas de un directorio de la capa superior.
+
+    Devuelve [[nombre, tipo, detalle, tamaño, contexto], ...]: tipo es ADDED,
+    REMOVED, MODIFIED o "" (directorio contenedor, sin cambio propio), y
+    contexto es el de los subdirectorios (None para lo que no es directorio).
+    """
+    entries = []
+    with os.scandir(os.path.join(upper, relative)) as iterator:
+        for entry in sorted(iterator, key=lambda entry: entry.name):
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            path = os.path.join(relative, entry.name)
+            if stat.S_ISCHR(st.st_mode) and st.st_rdev == 0:
+                entries.append([entry.name, REMOVED, "", None, None])
+                continue
+            exists = context == MERGED and in_lowers(lowers, path)
+            if stat.S_ISDIR(st.st_mode):
+                if not exists:
+                    entries.append([entry.name, ADDED, "", None, NEW])
+                elif is_opaque(entry.path):
+                    # Lo de abajo queda oculto y todo lo de dentro cuenta como nuevo
+                    entries.append([entry.name, MODIFIED, "opaque", None, NEW])
+                else:
+                    entries.append([entry.name, "", "", None, MERGED])
+                continue
+            entries.append([entry.name, MODIFIED if exists else ADDED, "", st.st_size, None])
+    return entries
+
+
+class OverlayScanner:
+    """Recorre capas superiores y mantiene el índice por directorio entre análisis"""
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path
+        # upperdir -> {"lowers": [...], "dirs": {ruta relativa: [mtime_ns, inodo, contexto, entradas]}}
+        self.index = {}
+        self.scanned_dirs = 0
+        self.cached_dirs = 0
+        # El índice cambió y hay que volver a escribirlo
+        self.dirty = False
+
+    def load_index(self):
+        if not self.index_path:
+            return
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.index = data.get("uppers", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading overlay index: {e}")
+
+    def save_index(self):
+        if not self.index_path or not self.dirty:
+            return
+        try:
+            write_json(self.index_path, {"version": INDEX_VERSION, "uppers": self.index}, separators=(",", ":"))
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving overlay index: {e}")
+
+    def scan(self, mount):
+        """Genera los cambios (DiffEntry con rutas absolutas bajo el punto de montaje) de un overlay.
+
+        OSError si no se puede leer la raíz de la capa superior.
+        """
+        # Comprobación previa para dar un error claro (normalmente, falta de permisos)
+        os.scandir(mount.upper).close()
+        racy_before = time.time_ns() - RACY_SECONDS * 1_000_000_000
+        previous = self.index.get(mount.upper)
+        # Si cambian las capas inferiores (p. ej. tras un despliegue) el índice no vale
+        previous = previous["dirs"] if previous and previous.get("lowers") == mount.lowers else {}
+        dirs = {}
+
+        stack = [("", MERGED)]
+        while stack:
+            relative, context = stack.pop()
+            try:
+                st = os.lstat(os.path.join(mount.upper, relative))
+            except OSError:
+                continue
+            cached = previous.get(relative)
+            if cached is not None and cached[:3] == [st.st_mtime_ns, st.st_ino, context]:
+                entries = cached[3]
+                dirs[relative] = cached
+                self.cached_dirs += 1
+            else:
+                try:
+                    entries = classify_directory(mount.upper, mount.lowers, relative, context)
+                except OSError:
+                    continue
+                self.scanned_dirs += 1
+                if st.st_mtime_ns < racy_before:
+                    dirs[relative] = [st.st_mtime_ns, st.st_ino, context, entries]
+                    self.dirty = True
+
+            subdirs = []
+            for name, kind, detail, size, child_context in entries:
+                path = os.path.join(relative, name)
+                if kind:
+                    yield DiffEntry(kind, os.path.join(mount.target, path), detail, size)
+                if child_context is not None:
+                    subdirs.append((path, child_context))
+            stack.extend(reversed(subdirs))
+
+        # También cambia si desaparecieron directorios
+        if dirs.keys() != previous.keys():
+            self.dirty = True
+        self.index[mount.upper] = {"lowers": mount.lowers, "dirs": dirs}
+
+
+def default_index_path():
+    return os.path.join(get_cache_dir(), "overlay-index.json")
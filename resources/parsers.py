@@ -0,0 +1,306 @@
+"""Parsers de la salida de deepin-immutable-ctl, deepin-immutable-writable y ostree.
+
+No dependen de Qt: los usan tanto las pestañas como el modo --cli. Aceptan
+str, bytes o cualquier iterable de líneas (p. ej. el stdout de un Popen) y
+recorren la salida una sola vez, línea a línea, sin copias intermedias.
+Devuelven registros con __slots__ y campos ya tipados.
+"""
+import io
+import re
+
+# Separador que añaden las consultas entre stdout y stderr
+ERROR_SEPARATOR = "\n\nERROR:\n"
+ERROR_MARKER = "ERROR:"
+
+# Fecha de `snapshot list`; ancla las columnas cuando una fila no cuadra con la cabecera
+TIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?")
+# Columnas de una cabecera: palabras separadas por un único espacio forman una sola columna
+HEADER_RE = re.compile(r"\S+(?: \S+)*")
+
+
+class OutputLines:
+    """Líneas de una salida sin el salto final, decodificando los bytes por línea.
+
+    Tras una línea en blanco seguida de "ERROR:" (ERROR_SEPARATOR) se deja de
+    leer: lo que sigue es la salida de error y no forma parte del listado.
+    Después de recorrerla, `error` indica si se encontró ese bloque.
+    """
+    __slots__ = ("source", "error")
+
+    def __init__(self, output):
+        if isinstance(output, str):
+            output = io.StringIO(output)
+        elif isinstance(output, (bytes, bytearray)):
+            output = io.BytesIO(output)
+        self.source = output
+        self.error = False
+
+    def __iter__(self):
+        previous_blank = False
+        for line in self.source:
+            if not isinstance(line, str):
+                line = line.decode('utf-8', errors='replace')
+            line = line.rstrip('\r\n')
+            if previous_blank and line == ERROR_MARKER:
+                self.error = True
+                return
+            previous_blank = not line
+            yield line
+
+
+class SnapshotRecord:
+    """Datos de un snapshot tal como los muestran `snapshot list` y `snapshot show`"""
+    __slots__ = ("id", "name", "time", "desc")
+
+    def __init__(self, id, name="", time="", desc=""):
+        self.id = id
+        self.name = name
+        self.time = time
+        self.desc = desc
+
+    def __eq__(self, other):
+        if not isinstance(other, SnapshotRecord):
+            return NotImplemented
+        return (self.id, self.name, self.time, self.desc) == (other.id, other.name, other.time, other.desc)
+
+    def __repr__(self):
+        return f"SnapshotRecord({self.id!r}, {self.name!r}, {self.time!r}, {self.desc!r})"
+
+    def to_dict(self):
+        return {"id": self.id, "name": self.name, "time": self.time, "desc": self.desc}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("id", ""), data.get("name", ""), data.get("time", ""), data.get("desc", ""))
+
+
+# Columnas de `snapshot list` (en minúsculas) -> campos de SnapshotRecord
+SNAPSHOT_COLUMNS = {"id": "id", "name": "name", "time": "time", "desc": "desc", "description": "desc"}
+# Campo sin columna en la cabecera
+EMPTY_SLICE = slice(0, 0)
+
+
+def header_columns(header):
+    """(campo, inicio, fin) de cada columna según su posición en la cabecera.
+
+    El fin de la última columna es None. Las columnas desconocidas tienen
+    campo None y solo sirven para delimitar las demás.
+    """
+    matches = list(HEADER_RE.finditer(header))
+    columns = []
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else None
+        columns.append((SNAPSHOT_COLUMNS.get(match.group().lower()), match.start(), end))
+    return columns
+
+
+def split_anchored(line):
+    """Reparte una fila desalineada tomando la fecha como ancla (el nombre puede tener espacios)"""
+    match = TIME_RE.search(line)
+    if match:
+        head = line[:match.start()].split(None, 1)
+        if not head:
+            return None
+        return SnapshotRecord(head[0], head[1].strip() if len(head) > 1 else "",
+                              match.group(), line[match.end():].strip())
+    # Sin fecha reconocible: un campo por palabra, como las versiones antiguas
+    parts = line.split()
+    if len(parts) < 4:
+        return None
+    return SnapshotRecord(parts[0], parts[1], " ".join(parts[2:4]), " ".join(parts[4:]))
+
+
+def parse_snapshot_list(output):
+    """Parsea la salida de `snapshot list`. Devuelve None si la consulta falló.
+
+    Las filas se cortan por las posiciones de las columnas de la cabecera, así
+    que los nombres pueden llevar espacios. Si un valor no cabe en su columna
+    y desplaza a los demás, o si la cabecera no separa el ID y la fecha en
+    columnas propias, la fila se reparte tomando la fecha como ancla.
+    """
+    lines = OutputLines(output)
+    records = []
+    columns = None
+    for line in lines:
+        if not line or line.isspace():
+            continue
+        if columns is None:
+            columns = header_columns(line)
+            # Inicios de columna que deben caer justo tras un espacio en cada fila
+            starts = [start for _, start, _ in columns if start]
+            slices = {field: slice(start, end) for field, start, end in columns if field}
+            id_slice, name_slice, time_slice, desc_slice = (
+                slices.get(field, EMPTY_SLICE) for field in SnapshotRecord.__slots__)
+            # Cabecera separada por espacios sueltos ("ID Name Time Desc"): sin
+            # columnas de ID y fecha propias, todas las filas van por la fecha
+            anchored = "id" not in slices or "time" not in slices
+            continue
+
+        if anchored:
+            record = split_anchored(line)
+            if record is not None and record.id:
+                records.append(record)
+            continue
+        length = len(line)
+        for start in starts:
+            if start <= length and line[start - 1] != ' ':
+                record = split_anchored(line)
+                break
+        else:
+            time = line[time_slice].strip()
+            # La fecha no lleva espacios de más: si no encaja, las columnas están desplazadas
+            if time and not TIME_RE.fullmatch(time):
+                record = split_anchored(line)
+            else:
+                record = SnapshotRecord(line[id_slice].strip(), line[name_slice].strip(), time,
+                                        line[desc_slice].strip())
+        if record is not None and record.id:
+            records.append(record)
+
+    # Un error sin ninguna fila no significa que no haya snapshots
+    if lines.error and not records:
+        return None
+    return records
+
+
+# Claves de `snapshot show` -> campos de SnapshotRecord
+DETAIL_FIELDS = {"ID": "id", "Name": "name", "Time": "time", "Desc": "desc"}
+
+
+def parse_key_values(output, fields):
+    """Líneas `Clave: valor` de las claves de `fields`, como {campo: valor}"""
+    values = {}
+    for line in OutputLines(output):
+        key, sep, value = line.partition(':')
+        if sep:
+            field = fields.get(key.strip())
+            if field:
+                values[field] = value.strip()
+    return values
+
+
+def parse_snapshot_details(output):
+    """Parsea la salida de `snapshot show`. Devuelve None si la consulta falló."""
+    details = parse_key_values(output, DETAIL_FIELDS)
+    if not details:
+        return None
+    return SnapshotRecord.from_dict(details)
+
+
+class StatusRecord:
+    """Estado de `deepin-immutable-writable status` con los valores ya tipados"""
+    __slots__ = ("enable", "booted", "whitelist", "clear_after_reboot", "clean_data",
+                 "overlay_dirs", "overlay_all_dirs")
+
+    def __init__(self, enable=False, booted=False, whitelist="", clear_after_reboot=False,
+                 clean_data=False, overlay_dirs="", overlay_all_dirs=False):
+        self.enable = enable
+        self.booted = booted
+        self.whitelist = whitelist
+        self.clear_after_reboot = clear_after_reboot
+        self.clean_data = clean_data
+        self.overlay_dirs = overlay_dirs
+        self.overlay_all_dirs = overlay_all_dirs
+
+    @property
+    def immutable(self):
+        # `Enable: true` significa que la ESCRITURA está habilitada
+        return not self.enable
+
+    def __eq__(self, other):
+        if not isinstance(other, StatusRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"StatusRecord({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    def to_dict(self):
+        data = {"immutable": self.immutable}
+        data.update((name, getattr(self, name)) for name in self.__slots__)
+        return data
+
+
+# Claves de `deepin-immutable-writable status` -> campos de StatusRecord
+STATUS_FIELDS = {
+    "Enable": "enable",
+    "Booted": "booted",
+    "Whitelist": "whitelist",
+    "ClearAfterReboot": "clear_after_reboot",
+    "CleanData": "clean_data",
+    "OverlayDirs": "overlay_dirs",
+    "OverlayAllDirs": "overlay_all_dirs",
+}
+STATUS_FLAGS = {"enable", "booted", "clear_after_reboot", "clean_data", "overlay_all_dirs"}
+
+
+def parse_status(output):
+    """Parsea la salida de `deepin-immutable-writable status`. None si no trae ninguna clave conocida."""
+    values = parse_key_values(output, STATUS_FIELDS)
+    if not values:
+        return None
+    for field, value in values.items():
+        value = value.rstrip(',')  # Quitar la coma final
+        values[field] = value.lower() == "true" if field in STATUS_FLAGS else value
+    return StatusRecord(**values)
+
+
+class DeploymentRecord:
+    """Un despliegue de `ostree admin status`"""
+    __slots__ = ("osname", "checksum", "serial", "booted", "pending", "rollback", "staged",
+                 "pinned", "version", "origin")
+
+    def __init__(self, osname, checksum, serial=0, booted=False, pending=False, rollback=False,
+                 staged=False, pinned=False, version="", origin=""):
+        self.osname = osname
+        self.checksum = checksum
+        self.serial = serial
+        self.booted = booted
+        self.pending = pending
+        self.rollback = rollback
+        self.staged = staged
+        self.pinned = pinned
+        self.version = version
+        self.origin = origin
+
+    def __eq__(self, other):
+        if not isinstance(other, DeploymentRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"DeploymentRecord({self.osname!r}, {self.checksum!r}, {self.serial!r})"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# "* deepin 3a9f…e2.0 (pending) (rollback)": marca de arranque, sistema, checksum.serial y estados
+DEPLOYMENT_RE = re.compile(r"^([* ]) (\S+) ([0-9a-f]{64})\.(\d+)((?: \(\w+\))*)\s*$")
+# Líneas sangradas bajo cada despliegue -> campos de DeploymentRecord
+DEPLOYMENT_FIELDS = {"Version": "version", "origin refspec": "origin", "Pinned": "pinned"}
+
+
+def parse_deployments(output):
+    """Parsea la salida de `ostree admin status`. Devuelve None si la consulta falló."""
+    lines = OutputLines(output)
+    deployments = []
+    for line in lines:
+        match = DEPLOYMENT_RE.match(line)
+        if match:
+            mark, osname, checksum, serial, flags = match.groups()
+            flags = set(re.findall(r"\((\w+)\)", flags))
+            deployments.append(DeploymentRecord(
+                osname, checksum, int(serial), booted=mark == "*", pending="pending" in flags,
+                rollback="rollback" in flags, staged="staged" in flags))
+            continue
+        if deployments and line.startswith(" "):
+            key, sep, value = line.strip().partition(": ")
+            field = DEPLOYMENT_FIELDS.get(key)
+            if sep and field:
+                value = value.strip()
+                setattr(deployments[-1], field, value == "yes" if field == "pinned" else value)
+
+    if lines.error and not deployments:
+        return None
+    return deployments
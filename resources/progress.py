@@ -0,0 +1,254 @@
+"""Progreso por fases de los comandos largos a partir de su salida, sin depender de Qt.
+
+Cada operación conocida (resources.helper.parse_operation) tiene una lista
+ordenada de fases; cada fase empieza cuando aparece en la salida alguna de
+sus marcas (mensajes de deepin-immutable-ctl y de ostree, sin distinguir
+mayúsculas). Las fases solo avanzan: una marca de una fase posterior salta
+las intermedias, y una de una fase anterior se ignora. Dentro de una fase,
+los contadores de la forma "45%" o "(120/800)" dan su avance.
+
+Lo que dura cada fase se guarda al terminar bien el comando, y las medianas
+de las últimas ejecuciones en esta máquina dan el peso de cada fase en la
+barra y el tiempo restante. Sin historial se usan pesos fijos y no hay
+tiempo restante. Si las marcas no aparecen nunca, todo el tiempo cuenta
+para la primera fase y el avance pasa a ser el tiempo transcurrido frente
+al habitual. Los comandos sin perfil se quedan con la barra indeterminada.
+"""
+import json
+import os
+import re
+import statistics
+
+from resources.cache import get_cache_dir, write_json
+from resources.helper import parse_operation
+
+HISTORY_VERSION = 1
+# Duraciones que se guardan por fase
+HISTORY_SAMPLES = 20
+# Sin contador, una fase no pasa de aquí por mucho que se alargue
+MAX_TIME_FRACTION = 0.95
+# Por debajo de este avance un contador aún no sirve para extrapolar el tiempo restante
+MIN_COUNTER_FRACTION = 0.05
+
+# Líneas del final de cada fragmento en las que se busca un contador
+COUNTER_LINES = 8
+# "45%" o "(120/800)"; en una línea con los dos, vale el último
+COUNTER_PATTERN = re.compile(r"(\d{1,3}(?:[.,]\d+)?)\s*%|(?<![\w/])(\d+)\s*/\s*(\d+)(?![\w/])")
+
+
+class Phase:
+    """Una fase: clave, peso por defecto y marcas que indican que ha empezado"""
+    __slots__ = ("key", "weight", "markers", "pattern")
+
+    def __init__(self, key, weight, markers=()):
+        self.key = key
+        self.weight = weight
+        self.markers = markers
+        # La primera fase no tiene marcas: empieza con el comando. Las marcas
+        # van en minúsculas y se buscan en el texto ya pasado a minúsculas
+        # (re.IGNORECASE hace la búsqueda varias veces más lenta)
+        self.pattern = re.compile("|".join(markers)) if markers else None
+
+
+COMMIT_MARKERS = (r"writing objects", r"committing", r"creating (?:a )?(?:new )?(?:commit|snapshot)",
+                  r"scanning metadata")
+CHECKOUT_MARKERS = (r"checking out", r"creating (?:new )?deployment")
+ETC_MARKERS = (r"copying /etc", r"merging /etc", r"/etc changes")
+BOOTLOADER_MARKERS = (r"bootloader", r"bootconfig", r"updating grub", r"transaction complete")
+CLEANUP_MARKERS = (r"prun", r"freed objects", r"cleaning up", r"deleting \d+ objects", r"removing deployment")
+
+# Clave del perfil -> fases en orden
+PROFILES = {
+    "deploy": (Phase("prepare", 1), Phase("commit", 6, COMMIT_MARKERS), Phase("checkout", 2, CHECKOUT_MARKERS),
+               Phase("etc", 1, ETC_MARKERS), Phase("bootloader", 1, BOOTLOADER_MARKERS),
+               Phase("cleanup", 1, CLEANUP_MARKERS)),
+    "finalize": (Phase("prepare", 1), Phase("bootloader", 2, BOOTLOADER_MARKERS),
+                 Phase("cleanup", 2, CLEANUP_MARKERS)),
+    "rollback": (Phase("prepare", 1), Phase("checkout", 3, CHECKOUT_MARKERS), Phase("etc", 1, ETC_MARKERS),
+                 Phase("bootloader", 1, BOOTLOADER_MARKERS), Phase("cleanup", 1, CLEANUP_MARKERS)),
+    "snapshot-create": (Phase("prepare", 1), Phase("commit", 4, COMMIT_MARKERS)),
+    "snapshot-delete": (Phase("prepare", 1), Phase("cleanup", 3, CLEANUP_MARKERS)),
+}
+
+
+def profile_for(command):
+    """Clave del perfil de un comando completo (con pkexec o no), o None si no tiene"""
+    operation = parse_operation(command)
+    if operation is None:
+        return None
+    op, args = operation
+    if op == "admin.deploy":
+        return "finalize" if args.get("finalize") else "deploy"
+    if op in ("admin.rollback", "snapshot.rollback"):
+        return "rollback"
+    if op == "snapshot.create":
+        return "snapshot-create"
+    if op == "snapshot.delete":
+        return "snapshot-delete"
+    return None
+
+
+def default_history_path():
+    return os.path.join(get_cache_dir(), "phase-history.json")
+
+
+def load_history(path=None):
+    """{perfil: {fase: [segundos, ...]}} de las ejecuciones anteriores"""
+    try:
+        with open(path or default_history_path()) as f:
+            data = json.load(f)
+        if data.get("version") == HISTORY_VERSION and isinstance(data.get("profiles"), dict):
+            return data["profiles"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading phase history: {e}")
+    return {}
+
+
+def record_durations(history, profile, durations, path=None):
+    """Añade las duraciones de una ejecución terminada al historial y lo guarda"""
+    phases = history.setdefault(profile, {})
+    for key, seconds in durations.items():
+        phases[key] = (phases.get(key, []) + [round(seconds, 3)])[-HISTORY_SAMPLES:]
+    path = path or default_history_path()
+    try:
+        write_json(path, {"version": HISTORY_VERSION, "profiles": history})
+    except Exception as e:
+        print(f"Error saving phase history: {e}")
+    return history
+
+
+def last_counter(text):
+    """Avance (0-1) del último porcentaje o contador a/b de un texto, o None"""
+    # Desde el final y solo las últimas líneas: un contador más antiguo ya
+    # está superado, y buscar en todo el texto cuesta más que el resto del análisis
+    end = len(text)
+    match = None
+    for _ in range(COUNTER_LINES):
+        if end <= 0 or match is not None:
+            break
+        start = text.rfind("\n", 0, end) + 1
+        for match in COUNTER_PATTERN.finditer(text, start, end):
+            pass
+        end = start - 1
+    if match is None:
+        return None
+    if match.group(1) is not None:
+        return min(float(match.group(1).replace(",", ".")) / 100, 1.0)
+    total = int(match.group(3))
+    return min(int(match.group(2)) / total, 1.0) if total else None
+
+
+class ProgressState:
+    """Lo que se muestra en un momento dado: fase, avance total (0-1) y segundos restantes (o None)"""
+    __slots__ = ("phase", "index", "count", "fraction", "remaining")
+
+    def __init__(self, phase, index, count, fraction, remaining):
+        self.phase = phase
+        self.index = index
+        self.count = count
+        self.fraction = fraction
+        self.remaining = remaining
+
+
+class ProgressTracker:
+    """Sigue las fases de un comando según llega su salida.
+
+    Los tiempos (`now`) los pone quien llama, en segundos monótonos, para
+    poder recalcular el estado entre salidas sin depender de un reloj propio.
+    """
+
+    def __init__(self, profile, now, history=None):
+        self.profile = profile
+        self.phases = PROFILES[profile]
+        self.index = 0
+        self.started = [now] + [None] * (len(self.phases) - 1)
+        self.counter = None
+        self.buffer = ""
+        # Las barras no retroceden aunque el cálculo lo haga (p. ej. un contador que vuelve a empezar)
+        self.shown = 0.0
+        # Cualquier marca de cualquier fase: casi ningún fragmento tiene una
+        self.any_marker = re.compile("|".join(marker for phase in self.phases for marker in phase.markers))
+        samples = (history or {}).get(profile, {})
+        self.expected = [statistics.median(samples[phase.key]) if samples.get(phase.key) else None
+                         for phase in self.phases]
+        if None in self.expected:
+            self.expected = None
+
+    def feed(self, text, now):
+        """Procesa un fragmento de salida; True si cambió la fase o el contador"""
+        # Solo líneas completas; ostree repinta su progreso con \r en la misma línea
+        text, newline, self.buffer = (self.buffer + text).replace("\r", "\n").rpartition("\n")
+        if not newline:
+            return False
+        return self.feed_lines(text.lower(), now)
+
+    def finish(self, now):
+        """Procesa la última línea, si quedó sin salto de línea"""
+        if self.buffer:
+            self.feed_lines(self.buffer.lower(), now)
+            self.buffer = ""
+
+    def feed_lines(self, text, now):
+        changed = False
+        if self.any_marker.search(text):
+            # Línea a línea solo si hay alguna marca: los contadores anteriores a
+            # un cambio de fase son de la fase que termina
+            lines = text.split("\n")
+            for position, line in enumerate(lines):
+                # De la última a la siguiente a la actual: una marca posterior salta las intermedias
+                for index in range(len(self.phases) - 1, self.index, -1):
+                    pattern = self.phases[index].pattern
+                    if pattern is not None and pattern.search(line):
+                        for skipped in range(self.index + 1, index + 1):
+                            self.started[skipped] = now
+                        self.index = index
+                        self.counter = None
+                        changed = True
+                        text = "\n".join(lines[position:])
+                        break
+        counter = last_counter(text)
+        if counter is not None and counter != self.counter:
+            self.counter = counter
+            changed = True
+        return changed
+
+    def durations(self, now):
+        """Segundos de cada fase hasta `now`; las que no llegaron a empezar, 0"""
+        result = {}
+        for index, phase in enumerate(self.phases):
+            start = self.started[index]
+            if start is None:
+                result[phase.key] = 0.0
+                continue
+            end = next((self.started[later] for later in range(index + 1, len(self.phases))
+                        if self.started[later] is not None), now)
+            result[phase.key] = max(end - start, 0.0)
+        return result
+
+    def state(self, now):
+        elapsed = now - self.started[self.index]
+        expected = self.expected
+        if expected is not None and sum(expected) > 0:
+            weights = expected
+        else:
+            weights = [phase.weight for phase in self.phases]
+            expected = None
+
+        within = self.counter
+        if within is None:
+            within = 0.0
+            if expected is not None and expected[self.index] > 0:
+                within = min(elapsed / expected[self.index], MAX_TIME_FRACTION)
+        fraction = (sum(weights[:self.index]) + weights[self.index] * within) / sum(weights)
+        self.shown = max(self.shown, min(fraction, 1.0))
+
+        remaining = None
+        if expected is not None:
+            if self.counter is not None and self.counter >= MIN_COUNTER_FRACTION:
+                current = elapsed * (1 - self.counter) / self.counter
+            else:
+                current = max(expected[self.index] - elapsed, 0.0)
+            remaining = current + sum(expected[self.index + 1:])
+        return ProgressState(self.phases[self.index].key, self.index, len(self.phases), self.shown, remaining)
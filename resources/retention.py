@@ -0,0 +1,143 @@
+"""Política de retención de snapshots: qué conservar y qué eliminar.
+
+No depende de Qt. A partir del listado ya parseado (SnapshotRecord) calcula
+el conjunto a eliminar; la interfaz lo muestra como vista previa y lo
+ejecuta como un único lote. Las reglas siguen el esquema habitual de las
+herramientas de copias (keep-last, keep-daily/weekly/monthly): se conserva
+el snapshot más reciente de cada día, semana o mes hasta el número pedido
+de periodos, y un snapshot se conserva si lo pide cualquiera de las reglas.
+Los fijados nunca se eliminan. Un snapshot con una fecha que no se puede
+interpretar tampoco: ante la duda se conserva.
+
+Coste: una ordenación por fecha y una pasada por regla, O(n log n).
+"""
+from datetime import datetime
+
+
+class RetentionPolicy:
+    """Reglas de retención. Un 0 desactiva la regla; sin ninguna regla no se elimina nada."""
+    __slots__ = ("keep_last", "keep_daily", "keep_weekly", "keep_monthly", "max_total_size")
+
+    def __init__(self, keep_last=0, keep_daily=0, keep_weekly=0, keep_monthly=0, max_total_size=0):
+        self.keep_last = keep_last
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+        self.keep_monthly = keep_monthly
+        # Bytes; solo cuenta con los tamaños que se pasen a evaluate()
+        self.max_total_size = max_total_size
+
+    @property
+    def enabled(self):
+        return any(getattr(self, name) > 0 for name in self.__slots__)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        values = {}
+        for name in cls.__slots__:
+            value = data.get(name, 0)
+            # Un valor no válido en la configuración desactiva la regla
+            values[name] = value if isinstance(value, int) and not isinstance(value, bool) and value > 0 else 0
+        return cls(**values)
+
+
+class RetentionPlan:
+    """Resultado de evaluar una política: registros a conservar (con sus motivos) y a eliminar"""
+    __slots__ = ("keep", "prune", "reasons")
+
+    def __init__(self, keep, prune, reasons):
+        # Ambas listas de la más reciente a la más antigua
+        self.keep = keep
+        self.prune = prune
+        # ID -> motivos por los que se conserva ("last", "daily", "pinned"...)
+        self.reasons = reasons
+
+    def prune_ids(self):
+        return [record.id for record in self.prune]
+
+
+def parse_time(text):
+    try:
+        return datetime.fromisoformat(text.strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+def period_keys(moment):
+    """Clave del día, la semana ISO y el mes de una fecha"""
+    year, week, _ = moment.isocalendar()
+    return (moment.year, moment.month, moment.day), (year, week), (moment.year, moment.month)
+
+
+def evaluate(records, policy, pinned=(), sizes=None):
+    """Calcula el plan de retención de un listado.
+
+    `pinned` son los IDs protegidos y `sizes` un dict opcional ID -> bytes
+    para max_total_size (los snapshots sin tamaño conocido cuentan como 0).
+    """
+    pinned = set(pinned)
+    reasons = {}
+    if not policy.enabled:
+        return RetentionPlan(list(records), [], {record.id: ["policy-disabled"] for record in records})
+
+    dated = []
+    undated = []
+    for position, record in enumerate(records):
+        moment = parse_time(record.time)
+        if moment is None:
+            undated.append(record)
+            reasons.setdefault(record.id, []).append("unknown-time")
+        else:
+            # La posición desempata fechas iguales manteniendo el orden del listado
+            dated.append((moment, position, record))
+    # De la más reciente a la más antigua
+    dated.sort(key=lambda item: (item[0], item[1]), reverse=True)
+
+    for record in records:
+        if record.id in pinned:
+            reasons.setdefault(record.id, []).append("pinned")
+
+    for _, _, record in dated[:policy.keep_last]:
+        reasons.setdefault(record.id, []).append("last")
+
+    for rule, index, limit in (("daily", 0, policy.keep_daily), ("weekly", 1, policy.keep_weekly),
+                               ("monthly", 2, policy.keep_monthly)):
+        if limit <= 0:
+            continue
+        last_key = None
+        kept = 0
+        for moment, _, record in dated:
+            key = period_keys(moment)[index]
+            if key == last_key:
+                continue
+            last_key = key
+            reasons.setdefault(record.id, []).append(rule)
+            kept += 1
+            if kept >= limit:
+                break
+
+    # Sin reglas de conservación activas, max_total_size parte de todos los snapshots
+    count_rules = policy.keep_last or policy.keep_daily or policy.keep_weekly or policy.keep_monthly
+    if not count_rules:
+        for _, _, record in dated:
+            reasons.setdefault(record.id, []).append("size")
+
+    if policy.max_total_size > 0 and sizes is not None:
+        total = sum(sizes.get(record.id, 0) for record in records if record.id in reasons)
+        # Se sueltan los conservados más antiguos hasta caber; nunca los fijados ni el más reciente
+        newest = dated[0][2].id if dated else None
+        for _, _, record in reversed(dated):
+            if total <= policy.max_total_size:
+                break
+            if record.id not in reasons or record.id in pinned or record.id == newest:
+                continue
+            del reasons[record.id]
+            total -= sizes.get(record.id, 0)
+
+    keep = [record for _, _, record in dated if record.id in reasons]
+    prune = [record for _, _, record in dated if record.id not in reasons]
+    # Los de fecha desconocida se conservan, al final de la lista
+    keep.extend(undated)
+    return RetentionPlan(keep, prune, reasons)
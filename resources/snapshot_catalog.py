@@ -0,0 +1,91 @@
+import os
+import json
+from resources.cache import get_cache_dir, write_json
+from resources.parsers import SnapshotRecord
+
+
+class SnapshotCatalog:
+    """Catálogo de snapshots indexado por ID y persistido en disco.
+
+    Permite mostrar la última lista conocida al arrancar y actualizarla de
+    forma incremental comparándola con cada nuevo listado de la CLI.
+    """
+    VERSION = 1
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_cache_dir(), "snapshots.json")
+        # ID -> SnapshotRecord, en el orden del listado de la CLI
+        self.index = {}
+        # ID -> detalles de `snapshot show` ya obtenidos
+        self.details = {}
+        # Hay cambios sin guardar en disco
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, snapshot_id):
+        return snapshot_id in self.index
+
+    def get(self, snapshot_id):
+        return self.index.get(snapshot_id)
+
+    def records(self):
+        return list(self.index.values())
+
+    def get_details(self, snapshot_id):
+        return self.details.get(snapshot_id)
+
+    def set_details(self, snapshot_id, details):
+        if snapshot_id not in self.index or self.details.get(snapshot_id) == details:
+            return
+        self.details[snapshot_id] = details
+        self.dirty = True
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            self.index = {}
+            for item in data.get("snapshots", []):
+                record = SnapshotRecord.from_dict(item)
+                self.index[record.id] = record
+            self.details = {snapshot_id: SnapshotRecord.from_dict(details)
+                            for snapshot_id, details in data.get("details", {}).items()
+                            if snapshot_id in self.index}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading snapshot cache: {e}")
+
+    def save(self):
+        try:
+            data = {
+                "version": self.VERSION,
+                "snapshots": [record.to_dict() for record in self.index.values()],
+                "details": {snapshot_id: details.to_dict() for snapshot_id, details in self.details.items()},
+            }
+            write_json(self.path, data)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving snapshot cache: {e}")
+
+    def apply_listing(self, records):
+        """Sustituye el catálogo por un nuevo listado.
+
+        Devuelve las listas de IDs añadidos, eliminados y modificados. Los
+        detalles de los snapshots eliminados o modificados se descartan.
+        """
+        new_index = {record.id: record for record in records}
+        added = [snapshot_id for snapshot_id in new_index if snapshot_id not in self.index]
+        removed = [snapshot_id for snapshot_id in self.index if snapshot_id not in new_index]
+        changed = [snapshot_id for snapshot_id, record in new_index.items()
+                   if snapshot_id in self.index and self.index[snapshot_id] != record]
+        if added or removed or changed or list(self.index) != list(new_index):
+            self.dirty = True
+        for snapshot_id in removed + changed:
+            self.details.pop(snapshot_id, None)
+        self.index = new_index
+        return added, removed, changed
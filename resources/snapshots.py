@@ -1,21 +1,33 @@
 import os
+import json
+from collections import OrderedDict
 from PySide6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QGroupBox, 
-                              QPushButton, QListWidget, QListWidgetItem, 
-                              QInputDialog, QLineEdit, QLabel, QFrame,
-                              QMessageBox, QDialog, QDialogButtonBox)
-from PySide6.QtGui import QIcon, QPixmap, QFont
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtCore import QCoreApplication, QTranslator
+                              QPushButton, QListView, QStyledItemDelegate,
+                              QLineEdit, QLabel, QFrame, QProgressBar, QPlainTextEdit,
+                              QMessageBox, QDialog, QDialogButtonBox, QSpinBox, QCheckBox,
+                              QFormLayout, QListWidget, QTableWidget, QTableWidgetItem,
+                              QHeaderView)
+from PySide6.QtCore import Qt, QPoint, QTimer, QAbstractListModel, QModelIndex
+from PySide6.QtCore import QCoreApplication, QEvent, QT_TRANSLATE_NOOP
+from resources.snapshot_catalog import SnapshotCatalog
+from resources.parsers import ERROR_SEPARATOR, SnapshotRecord, parse_snapshot_list, parse_snapshot_details
+from resources.commands import SNAPSHOT_LIST_COMMAND, build_full_command, snapshot_command
+from resources.retention import RetentionPolicy, evaluate as evaluate_retention
+from resources.diskusage import DiskUsageReport, format_size
+from resources.diffentry import ADDED, REMOVED
+from resources.icons import ICONS
 
 class SnapshotInfoDialog(QDialog):
     def __init__(self, parent=None, snapshot_info=None):
         super().__init__(parent)
         self.parent = parent
-        self.snapshot_info = snapshot_info or {}
+        self.snapshot_info = snapshot_info or SnapshotRecord("")
         self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setFixedSize(500, 450)  # Aumenté la altura para dar más espacio al botón
         self.setup_ui()
+        self.retranslate_ui()
+        self.set_snapshot_info(self.snapshot_info)
 
     def setup_ui(self):
         # Widget principal con bordes redondeados
@@ -27,18 +39,10 @@ class SnapshotInfoDialog(QDialog):
         layout.setSpacing(20)
 
         # Título
-        title_label = QLabel(self.tr("Información del Snapshot"))
-        title_label.setObjectName("dialog_title")
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            QLabel#dialog_title {
-                font-size: 18px;
-                font-weight: bold;
-                padding: 10px;
-                background-color: transparent;
-            }
-        """)
-        layout.addWidget(title_label)
+        self.title_label = QLabel()
+        self.title_label.setObjectName("dialog_title")
+        self.title_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.title_label)
 
         # Separador
         separator = QFrame()
@@ -57,14 +61,14 @@ class SnapshotInfoDialog(QDialog):
         name_container = QWidget()
         name_layout = QHBoxLayout(name_container)
         name_layout.setContentsMargins(0, 0, 0, 0)
-        name_label = QLabel(self.tr("Nombre:"))
-        name_label.setObjectName("field_label")
-        name_label.setFixedWidth(120)
-        self.name_value = QLabel(self.snapshot_info.get('name', 'N/A'))
+        self.name_label = QLabel()
+        self.name_label.setObjectName("field_label")
+        self.name_label.setFixedWidth(120)
+        self.name_value = QLabel()
         self.name_value.setObjectName("field_value")
         self.name_value.setWordWrap(True)
         self.name_value.setMinimumHeight(25)
-        name_layout.addWidget(name_label)
+        name_layout.addWidget(self.name_label)
         name_layout.addWidget(self.name_value)
         info_layout.addWidget(name_container)
 
@@ -72,14 +76,14 @@ class SnapshotInfoDialog(QDialog):
         id_container = QWidget()
         id_layout = QHBoxLayout(id_container)
         id_layout.setContentsMargins(0, 0, 0, 0)
-        id_label = QLabel(self.tr("ID del respaldo:"))
-        id_label.setObjectName("field_label")
-        id_label.setFixedWidth(120)
-        self.id_value = QLabel(self.snapshot_info.get('id', 'N/A'))
+        self.id_label = QLabel()
+        self.id_label.setObjectName("field_label")
+        self.id_label.setFixedWidth(120)
+        self.id_value = QLabel()
         self.id_value.setObjectName("field_value")
         self.id_value.setWordWrap(True)
         self.id_value.setMinimumHeight(25)
-        id_layout.addWidget(id_label)
+        id_layout.addWidget(self.id_label)
         id_layout.addWidget(self.id_value)
         info_layout.addWidget(id_container)
 
@@ -87,14 +91,14 @@ class SnapshotInfoDialog(QDialog):
         date_container = QWidget()
         date_layout = QHBoxLayout(date_container)
         date_layout.setContentsMargins(0, 0, 0, 0)
-        date_label = QLabel(self.tr("Fecha:"))
-        date_label.setObjectName("field_label")
-        date_label.setFixedWidth(120)
-        self.date_value = QLabel(self.snapshot_info.get('time', 'N/A'))
+        self.date_label = QLabel()
+        self.date_label.setObjectName("field_label")
+        self.date_label.setFixedWidth(120)
+        self.date_value = QLabel()
         self.date_value.setObjectName("field_value")
         self.date_value.setWordWrap(True)
         self.date_value.setMinimumHeight(25)
-        date_layout.addWidget(date_label)
+        date_layout.addWidget(self.date_label)
         date_layout.addWidget(self.date_value)
         info_layout.addWidget(date_container)
 
@@ -103,14 +107,14 @@ class SnapshotInfoDialog(QDialog):
         desc_layout = QVBoxLayout(desc_container)
         desc_layout.setContentsMargins(0, 0, 0, 0)
         desc_layout.setSpacing(5)
-        desc_label = QLabel(self.tr("Descripción:"))
-        desc_label.setObjectName("field_label")
-        self.desc_value = QLabel(self.snapshot_info.get('desc', 'N/A'))
+        self.desc_label = QLabel()
+        self.desc_label.setObjectName("field_label")
+        self.desc_value = QLabel()
         self.desc_value.setObjectName("field_value")
         self.desc_value.setWordWrap(True)
         self.desc_value.setMinimumHeight(60)
         self.desc_value.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        desc_layout.addWidget(desc_label)
+        desc_layout.addWidget(self.desc_label)
         desc_layout.addWidget(self.desc_value)
         info_layout.addWidget(desc_container)
 
@@ -125,7 +129,7 @@ class SnapshotInfoDialog(QDialog):
         button_layout.setContentsMargins(0, 0, 0, 0)  # Margen superior de 20px
         button_layout.addStretch(1)
         
-        self.close_button = QPushButton(self.tr("Cerrar"))  # Texto correcto
+        self.close_button = QPushButton()
         self.close_button.setObjectName("close_button")
         self.close_button.setFixedSize(100, 49)
         self.close_button.clicked.connect(self.accept)
@@ -139,106 +143,26 @@ class SnapshotInfoDialog(QDialog):
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.addWidget(main_widget)
 
-        # Aplicar estilos según el tema del parent
-        self.apply_theme()
+    def retranslate_ui(self):
+        self.title_label.setText(self.tr("Información del Snapshot"))
+        self.name_label.setText(self.tr("Nombre:"))
+        self.id_label.setText(self.tr("ID del respaldo:"))
+        self.date_label.setText(self.tr("Fecha:"))
+        self.desc_label.setText(self.tr("Descripción:"))
+        self.close_button.setText(self.tr("Cerrar"))
 
-    def apply_theme(self):
-        # Obtener el tema del parent principal (MainWindow)
-        if hasattr(self.parent, 'parent') and hasattr(self.parent.parent, 'dark_mode'):
-            dark_mode = self.parent.parent.dark_mode
-        elif hasattr(self.parent, 'dark_mode'):
-            dark_mode = self.parent.dark_mode
-        else:
-            dark_mode = True  # Por defecto oscuro
-        
-        if dark_mode:
-            stylesheet = """
-                #info_dialog {
-                    background-color: #3A3A3A;
-                    border: 1px solid #555555;
-                    border-radius: 8px;
-                }
-                #dialog_title {
-                    color: #FFFFFF;
-                    background-color: transparent;
-                }
-                #field_label {
-                    font-weight: bold;
-                    color: #BEBEBE;
-                    font-size: 13px;
-                    background-color: transparent;
-                }
-                #field_value {
-                    color: #E0E0E0;
-                    font-size: 13px;
-                    background-color: #2D2D2D;
-                    padding: 6px 10px;
-                    border-radius: 4px;
-                    border: 1px solid #444444;
-                }
-                #close_button {
-                    background-color: #2ca7f8;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    font-size: 13px;
-                    font-weight: bold;
-                }
-                #close_button:hover {
-                    background-color: #1d8dd8;
-                }
-                #close_button:pressed {
-                    background-color: #0a70b9;
-                }
-                QFrame {
-                    background-color: #555555;
-                }
-            """
-        else:
-            stylesheet = """
-                #info_dialog {
-                    background-color: #FFFFFF;
-                    border: 1px solid #E0E0E0;
-                    border-radius: 8px;
-                }
-                #dialog_title {
-                    color: #333333;
-                    background-color: transparent;
-                }
-                #field_label {
-                    font-weight: bold;
-                    color: #333333;
-                    font-size: 13px;
-                    background-color: transparent;
-                }
-                #field_value {
-                    color: #333333;
-                    font-size: 13px;
-                    background-color: #F8F8F8;
-                    padding: 6px 10px;
-                    border-radius: 4px;
-                    border: 1px solid #E0E0E0;
-                }
-                #close_button {
-                    background-color: #2ca7f8;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    font-size: 13px;
-                    font-weight: bold;
-                }
-                #close_button:hover {
-                    background-color: #1d8dd8;
-                }
-                #close_button:pressed {
-                    background-color: #0a70b9;
-                }
-                QFrame {
-                    background-color: #E0E0E0;
-                }
-            """
-        
-        self.setStyleSheet(stylesheet)
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
+    def set_snapshot_info(self, snapshot_info):
+        """Actualiza los campos cuando llegan los detalles en segundo plano"""
+        self.snapshot_info = snapshot_info
+        self.name_value.setText(snapshot_info.name or 'N/A')
+        self.id_value.setText(snapshot_info.id or 'N/A')
+        self.date_value.setText(snapshot_info.time or 'N/A')
+        self.desc_value.setText(snapshot_info.desc or 'N/A')
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -250,15 +174,648 @@ class SnapshotInfoDialog(QDialog):
             self.move(event.globalPosition().toPoint() - self.drag_position)
             event.accept()
 
+class BulkOperationDialog(QDialog):
+    """Progreso de una operación sobre varios snapshots (un BatchJob).
+
+    Muestra el elemento en curso, los completados y, al terminar, un resumen
+    con los que fallaron y por qué.
+    """
+    def __init__(self, batch, title, item_text, labels, parent=None):
+        super().__init__(parent)
+        self.batch = batch
+        self.title = title
+        # Texto del elemento en curso, con {0} etiqueta, {1} posición y {2} total
+        self.item_text = item_text
+        self.labels = labels
+        self.setMinimumWidth(460)
+        self.setup_ui()
+        self.retranslate_ui()
+
+        batch.itemStarted.connect(self.handle_item_started)
+        batch.itemFinished.connect(self.handle_item_finished)
+        batch.finished.connect(self.handle_finished)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, len(self.labels))
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.failures_label = QLabel()
+        self.failures_label.setVisible(False)
+        layout.addWidget(self.failures_label)
+
+        self.failures_view = QPlainTextEdit()
+        self.failures_view.setReadOnly(True)
+        self.failures_view.setVisible(False)
+        layout.addWidget(self.failures_view)
+
+        button_box = QDialogButtonBox()
+        self.cancel_button = button_box.addButton("", QDialogButtonBox.RejectRole)
+        self.close_button = button_box.addButton("", QDialogButtonBox.AcceptRole)
+        self.close_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.batch.cancel)
+        self.close_button.clicked.connect(self.accept)
+        layout.addWidget(button_box)
+
+    def retranslate_ui(self):
+        self.setWindowTitle(self.title)
+        self.failures_label.setText(self.tr("Elementos con errores:"))
+        self.cancel_button.setText(self.tr("Cancelar"))
+        self.close_button.setText(self.tr("Cerrar"))
+        if not self.status_label.text():
+            self.status_label.setText(self.tr("Esperando autenticación..."))
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
+    def tr(self, text):
+        return QCoreApplication.translate("SnapshotsTab", text)
+
+    def handle_item_started(self, index):
+        self.status_label.setText(self.item_text.format(self.labels[index], index + 1, len(self.labels)))
+
+    def handle_item_finished(self, index, result):
+        self.progress_bar.setValue(self.batch.completed)
+        if result["exit_code"] != 0:
+            error = (result["error"] or result["output"]).strip() or self.tr("código de salida {0}").format(
+                result["exit_code"])
+            self.failures_label.setVisible(True)
+            self.failures_view.setVisible(True)
+            self.failures_view.appendPlainText(f"{self.labels[index]}: {error}")
+
+    def handle_finished(self, batch):
+        failed = len(batch.failed)
+        succeeded = batch.completed - failed
+        if batch.cancelled:
+            summary = self.tr("Cancelado: {0} correctos, {1} con errores, {2} sin ejecutar.").format(
+                succeeded, failed, len(self.labels) - batch.completed)
+        elif batch.completed == 0 and batch.error:
+            summary = self.tr("No se pudo ejecutar la operación: {0}").format(batch.error)
+        else:
+            summary = self.tr("Terminado: {0} correctos, {1} con errores.").format(succeeded, failed)
+        self.status_label.setText(summary)
+        self.cancel_button.setEnabled(False)
+        self.close_button.setEnabled(True)
+
+    def reject(self):
+        # Cerrar mientras el lote sigue en marcha equivale a cancelarlo
+        if not self.close_button.isEnabled():
+            self.batch.cancel()
+            return
+        super().reject()
+
+class RetentionDialog(QDialog):
+    """Edición de la política de retención con vista previa de lo que se eliminaría"""
+    # Filas de la vista previa; el resto solo se cuenta
+    PREVIEW_LIMIT = 500
+    # El tamaño máximo se edita en GiB y se guarda en bytes
+    SIZE_UNIT = 1024 ** 3
+
+    def __init__(self, records, policy, pinned, auto, sizes=None, parent=None):
+        super().__init__(parent)
+        self.records = records
+        self.pinned = pinned
+        # ID -> bytes exclusivos del último análisis de uso de disco; None si no lo hay
+        self.sizes = sizes
+        self.plan = None
+        # El usuario pulsó "Eliminar ahora" además de guardar
+        self.prune_requested = False
+        self.setMinimumWidth(480)
+        self.setup_ui()
+        self.retranslate_ui()
+
+        for spin, value in zip(self.spins, (policy.keep_last, policy.keep_daily, policy.keep_weekly,
+                                            policy.keep_monthly)):
+            spin.setValue(value)
+            spin.valueChanged.connect(self.update_preview)
+        self.auto_check.setChecked(auto)
+        self.max_total_size = policy.max_total_size
+        self.size_spin.setValue(round(policy.max_total_size / self.SIZE_UNIT))
+        self.size_spin.valueChanged.connect(self.set_max_total_size)
+        # Sin tamaños el límite no se puede aplicar: se conserva el guardado, sin editarlo
+        self.size_spin.setEnabled(sizes is not None)
+        self.size_note.setVisible(sizes is None)
+        self.update_preview()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.spin_labels = [QLabel() for _ in range(4)]
+        self.spins = []
+        for label in self.spin_labels:
+            spin = QSpinBox()
+            spin.setRange(0, 9999)
+            self.spins.append(spin)
+            form.addRow(label, spin)
+        self.size_label = QLabel()
+        self.size_spin = QSpinBox()
+        self.size_spin.setRange(0, 99999)
+        self.size_spin.setSuffix(" GiB")
+        form.addRow(self.size_label, self.size_spin)
+        layout.addLayout(form)
+        self.size_note = QLabel()
+        self.size_note.setWordWrap(True)
+        layout.addWidget(self.size_note)
+
+        self.auto_check = QCheckBox()
+        layout.addWidget(self.auto_check)
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+        self.preview_list = QListWidget()
+        layout.addWidget(self.preview_list)
+
+        button_box = QDialogButtonBox()
+        self.prune_button = button_box.addButton("", QDialogButtonBox.AcceptRole)
+        self.save_button = button_box.addButton("", QDialogButtonBox.ApplyRole)
+        self.cancel_button = button_box.addButton("", QDialogButtonBox.RejectRole)
+        self.prune_button.clicked.connect(self.request_prune)
+        self.save_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def retranslate_ui(self):
+        self.setWindowTitle(self.tr("Política de Retención"))
+        for label, text in zip(self.spin_labels, (self.tr("Conservar los últimos:"),
+                                                  self.tr("Conservar uno por día (días):"),
+                                                  self.tr("Conservar uno por semana (semanas):"),
+                                                  self.tr("Conservar uno por mes (meses):"))):
+            label.setText(text)
+        self.size_label.setText(self.tr("Tamaño máximo de los snapshots (0 = sin límite):"))
+        self.size_note.setText(self.tr("El tamaño máximo usa el análisis de «Uso de disco»: hasta que se haga "
+                                       "uno no se puede editar ni se aplica."))
+        self.auto_check.setText(self.tr("Eliminar automáticamente lo que sobre tras cada listado"))
+        self.prune_button.setText(self.tr("Guardar y eliminar ahora"))
+        self.save_button.setText(self.tr("Guardar"))
+        self.cancel_button.setText(self.tr("Cancelar"))
+        if self.plan is not None:
+            self.update_preview()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
+    def tr(self, text):
+        return QCoreApplication.translate("SnapshotsTab", text)
+
+    def policy(self):
+        return RetentionPolicy(*(spin.value() for spin in self.spins), max_total_size=self.max_total_size)
+
+    def set_max_total_size(self, value):
+        self.max_total_size = value * self.SIZE_UNIT
+        self.update_preview()
+
+    def update_preview(self):
+        # Vista previa en seco: se evalúa la política sin ejecutar nada
+        self.plan = evaluate_retention(self.records, self.policy(), self.pinned, self.sizes)
+        prune = self.plan.prune
+        if not self.policy().enabled:
+            self.summary_label.setText(self.tr("Sin reglas activas: no se eliminará ningún snapshot."))
+        else:
+            self.summary_label.setText(self.tr("Se eliminarán {0} de {1} snapshots ({2} fijados se conservan siempre):")
+                                       .format(len(prune), len(self.records), len(self.pinned)))
+        self.preview_list.clear()
+        self.preview_list.addItems([f"{record.time}  {record.name} ({record.id})"
+                                    for record in prune[:self.PREVIEW_LIMIT]])
+        if len(prune) > self.PREVIEW_LIMIT:
+            self.preview_list.addItem(self.tr("… y {0} más").format(len(prune) - self.PREVIEW_LIMIT))
+        self.prune_button.setEnabled(bool(prune))
+
+    def request_prune(self):
+        self.prune_requested = True
+        self.accept()
+
+class SizeItem(QTableWidgetItem):
+    """Celda que muestra un tamaño legible y ordena por bytes"""
+    def __init__(self, size):
+        super().__init__(format_size(size))
+        self.size = size
+        self.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+    def __lt__(self, other):
+        if isinstance(other, SizeItem):
+            return self.size < other.size
+        return super().__lt__(other)
+
+class DiskUsageDialog(QDialog):
+    """Desglose del uso de disco por raíz: repositorio y despliegues de ostree"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.report = None
+        self.snapshot_names = {}
+        self.busy = False
+        self.setMinimumSize(640, 360)
+        self.setup_ui()
+        self.retranslate_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, 5)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        button_box = QDialogButtonBox()
+        self.analyze_button = button_box.addButton("", QDialogButtonBox.ActionRole)
+        self.close_button = button_box.addButton("", QDialogButtonBox.RejectRole)
+        self.close_button.clicked.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def retranslate_ui(self):
+        self.setWindowTitle(self.tr("Uso de Disco"))
+        self.table.setHorizontalHeaderLabels([self.tr("Raíz"), self.tr("Snapshot"), self.tr("Exclusivo"),
+                                              self.tr("Compartido"), self.tr("Inodos")])
+        self.analyze_button.setText(self.tr("Reanalizar"))
+        self.close_button.setText(self.tr("Cerrar"))
+        self.update_summary()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
+    def tr(self, text):
+        return QCoreApplication.translate("SnapshotsTab", text)
+
+    def set_busy(self):
+        self.busy = True
+        self.analyze_button.setEnabled(False)
+        self.update_summary()
+
+    def set_error(self, message):
+        self.busy = False
+        self.analyze_button.setEnabled(True)
+        self.summary_label.setText(self.tr("No se pudo analizar el uso de disco: {0}").format(message))
+
+    def set_report(self, report, snapshot_names):
+        """snapshot_names: nombre de raíz -> nombre del snapshot que le corresponde"""
+        self.busy = False
+        self.report = report
+        self.snapshot_names = snapshot_names
+        self.analyze_button.setEnabled(True)
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(report.roots))
+        for row, root in enumerate(report.roots):
+            name_item = QTableWidgetItem(root.name)
+            name_item.setToolTip(root.path)
+            self.table.setItem(row, 0, name_item)
+            self.table.setItem(row, 1, QTableWidgetItem(snapshot_names.get(root.name, "")))
+            self.table.setItem(row, 2, SizeItem(root.exclusive))
+            self.table.setItem(row, 3, SizeItem(root.shared))
+            files_item = QTableWidgetItem()
+            files_item.setData(Qt.DisplayRole, root.files)
+            self.table.setItem(row, 4, files_item)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(2, Qt.DescendingOrder)
+        self.update_summary()
+
+    def update_summary(self):
+        if self.busy:
+            self.summary_label.setText(self.tr("Analizando el repositorio de ostree y los despliegues..."))
+        elif self.report is not None:
+            self.summary_label.setText(
+                self.tr("Total sin duplicados: {0}. Exclusivo es lo que se libera al eliminar esa raíz; "
+                        "compartido, lo que usa también alguna otra. ({1} directorios leídos, {2} de caché, {3} ms)")
+                .format(format_size(self.report.total), self.report.scanned_dirs, self.report.cached_dirs,
+                        self.report.elapsed_ms))
+
+class DiffListModel(QAbstractListModel):
+    """Diferencias de un DiffJob; solo crece, por lotes, según llegan"""
+    MARKS = {ADDED: "+", REMOVED: "−"}
+    # Se marcan para lupdate y se traducen al mostrarlos
+    DETAIL_TEXTS = {
+        "content": QT_TRANSLATE_NOOP("SnapshotsTab", "contenido"),
+        "metadata": QT_TRANSLATE_NOOP("SnapshotsTab", "permisos o propietario"),
+        "type": QT_TRANSLATE_NOOP("SnapshotsTab", "tipo de fichero"),
+        "target": QT_TRANSLATE_NOOP("SnapshotsTab", "destino del enlace"),
+        "unreadable": QT_TRANSLATE_NOOP("SnapshotsTab", "no se pudo leer"),
+    }
+
+    def __init__(self, prefix="", parent=None):
+        super().__init__(parent)
+        # Ruta que se antepone a las relativas del diff (p. ej. /usr)
+        self.prefix = prefix
+        self.entries = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.entries):
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            path = os.path.join(self.prefix, entry.path)
+            if entry.detail:
+                return f"~ {path}  ({self.detail_text(entry.detail)})"
+            return f"{self.MARKS.get(entry.kind, '~')} {path}"
+        return None
+
+    @classmethod
+    def detail_text(cls, detail):
+        text = cls.DETAIL_TEXTS.get(detail)
+        return QCoreApplication.translate("SnapshotsTab", text) if text else detail
+
+    def append(self, entries):
+        first = len(self.entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.entries.extend(entries)
+        self.endInsertRows()
+
+class SnapshotDiffDialog(QDialog):
+    """Cambios que aplicaría una acción (p. ej. revertir a un snapshot), mostrados según llegan.
+
+    Sirve de confirmación: "Continuar" acepta el diálogo. Al cerrarlo se
+    cancela la comparación si aún no había terminado.
+    """
+    def __init__(self, diff_job, title, message, prefix="", parent=None):
+        super().__init__(parent)
+        self.diff_job = diff_job
+        self.title = title
+        self.message = message
+        self.counts = {}
+        self.setMinimumSize(640, 420)
+        self.model = DiffListModel(prefix, self)
+        self.setup_ui()
+        self.retranslate_ui()
+
+        diff_job.entriesReceived.connect(self.handle_entries)
+        diff_job.finished.connect(self.handle_finished)
+        self.finished.connect(self.cancel_diff)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        self.message_label = QLabel()
+        self.message_label.setWordWrap(True)
+        layout.addWidget(self.message_label)
+
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        self.diff_view = QListView()
+        self.diff_view.setModel(self.model)
+        # Filas de una línea y altura fija: la vista no mide cada fila
+        self.diff_view.setUniformItemSizes(True)
+        layout.addWidget(self.diff_view)
+
+        button_box = QDialogButtonBox()
+        self.continue_button = button_box.addButton("", QDialogButtonBox.AcceptRole)
+        self.cancel_button = button_box.addButton("", QDialogButtonBox.RejectRole)
+        self.cancel_button.setDefault(True)
+        self.continue_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def retranslate_ui(self):
+        self.setWindowTitle(self.title)
+        self.message_label.setText(self.message)
+        self.continue_button.setText(self.tr("Continuar..."))
+        self.cancel_button.setText(self.tr("Cancelar"))
+        self.update_status()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
+    def tr(self, text):
+        return QCoreApplication.translate("SnapshotsTab", text)
+
+    def handle_entries(self, entries):
+        for entry in entries:
+            self.counts[entry.kind] = self.counts.get(entry.kind, 0) + 1
+        self.model.append(entries)
+        self.update_status()
+
+    def handle_finished(self, diff_job):
+        self.update_status()
+
+    def cancel_diff(self):
+        # No hace nada si la comparación ya terminó
+        self.diff_job.cancel()
+
+    def update_status(self):
+        counts = self.tr("{0} añadidos, {1} eliminados, {2} modificados").format(
+            self.counts.get(ADDED, 0), self.counts.get(REMOVED, 0),
+            len(self.model.entries) - self.counts.get(ADDED, 0) - self.counts.get(REMOVED, 0))
+        if self.diff_job.summary is not None:
+            if not self.model.entries:
+                self.status_label.setText(self.tr("No hay diferencias."))
+            else:
+                self.status_label.setText(self.tr("Comparación terminada: {0}.").format(counts))
+        elif self.diff_job.cancelled:
+            self.status_label.setText(self.tr("Comparación cancelada: {0}.").format(counts))
+        elif self.diff_job.job.done:
+            self.status_label.setText(self.tr("No se pudo completar la comparación: {0}").format(
+                self.diff_job.error or self.tr("error desconocido")))
+        else:
+            self.status_label.setText(self.tr("Comparando... {0}").format(counts))
+
+class SnapshotListModel(QAbstractListModel):
+    """Modelo de la lista de snapshots respaldado por los registros del catálogo.
+
+    Las filas se entregan a la vista por lotes (canFetchMore/fetchMore) y los
+    refrescos emiten solo las inserciones, eliminaciones y cambios necesarios.
+    """
+    IdRole = Qt.UserRole
+    FETCH_BATCH = 256
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.snapshots = []
+        # Filas ya entregadas a la vista
+        self.loaded = 0
+        self.rows_by_id = {}
+        # IDs protegidos por la política de retención
+        self.pinned = set()
+        # ID -> RootUsage del último análisis de disco, si se conoce su raíz
+        self.usage = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        record = self.snapshots[index.row()]
+        if role == Qt.DisplayRole:
+            pin = "★ " if record.id in self.pinned else ""
+            text = f"{pin}{record.name} ({record.id})\n{record.time} - {record.desc}"
+            usage = self.usage.get(record.id)
+            if usage is not None:
+                text += QCoreApplication.translate("SnapshotsTab", "  ·  {0} exclusivo, {1} compartido").format(
+                    format_size(usage.exclusive), format_size(usage.shared))
+            return text
+        if role == self.IdRole:
+            return record.id
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.snapshots)
+
+    def fetchMore(self, parent):
+        # Cada inserción hace que la vista recoloque todas las filas ya cargadas:
+        # con lotes fijos llegar al final de 50k filas cuesta O(n²). Doblando lo
+        # cargado en cada lote son unas pocas inserciones y el total queda en O(n)
+        count = min(max(self.FETCH_BATCH, self.loaded), len(self.snapshots) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def record(self, row):
+        return self.snapshots[row] if 0 <= row < self.loaded else None
+
+    def row_of(self, snapshot_id):
+        return self.rows_by_id.get(snapshot_id, -1)
+
+    def set_pinned(self, pinned):
+        self.pinned = set(pinned)
+        if self.loaded:
+            self.dataChanged.emit(self.index(0), self.index(self.loaded - 1))
+
+    def set_usage(self, usage):
+        self.usage = usage
+        if self.loaded:
+            self.dataChanged.emit(self.index(0), self.index(self.loaded - 1))
+
+    def _rebuild_index(self):
+        self.rows_by_id = {record.id: row for row, record in enumerate(self.snapshots)}
+
+    def set_records(self, records):
+        self.beginResetModel()
+        self.snapshots = list(records)
+        self.loaded = min(max(self.loaded, self.FETCH_BATCH), len(self.snapshots))
+        self._rebuild_index()
+        self.endResetModel()
+
+    def apply_listing(self, records, changed=()):
+        """Lleva el modelo al nuevo listado con señales de grano fino"""
+        new_id_set = set(record.id for record in records)
+
+        # Eliminar, de abajo arriba, los tramos contiguos que ya no existen
+        row = len(self.snapshots) - 1
+        while row >= 0:
+            if self.snapshots[row].id in new_id_set:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and self.snapshots[row].id not in new_id_set:
+                row -= 1
+            start = row + 1
+            if start < self.loaded:
+                visible_end = min(end, self.loaded - 1)
+                self.beginRemoveRows(QModelIndex(), start, visible_end)
+                del self.snapshots[start:end + 1]
+                self.loaded -= visible_end - start + 1
+                self.endRemoveRows()
+            else:
+                del self.snapshots[start:end + 1]
+
+        # Si cambió el orden de los que quedan, un reinicio es lo más simple
+        kept_ids = set(record.id for record in self.snapshots)
+        if [record.id for record in self.snapshots] != [record.id for record in records if record.id in kept_ids]:
+            self.set_records(records)
+            return
+
+        # Insertar en su posición los tramos contiguos nuevos
+        row = 0
+        while row < len(records):
+            if records[row].id in kept_ids:
+                self.snapshots[row] = records[row]
+                row += 1
+                continue
+            start = row
+            while row < len(records) and records[row].id not in kept_ids:
+                row += 1
+            if start < self.loaded or self.loaded == len(self.snapshots):
+                self.beginInsertRows(QModelIndex(), start, row - 1)
+                self.snapshots[start:start] = records[start:row]
+                self.loaded += row - start
+                self.endInsertRows()
+            else:
+                self.snapshots[start:start] = records[start:row]
+        self._rebuild_index()
+
+        for snapshot_id in changed:
+            row = self.rows_by_id.get(snapshot_id, -1)
+            if 0 <= row < self.loaded:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+class SnapshotItemDelegate(QStyledItemDelegate):
+    """Delegado ligero: todas las filas miden lo mismo, así que el tamaño se
+    calcula una sola vez en lugar de maquetar el texto de cada fila."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cached_size = None
+
+    def sizeHint(self, option, index):
+        if self.cached_size is None:
+            self.cached_size = super().sizeHint(option, index)
+        return self.cached_size
+
 class SnapshotsTab(QWidget):
+    # Consultas `snapshot show` simultáneas como máximo durante la precarga
+    PREFETCH_CONCURRENCY = 2
+    # Filas que se precargan si la vista aún no tiene geometría
+    PREFETCH_FALLBACK_ROWS = 20
+    # Snapshots seleccionados recientemente que se mantienen precargados
+    RECENT_SELECTION_SIZE = 8
+    PREFETCH_DELAY_MS = 200
+
     def __init__(self, controller, parent=None):
         super().__init__(parent)
         self.controller = controller
         self.parent = parent
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
+        # Catálogo persistente: se muestra al instante y luego se reconcilia
+        self.catalog = SnapshotCatalog()
+        self.catalog.load()
+        self.snapshot_model = SnapshotListModel(self)
+        # Precarga de detalles: cola por prioridad, consultas en curso y
+        # diálogos abiertos a la espera de sus datos
+        self.prefetch_queue = OrderedDict()
+        self.prefetch_running = set()
+        self.recent_selection = []
+        self.pending_info_dialogs = {}
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(self.PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self.prefetch_visible_details)
+        # Lote de retención en curso; no se lanza otro hasta que termine
+        self.retention_batch = None
+        # IDs que la retención automática ya intentó eliminar; no se reintentan en cada listado
+        self.retention_attempted = set()
+        # Último análisis de uso de disco y su ventana, si está abierta
+        self.disk_usage = None
+        self.disk_usage_dialog = None
         self.setup_ui()
+        self.retranslate_ui()
         self.connect_signals()
-        self.refresh_snapshots()
+        self.populate_from_catalog()
+        # La consulta a la CLI no forma parte de la construcción de la pestaña
+        QTimer.singleShot(0, self.refresh_snapshots)
 
     def tr(self, text):
         """Método wrapper para traducciones"""
@@ -270,21 +827,30 @@ class SnapshotsTab(QWidget):
         snapshot_main_layout.setSpacing(15)
 
         # Lista de snapshots
-        snapshot_list_container = QGroupBox(self.tr("Gestión de Snapshots"))
-        snapshot_list_layout = QVBoxLayout(snapshot_list_container)
+        self.snapshot_list_container = QGroupBox()
+        snapshot_list_layout = QVBoxLayout(self.snapshot_list_container)
 
-        self.snapshot_list = QListWidget()
+        self.snapshot_list = QListView()
+        self.snapshot_list.setObjectName("snapshot_list")
+        self.snapshot_list.setModel(self.snapshot_model)
+        self.snapshot_list.setItemDelegate(SnapshotItemDelegate(self.snapshot_list))
+        self.snapshot_list.setUniformItemSizes(True)
+        self.snapshot_list.setLayoutMode(QListView.Batched)
+        self.snapshot_list.setBatchSize(SnapshotListModel.FETCH_BATCH)
+        self.snapshot_list.setEditTriggers(QListView.NoEditTriggers)
+        # Mayús/Ctrl para seleccionar varios y eliminarlos o modificarlos de una vez
+        self.snapshot_list.setSelectionMode(QListView.ExtendedSelection)
         snapshot_list_layout.addWidget(self.snapshot_list)
 
         # Botones de acciones
         snapshot_action_buttons_layout = QHBoxLayout()
         snapshot_action_buttons_layout.setSpacing(5)  # Reducir espaciado entre botones
 
-        self.btn_create = QPushButton(self.tr("Crear"))
+        self.btn_create = QPushButton()
         self.btn_create.setObjectName("btn_create_snapshot")
         snapshot_action_buttons_layout.addWidget(self.btn_create)
 
-        self.btn_delete = QPushButton(self.tr("Eliminar"))
+        self.btn_delete = QPushButton()
         self.btn_delete.setObjectName("btn_delete_snapshot")
         self.btn_delete.setEnabled(False)
         snapshot_action_buttons_layout.addWidget(self.btn_delete)
@@ -292,7 +858,6 @@ class SnapshotsTab(QWidget):
         # Configurar botón mostrar con icono - TAMAÑO FIJADO
         self.btn_show = QPushButton()
         self.btn_show.setObjectName("btn_show_snapshot")
-        self.btn_show.setToolTip(self.tr("Mostrar Información del Snapshot"))
         self.btn_show.setEnabled(False)
         self.btn_show.setFixedSize(32, 32)  # Tamaño fijo pequeño
         
@@ -302,11 +867,7 @@ class SnapshotsTab(QWidget):
 
         icon_show = QLabel()
         icon_size = 16
-        icon_path = os.path.join(self.parent.current_dir, "resources", "btn-info-snapshot.png")
-        if os.path.exists(icon_path):
-            icon_show.setPixmap(QPixmap(icon_path).scaled(icon_size, icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        else:
-            icon_show.setPixmap(QIcon.fromTheme("dialog-information").pixmap(icon_size, icon_size))
+        icon_show.setPixmap(ICONS.pixmap("btn-info-snapshot", icon_size))
         btn_show_layout.addWidget(icon_show)
         
         snapshot_action_buttons_layout.addWidget(self.btn_show)
@@ -314,7 +875,6 @@ class SnapshotsTab(QWidget):
         # Configurar botón modificar con icono - TAMAÑO FIJADO
         self.btn_modify = QPushButton()
         self.btn_modify.setObjectName("btn_modify_snapshot")
-        self.btn_modify.setToolTip(self.tr("Modificar Snapshot"))
         self.btn_modify.setEnabled(False)
         self.btn_modify.setFixedSize(32, 32)  # Tamaño fijo pequeño
         
@@ -323,11 +883,7 @@ class SnapshotsTab(QWidget):
         btn_modify_layout.setSpacing(2)
         
         icon_modify = QLabel()
-        icon_path = os.path.join(self.parent.current_dir, "resources", "btn-modify-snapshot.png")
-        if os.path.exists(icon_path):
-            icon_modify.setPixmap(QPixmap(icon_path).scaled(icon_size, icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        else:
-            icon_modify.setPixmap(QIcon.fromTheme("document-edit").pixmap(icon_size, icon_size))
+        icon_modify.setPixmap(ICONS.pixmap("btn-modify-snapshot", icon_size))
         btn_modify_layout.addWidget(icon_modify)
         
         snapshot_action_buttons_layout.addWidget(self.btn_modify)
@@ -335,7 +891,6 @@ class SnapshotsTab(QWidget):
         # Configurar botón refrescar con icono - TAMAÑO FIJADO
         self.btn_refresh = QPushButton()
         self.btn_refresh.setObjectName("btn_refresh_list")
-        self.btn_refresh.setToolTip(self.tr("Refrescar Lista de Snapshots"))
         self.btn_refresh.setFixedSize(32, 32)  # Tamaño fijo pequeño
         
         btn_refresh_layout = QHBoxLayout(self.btn_refresh)
@@ -343,162 +898,231 @@ class SnapshotsTab(QWidget):
         btn_refresh_layout.setSpacing(2)
 
         icon_refresh = QLabel()
-        icon_path = os.path.join(self.parent.current_dir, "resources", "btn-refresh-snapshot.png")
-        if os.path.exists(icon_path):
-            icon_refresh.setPixmap(QPixmap(icon_path).scaled(icon_size, icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        else:
-            icon_refresh.setPixmap(QIcon.fromTheme("view-refresh").pixmap(icon_size, icon_size))
+        icon_refresh.setPixmap(ICONS.pixmap("btn-refresh-snapshot", icon_size))
         btn_refresh_layout.addWidget(icon_refresh)
         
         snapshot_action_buttons_layout.addWidget(self.btn_refresh)
 
+        self.btn_pin = QPushButton()
+        self.btn_pin.setObjectName("btn_pin_snapshot")
+        self.btn_pin.setEnabled(False)
+        snapshot_action_buttons_layout.addWidget(self.btn_pin)
+
+        self.btn_retention = QPushButton()
+        self.btn_retention.setObjectName("btn_retention")
+        snapshot_action_buttons_layout.addWidget(self.btn_retention)
+
+        self.btn_disk_usage = QPushButton()
+        self.btn_disk_usage.setObjectName("btn_disk_usage")
+        snapshot_action_buttons_layout.addWidget(self.btn_disk_usage)
+
         # Añadir espaciador para empujar los botones a la izquierda
         snapshot_action_buttons_layout.addStretch(1)
 
-        # Estilos CSS para los botones - AÑADIR ESTILOS ESPECÍFICOS PARA BOTONES PEQUEÑOS
-        button_style = """
-            QPushButton:hover {
-                background-color: #1d8dd8;
-            }
-            QPushButton:pressed {
-                background-color: #0a70b9;
-            }
-            QPushButton:disabled {
-                background-color: #CCCCCC;
-                color: #777777;
-            }
-            /* Estilos específicos para botones pequeños con iconos */
-            #btn_show_snapshot, #btn_modify_snapshot, #btn_refresh_list {
-                min-width: 32px;
-                max-width: 32px;
-                min-height: 32px;
-                max-height: 32px;
-                padding: 0px;
-                margin: 0px;
-            }
-        """
-        
-        self.btn_delete.setStyleSheet(button_style)
-        self.btn_create.setStyleSheet(button_style)
-        self.btn_show.setStyleSheet(button_style)
-        self.btn_modify.setStyleSheet(button_style)
-        self.btn_refresh.setStyleSheet(button_style)
+        # Los estilos de los botones (colores y tamaño de los botones con icono)
+        # están en la hoja del tema, por nombre de objeto
 
         snapshot_list_layout.addLayout(snapshot_action_buttons_layout)
-        snapshot_main_layout.addWidget(snapshot_list_container, 2)
+        snapshot_main_layout.addWidget(self.snapshot_list_container, 2)
 
         # Panel de revertir
-        revert_group = QGroupBox(self.tr("Revertir Sistema a Snapshot"))
-        revert_layout = QVBoxLayout(revert_group)
+        self.revert_group = QGroupBox()
+        revert_layout = QVBoxLayout(self.revert_group)
 
-        self.btn_revert = QPushButton(self.tr("Revertir Ahora"))
+        self.btn_revert = QPushButton()
         self.btn_revert.setEnabled(False)
         revert_layout.addWidget(self.btn_revert, alignment=Qt.AlignCenter)
 
-        revert_explanation = QLabel(self.tr(
+        self.revert_explanation = QLabel()
+        self.revert_explanation.setWordWrap(True)
+        revert_layout.addWidget(self.revert_explanation)
+
+        self.info_link = QLabel()
+        self.info_link.setOpenExternalLinks(True)
+        revert_layout.addWidget(self.info_link)
+
+        self.revert_group.setMinimumWidth(280)
+        snapshot_main_layout.addWidget(self.revert_group, 1)
+
+    def retranslate_ui(self):
+        self.snapshot_list_container.setTitle(self.tr("Gestión de Snapshots"))
+        self.btn_create.setText(self.tr("Crear"))
+        self.btn_delete.setText(self.tr("Eliminar"))
+        self.btn_show.setToolTip(self.tr("Mostrar Información del Snapshot"))
+        self.btn_modify.setToolTip(self.tr("Modificar Snapshot"))
+        self.btn_refresh.setToolTip(self.tr("Refrescar Lista de Snapshots"))
+        self.btn_pin.setText(self.tr("Fijar"))
+        self.btn_pin.setToolTip(self.tr("Fija o libera los snapshots seleccionados: los fijados nunca se eliminan por retención"))
+        self.btn_retention.setText(self.tr("Retención"))
+        self.btn_disk_usage.setText(self.tr("Uso de disco"))
+        self.btn_disk_usage.setToolTip(self.tr("Espacio exclusivo y compartido del repositorio de ostree y de cada despliegue"))
+        self.revert_group.setTitle(self.tr("Revertir Sistema a Snapshot"))
+        self.btn_revert.setText(self.tr("Revertir Ahora"))
+        self.revert_explanation.setText(self.tr(
             "Revertir el sistema a un snapshot restaurará el estado del sistema al momento en que se creó ese snapshot. "
             "Esto eliminará permanentemente todos los cambios realizados posteriormente. "
             "Esta operación es irreversible y requerirá un reinicio inmediato del equipo."
         ))
-        revert_explanation.setWordWrap(True)
-        revert_layout.addWidget(revert_explanation)
 
-        # --- INICIO DE LA MODIFICACIÓN ---
         # Definir los estilos del enlace
         link_style = "style='color:#2ECC71; text-decoration:none;'"
         hover_style = ("onmouseover=\"this.style.color='#27AE60'; this.style.textDecoration='underline'\" "
                      "onmouseout=\"this.style.color='#2ECC71'; this.style.textDecoration='none'\"")
 
         # Aplicar los estilos al HTML del enlace
-        info_link_text = self.tr(
+        self.info_link.setText(self.tr(
             '<a href="https://xn--deepinenespaol-1nb.org/noticias/solido-como-acceder-a-root-en-v25/" {0} {1}>Más información</a>'
-        ).format(link_style, hover_style)
-        
-        info_link = QLabel(info_link_text)
-        info_link.setOpenExternalLinks(True)
-        revert_layout.addWidget(info_link)
-        # --- FIN DE LA MODIFICACIÓN ---
+        ).format(link_style, hover_style))
 
-        revert_group.setMinimumWidth(280)
-        snapshot_main_layout.addWidget(revert_group, 1)
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
 
     def connect_signals(self):
-        self.snapshot_list.itemSelectionChanged.connect(self.enable_snapshot_buttons)
+        self.snapshot_list.selectionModel().selectionChanged.connect(lambda *args: self.handle_selection_changed())
+        self.snapshot_list.verticalScrollBar().valueChanged.connect(lambda *args: self.prefetch_timer.start())
         self.btn_create.clicked.connect(self.show_create_snapshot_dialog)
         self.btn_delete.clicked.connect(self.confirm_delete_snapshot)
         self.btn_show.clicked.connect(self.show_snapshot_info)
         self.btn_modify.clicked.connect(self.show_modify_snapshot_dialog)
-        self.btn_refresh.clicked.connect(self.refresh_snapshots)
+        self.btn_refresh.clicked.connect(lambda: self.refresh_snapshots(use_cache=False))
         self.btn_revert.clicked.connect(self.confirm_revert_snapshot)
+        self.btn_pin.clicked.connect(self.toggle_pinned)
+        self.btn_retention.clicked.connect(self.show_retention_dialog)
+        self.btn_disk_usage.clicked.connect(self.show_disk_usage_dialog)
 
-    def refresh_snapshots(self):
-        self.snapshot_list.clear()
-        output = self.controller.execute_command(
-            "deepin-immutable-ctl snapshot list", 
-            show_in_console=False
+    def refresh_snapshots(self, use_cache=True):
+        # La lista se rellena cuando responde la CLI, sin bloquear la interfaz
+        self.controller.query_async(
+            SNAPSHOT_LIST_COMMAND,
+            self.populate_snapshots,
+            use_cache=use_cache
         )
 
-        lines = output.split('\n')
-        if len(lines) > 1:
-            for line in lines[1:]:
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        snapshot_id = parts[0]
-                        name = parts[1]
-                        time = ' '.join(parts[2:4])
-                        desc = ' '.join(parts[4:]) if len(parts) > 4 else ''
-                        item_text = f"{name} ({snapshot_id})\n{time} - {desc}"
-                        self.snapshot_list.addItem(item_text)
+    def populate_from_catalog(self):
+        self.snapshot_model.pinned = self.pinned_ids()
+        self.snapshot_model.set_records(self.catalog.records())
         self.enable_snapshot_buttons()
 
+    def populate_snapshots(self, output):
+        records = parse_snapshot_list(output)
+        if records is None:
+            # La consulta falló: se mantiene la última lista conocida
+            return
+
+        added, removed, changed = self.catalog.apply_listing(records)
+        # Tras cada listado se precargan los detalles de lo que está a la vista
+        self.prefetch_timer.start()
+        if self.catalog.dirty:
+            self.catalog.save()
+            # Actualización incremental: solo se tocan las filas que cambian
+            self.snapshot_model.apply_listing(self.catalog.records(), changed)
+            self.enable_snapshot_buttons()
+            self.apply_disk_usage()
+        self.auto_prune()
+
+    def handle_selection_changed(self):
+        self.enable_snapshot_buttons()
+        snapshot_id = self.get_selected_snapshot_id()
+        if not snapshot_id:
+            return
+        if snapshot_id in self.recent_selection:
+            self.recent_selection.remove(snapshot_id)
+        self.recent_selection.insert(0, snapshot_id)
+        del self.recent_selection[self.RECENT_SELECTION_SIZE:]
+        self.schedule_prefetch([snapshot_id], urgent=True)
+
+    def visible_snapshot_ids(self):
+        """IDs de las filas que se ven ahora mismo en la lista"""
+        model = self.snapshot_model
+        viewport = self.snapshot_list.viewport()
+        top = self.snapshot_list.indexAt(QPoint(0, 0))
+        if not top.isValid() or not viewport.isVisible():
+            rows = range(min(model.rowCount(), self.PREFETCH_FALLBACK_ROWS))
+        else:
+            bottom = self.snapshot_list.indexAt(QPoint(0, viewport.height() - 1))
+            last = bottom.row() if bottom.isValid() else model.rowCount() - 1
+            rows = range(top.row(), last + 1)
+        return [model.record(row).id for row in rows]
+
+    def prefetch_visible_details(self):
+        self.schedule_prefetch(self.recent_selection + self.visible_snapshot_ids())
+
+    def schedule_prefetch(self, snapshot_ids, urgent=False):
+        """Encola la consulta de detalles de los snapshots que aún no los tienen.
+
+        Los urgentes (selección, diálogo abierto) se adelantan al resto.
+        """
+        for snapshot_id in reversed(snapshot_ids) if urgent else snapshot_ids:
+            if (snapshot_id not in self.catalog or self.catalog.get_details(snapshot_id)
+                    or snapshot_id in self.prefetch_running):
+                continue
+            self.prefetch_queue[snapshot_id] = None
+            if urgent:
+                self.prefetch_queue.move_to_end(snapshot_id, last=False)
+        self.run_prefetch()
+
+    def run_prefetch(self):
+        while self.prefetch_queue and len(self.prefetch_running) < self.PREFETCH_CONCURRENCY:
+            snapshot_id, _ = self.prefetch_queue.popitem(last=False)
+            if snapshot_id not in self.catalog or self.catalog.get_details(snapshot_id):
+                continue
+            self.prefetch_running.add(snapshot_id)
+            self.controller.query_async(
+                snapshot_command("show", snapshot_id),
+                lambda output, snapshot_id=snapshot_id: self.handle_details_fetched(snapshot_id, output)
+            )
+
+    def handle_details_fetched(self, snapshot_id, output):
+        self.prefetch_running.discard(snapshot_id)
+        details = parse_snapshot_details(output)
+        if details:
+            self.catalog.set_details(snapshot_id, details)
+
+        dialog = self.pending_info_dialogs.pop(snapshot_id, None)
+        if dialog:
+            dialog.set_snapshot_info(details or self.listing_snapshot_info(snapshot_id))
+
+        self.run_prefetch()
+        # Se guarda una sola vez al vaciarse la cola, no por cada snapshot
+        if not self.prefetch_queue and not self.prefetch_running and self.catalog.dirty:
+            self.catalog.save()
+
     def get_selected_snapshot_id(self):
-        current_item = self.snapshot_list.currentItem()
-        if current_item:
-            text = current_item.text()
-            start = text.find("(") + 1
-            end = text.find(")")
-            if start > 0 and end > start:
-                return text[start:end]
+        """ID del snapshot seleccionado, o None si no hay exactamente uno"""
+        selected = self.snapshot_list.selectionModel().selectedIndexes()
+        if len(selected) == 1:
+            return selected[0].data(SnapshotListModel.IdRole)
         return None
 
+    def get_selected_snapshot_ids(self):
+        """IDs seleccionados en el orden de la lista"""
+        rows = sorted(index.row() for index in self.snapshot_list.selectionModel().selectedIndexes())
+        return [self.snapshot_model.record(row).id for row in rows]
+
     def get_selected_snapshot_info(self):
-        """Obtiene información detallada del snapshot seleccionado"""
+        """Detalles del snapshot seleccionado si ya están en el catálogo"""
         snapshot_id = self.get_selected_snapshot_id()
         if not snapshot_id:
             return None
+        return self.catalog.get_details(snapshot_id)
 
-        output = self.controller.execute_command(
-            f'deepin-immutable-ctl snapshot show "{snapshot_id}"',
-            show_in_console=False
-        )
-
-        # Parsear la información del snapshot
-        snapshot_info = {'id': snapshot_id}
-        lines = output.split('\n')
-        for line in lines:
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                if key == 'ID':
-                    snapshot_info['id'] = value
-                elif key == 'Name':
-                    snapshot_info['name'] = value
-                elif key == 'Time':
-                    snapshot_info['time'] = value
-                elif key == 'Desc':
-                    snapshot_info['desc'] = value
-
-        return snapshot_info
+    def listing_snapshot_info(self, snapshot_id, placeholder=None):
+        """Información del listado para un snapshot sin detalles"""
+        record = self.catalog.get(snapshot_id)
+        if not record:
+            return SnapshotRecord(snapshot_id)
+        return SnapshotRecord(record.id, record.name, record.time, placeholder or record.desc)
 
     def enable_snapshot_buttons(self):
-        selected = self.snapshot_list.currentItem() is not None
-        self.btn_delete.setEnabled(selected)
-        self.btn_show.setEnabled(selected)
-        self.btn_modify.setEnabled(selected)
-        self.btn_revert.setEnabled(selected)
+        count = len(self.snapshot_list.selectionModel().selectedIndexes())
+        # Eliminar y modificar admiten varios snapshots; ver y revertir, solo uno
+        self.btn_delete.setEnabled(count > 0)
+        self.btn_modify.setEnabled(count > 0)
+        self.btn_show.setEnabled(count == 1)
+        self.btn_revert.setEnabled(count == 1)
+        self.btn_pin.setEnabled(count > 0)
 
     def confirm_action(self, title, message, command, show_console=True, requires_reboot=False):
         """Wrapper para usar el confirm_action de la ventana principal"""
@@ -543,12 +1167,13 @@ class SnapshotsTab(QWidget):
         def create_snapshot():
             name = name_edit.text().strip()
             description = desc_edit.text().strip()
+            # El nombre y la descripción son posicionales: sin nombre, la descripción pasaría a serlo
+            if description and not name:
+                QMessageBox.warning(dialog, self.tr("Advertencia"),
+                                    self.tr("Indica un nombre para poder añadir una descripción"))
+                return
             
-            command = "pkexec deepin-immutable-ctl snapshot create"
-            if name:
-                command += f' "{name}"'
-            if description:
-                command += f' "{description}"'
+            command = build_full_command(snapshot_command("create", *[arg for arg in (name, description) if arg]))
             
             self.confirm_action(
                 self.tr("Confirmar Creación de Snapshot"),
@@ -564,6 +1189,10 @@ class SnapshotsTab(QWidget):
         dialog.exec()
 
     def show_modify_snapshot_dialog(self):
+        snapshot_ids = self.get_selected_snapshot_ids()
+        if len(snapshot_ids) > 1:
+            self.show_bulk_modify_dialog(snapshot_ids)
+            return
         snapshot_id = self.get_selected_snapshot_id()
         if not snapshot_id:
             QMessageBox.warning(self, self.tr("Advertencia"), self.tr("Selecciona un snapshot primero"))
@@ -600,17 +1229,20 @@ class SnapshotsTab(QWidget):
             name = name_edit.text().strip()
             description = desc_edit.text().strip()
             
-            command_parts = [f'pkexec deepin-immutable-ctl snapshot modify "{snapshot_id}"']
-            if name:
-                command_parts.append(f'"{name}"')
-            if description:
-                command_parts.append(f'"{description}"')
+            if description and not name:
+                # Nombre y descripción son posicionales: se repite el nombre actual
+                record = self.catalog.get(snapshot_id)
+                name = record.name if record else ""
+                if not name:
+                    QMessageBox.warning(dialog, self.tr("Advertencia"),
+                                        self.tr("Indica un nombre para poder añadir una descripción"))
+                    return
 
-            if len(command_parts) > 1:
+            if name or description:
                 self.confirm_action(
                     self.tr("Confirmar Modificación"),
                     self.tr("¿Modificar snapshot {}?").format(snapshot_id),
-                    " ".join(command_parts),
+                    build_full_command(snapshot_command("modify", snapshot_id, *[arg for arg in (name, description) if arg])),
                     requires_reboot=False
                 )
             dialog.accept()
@@ -621,29 +1253,268 @@ class SnapshotsTab(QWidget):
         dialog.exec()
 
     def show_snapshot_info(self):
+        snapshot_id = self.get_selected_snapshot_id()
+        if not snapshot_id:
+            QMessageBox.warning(self, self.tr("Error"), self.tr("No se pudo obtener la información del snapshot"))
+            return
+
         snapshot_info = self.get_selected_snapshot_info()
         if snapshot_info:
             dialog = SnapshotInfoDialog(self, snapshot_info)
-            dialog.exec()
         else:
-            QMessageBox.warning(self, self.tr("Error"), self.tr("No se pudo obtener la información del snapshot"))
+            # Se abre al momento con los datos del listado y se completa
+            # cuando responde `snapshot show`
+            dialog = SnapshotInfoDialog(self, self.listing_snapshot_info(snapshot_id, self.tr("Cargando...")))
+            self.pending_info_dialogs[snapshot_id] = dialog
+            self.schedule_prefetch([snapshot_id], urgent=True)
+        dialog.exec()
+        self.pending_info_dialogs.pop(snapshot_id, None)
+
+    def ask_confirmation(self, title, message):
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle(title)
+        msg_box.setText(message)
+        yes_button = msg_box.addButton(self.tr("Sí"), QMessageBox.ButtonRole.YesRole)
+        no_button = msg_box.addButton(self.tr("No"), QMessageBox.ButtonRole.NoRole)
+        msg_box.setDefaultButton(no_button)
+        msg_box.exec()
+        return msg_box.clickedButton() == yes_button
+
+    def validate_bulk_selection(self, snapshot_ids):
+        """Comprueba el conjunto entero antes de lanzar nada. Devuelve un mensaje de error o None."""
+        if len(set(snapshot_ids)) != len(snapshot_ids):
+            return self.tr("La selección contiene snapshots repetidos")
+        missing = [snapshot_id for snapshot_id in snapshot_ids if snapshot_id not in self.catalog]
+        if missing:
+            return self.tr("Estos snapshots ya no existen: {0}").format(", ".join(missing))
+        return None
+
+    def run_bulk_operation(self, operations, snapshot_ids, title, item_text):
+        error = self.validate_bulk_selection(snapshot_ids)
+        if error is None:
+            try:
+                batch = self.controller.submit_batch(operations)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            QMessageBox.warning(self, self.tr("Error"), error)
+            return
+        # La lista se refresca una sola vez, cuando el lote termina e invalida la caché
+        BulkOperationDialog(batch, title, item_text, snapshot_ids, self).exec()
+
+    def confirm_bulk_delete(self, snapshot_ids):
+        if not self.ask_confirmation(
+                self.tr("Confirmar Eliminación"),
+                self.tr("¿Eliminar {0} snapshots?\n\n{1}").format(len(snapshot_ids), self.summarize_ids(snapshot_ids))):
+            return
+        self.run_bulk_operation(
+            [("snapshot.delete", {"id": snapshot_id}) for snapshot_id in snapshot_ids],
+            snapshot_ids,
+            self.tr("Eliminando snapshots"),
+            self.tr("Eliminando {0} ({1} de {2})")
+        )
+
+    def show_bulk_modify_dialog(self, snapshot_ids):
+        dialog = QDialog(self)
+        dialog.setWindowTitle(self.tr("Modificar Snapshots"))
+        dialog.setMinimumWidth(400)
+        layout = QVBoxLayout(dialog)
+
+        desc_label = QLabel(self.tr("Nueva descripción para {0} snapshots (se mantiene el nombre de cada uno):").format(
+            len(snapshot_ids)))
+        desc_label.setWordWrap(True)
+        layout.addWidget(desc_label)
+        desc_edit = QLineEdit()
+        layout.addWidget(desc_edit)
+
+        button_box = QDialogButtonBox()
+        button_box.addButton(self.tr("Modificar"), QDialogButtonBox.AcceptRole)
+        button_box.addButton(self.tr("Cancelar"), QDialogButtonBox.RejectRole)
+        button_box.accepted.connect(dialog.accept)
+        button_box.rejected.connect(dialog.reject)
+        layout.addWidget(button_box)
+
+        description = desc_edit.text().strip() if dialog.exec() == QDialog.Accepted else ""
+        if not description:
+            return
+        # Nombre y descripción son posicionales: se repite el nombre actual, y
+        # los snapshots sin nombre no pueden recibir solo una descripción
+        names, unnamed = {}, []
+        for snapshot_id in snapshot_ids:
+            record = self.catalog.get(snapshot_id)
+            if record and record.name:
+                names[snapshot_id] = record.name
+            else:
+                unnamed.append(snapshot_id)
+        if unnamed:
+            QMessageBox.warning(self, self.tr("Advertencia"),
+                                self.tr("Se omiten los snapshots sin nombre: {}").format(", ".join(unnamed)))
+            snapshot_ids = [snapshot_id for snapshot_id in snapshot_ids if snapshot_id in names]
+            if not snapshot_ids:
+                return
+        operations = [("snapshot.modify", {"id": snapshot_id, "name": names[snapshot_id], "desc": description})
+                      for snapshot_id in snapshot_ids]
+        self.run_bulk_operation(operations, snapshot_ids, self.tr("Modificando snapshots"),
+                                self.tr("Modificando {0} ({1} de {2})"))
+
+    def pinned_ids(self):
+        return set(self.parent.config.get("retention_pinned"))
+
+    def retention_policy(self):
+        return RetentionPolicy.from_dict(self.parent.config.get("retention_policy"))
+
+    def snapshot_sizes(self):
+        """Tamaños para max_total_size a partir del último análisis de uso de disco; None si no lo hay"""
+        if self.disk_usage is None:
+            return None
+        return self.disk_usage.snapshot_sizes(self.catalog.index)
+
+    def toggle_pinned(self):
+        """Fija los seleccionados o, si ya lo estaban todos, los libera"""
+        snapshot_ids = self.get_selected_snapshot_ids()
+        pinned = self.pinned_ids()
+        if all(snapshot_id in pinned for snapshot_id in snapshot_ids):
+            pinned.difference_update(snapshot_ids)
+        else:
+            pinned.update(snapshot_ids)
+        # Los IDs que ya no existen se descartan al guardar
+        self.parent.config.set("retention_pinned", sorted(pinned & set(self.catalog.index)))
+        self.snapshot_model.set_pinned(pinned)
+
+    def show_retention_dialog(self):
+        dialog = RetentionDialog(self.catalog.records(), self.retention_policy(), self.pinned_ids(),
+                                 self.parent.config.get("retention_auto"), self.snapshot_sizes(), self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        self.parent.config.set("retention_policy", dialog.policy().to_dict())
+        self.parent.config.set("retention_auto", dialog.auto_check.isChecked())
+        if dialog.prune_requested:
+            self.run_retention(show_progress=True)
+
+    def run_retention(self, show_progress=False):
+        """Elimina lo que sobra según la política, como un lote de baja prioridad"""
+        if self.retention_batch is not None:
+            return
+        plan = evaluate_retention(self.catalog.records(), self.retention_policy(), self.pinned_ids(),
+                                  self.snapshot_sizes())
+        snapshot_ids = plan.prune_ids()
+        if not show_progress:
+            snapshot_ids = [snapshot_id for snapshot_id in snapshot_ids if snapshot_id not in self.retention_attempted]
+        if not snapshot_ids:
+            return
+        try:
+            batch = self.controller.submit_batch(
+                [("snapshot.delete", {"id": snapshot_id}) for snapshot_id in snapshot_ids],
+                priority=self.controller.scheduler.PRIORITY_LOW)
+        except ValueError as e:
+            QMessageBox.warning(self, self.tr("Error"), str(e))
+            return
+        self.retention_batch = batch
+        batch.finished.connect(lambda batch: self.handle_retention_finished(batch, snapshot_ids))
+        if show_progress:
+            # Sin bloquear: el lote sigue en segundo plano aunque se cierre el diálogo
+            dialog = BulkOperationDialog(batch, self.tr("Aplicando retención"), self.tr("Eliminando {0} ({1} de {2})"),
+                                         snapshot_ids, self)
+            dialog.setAttribute(Qt.WA_DeleteOnClose)
+            dialog.show()
+
+    def handle_retention_finished(self, batch, snapshot_ids):
+        self.retention_batch = None
+        # Solo los que llegaron a ejecutarse: si el lote no arrancó o se canceló, el resto se reintenta
+        self.retention_attempted.update(snapshot_ids[index] for index, result in enumerate(batch.results)
+                                        if result is not None)
+        failed = [snapshot_ids[index] for index in batch.failed]
+        if failed:
+            print(f"Retención: no se pudieron eliminar {', '.join(failed)}")
+
+    def auto_prune(self):
+        if self.parent.config.get("retention_auto"):
+            self.run_retention()
+
+    def show_disk_usage_dialog(self):
+        if self.disk_usage_dialog is None:
+            self.disk_usage_dialog = DiskUsageDialog(self)
+            self.disk_usage_dialog.analyze_button.clicked.connect(self.analyze_disk_usage)
+        dialog = self.disk_usage_dialog
+        dialog.show()
+        dialog.raise_()
+        if self.disk_usage is None and not dialog.busy:
+            self.analyze_disk_usage()
+
+    def analyze_disk_usage(self):
+        if self.disk_usage_dialog is not None:
+            self.disk_usage_dialog.set_busy()
+        self.controller.analyze_disk_usage(self.handle_disk_usage)
+
+    def handle_disk_usage(self, output):
+        output, _, error = output.partition(ERROR_SEPARATOR)
+        try:
+            report = DiskUsageReport.from_dict(json.loads(output))
+        except (ValueError, AttributeError):
+            message = error.strip() or output.strip()
+            print(f"Error analizando el uso de disco: {message}")
+            if self.disk_usage_dialog is not None:
+                self.disk_usage_dialog.set_error(message)
+            return
+        self.disk_usage = report
+        self.apply_disk_usage()
+
+    def apply_disk_usage(self):
+        """Asocia cada snapshot a su raíz analizada y actualiza la lista y el desglose"""
+        report = self.disk_usage
+        if report is None:
+            return
+        usage = {}
+        snapshot_names = {}
+        for record in self.catalog.records():
+            root = report.match_snapshot(record.id)
+            if root is not None:
+                usage[record.id] = root
+                snapshot_names[root.name] = record.name or record.id
+        self.snapshot_model.set_usage(usage)
+        if self.disk_usage_dialog is not None:
+            self.disk_usage_dialog.set_report(report, snapshot_names)
+
+    @staticmethod
+    def summarize_ids(snapshot_ids, limit=10):
+        shown = "\n".join(snapshot_ids[:limit])
+        if len(snapshot_ids) > limit:
+            shown += f"\n… (+{len(snapshot_ids) - limit})"
+        return shown
 
     def confirm_delete_snapshot(self):
+        snapshot_ids = self.get_selected_snapshot_ids()
+        if len(snapshot_ids) > 1:
+            self.confirm_bulk_delete(snapshot_ids)
+            return
         snapshot_id = self.get_selected_snapshot_id()
         if snapshot_id:
             self.confirm_action(
                 self.tr("Confirmar Eliminación"),
                 self.tr("¿Eliminar snapshot {}?").format(snapshot_id),
-                f'pkexec deepin-immutable-ctl snapshot delete "{snapshot_id}"',
+                build_full_command(snapshot_command("delete", snapshot_id)),
                 requires_reboot=False
             )
 
+    def preview_revert(self, snapshot_id):
+        """Muestra qué cambiaría en /usr al revertir. False si el usuario lo cancela.
+
+        El despliegue del snapshot lo busca el propio proceso del diff, fuera
+        del hilo de la interfaz; si no está en disco, el diálogo lo indica y
+        se puede continuar igualmente.
+        """
+        dialog = SnapshotDiffDialog(
+            self.controller.diff_trees("live", snapshot_id), self.tr("Cambios al Revertir"),
+            self.tr("Estos son los cambios en /usr entre el sistema actual y el snapshot {0}. "
+                    "Revisa la lista antes de continuar.").format(snapshot_id), "/usr", self)
+        return dialog.exec() == QDialog.Accepted
+
     def confirm_revert_snapshot(self):
         snapshot_id = self.get_selected_snapshot_id()
-        if snapshot_id:
+        if snapshot_id and self.preview_revert(snapshot_id):
             self.confirm_action(
                 self.tr("Confirmar Reversión"),
                 self.tr("¡ADVERTENCIA! Revertir a {} es irreversible. Esta acción requerirá un reinicio inmediato del sistema.").format(snapshot_id),
-                f'pkexec deepin-immutable-ctl snapshot rollback "{snapshot_id}"',
+                build_full_command(snapshot_command("rollback", snapshot_id)),
                 requires_reboot=True
             )
\ No newline at end of file
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+def process_age():
+    """Segundos desde que se creó el proceso, según /proc (resolución de un tick)"""
+    try:
+        with open("/proc/self/stat") as f:
+            # Los campos tras el nombre del ejecutable empiezan en el 3; starttime es el 22
+            start_ticks = int(f.read().rpartition(")")[2].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfiler:
+    """Registra la duración de cada fase del arranque (--profile-startup).
+
+    Desactivado no hace nada, así que las llamadas pueden quedarse en el
+    camino de arranque normal. Las fases se miden con mark(), que cierra la
+    fase iniciada al terminar la anterior, o con phase(), que puede anidarse.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        # Tiempo entre la creación del proceso y la primera línea de main.py
+        self.interpreter_time = process_age() if enabled else None
+        # (nombre, inicio relativo, duración, profundidad)
+        self.phases = []
+        self.last = self.origin
+        self.depth = 0
+        self.reported = False
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, self.last - self.origin, now - self.last, self.depth))
+        self.last = now
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            end = time.perf_counter()
+            self.phases.append((name, start - self.origin, end - start, self.depth))
+            self.last = end
+
+    def report(self, stream=None):
+        """Imprime el informe una sola vez, ordenado por el inicio de cada fase"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        stream = stream or sys.stderr
+
+        total = time.perf_counter() - self.origin
+        print("Perfil de arranque (ms)", file=stream)
+        print(f"  {'fase':<34}{'inicio':>10}{'duración':>10}", file=stream)
+        if self.interpreter_time is not None:
+            interpreter_ms = self.interpreter_time * 1000
+            print(f"  {'intérprete de Python':<34}{-interpreter_ms:>10.1f}{interpreter_ms:>10.1f}", file=stream)
+            total += self.interpreter_time
+        for name, start, duration, depth in sorted(self.phases, key=lambda phase: (phase[1], phase[3])):
+            label = "  " * depth + name
+            print(f"  {label:<34}{start * 1000:>10.1f}{duration * 1000:>10.1f}", file=stream)
+        print(f"  {'total':<34}{'':>10}{total * 1000:>10.1f}", file=stream)
+        stream.flush()
@@ -1,14 +1,157 @@
 #!/usr/bin/env python3
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, 
-                              QPushButton, QLabel, QFrame, QGridLayout)
-from PySide6.QtCore import Qt
+                              QPushButton, QLabel, QFrame, QGridLayout, QDialog,
+                              QDialogButtonBox, QListView)
+from PySide6.QtCore import Qt, QTimer, QEvent, QAbstractListModel, QModelIndex, QCoreApplication
+from resources.parsers import parse_status
+from resources.commands import STATUS_COMMAND
+from resources.diskusage import format_size
+from resources.overlay import split_overlay_dirs
+from resources.diffentry import ADDED, REMOVED
+
+class OverlayChangesModel(QAbstractListModel):
+    """Cambios de la capa escribible según llegan; solo crece, por lotes"""
+    MARKS = {ADDED: "+", REMOVED: "−"}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.entries):
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            text = f"{self.MARKS.get(entry.kind, '~')} {entry.path}"
+            if entry.detail == "opaque":
+                text += "  " + QCoreApplication.translate("StatusTab", "(sustituye al directorio original)")
+            elif entry.size is not None:
+                text += f"  ({format_size(entry.size)})"
+            return text
+        return None
+
+    def append(self, entries):
+        first = len(self.entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.entries.extend(entries)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.entries = []
+        self.endResetModel()
+
+class OverlayChangesDialog(QDialog):
+    """Lo escrito en los overlays y aún no desplegado, con su tamaño"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.diff_job = None
+        self.counts = {}
+        self.size = 0
+        self.setMinimumSize(640, 420)
+        self.model = OverlayChangesModel(self)
+        self.setup_ui()
+        self.retranslate_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        self.changes_view = QListView()
+        self.changes_view.setModel(self.model)
+        self.changes_view.setUniformItemSizes(True)
+        layout.addWidget(self.changes_view)
+
+        button_box = QDialogButtonBox()
+        self.rescan_button = button_box.addButton("", QDialogButtonBox.ActionRole)
+        self.close_button = button_box.addButton("", QDialogButtonBox.RejectRole)
+        self.close_button.clicked.connect(self.reject)
+        layout.addWidget(button_box)
+        # Al cerrar se cancela el análisis en curso
+        self.finished.connect(self.cancel_scan)
+
+    def retranslate_ui(self):
+        self.setWindowTitle(self.tr("Cambios Pendientes en Overlay"))
+        self.rescan_button.setText(self.tr("Reanalizar"))
+        self.close_button.setText(self.tr("Cerrar"))
+        self.update_status()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
+
+    def tr(self, text):
+        return QCoreApplication.translate("StatusTab", text)
+
+    def set_job(self, diff_job):
+        self.cancel_scan()
+        self.diff_job = diff_job
+        self.counts = {}
+        self.size = 0
+        self.model.clear()
+        self.rescan_button.setEnabled(False)
+        diff_job.entriesReceived.connect(self.handle_entries)
+        diff_job.finished.connect(self.handle_finished)
+        self.update_status()
+
+    def cancel_scan(self):
+        if self.diff_job is not None:
+            self.diff_job.cancel()
+
+    def handle_entries(self, entries):
+        for entry in entries:
+            self.counts[entry.kind] = self.counts.get(entry.kind, 0) + 1
+            self.size += entry.size or 0
+        self.model.append(entries)
+        self.update_status()
+
+    def handle_finished(self, diff_job):
+        self.rescan_button.setEnabled(True)
+        self.update_status()
+
+    def update_status(self):
+        job = self.diff_job
+        if job is None:
+            self.status_label.setText("")
+            return
+        counts = self.tr("{0} añadidos, {1} eliminados, {2} modificados ({3} escritos)").format(
+            self.counts.get(ADDED, 0), self.counts.get(REMOVED, 0),
+            len(self.model.entries) - self.counts.get(ADDED, 0) - self.counts.get(REMOVED, 0),
+            format_size(self.size))
+        summary = job.summary
+        if summary is None:
+            if job.cancelled:
+                self.status_label.setText(self.tr("Análisis cancelado: {0}.").format(counts))
+            elif job.job.done:
+                self.status_label.setText(self.tr("No se pudo analizar la capa escribible: {0}").format(
+                    job.error or self.tr("error desconocido")))
+            else:
+                self.status_label.setText(self.tr("Analizando... {0}").format(counts))
+            return
+        if not summary.get("mounts"):
+            self.status_label.setText(self.tr("No hay ningún overlay escribible montado."))
+            return
+        text = self.tr("Pendiente de desplegar en {0}: {1}.").format(
+            ", ".join(mount["target"] for mount in summary["mounts"]), counts)
+        if summary.get("errors"):
+            text += "\n" + self.tr("No se pudo leer: {0}. Es posible que haga falta ejecutarlo como root.").format(
+                "; ".join(summary["errors"]))
+        self.status_label.setText(text)
 
 class StatusTab(QWidget):
     def __init__(self, controller, parent=None):
         super().__init__(parent)
         self.controller = controller
         self.parent = parent
+        # Último estado mostrado, para no reescribir etiquetas sin cambios
+        self.last_status = None
         self.create_ui()
         
     def create_ui(self):
@@ -16,41 +159,41 @@ class StatusTab(QWidget):
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(15)
 
-        status_group = QGroupBox(self.tr("Estado Actual del Sistema Inmutable"))
-        status_group_layout = QVBoxLayout(status_group)
+        self.status_group = QGroupBox()
+        status_group_layout = QVBoxLayout(self.status_group)
         
-        self.status_label = QLabel(self.tr("Cargando estado..."))
+        self.status_label = QLabel()
         self.status_label.setObjectName("status_label")
         self.status_label.setAlignment(Qt.AlignCenter)
         status_group_layout.addWidget(self.status_label)
 
-        btn_check_status = QPushButton(self.tr("Actualizar Estado"))
-        btn_check_status.clicked.connect(self.check_immutable_status)
-        status_group_layout.addWidget(btn_check_status, alignment=Qt.AlignCenter)
+        self.btn_check_status = QPushButton()
+        self.btn_check_status.clicked.connect(lambda: self.check_immutable_status(use_cache=False))
+        status_group_layout.addWidget(self.btn_check_status, alignment=Qt.AlignCenter)
 
         status_group_layout.addWidget(self.create_separator())
 
         # Grupo para parámetros de configuración
-        params_group = QGroupBox(self.tr("Parámetros de Configuración"))
-        params_layout = QGridLayout(params_group)
+        self.params_group = QGroupBox()
+        params_layout = QGridLayout(self.params_group)
         params_layout.setVerticalSpacing(5)
         params_layout.setHorizontalSpacing(15)
 
         # Etiquetas para los parámetros
-        self.whitelist_label = QLabel(self.tr("Lista Blanca:"))
-        self.whitelist_value = QLabel("Cargando...")
+        self.whitelist_label = QLabel()
+        self.whitelist_value = QLabel(self.tr("Cargando..."))
         
-        self.clear_reboot_label = QLabel(self.tr("Limpiar tras Reinicio:"))
-        self.clear_reboot_value = QLabel("Cargando...")
+        self.clear_reboot_label = QLabel()
+        self.clear_reboot_value = QLabel(self.tr("Cargando..."))
         
-        self.clean_data_label = QLabel(self.tr("Limpiar Datos:"))
-        self.clean_data_value = QLabel("Cargando...")
+        self.clean_data_label = QLabel()
+        self.clean_data_value = QLabel(self.tr("Cargando..."))
         
-        self.overlay_dirs_label = QLabel(self.tr("Directorios en Overlay:"))
-        self.overlay_dirs_value = QLabel("Cargando...")
+        self.overlay_dirs_label = QLabel()
+        self.overlay_dirs_value = QLabel(self.tr("Cargando..."))
         
-        self.overlay_all_label = QLabel(self.tr("Overlay en Todos los Directorios:"))
-        self.overlay_all_value = QLabel("Cargando...")
+        self.overlay_all_label = QLabel()
+        self.overlay_all_value = QLabel(self.tr("Cargando..."))
 
         # Agregar al layout en dos columnas
         params_layout.addWidget(self.whitelist_label, 0, 0)
@@ -68,119 +211,149 @@ class StatusTab(QWidget):
         params_layout.addWidget(self.overlay_all_label, 4, 0)
         params_layout.addWidget(self.overlay_all_value, 4, 1)
 
-        status_group_layout.addWidget(params_group)
+        status_group_layout.addWidget(self.params_group)
+
+        self.btn_overlay_changes = QPushButton()
+        self.btn_overlay_changes.clicked.connect(self.show_overlay_changes)
+        status_group_layout.addWidget(self.btn_overlay_changes, alignment=Qt.AlignCenter)
+        self.overlay_changes_dialog = None
 
         status_group_layout.addWidget(self.create_separator())
 
         immutable_toggle_layout = QHBoxLayout()
         
-        self.btn_disable_immutable = QPushButton(self.tr("Desactivar Inmutabilidad"))
-        self.btn_disable_immutable.setStyleSheet("""
-            QPushButton { background-color: #E74C3C; color: white; }
-            QPushButton:hover { background-color: #C0392B; }
-            QPushButton:pressed { background-color: #A93226; }
-            QPushButton:disabled { background-color: #555555; color: #777777; }
-        """)
+        self.btn_disable_immutable = QPushButton()
+        self.btn_disable_immutable.setProperty("variant", "danger")
         self.btn_disable_immutable.clicked.connect(self.disable_immutable_mode)
         immutable_toggle_layout.addWidget(self.btn_disable_immutable)
 
-        self.btn_enable_immutable = QPushButton(self.tr("Activar Inmutabilidad"))
-        self.btn_enable_immutable.setStyleSheet("""
-            QPushButton { background-color: #2ECC71; color: white; }
-            QPushButton:hover { background-color: #27AE60; }
-            QPushButton:pressed { background-color: #1E8449; }
-            QPushButton:disabled { background-color: #555555; color: #777777; }
-        """)
+        self.btn_enable_immutable = QPushButton()
+        self.btn_enable_immutable.setProperty("variant", "success")
         self.btn_enable_immutable.clicked.connect(self.enable_immutable_mode)
         immutable_toggle_layout.addWidget(self.btn_enable_immutable)
 
         status_group_layout.addLayout(immutable_toggle_layout)
 
-        immutable_info_label = QLabel(self.tr(
+        self.immutable_info_label = QLabel()
+        self.immutable_info_label.setWordWrap(True)
+        status_group_layout.addWidget(self.immutable_info_label)
+
+        layout.addWidget(self.status_group)
+        layout.addStretch(1)
+        
+        self.retranslate_ui()
+
+        # Verificar estado inicial en cuanto la ventana se haya pintado
+        QTimer.singleShot(0, self.check_immutable_status)
+
+    def retranslate_ui(self):
+        self.status_group.setTitle(self.tr("Estado Actual del Sistema Inmutable"))
+        self.btn_check_status.setText(self.tr("Actualizar Estado"))
+        self.params_group.setTitle(self.tr("Parámetros de Configuración"))
+        self.whitelist_label.setText(self.tr("Lista Blanca:"))
+        self.clear_reboot_label.setText(self.tr("Limpiar tras Reinicio:"))
+        self.clean_data_label.setText(self.tr("Limpiar Datos:"))
+        self.overlay_dirs_label.setText(self.tr("Directorios en Overlay:"))
+        self.overlay_all_label.setText(self.tr("Overlay en Todos los Directorios:"))
+        self.btn_overlay_changes.setText(self.tr("Ver Cambios Pendientes"))
+        self.btn_overlay_changes.setToolTip(self.tr("Lo escrito en los directorios en overlay que aún no se ha desplegado"))
+        self.btn_disable_immutable.setText(self.tr("Desactivar Inmutabilidad"))
+        self.btn_enable_immutable.setText(self.tr("Activar Inmutabilidad"))
+        self.immutable_info_label.setText(self.tr(
             "Al desactivar la inmutabilidad, el directorio `/usr` se vuelve escribible, permitiendo la instalación de software y modificaciones directas en el sistema base. "
             "Esto es útil para desarrolladores o usuarios avanzados, pero reduce la seguridad y estabilidad del sistema inmutable."
             "<br><br>"
             "Al activar la inmutabilidad, `/usr` vuelve a ser de solo lectura, protegiendo el sistema base de cambios no deseados."
         ))
-        immutable_info_label.setWordWrap(True)
-        status_group_layout.addWidget(immutable_info_label)
+        # El estado ya consultado se vuelve a mostrar con los textos del nuevo idioma
+        if self.last_status is None:
+            self.status_label.setText(self.tr("Cargando estado..."))
+        else:
+            self.show_status(self.last_status)
 
-        layout.addWidget(status_group)
-        layout.addStretch(1)
-        
-        # Verificar estado inicial
-        self.check_immutable_status()
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.LanguageChange:
+            self.retranslate_ui()
+        super().changeEvent(event)
 
     def create_separator(self):
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)
         separator.setFrameShadow(QFrame.Sunken)
         separator.setFixedHeight(2)
-        
-        # Usar la referencia al parent para determinar el tema
-        if hasattr(self.parent, 'dark_mode') and self.parent.dark_mode:
-            separator.setStyleSheet("background-color: #444444; border: none;")
-        else:
-            separator.setStyleSheet("background-color: #DDDDDD; border: none;")
-            
+        # El color lo pone la hoja del tema según el nombre de objeto
+        separator.setObjectName("separator")
         return separator
 
-    def parse_status_output(self, output):
-        """Parsea la salida del comando de estado y extrae los parámetros"""
-        params = {}
-        
-        # Dividir por líneas y procesar cada una
-        for line in output.split('\n'):
-            line = line.strip()
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip().rstrip(',')  # Quitar la coma final
-                params[key] = value
-                
-        return params
+    def set_status_state(self, state):
+        # La hoja del tema colorea la etiqueta según la propiedad "state";
+        # solo se vuelve a pulir si el estado cambia
+        if self.status_label.property("state") == state:
+            return
+        self.status_label.setProperty("state", state)
+        self.status_label.style().unpolish(self.status_label)
+        self.status_label.style().polish(self.status_label)
 
-    def check_immutable_status(self):
-        # Obtener el estado completo
-        output = self.controller.execute_command("deepin-immutable-writable status", show_in_console=False)
-        
+    def check_immutable_status(self, use_cache=True):
+        # Obtener el estado completo sin bloquear la interfaz
+        self.controller.query_async(STATUS_COMMAND, self.update_status,
+                                    use_cache=use_cache)
+
+    def update_status(self, output):
         # Parsear la salida
-        params = self.parse_status_output(output)
-        
-        # --- ESTE ES EL CAMBIO ---
-        # `Enable: true` significa que la ESCRITURA está habilitada,
-        # por lo tanto, la INMUTABILIDAD está deshabilitada.
-        # La lógica debe ser inversa:
-        is_immutable = params.get('Enable', 'false').lower() == 'false'
-        # -------------------------
-        
-        is_booted = params.get('Booted', 'false').lower() == 'true'
+        status = parse_status(output)
+        # Si la consulta falla se mantiene lo último que se mostró
+        if status is None or status == self.last_status:
+            return
+        self.last_status = status
+        self.show_status(status)
 
-        if is_immutable:
+    def show_status(self, status):
+        if status.immutable:
             status_text = self.tr("✔ Sistema en modo inmutable")
-            if is_booted:
+            if status.booted:
                 # Si 'Enable' es false, 'Booted' también debería ser false, pero mantenemos la lógica por si acaso
                 status_text += self.tr(" (Arrancado en modo inmutable)")
             else:
                 status_text += self.tr(" (Configurado pero no arrancado en modo escritura)")
                 
             self.status_label.setText(status_text)
-            self.status_label.setStyleSheet("color: #2ECC71;")
+            self.set_status_state("immutable")
             self.btn_disable_immutable.setEnabled(True)  # Permitir desactivar (habilitar escritura)
             self.btn_enable_immutable.setEnabled(False) # Ya está activada
         else:
             # Esto significa que Enable: true (modo escritura activado)
             self.status_label.setText(self.tr("✖ El sistema NO está en modo inmutable (Modo Escritura Habilitado)"))
-            self.status_label.setStyleSheet("color: #E74C3C;")
+            self.set_status_state("writable")
             self.btn_disable_immutable.setEnabled(False) # Ya está desactivada
             self.btn_enable_immutable.setEnabled(True)   # Permitir activar (deshabilitar escritura)
 
         # Actualizar parámetros de configuración
-        self.whitelist_value.setText(params.get('Whitelist', 'N/A'))
-        self.clear_reboot_value.setText(self.tr("Sí") if params.get('ClearAfterReboot', 'false').lower() == 'true' else self.tr("No"))
-        self.clean_data_value.setText(self.tr("Sí") if params.get('CleanData', 'false').lower() == 'true' else self.tr("No"))
-        self.overlay_dirs_value.setText(params.get('OverlayDirs', 'N/A'))
-        self.overlay_all_value.setText(self.tr("Sí") if params.get('OverlayAllDirs', 'false').lower() == 'true' else self.tr("No"))
+        yes, no = self.tr("Sí"), self.tr("No")
+        self.whitelist_value.setText(status.whitelist or 'N/A')
+        self.clear_reboot_value.setText(yes if status.clear_after_reboot else no)
+        self.clean_data_value.setText(yes if status.clean_data else no)
+        self.overlay_dirs_value.setText(status.overlay_dirs or 'N/A')
+        self.overlay_all_value.setText(yes if status.overlay_all_dirs else no)
+
+    def show_overlay_changes(self):
+        if self.overlay_changes_dialog is None:
+            self.overlay_changes_dialog = OverlayChangesDialog(self)
+            self.overlay_changes_dialog.rescan_button.clicked.connect(self.scan_overlay_changes)
+        self.overlay_changes_dialog.show()
+        self.overlay_changes_dialog.raise_()
+        self.scan_overlay_changes()
+
+    def scan_overlay_changes(self):
+        self.overlay_changes_dialog.set_job(self.controller.scan_overlay(self.overlay_dirs()))
+
+    def overlay_dirs(self):
+        """Directorios de OverlayDirs, o None para todos los overlays escribibles montados"""
+        # Sin estado aún, o con OverlayAllDirs, valen todos
+        status = self.last_status
+        if status is None or status.overlay_all_dirs:
+            return None
+        return split_overlay_dirs(status.overlay_dirs) or None
 
     def disable_immutable_mode(self):
         # Esta función HABILITA el modo escritura
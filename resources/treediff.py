@@ -0,0 +1,189 @@
+"""Diferencias entre dos árboles de ficheros (snapshots o el sistema en uso), sin depender de Qt.
+
+Pensado para árboles de ostree, casi idénticos y hechos de enlaces duros al
+mismo repositorio: dos entradas con el mismo (dispositivo, inodo) son el
+mismo objeto de ostree y se dan por iguales sin leerlas, y un directorio
+compartido se salta entero. Solo se compara el contenido de los ficheros
+regulares con el mismo tamaño y distinto inodo; eso se hace por lotes en un
+pool de procesos, leyendo los dos ficheros a la vez y parando en el primer
+bloque distinto (más barato que calcular un hash de cada uno).
+
+Las diferencias se generan según se encuentran, para poder mostrarlas sin
+esperar al final del recorrido.
+"""
+import os
+import stat
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from resources.diffentry import ADDED, MODIFIED, REMOVED, DiffEntry
+from resources.diskusage import find_snapshot_root
+
+# Ficheros por tarea del pool y mínimo para que compense arrancarlo
+BATCH_SIZE = 128
+CHUNK_SIZE = 1024 * 1024
+
+
+def snapshot_tree(snapshot_id, ostree_dir=None):
+    """Árbol a comparar de un snapshot: el /usr de su despliegue (None si no está en disco)"""
+    root = find_snapshot_root(snapshot_id, ostree_dir)
+    return os.path.join(root, "usr") if root else None
+
+
+def compare_files(old_root, new_root, paths):
+    """Rutas (relativas) de `paths` cuyo contenido difiere, como [(ruta, detalle)]. Se ejecuta en el pool."""
+    changed = []
+    for path in paths:
+        try:
+            with open(os.path.join(old_root, path), 'rb') as old, open(os.path.join(new_root, path), 'rb') as new:
+                while True:
+                    old_chunk = old.read(CHUNK_SIZE)
+                    if old_chunk != new.read(CHUNK_SIZE):
+                        changed.append((path, "content"))
+                        break
+                    if not old_chunk:
+                        break
+        except OSError:
+            # Sin permiso de lectura no se puede saber; se avisa en lugar de darlo por igual
+            changed.append((path, "unreadable"))
+    return changed
+
+
+def compare_links(old_root, new_root, path):
+    try:
+        return "target" if os.readlink(os.path.join(old_root, path)) != os.readlink(os.path.join(new_root, path)) else ""
+    except OSError:
+        return "unreadable"
+
+
+def list_directory(path):
+    """{nombre: stat sin seguir enlaces} de un directorio; vacío si no se puede leer"""
+    entries = {}
+    try:
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    entries[entry.name] = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def walk_subtree(root, relative):
+    """Rutas relativas de todo lo que cuelga de un directorio, incluido él"""
+    yield relative
+    stack = [relative]
+    while stack:
+        current = stack.pop()
+        for name, st in sorted(list_directory(os.path.join(root, current)).items()):
+            path = os.path.join(current, name)
+            yield path
+            if stat.S_ISDIR(st.st_mode):
+                stack.append(path)
+
+
+def compare_entries(old_st, new_st):
+    """Qué cambió entre dos entradas sin mirar el contenido: detalle, "" si nada, o None si falta leerlo"""
+    if (old_st.st_dev, old_st.st_ino) == (new_st.st_dev, new_st.st_ino):
+        return ""
+    if stat.S_IFMT(old_st.st_mode) != stat.S_IFMT(new_st.st_mode):
+        return "type"
+    if (old_st.st_mode, old_st.st_uid, old_st.st_gid) != (new_st.st_mode, new_st.st_uid, new_st.st_gid):
+        return "metadata"
+    if stat.S_ISREG(old_st.st_mode):
+        return "content" if old_st.st_size != new_st.st_size else None
+    if stat.S_ISLNK(old_st.st_mode):
+        return "target" if old_st.st_size != new_st.st_size else None
+    return ""
+
+
+def diff_trees(old_root, new_root, workers=None):
+    """Genera las diferencias (DiffEntry) de new_root respecto a old_root.
+
+    Las rutas son relativas a las raíces. Las entradas añadidas o eliminadas
+    se dan con todo su contenido; las modificadas por contenido llegan según
+    terminan los lotes del pool, así que el orden no es alfabético. Con un
+    solo procesador no se usa el pool: solo añadiría el coste de los procesos.
+    """
+    workers = workers or os.cpu_count() or 1
+    pool = None
+    pending = set()
+    batch = []
+
+    def drain(block):
+        nonlocal pending
+        if not pending:
+            return
+        done, pending = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            for path, detail in future.result():
+                yield DiffEntry(MODIFIED, path, detail)
+
+    try:
+        stack = [""]
+        while stack:
+            relative = stack.pop()
+            old_entries = list_directory(os.path.join(old_root, relative))
+            new_entries = list_directory(os.path.join(new_root, relative))
+            subdirs = []
+            for name in sorted(old_entries.keys() | new_entries.keys()):
+                path = os.path.join(relative, name)
+                old_st = old_entries.get(name)
+                new_st = new_entries.get(name)
+                if new_st is None:
+                    if stat.S_ISDIR(old_st.st_mode):
+                        for removed in walk_subtree(old_root, path):
+                            yield DiffEntry(REMOVED, removed)
+                    else:
+                        yield DiffEntry(REMOVED, path)
+                    continue
+                if old_st is None:
+                    if stat.S_ISDIR(new_st.st_mode):
+                        for added in walk_subtree(new_root, path):
+                            yield DiffEntry(ADDED, added)
+                    else:
+                        yield DiffEntry(ADDED, path)
+                    continue
+
+                detail = compare_entries(old_st, new_st)
+                if detail is None:
+                    if stat.S_ISREG(old_st.st_mode):
+                        batch.append(path)
+                        continue
+                    detail = compare_links(old_root, new_root, path)
+                if detail:
+                    yield DiffEntry(MODIFIED, path, detail)
+                # Un directorio con el mismo inodo es el mismo: no hace falta bajar
+                if (stat.S_ISDIR(old_st.st_mode) and stat.S_ISDIR(new_st.st_mode)
+                        and (old_st.st_dev, old_st.st_ino) != (new_st.st_dev, new_st.st_ino)):
+                    subdirs.append(path)
+            # Orden alfabético al sacarlos de la pila
+            stack.extend(reversed(subdirs))
+
+            if len(batch) >= BATCH_SIZE:
+                if workers > 1:
+                    if pool is None:
+                        # Aquí y no arriba: multiprocessing cuesta importarlo y con un solo
+                        # procesador, o pocos candidatos, no se llega a usar
+                        from concurrent.futures import ProcessPoolExecutor
+                        pool = ProcessPoolExecutor(workers)
+                    pending.add(pool.submit(compare_files, old_root, new_root, batch))
+                else:
+                    for path, detail in compare_files(old_root, new_root, batch):
+                        yield DiffEntry(MODIFIED, path, detail)
+                batch = []
+            yield from drain(block=False)
+
+        # Con pocos candidatos no compensa arrancar procesos
+        if batch:
+            if pool is None:
+                for path, detail in compare_files(old_root, new_root, batch):
+                    yield DiffEntry(MODIFIED, path, detail)
+            else:
+                pending.add(pool.submit(compare_files, old_root, new_root, batch))
+        while pending:
+            yield from drain(block=True)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
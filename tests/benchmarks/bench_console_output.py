@@ -0,0 +1,95 @@
+"""Consola con una salida muy grande: tiempo total y memoria máxima.
+
+    QT_QPA_PLATFORM=offscreen python3 tests/benchmarks/bench_console_output.py [MB]
+
+Un comando sustituto escribe MB megabytes de líneas de unos 100 bytes, como
+un admin deploy --refresh muy hablador, y pasa por el mismo camino que
+cualquier comando: ImmutableController.execute_command y ConsoleOutputDialog.
+Se mide desde que se encola hasta que la consola pinta el final, el mayor
+bloqueo del bucle de eventos y la memoria residente máxima del proceso.
+"""
+import os
+import resource
+import shlex
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+LINE = "ostree: escribiendo objeto {:09d} " + "x" * 60 + "\n"
+
+
+def stand_in_command(megabytes):
+    lines = megabytes * 1024 * 1024 // len(LINE.format(0).encode())
+    script = ("import sys\nw = sys.stdout.write\n"
+              f"for i in range({lines}):\n    w({LINE!r}.format(i))\n")
+    return shlex.join([sys.executable, "-c", script]), lines
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    directory = tempfile.mkdtemp(prefix="bench-console-")
+    os.environ["HOME"] = directory
+    # Los comandos de la consola van con pkexec: el falso solo ejecuta el resto
+    pkexec = os.path.join(directory, "pkexec")
+    with open(pkexec, "w") as f:
+        f.write('#!/bin/sh\nexec "$@"\n')
+    os.chmod(pkexec, 0o755)
+    os.environ["PATH"] = directory + os.pathsep + os.environ["PATH"]
+    os.environ.pop("XDG_CACHE_HOME", None)
+    os.environ.pop("XDG_CONFIG_HOME", None)
+    sys.argv = [os.path.join(ROOT, "main.py")]
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+    import main as app_main
+
+    app = QApplication(sys.argv)
+    controller = app_main.ImmutableController()
+    console = app_main.ConsoleOutputDialog(controller=controller)
+    controller.commandStarted.connect(console.command_started)
+    controller.commandOutput.connect(console.append_output)
+    controller.commandFinished.connect(console.command_finished)
+    console.show()
+    app.processEvents()
+
+    command, lines = stand_in_command(megabytes)
+    beats = []
+    heartbeat = QTimer()
+    heartbeat.setInterval(5)
+    heartbeat.timeout.connect(lambda: beats.append(time.perf_counter()))
+    finished = []
+    controller.commandFinished.connect(lambda *args: finished.append(time.perf_counter()))
+
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    heartbeat.start()
+    controller.execute_command(command)
+    while not finished:
+        app.processEvents()
+    # Lo que quedaba por pintar
+    while console.flush_timer.isActive() or console.pending_chunks:
+        app.processEvents()
+    ended = time.perf_counter()
+    heartbeat.stop()
+
+    stall = max(later - earlier for earlier, later in zip(beats, beats[1:])) * 1000
+    log_size = console.output_log.tell()
+    visible = console.output_area.blockCount()
+    print(f"{megabytes} MB ({lines} líneas)\t{ended - started:.2f} s\t"
+          f"{megabytes / (ended - started):.0f} MB/s\tbloqueo máximo {stall:.0f} ms")
+    print(f"RSS máximo {peak_rss_mb():.0f} MB (antes del comando {rss_before:.0f} MB)\t"
+          f"registro {log_size / 1024 / 1024:.0f} MB\tlíneas visibles {visible}")
+    assert console.exit_code == 0
+    assert visible <= app_main.ConsoleOutputDialog.MAX_VISIBLE_LINES + 10
+
+
+if __name__ == "__main__":
+    main()
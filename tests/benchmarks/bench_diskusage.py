@@ -0,0 +1,91 @@
+"""Uso de disco sobre un repositorio ostree sintético grande, con un tiempo máximo.
+
+    python3 tests/benchmarks/bench_diskusage.py [ficheros] [segundos máximos]
+
+Crea un repositorio con `ficheros` objetos repartidos en objects/XX/ (como
+ostree) y dos despliegues que enlazan con enlaces duros el 60 % de ellos
+cada uno, solapados en el centro, en directorios de 1000 entradas. Mide el
+análisis en frío (sin la caché de la aplicación; la del sistema de ficheros
+sí está caliente tras crearlo) y el análisis con la caché cargada, y falla
+si el análisis en frío pasa del máximo.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from resources import diskusage  # noqa: E402
+from resources.diskusage import DiskUsageAnalyzer, default_roots, format_size  # noqa: E402
+
+PER_DIR = 1000
+
+
+def build(ostree, files):
+    objects = os.path.join(ostree, "repo", "objects")
+    for prefix in range(256):
+        os.makedirs(os.path.join(objects, f"{prefix:02x}"))
+    paths = []
+    for i in range(files):
+        path = os.path.join(objects, f"{i % 256:02x}", f"{i:062x}.file")
+        with open(path, "wb") as f:
+            # Casi todos vacíos para no llenar el disco; uno de cada 16 ocupa bloques
+            if i % 16 == 0:
+                f.write(b"x" * 1024)
+        paths.append(path)
+
+    span = files * 6 // 10
+    for name, start in (("aaaaaaaaaaaa.0", 0), ("bbbbbbbbbbbb.0", files - span)):
+        deploy = os.path.join(ostree, "deploy", "deepin", "deploy", name)
+        for offset in range(span):
+            if offset % PER_DIR == 0:
+                directory = os.path.join(deploy, "usr", f"d{offset // PER_DIR:04d}")
+                os.makedirs(directory)
+            os.link(paths[start + offset], os.path.join(directory, f"f{offset}"))
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 60
+    directory = tempfile.mkdtemp(prefix="bench-diskusage-")
+    try:
+        ostree = os.path.join(directory, "ostree")
+        started = time.perf_counter()
+        build(ostree, files)
+        print(f"{files} objetos creados en {time.perf_counter() - started:.1f} s")
+        # Lo recién modificado no entra en la caché (RACY_SECONDS)
+        time.sleep(diskusage.RACY_SECONDS + 1)
+
+        roots = default_roots(ostree)
+        cache_path = os.path.join(directory, "disk-usage.json")
+        cold_analyzer = DiskUsageAnalyzer(cache_path)
+        started = time.perf_counter()
+        cold = cold_analyzer.analyze(roots)
+        cold_s = time.perf_counter() - started
+        cold_analyzer.save_cache()
+
+        warm_analyzer = DiskUsageAnalyzer(cache_path)
+        started = time.perf_counter()
+        warm_analyzer.load_cache()
+        warm = warm_analyzer.analyze(roots)
+        warm_s = time.perf_counter() - started
+
+        print(f"en frío\t{cold_s:.2f} s\t{cold.scanned_dirs} directorios leídos\t"
+              f"total {format_size(cold.total)}")
+        print(f"con caché\t{warm_s:.2f} s\t{warm.cached_dirs} directorios de la caché\t"
+              f"caché {os.path.getsize(cache_path) / 1024 / 1024:.0f} MB")
+        for root in cold.roots:
+            print(f"  {root.name}\t{root.files} inodos\texclusivo {format_size(root.exclusive)}\t"
+                  f"compartido {format_size(root.shared)}")
+        assert warm.to_dict()["roots"] == cold.to_dict()["roots"]
+        assert cold.get("repo").files > files
+        assert cold_s <= budget, f"el análisis en frío tardó {cold_s:.1f} s (máximo {budget:.0f} s)"
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
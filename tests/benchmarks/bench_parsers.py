@@ -0,0 +1,42 @@
+"""Rendimiento de parse_snapshot_list sobre listados sintéticos grandes.
+
+    python3 tests/benchmarks/bench_parsers.py [filas...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from resources.parsers import parse_snapshot_list  # noqa: E402
+
+
+def listing(rows, aligned=True):
+    lines = ["ID              Name                    Time                 Desc" if aligned else "ID Name Time Desc"]
+    for i in range(rows):
+        name = f"snapshot {i}" if i % 3 else f"nightly-{i}"
+        time_text = f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:{i % 60:02d}:00"
+        if aligned:
+            lines.append(f"{i:016x}{name:<24}{time_text:<21}descripción {i}")
+        else:
+            lines.append(f"{i:016x} {name} {time_text} descripción {i}")
+    return "\n".join(lines).encode()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    for aligned in (True, False):
+        for rows in sizes:
+            data = listing(rows, aligned)
+            best = float("inf")
+            for _ in range(3):
+                started = time.perf_counter()
+                records = parse_snapshot_list(data)
+                best = min(best, time.perf_counter() - started)
+            assert len(records) == rows
+            print(f"{'alineado' if aligned else 'espacios'}\t{rows}\tfilas\t{best * 1000:.1f} ms\t"
+                  f"{len(data) / best / 1e6:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Bloqueo del hilo de la interfaz al consultar una CLI lenta: ruta síncrona frente a query_async.
+
+    QT_QPA_PLATFORM=offscreen python3 tests/benchmarks/bench_query_latency.py [segundos] [consultas]
+
+Un deepin-immutable-writable falso tarda `segundos` en responder. Un QTimer
+de 5 ms hace de latido del bucle de eventos: el mayor hueco entre dos
+latidos es lo que la ventana habría estado congelada.
+"""
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+HEARTBEAT_MS = 5
+
+
+def fake_cli(directory, delay):
+    path = os.path.join(directory, "deepin-immutable-writable")
+    with open(path, "w") as f:
+        f.write(f"#!/bin/sh\nsleep {delay}\necho 'OverlayDirs: /opt'\n")
+    os.chmod(path, 0o755)
+
+
+def measure(app, action, done):
+    """(hueco máximo entre latidos, tiempo total) en ms mientras `action` corre hasta done()"""
+    from PySide6.QtCore import QTimer
+
+    beats = []
+    timer = QTimer()
+    timer.setInterval(HEARTBEAT_MS)
+    timer.timeout.connect(lambda: beats.append(time.perf_counter()))
+    timer.start()
+    started = time.perf_counter()
+    QTimer.singleShot(20, action)
+    while not done() or time.perf_counter() - started < 0.05:
+        app.processEvents()
+        if time.perf_counter() - started > 120:
+            raise RuntimeError("la consulta no terminó")
+    timer.stop()
+    finished = time.perf_counter()
+    gaps = [later - earlier for earlier, later in zip(beats, beats[1:] + [finished])]
+    return max(gaps) * 1000, (finished - started) * 1000
+
+
+def main():
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    directory = tempfile.mkdtemp(prefix="bench-query-")
+    fake_cli(directory, delay)
+    os.environ["PATH"] = directory + os.pathsep + os.environ["PATH"]
+    os.environ["HOME"] = directory
+    os.environ.pop("XDG_CACHE_HOME", None)
+    os.environ.pop("XDG_CONFIG_HOME", None)
+    sys.argv = [os.path.join(ROOT, "main.py")]
+
+    from PySide6.QtWidgets import QApplication
+    import main as app_main
+
+    app = QApplication(sys.argv)
+    controller = app_main.ImmutableController()
+    command = "deepin-immutable-writable status"
+
+    results = []
+
+    # Comandos distintos (un comentario de shell al final) para que no respondan la caché ni la
+    # fusión de consultas iguales en curso
+    def run_sync():
+        for index in range(queries):
+            results.append(controller.execute_command(f"{command} # {index}", show_in_console=False))
+
+    stall, total = measure(app, run_sync, lambda: len(results) == queries)
+    print(f"síncrono\t{queries} consultas de {delay:g} s\tbloqueo máximo {stall:.0f} ms\ttotal {total:.0f} ms")
+
+    results.clear()
+
+    def run_async():
+        for index in range(queries):
+            controller.query_async(f"{command} # {index}", results.append, use_cache=False)
+
+    stall, total = measure(app, run_async, lambda: len(results) == queries)
+    print(f"query_async\t{queries} consultas de {delay:g} s\tbloqueo máximo {stall:.0f} ms\ttotal {total:.0f} ms")
+    assert all("OverlayDirs" in output for output in results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Lista de snapshots con listados sintéticos: carga inicial, refrescos y desplazamiento.
+
+    QT_QPA_PLATFORM=offscreen python3 tests/benchmarks/bench_snapshot_model.py [snapshots...]
+
+Cada medida incluye lo mismo que en la pestaña: analizar la salida de
+`snapshot list`, actualizar el catálogo y el modelo, y pintar la vista
+(QListView con SnapshotItemDelegate). El refresco con cambios elimina el
+1 % más antiguo, añade otros tantos al principio y modifica un 1 %.
+"""
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from bench_parsers import listing  # noqa: E402
+
+
+def listing_with_changes(rows):
+    """Listado de `rows` snapshots tras una ronda de cambios (ver el docstring)"""
+    changes = max(rows // 100, 1)
+    lines = listing(rows + changes).decode().split("\n")
+    header, body = lines[0], lines[1:]
+    # Los nuevos arriba, los más antiguos (al final) fuera
+    body = body[rows:] + body[:rows - changes]
+    for index in range(changes, len(body), max(len(body) // changes, 1)):
+        body[index] = body[index].replace("descripción", "editado")
+    return "\n".join([header] + body).encode()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1_000, 10_000, 50_000]
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtWidgets import QApplication, QListView
+    from resources.parsers import parse_snapshot_list
+    from resources.snapshot_catalog import SnapshotCatalog
+    from resources.snapshots import SnapshotItemDelegate, SnapshotListModel
+
+    app = QApplication(sys.argv)
+    directory = tempfile.mkdtemp(prefix="bench-model-")
+
+    for rows in sizes:
+        catalog = SnapshotCatalog(os.path.join(directory, f"snapshots-{rows}.json"))
+        model = SnapshotListModel()
+        view = QListView()
+        view.setModel(model)
+        view.setItemDelegate(SnapshotItemDelegate(view))
+        view.setUniformItemSizes(True)
+        view.resize(600, 700)
+        view.show()
+        app.processEvents()
+
+        def timed(action):
+            started = time.perf_counter()
+            action()
+            view.repaint()
+            app.processEvents()
+            return (time.perf_counter() - started) * 1000
+
+        first = listing(rows)
+        changed_listing = listing_with_changes(rows)
+
+        def populate():
+            catalog.apply_listing(parse_snapshot_list(first))
+            model.set_records(catalog.records())
+
+        def refresh(output):
+            def action():
+                _, _, changed = catalog.apply_listing(parse_snapshot_list(output))
+                model.apply_listing(catalog.records(), changed)
+            return action
+
+        populate_ms = timed(populate)
+        unchanged_ms = timed(refresh(first))
+        changed_ms = timed(refresh(changed_listing))
+
+        def scroll_to_end():
+            # La vista va pidiendo filas con fetchMore según se acerca al final
+            while model.canFetchMore(view.rootIndex()):
+                view.scrollToBottom()
+                app.processEvents()
+
+        scroll_ms = timed(scroll_to_end)
+        assert model.rowCount() == rows
+        print(f"{rows}\tsnapshots\tcarga {populate_ms:.1f} ms\trefresco sin cambios {unchanged_ms:.1f} ms\t"
+              f"refresco con cambios {changed_ms:.1f} ms\thasta el final {scroll_ms:.1f} ms")
+        view.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Arranque en frío con la plataforma offscreen: primer pintado e interactividad.
+
+    python3 tests/benchmarks/bench_startup.py [repeticiones] [raíz del repositorio]
+
+Cada repetición es un proceso nuevo que hace lo mismo que `python3 main.py`
+con CLIs falsas en el PATH. Se mide desde la creación del proceso (según
+/proc) hasta:
+  - primer pintado: el primer evento Paint de la ventana;
+  - interactivo: la primera vuelta del bucle de eventos tras ese pintado,
+    cuando la ventana ya atiende la entrada;
+  - pestañas: todas las pestañas construidas (las diferidas incluidas).
+Con otra raíz (p. ej. un `git worktree` de una versión anterior) se mide esa.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FAKE_CLI = """#!/bin/sh
+case "$1 $2" in
+  "snapshot list") printf 'ID        Name        Time                 Desc\\nabc123    nightly     2025-01-02 10:11:12  d1\\n';;
+  "snapshot show") printf 'ID: %s\\nName: nightly\\nTime: 2025-01-02 10:11:12\\nDesc: d1\\n' "$3";;
+  "status "*|"status") printf 'OverlayDirs: /opt\\nOverlayAllDirs: false\\n';;
+  *) echo ok;;
+esac
+"""
+
+# Lo que ejecuta cada proceso: el bloque __main__ de main.py con sondas
+DRIVER = r"""
+import os, sys, json
+sys.path.insert(0, ROOT)
+sys.argv = [os.path.join(ROOT, "main.py")]
+
+# Como resources/startup_profiler.process_age, que las versiones anteriores no tienen
+def process_age():
+    with open("/proc/self/stat") as f:
+        start_ticks = int(f.read().rpartition(")")[2].split()[19])
+    with open("/proc/uptime") as f:
+        uptime = float(f.read().split()[0])
+    return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+
+import main
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+times = {}
+
+class Probe(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and "paint" not in times:
+            times["paint"] = process_age()
+            QTimer.singleShot(0, lambda: times.setdefault("interactive", process_age()))
+        return False
+
+def poll():
+    if "interactive" in times and not getattr(window, "tab_loaders", None):
+        times["tabs"] = process_age()
+        print(json.dumps(times))
+        app.quit()
+
+app = QApplication(sys.argv)
+main.setup_translator(app)
+probe = Probe()
+app.installEventFilter(probe)
+window = main.MainWindow()
+window.show()
+timer = QTimer()
+timer.timeout.connect(poll)
+timer.start(1)
+app.exec()
+"""
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    root = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else ROOT
+    directory = tempfile.mkdtemp(prefix="bench-startup-")
+    for name in ("deepin-immutable-ctl", "deepin-immutable-writable"):
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(FAKE_CLI)
+        os.chmod(path, 0o755)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", HOME=directory,
+               PATH=directory + os.pathsep + os.environ["PATH"])
+    env.pop("XDG_CACHE_HOME", None)
+    env.pop("XDG_CONFIG_HOME", None)
+
+    samples = {"paint": [], "interactive": [], "tabs": []}
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", f"ROOT = {root!r}\n" + DRIVER], env=env, cwd=directory,
+                                capture_output=True, text=True, timeout=60)
+        times = json.loads(result.stdout.strip().splitlines()[-1])
+        for key in samples:
+            samples[key].append(times[key] * 1000)
+
+    print(f"{root}\t{runs} arranques (mediana / mínimo)")
+    for key, label in (("paint", "primer pintado"), ("interactive", "interactivo"), ("tabs", "todas las pestañas")):
+        print(f"  {label:<20}{statistics.median(samples[key]):>8.0f} ms{min(samples[key]):>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
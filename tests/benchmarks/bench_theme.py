@@ -0,0 +1,87 @@
+"""Cambio de tema y primera presentación de la ventana con todas las pestañas construidas.
+
+    python3 tests/benchmarks/bench_theme.py [cambios] [raíz del repositorio]
+
+Cada medida corre en un proceso nuevo (offscreen, CLIs falsas):
+  - primera presentación: de MainWindow() con todas las pestañas construidas
+    hasta pintada tras show();
+  - cambio de tema: toggle_theme() más el repintado de la ventana, la
+    mediana y el máximo de `cambios` alternando claro y oscuro.
+Con otra raíz (p. ej. un `git worktree` de una versión anterior) se mide esa.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_startup import FAKE_CLI  # noqa: E402
+
+DRIVER = r"""
+import os, sys, json, time, statistics
+sys.path.insert(0, ROOT)
+sys.argv = [os.path.join(ROOT, "main.py")]
+import main
+from PySide6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+main.setup_translator(app)
+started = time.perf_counter()
+window = main.MainWindow()
+# Las pestañas diferidas, si la versión las tiene
+for index in sorted(getattr(window, "tab_loaders", {})):
+    window.ensure_tab_loaded(index)
+window.show()
+window.repaint()
+app.processEvents()
+first_show = time.perf_counter() - started
+
+# Se visita cada pestaña para que todas estén polidas antes de medir
+for row in range(window.nav_list.count()):
+    window.nav_list.setCurrentRow(row)
+    window.repaint()
+    app.processEvents()
+
+toggles = []
+for _ in range(TOGGLES):
+    started = time.perf_counter()
+    window.toggle_theme()
+    window.repaint()
+    app.processEvents()
+    toggles.append(time.perf_counter() - started)
+print(json.dumps({"first_show": first_show * 1000, "toggle_median": statistics.median(toggles) * 1000,
+                  "toggle_max": max(toggles) * 1000}))
+window.close()
+"""
+
+
+def main():
+    toggles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    root = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else ROOT
+    directory = tempfile.mkdtemp(prefix="bench-theme-")
+    for name in ("deepin-immutable-ctl", "deepin-immutable-writable"):
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(FAKE_CLI)
+        os.chmod(path, 0o755)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", HOME=directory,
+               PATH=directory + os.pathsep + os.environ["PATH"])
+    env.pop("XDG_CACHE_HOME", None)
+    env.pop("XDG_CONFIG_HOME", None)
+
+    runs = []
+    for _ in range(5):
+        result = subprocess.run([sys.executable, "-c", f"ROOT = {root!r}\nTOGGLES = {toggles}\n" + DRIVER],
+                                env=env, cwd=directory, capture_output=True, text=True, timeout=120)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    runs.sort(key=lambda run: run["first_show"])
+    middle = runs[len(runs) // 2]
+    print(f"{root}\tprimera presentación {middle['first_show']:.0f} ms\t"
+          f"cambio de tema {middle['toggle_median']:.1f} ms (máximo {middle['toggle_max']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Configuración común: los tests importan los módulos como la aplicación (from resources.x import ...)."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,13 @@
+"""Salida de --cli que lee la interfaz (resources/cli.py)"""
+import json
+
+from resources import cli
+
+
+def test_diff_missing_deployment_is_a_single_json_line(tmp_path, capsys, monkeypatch):
+    # DiffJob lee la salida de diff línea a línea: el error también debe ir en una
+    monkeypatch.chdir(tmp_path)
+    assert cli.main(["diff", "live", "no-existe-0000", "--json"]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["error"].endswith("no-existe-0000")
@@ -0,0 +1,74 @@
+"""Predicción de la duración de un despliegue (resources/deployestimate.py)"""
+import pytest
+
+from resources.deployestimate import format_duration, load_history, predict_duration, record_deploy
+
+PLAIN = {"backup": False, "refresh": False, "append": False}
+REFRESH = {"backup": False, "refresh": True, "append": False}
+
+
+def deploy(seconds, size, options=PLAIN):
+    return {"seconds": seconds, "size": size, "options": dict(options)}
+
+
+def test_no_history():
+    assert predict_duration([], 100, PLAIN) is None
+
+
+def test_regression_on_size():
+    # 10 s fijos más 1 s por MB
+    history = [deploy(10 + size / 1e6, size) for size in (1_000_000, 5_000_000, 20_000_000)]
+    prediction = predict_duration(history, 50_000_000, PLAIN)
+    assert prediction.method == "regression" and prediction.samples == 3
+    assert prediction.seconds == pytest.approx(60)
+    assert prediction.spread == pytest.approx(0, abs=1e-6)
+
+
+def test_two_points_have_no_spread():
+    prediction = predict_duration([deploy(10, 0), deploy(20, 100)], 50, PLAIN)
+    assert prediction.seconds == pytest.approx(15) and prediction.spread is None
+
+
+def test_negative_slope_falls_back_to_median():
+    history = [deploy(30, 100), deploy(20, 200), deploy(10, 300)]
+    prediction = predict_duration(history, 1000, PLAIN)
+    assert prediction.method == "median" and prediction.seconds == 20
+
+
+def test_median_without_sizes():
+    history = [deploy(10, None), deploy(40, None), deploy(20, None)]
+    prediction = predict_duration(history, 100, PLAIN)
+    assert prediction.method == "median" and prediction.seconds == 20 and prediction.samples == 3
+    # Sin tamaño pendiente tampoco hay regresión
+    sized = [deploy(10, 1), deploy(20, 2), deploy(30, 3)]
+    assert predict_duration(sized, None, PLAIN).method == "median"
+
+
+def test_same_options_preferred_when_enough():
+    history = [deploy(100, None, REFRESH), deploy(200, None, REFRESH), deploy(10, None), deploy(12, None)]
+    assert predict_duration(history, None, {"refresh": True}).seconds == 150
+    # Opciones ausentes cuentan como desactivadas
+    assert predict_duration(history, None, {}).seconds == 11
+    # Con menos de MIN_SAMPLES iguales se usan todos
+    history = history[1:]
+    assert predict_duration(history, None, {"refresh": True}).samples == 3
+
+
+def test_invalid_records_are_ignored():
+    history = [{"seconds": "rápido"}, {"size": 10}, deploy(8, None)]
+    prediction = predict_duration(history, None, PLAIN)
+    assert prediction.seconds == 8 and prediction.spread is None
+
+
+def test_record_deploy_round_trip(tmp_path):
+    path = str(tmp_path / "cache" / "deploy-history.json")
+    record_deploy(12.3456, {"refresh": 1}, 1000, 5, path=path)
+    history = load_history(path)
+    assert len(history) == 1
+    assert history[0]["seconds"] == 12.346 and history[0]["options"] == REFRESH
+
+
+def test_format_duration():
+    assert format_duration(42.4) == "42 s"
+    assert format_duration(125) == "2 min 05 s"
+    assert format_duration(3 * 3600 + 7 * 60) == "3 h 07 min"
@@ -0,0 +1,124 @@
+"""Recuento de uso de disco con enlaces duros (resources/diskusage.py)"""
+import os
+
+import pytest
+
+from resources import diskusage
+from resources.diskusage import DiskUsageAnalyzer, default_roots, format_size, matches_snapshot
+
+
+def blocks(path):
+    return os.lstat(path).st_blocks * 512
+
+
+def write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+@pytest.fixture
+def ostree(tmp_path):
+    """Repositorio con tres objetos y dos despliegues que enlazan a ellos.
+
+    a: solo del repositorio; b: repositorio y despliegue 1; c: repositorio y
+    los dos despliegues. Cada despliegue tiene además un fichero propio.
+    """
+    root = tmp_path / "ostree"
+    objects = root / "repo" / "objects"
+    first = root / "deploy" / "deepin" / "deploy" / "aaaaaaaaaaaa.0"
+    second = root / "deploy" / "deepin" / "deploy" / "bbbbbbbbbbbb.0"
+    write(str(objects / "aa" / "a.file"), 10_000)
+    b = write(str(objects / "bb" / "b.file"), 20_000)
+    c = write(str(objects / "cc" / "c.file"), 40_000)
+    os.makedirs(first / "usr")
+    os.makedirs(second / "usr")
+    os.link(b, first / "usr" / "b")
+    os.link(c, first / "usr" / "c")
+    os.link(c, second / "usr" / "c")
+    # Dos enlaces dentro del mismo despliegue cuentan una vez
+    os.link(c, second / "usr" / "c2")
+    write(str(first / "etc" / "own"), 5_000)
+    write(str(second / "etc" / "own"), 7_000)
+    return root
+
+
+def dir_blocks(top):
+    return sum(blocks(path) for path, _, _ in os.walk(top))
+
+
+def test_default_roots(ostree):
+    names = [name for name, _ in default_roots(str(ostree))]
+    assert names == ["repo", "aaaaaaaaaaaa.0", "bbbbbbbbbbbb.0"]
+
+
+def test_exclusive_and_shared_bytes(ostree):
+    roots = default_roots(str(ostree))
+    report = DiskUsageAnalyzer().analyze(roots)
+    repo, first, second = report.roots
+    objects = ostree / "repo" / "objects"
+    a, b, c = (blocks(objects / "aa" / "a.file"), blocks(objects / "bb" / "b.file"),
+               blocks(objects / "cc" / "c.file"))
+
+    assert repo.exclusive == a + dir_blocks(ostree / "repo")
+    assert repo.shared == b + c
+    first_path, second_path = first.path, second.path
+    assert first.exclusive == blocks(os.path.join(first_path, "etc", "own")) + dir_blocks(first_path)
+    assert first.shared == b + c
+    assert second.exclusive == blocks(os.path.join(second_path, "etc", "own")) + dir_blocks(second_path)
+    assert second.shared == c
+    # El total cuenta cada inodo una vez
+    assert report.total == repo.exclusive + first.exclusive + second.exclusive + b + c
+    assert second.files == 5  # raíz, usr, etc, own y c (con sus dos nombres)
+    assert report.match_snapshot("bbbbbbbbbbbb1234").name == "bbbbbbbbbbbb.0"
+    # Lo que usa max_total_size: solo los snapshots con despliegue analizado
+    assert report.snapshot_sizes(["aaaaaaaaaaaa", "bbbbbbbbbbbb1234", "cccccccccccc"]) == {
+        "aaaaaaaaaaaa": first.exclusive, "bbbbbbbbbbbb1234": second.exclusive}
+
+
+def test_cache_skips_unchanged_directories(ostree, tmp_path, monkeypatch):
+    # Todo cuenta como antiguo para que se pueda guardar en caché
+    monkeypatch.setattr(diskusage, "RACY_SECONDS", -60)
+    roots = default_roots(str(ostree))
+    cache_path = str(tmp_path / "cache" / "disk-usage.json")
+    first = DiskUsageAnalyzer(cache_path)
+    cold = first.analyze(roots)
+    first.save_cache()
+    assert cold.cached_dirs == 0
+
+    second = DiskUsageAnalyzer(cache_path)
+    second.load_cache()
+    warm = second.analyze(roots)
+    assert warm.scanned_dirs == 0 and warm.cached_dirs == cold.scanned_dirs
+    assert warm.to_dict()["roots"] == cold.to_dict()["roots"]
+
+    # Un fichero nuevo cambia el mtime de su directorio: solo ese se vuelve a leer
+    new = write(str(ostree / "repo" / "objects" / "aa" / "d.file"), 8_000)
+    changed = second.analyze(roots)
+    assert changed.scanned_dirs == 1
+    assert changed.get("repo").exclusive == cold.get("repo").exclusive + blocks(new)
+
+
+def test_racy_directories_are_not_cached(ostree):
+    analyzer = DiskUsageAnalyzer()
+    analyzer.analyze(default_roots(str(ostree)))
+    # Recién creados: ninguno tiene más de RACY_SECONDS
+    assert analyzer.cache == {}
+
+
+def test_missing_root_counts_nothing(tmp_path):
+    report = DiskUsageAnalyzer().analyze([("repo", str(tmp_path / "no-existe"))])
+    assert report.total == 0 and report.roots[0].files == 0
+
+
+def test_matches_snapshot_needs_eight_characters():
+    assert matches_snapshot("0123456789ab.0", "01234567")
+    assert not matches_snapshot("0123456789ab.0", "0123")
+    assert not matches_snapshot("repo", "01234567")
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KiB"
+    assert format_size(3 * 1024 ** 4) == "3.0 TiB"
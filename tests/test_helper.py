@@ -0,0 +1,141 @@
+"""Operaciones permitidas del asistente privilegiado (resources/helper.py)"""
+import json
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+from conftest import ROOT
+from resources import cli
+from resources.helper import (HelperClient, batch_command, batch_input, operation_argv, parse_operation,
+                              serve)
+
+MAIN = os.path.join(ROOT, "main.py")
+
+
+def test_create_keeps_name_and_description_positions():
+    assert operation_argv("snapshot.create", {"name": "a", "desc": "b"})[3:] == ["a", "b"]
+    assert operation_argv("snapshot.create", {"name": "a"})[3:] == ["a"]
+    assert operation_argv("snapshot.create", {})[3:] == []
+
+
+@pytest.mark.parametrize("op, args", [
+    ("snapshot.create", {"desc": "b"}),
+    ("snapshot.create", {"name": "", "desc": "b"}),
+    ("snapshot.modify", {"id": "abc", "name": "", "desc": "b"}),
+])
+def test_description_without_name_is_rejected(op, args):
+    # Regresión: la descripción acababa como nombre, o el nombre como argumento vacío
+    with pytest.raises(ValueError):
+        operation_argv(op, args)
+
+
+def test_modify_round_trip_from_command():
+    op, args = parse_operation("pkexec deepin-immutable-ctl snapshot modify abc 'nuevo nombre' desc")
+    assert operation_argv(op, args) == ["deepin-immutable-ctl", "snapshot", "modify", "abc", "nuevo nombre", "desc"]
+
+
+def test_cli_create_rejects_description_without_name(monkeypatch, capsys):
+    monkeypatch.setattr(cli, "run_mutation", lambda args, command: pytest.fail(command))
+    assert cli.main(["snapshot", "create", "--desc", "x"]) == 1
+    assert "--name" in capsys.readouterr().err
+
+
+def fake_tool(tmp_path, name, script):
+    tool = tmp_path / name
+    tool.write_text("#!/bin/sh\n" + script)
+    tool.chmod(0o755)
+    return str(tmp_path)
+
+
+def test_batch_reads_operations_from_stdin(tmp_path):
+    # Regresión: el lote iba entero en un argumento y con unos 3000 elementos
+    # superaba el límite del kernel (E2BIG)
+    env = dict(os.environ, PATH=fake_tool(tmp_path, "deepin-immutable-ctl", 'echo "$2 $3"\n') + os.pathsep
+               + os.environ["PATH"])
+    operations = [["snapshot.delete", {"id": f"snapshot-{index:06d}-" + "x" * 40}] for index in range(3000)]
+    data = batch_input(operations)
+    assert len(data) > 128 * 1024
+    command = batch_command(MAIN)[1:]
+    assert command[-1] == "-"
+    result = subprocess.run(command, input=data, capture_output=True, env=env, cwd=ROOT, timeout=120)
+    messages = [json.loads(line) for line in result.stdout.decode().splitlines()]
+    finished = [message for message in messages if "exit_code" in message]
+    assert result.returncode == 0
+    assert [message["item"] for message in finished] == list(range(3000))
+    assert finished[-1]["output"] == f"delete {operations[-1][1]['id']}\n"
+
+
+@pytest.fixture
+def helper(tmp_path, monkeypatch):
+    """Asistente sin privilegios en un socket temporal, con un deepin-immutable-ctl falso"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    # Falla al borrar "bad"; si no, repite sus argumentos
+    monkeypatch.setenv("PATH", fake_tool(bin_dir, "deepin-immutable-ctl",
+                                         '[ "$3" = bad ] && { echo fallo >&2; exit 3; }\necho "$*"\n')
+                       + os.pathsep + os.environ["PATH"])
+    path = str(tmp_path / "run" / "helper.sock")
+    thread = threading.Thread(target=serve, args=(path, os.getuid(), 30), daemon=True)
+    thread.start()
+    client = HelperClient(path, timeout=10)
+    deadline = time.monotonic() + 5
+    while not client.ping():
+        assert time.monotonic() < deadline, "el asistente no arrancó"
+        time.sleep(0.01)
+    yield client
+    client.shutdown()
+    thread.join(5)
+
+
+def test_client_reads_a_whole_batch(helper):
+    # Regresión: el cliente se detenía en el primer mensaje con exit_code, el del elemento 0
+    operations = [["snapshot.delete", {"id": "a"}], ["snapshot.delete", {"id": "bad"}],
+                  ["snapshot.modify", {"id": "c", "name": "n", "desc": "d"}]]
+    messages = list(helper.request("batch", {"operations": operations}))
+    items = [message for message in messages if "item" in message]
+    assert [(message["item"], message.get("state", message.get("exit_code"))) for message in items] == [
+        (0, "running"), (0, 0), (1, "running"), (1, 3), (2, "running"), (2, 0)]
+    assert items[3]["error"] == "fallo\n"
+    assert items[5]["output"] == "snapshot modify c n d\n"
+    assert messages[-1] == {"exit_code": 1}
+
+
+def test_invalid_batch_runs_nothing(helper):
+    operations = [["snapshot.delete", {"id": "a"}], ["snapshot.delete", {"id": "-rf"}]]
+    messages = list(helper.request("batch", {"operations": operations}))
+    assert len(messages) == 1 and "elemento 1" in messages[0]["error"]
+
+
+def test_client_run_streams_single_operation(helper):
+    assert helper.run("snapshot.rollback", {"id": "abc"}) == (0, "snapshot rollback abc\n")
+    exit_code, output = helper.run("snapshot.delete", {"id": "bad"})
+    assert exit_code == 3 and output.endswith("fallo\n")
+
+
+@pytest.mark.parametrize("op, args", [
+    ("admin.exec", {"argv": ["sh"]}),
+    ("snapshot.delete", {"id": "-rf"}),
+    ("snapshot.delete", {"id": ""}),
+    ("snapshot.delete", {"id": "a\0b"}),
+    ("snapshot.delete", {"id": 3}),
+    ("snapshot.delete", {"id": "a", "force": True}),
+    ("admin.deploy", {"backup": "yes"}),
+    ("admin.file-op", {"argv": []}),
+    ("writable.enable", {"directory": "--all"}),
+])
+def test_whitelist_rejects(op, args):
+    with pytest.raises(ValueError):
+        operation_argv(op, args)
+
+
+def test_parse_operation_only_maps_known_commands():
+    assert parse_operation("pkexec deepin-immutable-ctl admin deploy --backup --append") == (
+        "admin.deploy", {"backup": True, "append": True})
+    assert parse_operation("pkexec deepin-immutable-ctl admin deploy --finalize --backup") is None
+    assert parse_operation("pkexec deepin-immutable-ctl admin exec rm -rf /") is None
+    assert parse_operation("pkexec deepin-immutable-writable enable -d /opt -y") == (
+        "writable.enable", {"directory": "/opt"})
+    assert parse_operation("echo 'sin cerrar") is None
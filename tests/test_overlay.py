@@ -0,0 +1,159 @@
+"""Cambios en las capas superiores de los overlays (resources/overlay.py)"""
+import os
+import stat
+import time
+
+import pytest
+
+from resources import overlay
+from resources.overlay import OverlayMount, OverlayScanner, overlay_mounts, parse_mountinfo, split_overlay_dirs
+from resources.treediff import ADDED, MODIFIED, REMOVED, DiffEntry
+
+MOUNTINFO = """\
+22 1 253:1 / / rw,relatime shared:1 - ext4 /dev/vda1 rw
+95 22 0:45 / /opt rw,relatime shared:50 - overlay overlay rw,lowerdir=/sysroot/opt,upperdir=/persistent/opt/upper,workdir=/persistent/opt/work
+96 22 0:46 / /usr/my\\040dir rw,relatime - overlay overlay rw,lowerdir=/a\\:b:/c,upperdir=/up\\054per,workdir=/w
+97 22 0:47 / /ro rw,relatime - overlay overlay ro,lowerdir=/x:/y
+98 22 0:48 / /tmp rw - tmpfs tmpfs rw,upperdir=/no-es-overlay
+"""
+
+
+def test_parse_mountinfo():
+    mounts = parse_mountinfo(MOUNTINFO)
+    assert [mount.to_dict() for mount in mounts] == [
+        {"target": "/opt", "upper": "/persistent/opt/upper", "lowers": ["/sysroot/opt"]},
+        # Espacios y comas escapados; el ":" escapado no separa capas
+        {"target": "/usr/my dir", "upper": "/up,per", "lowers": ["/a:b", "/c"]},
+    ]
+
+
+def test_parse_mountinfo_ignores_malformed_lines():
+    assert parse_mountinfo("basura\n1 2 - overlay\n\n") == []
+
+
+def test_overlay_mounts_filters_by_target(tmp_path):
+    path = tmp_path / "mountinfo"
+    path.write_text(MOUNTINFO)
+    assert [mount.target for mount in overlay_mounts(["/opt/"], str(path))] == ["/opt"]
+    assert len(overlay_mounts(None, str(path))) == 2
+    assert overlay_mounts(None, str(tmp_path / "no-existe")) == []
+
+
+def test_split_overlay_dirs():
+    assert split_overlay_dirs("/usr, /opt;/var/lib relativo") == ["/usr", "/opt", "/var/lib"]
+
+
+def whiteout(path):
+    try:
+        os.mknod(path, stat.S_IFCHR | 0o600, 0)
+    except PermissionError:
+        pytest.skip("crear un whiteout (dispositivo 0:0) requiere root")
+
+
+def opaque(path):
+    for name in overlay.OPAQUE_XATTRS:
+        try:
+            os.setxattr(path, name, b"y")
+            return
+        except OSError:
+            continue
+    pytest.skip("el sistema de ficheros no admite el atributo overlay.opaque")
+
+
+def write(path, data="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(data)
+
+
+@pytest.fixture
+def mount(tmp_path):
+    lower = tmp_path / "lower"
+    upper = tmp_path / "upper"
+    for name in ("bin/tool", "bin/old", "etc/conf", "share/icons/a", "share/icons/b", "lib/gone/x"):
+        write(str(lower / name))
+    write(str(upper / "bin/tool"), "nuevo contenido")
+    write(str(upper / "bin/new"), "abc")
+    whiteout(str(upper / "bin/old"))
+    os.makedirs(upper / "lib")
+    whiteout(str(upper / "lib/gone"))
+    os.makedirs(upper / "share/icons")
+    opaque(str(upper / "share/icons"))
+    write(str(upper / "share/icons/a"))
+    write(str(upper / "extra/dir/file"))
+    os.makedirs(upper / "etc")
+    return OverlayMount("/opt", str(upper), [str(tmp_path / "empty"), str(lower)])
+
+
+def test_classification(mount):
+    entries = sorted(OverlayScanner().scan(mount), key=lambda entry: entry.path)
+    assert entries == [
+        DiffEntry(ADDED, "/opt/bin/new", "", 3),
+        DiffEntry(REMOVED, "/opt/bin/old"),
+        DiffEntry(MODIFIED, "/opt/bin/tool", "", 15),
+        DiffEntry(ADDED, "/opt/extra"),
+        DiffEntry(ADDED, "/opt/extra/dir"),
+        DiffEntry(ADDED, "/opt/extra/dir/file", "", 1),
+        DiffEntry(REMOVED, "/opt/lib/gone"),
+        # Opaco: lo de dentro es nuevo aunque exista abajo, y "b" no se da por eliminado
+        DiffEntry(MODIFIED, "/opt/share/icons", "opaque"),
+        DiffEntry(ADDED, "/opt/share/icons/a", "", 1),
+    ]
+
+
+def test_unreadable_upper_raises(tmp_path):
+    with pytest.raises(OSError):
+        list(OverlayScanner().scan(OverlayMount("/opt", str(tmp_path / "no-existe"), [])))
+
+
+def test_index_reused_and_invalidated(mount, tmp_path, monkeypatch):
+    monkeypatch.setattr(overlay, "RACY_SECONDS", -60)
+    index_path = str(tmp_path / "cache" / "overlay-index.json")
+    first = OverlayScanner(index_path)
+    cold = list(first.scan(mount))
+    first.save_index()
+
+    second = OverlayScanner(index_path)
+    second.load_index()
+    assert list(second.scan(mount)) == cold
+    assert second.scanned_dirs == 0 and second.cached_dirs == first.scanned_dirs
+    assert not second.dirty
+
+    # Otras capas inferiores: el índice no vale
+    third = OverlayScanner(index_path)
+    third.load_index()
+    other = OverlayMount(mount.target, mount.upper, mount.lowers[1:])
+    assert sorted(third.scan(other), key=lambda entry: entry.path) == sorted(cold, key=lambda entry: entry.path)
+    assert third.cached_dirs == 0
+
+
+def test_cold_and_warm_scan_of_100k_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(overlay, "RACY_SECONDS", -60)
+    lower = tmp_path / "lower"
+    upper = tmp_path / "upper"
+    # 100 directorios de 1000 ficheros; la mitad de los directorios existe abajo
+    for directory in range(100):
+        os.makedirs(upper / f"d{directory}")
+        if directory % 2:
+            os.makedirs(lower / f"d{directory}")
+            write(str(lower / f"d{directory}" / "f0"))
+        for i in range(1000):
+            open(upper / f"d{directory}" / f"f{i}", "w").close()
+    mount = OverlayMount("/opt", str(upper), [str(lower)])
+
+    scanner = OverlayScanner()
+    started = time.perf_counter()
+    cold = list(scanner.scan(mount))
+    cold_s = time.perf_counter() - started
+    assert len(cold) == 100_000 + 50
+    assert sum(entry.kind == MODIFIED for entry in cold) == 50
+    assert scanner.scanned_dirs == 101
+
+    scanner.scanned_dirs = scanner.cached_dirs = 0
+    started = time.perf_counter()
+    warm = list(scanner.scan(mount))
+    warm_s = time.perf_counter() - started
+    assert warm == cold
+    assert scanner.scanned_dirs == 0 and scanner.cached_dirs == 101
+    # Sin stat de los ficheros ni consultas a las capas inferiores
+    assert warm_s < cold_s / 2
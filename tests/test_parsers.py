@@ -0,0 +1,103 @@
+"""Casos límite de resources/parsers.py"""
+from resources.parsers import (ERROR_SEPARATOR, SnapshotRecord, parse_deployments, parse_snapshot_details,
+                               parse_snapshot_list, parse_status)
+
+ALIGNED = (
+    "ID        Name            Time                 Desc\n"
+    "abc123    nightly         2025-01-02 10:00:00  antes de actualizar\n"
+    "def456    con espacios    2025-01-03 11:30:00  \n"
+)
+
+
+def test_aligned_columns():
+    assert parse_snapshot_list(ALIGNED) == [
+        SnapshotRecord("abc123", "nightly", "2025-01-02 10:00:00", "antes de actualizar"),
+        SnapshotRecord("def456", "con espacios", "2025-01-03 11:30:00", ""),
+    ]
+
+
+def test_single_space_header_falls_back_to_date_anchor():
+    # Regresión: con la cabecera separada por espacios sueltos todo era una
+    # sola columna, los IDs salían vacíos y se descartaban todas las filas
+    output = ("ID Name Time Desc\n"
+              "abc123 nightly 2025-01-02 10:00:00 antes de actualizar\n"
+              "def456 con espacios 2025-01-03 11:30 x\n")
+    assert parse_snapshot_list(output) == [
+        SnapshotRecord("abc123", "nightly", "2025-01-02 10:00:00", "antes de actualizar"),
+        SnapshotRecord("def456", "con espacios", "2025-01-03 11:30", "x"),
+    ]
+
+
+def test_single_space_header_matches_whitespace_split():
+    # Lo que la versión original (split por espacios) leía bien se sigue leyendo igual
+    rows = [f"id{i:04d} snap{i} 2025-01-{i % 28 + 1:02d} 10:00:00 desc{i}" for i in range(50)]
+    records = parse_snapshot_list("ID Name Time Desc\n" + "\n".join(rows))
+    expected = []
+    for row in rows:
+        parts = row.split()
+        expected.append(SnapshotRecord(parts[0], parts[1], " ".join(parts[2:4]), " ".join(parts[4:])))
+    assert records == expected
+
+
+def test_row_wider_than_its_column_is_anchored_on_the_date():
+    output = ("ID      Name    Time                 Desc\n"
+              "abc123  un nombre muy largo 2025-01-02 10:00:00  d\n")
+    assert parse_snapshot_list(output) == [
+        SnapshotRecord("abc123", "un nombre muy largo", "2025-01-02 10:00:00", "d")]
+
+
+def test_bytes_and_blank_lines():
+    output = ("\n" + ALIGNED + "\n   \n").encode()
+    assert [record.id for record in parse_snapshot_list(output)] == ["abc123", "def456"]
+
+
+def test_error_without_rows_is_none_and_rows_survive_an_error():
+    assert parse_snapshot_list("ID Name Time Desc\n" + ERROR_SEPARATOR + "boom") is None
+    assert len(parse_snapshot_list(ALIGNED + ERROR_SEPARATOR + "aviso")) == 2
+
+
+def test_empty_listing_is_not_an_error():
+    assert parse_snapshot_list("ID   Name   Time   Desc\n") == []
+
+
+def test_snapshot_details():
+    record = parse_snapshot_details("ID: abc\nName: n x\nTime: 2025-01-02 10:00:00\nDesc: d: con dos puntos\n")
+    assert record == SnapshotRecord("abc", "n x", "2025-01-02 10:00:00", "d: con dos puntos")
+    assert parse_snapshot_details("nada\n") is None
+
+
+def test_status_flags_are_typed():
+    status = parse_status("Enable: true,\nBooted: false\nOverlayDirs: /usr,/opt\nOverlayAllDirs: TRUE\n")
+    assert status.enable is True and status.booted is False and status.overlay_all_dirs is True
+    assert status.overlay_dirs == "/usr,/opt"
+    assert status.immutable is False
+    assert parse_status("") is None
+
+
+def test_deployments():
+    checksum = "a" * 64
+    output = (f"* deepin {checksum}.0 (pending)\n"
+              "    Version: 25.0\n"
+              "    origin refspec: deepin:main\n"
+              f"  deepin {'b' * 64}.1 (rollback)\n"
+              "    Pinned: yes\n")
+    first, second = parse_deployments(output)
+    assert first.booted and first.pending and first.version == "25.0" and first.origin == "deepin:main"
+    assert not second.booted and second.rollback and second.pinned and second.serial == 1
+
+
+def test_crlf_and_invalid_utf8():
+    output = (b"ID      Name        Time                 Desc\r\n"
+              b"abc123  my name     2025-01-02 10:11:12  d\xff\r\n")
+    assert parse_snapshot_list(output) == [SnapshotRecord("abc123", "my name", "2025-01-02 10:11:12", "d�")]
+    record = parse_snapshot_details(b"ID: a\r\nName: x: y\r\nDesc:\r\n")
+    assert record == SnapshotRecord("a", "x: y", "", "")
+    status = parse_status(b"Enable: TRUE\r\nBooted: no\r\nOverlayDirs:  /usr \r\n")
+    assert status.enable is True and status.booted is False and status.overlay_dirs == "/usr"
+
+
+def test_empty_name_column():
+    output = ("ID      Name        Time                 Desc\n"
+              "abc123              2025-01-02 10:11:12  \n")
+    assert parse_snapshot_list(output) == [SnapshotRecord("abc123", "", "2025-01-02 10:11:12", "")]
+    assert parse_snapshot_list(b"") == []
@@ -0,0 +1,39 @@
+"""Fuzz de parse_snapshot_list: filas aleatorias con y sin alinear, nunca deben romper el parser"""
+import random
+import string
+
+from resources.parsers import parse_snapshot_list
+
+WORDS = ["nightly", "con espacios", "a", "ünïcode", "x" * 40, "", "2025", "1/2", "50%"]
+
+
+def random_row(rng, aligned, widths):
+    snapshot_id = "".join(rng.choice("0123456789abcdef") for _ in range(rng.randint(6, 12)))
+    name = rng.choice(WORDS) or "n"
+    time = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+    desc = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 3))).strip()
+    if aligned:
+        return f"{snapshot_id:<{widths[0]}}{name:<{widths[1]}}{time:<{widths[2]}}{desc}", snapshot_id, time
+    return f"{snapshot_id} {name} {time} {desc}", snapshot_id, time
+
+
+def test_fuzz_rows_keep_id_and_time():
+    rng = random.Random(1234)
+    for _ in range(200):
+        aligned = rng.random() < 0.5
+        widths = (14, rng.randint(8, 24), 21)
+        header = ("ID".ljust(widths[0]) + "Name".ljust(widths[1]) + "Time".ljust(widths[2]) + "Desc"
+                  if aligned else "ID Name Time Desc")
+        rows = [random_row(rng, aligned, widths) for _ in range(rng.randint(0, 20))]
+        records = parse_snapshot_list(header + "\n" + "\n".join(row for row, _, _ in rows))
+        assert [(record.id, record.time) for record in records] == [(i, t) for _, i, t in rows]
+
+
+def test_fuzz_garbage_never_raises():
+    rng = random.Random(99)
+    alphabet = string.printable + "ñ€\t"
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 300)))
+        result = parse_snapshot_list(text)
+        assert result is None or all(record.id for record in result)
+        parse_snapshot_list(text.encode("utf-8", errors="replace") + b"\xff\xfe")
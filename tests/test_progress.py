@@ -0,0 +1,161 @@
+"""Progreso por fases a partir de la salida (resources/progress.py)"""
+import os
+import subprocess
+import time
+
+import pytest
+
+from resources.progress import (MAX_TIME_FRACTION, ProgressTracker, last_counter, load_history, profile_for,
+                                record_durations)
+
+# Lo que escribe `admin deploy` en una máquina real, resumido; PAUSE separa fases
+DEPLOY_OUTPUT = [
+    "Preparing deployment for /usr /opt\n",
+    "PAUSE",
+    "Scanning metadata: 1204\n",
+    "Writing objects: 10% (120/1200)\r",
+    "Writing objects: 55% (660/1200)\r",
+    "PAUSE",
+    "Writing objects: 100% (1200/1200)\n",
+    "Committing transaction\n",
+    "Checking out tree 3f2a9c1e\n",
+    "PAUSE",
+    "Creating new deployment deepin 3f2a9c1e.1\n",
+    "Copying /etc changes: 3 modified, 0 removed, 12 added\n",
+    "PAUSE",
+    "Bootloader updated; bootconfig swap: yes; bootversion: boot.1.1, deployment count change: 1\n",
+    "PAUSE",
+    "Pruning repo\n",
+    "Freed objects: 48.2 MB",
+]
+
+
+@pytest.fixture
+def fake_ctl(tmp_path):
+    lines = []
+    for chunk in DEPLOY_OUTPUT:
+        if chunk == "PAUSE":
+            lines.append("sleep 0.1")
+        else:
+            lines.append("printf '%s' " + repr(chunk).replace("\\n", "\n").replace("\\r", "\r"))
+    path = tmp_path / "deepin-immutable-ctl"
+    path.write_text('#!/bin/sh\n[ "$1 $2" = "admin deploy" ] || exit 1\n' + "\n".join(lines) + "\n")
+    os.chmod(path, 0o755)
+    return str(path)
+
+
+def run(command, tracker):
+    """Ejecuta un comando y pasa su salida al tracker según llega; devuelve los estados"""
+    states = []
+    process = subprocess.Popen(command, stdout=subprocess.PIPE)
+    while True:
+        chunk = os.read(process.stdout.fileno(), 4096)
+        if not chunk:
+            break
+        tracker.feed(chunk.decode(), time.monotonic())
+        states.append(tracker.state(time.monotonic()))
+    process.wait()
+    tracker.finish(time.monotonic())
+    return states
+
+
+def test_profiles():
+    assert profile_for("pkexec deepin-immutable-ctl admin deploy --refresh") == "deploy"
+    assert profile_for("pkexec deepin-immutable-ctl admin deploy --finalize") == "finalize"
+    assert profile_for("pkexec deepin-immutable-ctl snapshot create nombre") == "snapshot-create"
+    assert profile_for("deepin-immutable-ctl snapshot list") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Writing objects: 45%", 0.45),
+    ("Writing objects: 45% (660/1200)", 0.55),
+    ("progreso 12,5 %", 0.125),
+    ("(3/0)", None),
+    ("copiando /usr/lib/3/4", None),
+    ("120/100", 1.0),
+    ("10%\nsin contador\n", 0.1),
+    ("sin contador", None),
+])
+def test_last_counter(text, expected):
+    assert last_counter(text) == expected
+
+
+def test_scripted_deploy_goes_through_every_phase(fake_ctl, tmp_path):
+    started = time.monotonic()
+    tracker = ProgressTracker("deploy", started)
+    states = run([fake_ctl, "admin", "deploy"], tracker)
+
+    seen = []
+    for state in states:
+        if not seen or seen[-1] != state.phase:
+            seen.append(state.phase)
+    assert seen == ["prepare", "commit", "checkout", "etc", "bootloader", "cleanup"]
+    # Las barras no retroceden
+    fractions = [state.fraction for state in states]
+    assert fractions == sorted(fractions)
+    # Sin historial no hay tiempo restante
+    assert all(state.remaining is None for state in states)
+
+    durations = tracker.durations(time.monotonic())
+    assert list(durations) == ["prepare", "commit", "checkout", "etc", "bootloader", "cleanup"]
+    # Cada fase duró al menos una pausa del guion
+    for key in ("prepare", "commit", "checkout", "etc", "bootloader"):
+        assert durations[key] >= 0.09
+
+    # Con el historial guardado, la siguiente ejecución ya da tiempo restante
+    path = str(tmp_path / "phase-history.json")
+    record_durations(load_history(path), "deploy", durations, path=path)
+    history = load_history(path)
+    assert set(history["deploy"]) == set(durations)
+    tracker = ProgressTracker("deploy", time.monotonic(), history)
+    states = run([fake_ctl, "admin", "deploy"], tracker)
+    assert states[0].remaining is not None and states[0].remaining > 0.3
+    assert states[-1].remaining < states[0].remaining
+
+
+def test_markers_only_move_forward():
+    tracker = ProgressTracker("deploy", 0)
+    # Una marca posterior salta las intermedias
+    assert tracker.feed("Copying /etc changes\n", 1)
+    assert tracker.state(1).phase == "etc"
+    assert tracker.started[1:4] == [1, 1, 1]
+    # Y una anterior se ignora
+    assert not tracker.feed("Writing objects\n", 2)
+    assert tracker.state(2).phase == "etc"
+    assert tracker.durations(3) == {"prepare": 1, "commit": 0, "checkout": 0, "etc": 2, "bootloader": 0.0,
+                                    "cleanup": 0.0}
+
+
+def test_partial_lines_and_counters():
+    tracker = ProgressTracker("snapshot-create", 0)
+    # Sin salto de línea no se procesa todavía
+    assert not tracker.feed("Writing obj", 1)
+    assert tracker.state(1).phase == "prepare"
+    assert tracker.feed("ects: 30% (3/10)\r", 2)
+    state = tracker.state(2)
+    assert state.phase == "commit" and tracker.counter == 0.3
+    # Pesos por defecto 1 y 4: 1/5 + 4/5 * 0.3
+    assert state.fraction == pytest.approx(0.44)
+    # Un contador de la fase anterior a la marca no cuenta para la nueva
+    tracker = ProgressTracker("snapshot-create", 0)
+    tracker.feed("preparando 90%\nCommitting\n", 1)
+    assert tracker.counter is None
+    tracker.feed("Committing 100%", 2)
+    assert tracker.counter is None
+    tracker.finish(3)
+    assert tracker.counter == 1.0
+
+
+def test_time_based_progress_with_history():
+    history = {"snapshot-create": {"prepare": [2.0, 4.0, 2.0], "commit": [8.0]}}
+    tracker = ProgressTracker("snapshot-create", 0, history)
+    assert tracker.expected == [2.0, 8.0]
+    state = tracker.state(1)
+    # Mitad de la fase prepare: 1 de 10 segundos, y quedan 1 + 8
+    assert state.fraction == pytest.approx(0.1) and state.remaining == pytest.approx(9)
+    # Si la fase se alarga, no pasa de MAX_TIME_FRACTION
+    assert tracker.state(100).fraction == pytest.approx(0.2 * MAX_TIME_FRACTION)
+    tracker.feed("Committing\n", 100)
+    tracker.feed("25%\n", 102)
+    # Con contador, el restante se extrapola: 2 s para el 25 %
+    assert tracker.state(102).remaining == pytest.approx(6)
@@ -0,0 +1,143 @@
+"""Reglas de retención (resources/retention.py)"""
+import os
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+from resources.parsers import SnapshotRecord, parse_snapshot_list
+from resources.retention import RetentionPolicy, evaluate
+
+START = datetime(2025, 1, 1, 0, 30)
+
+
+def hourly(count):
+    """`count` snapshots, uno por hora desde START, de la más reciente a la más antigua"""
+    records = []
+    for i in reversed(range(count)):
+        moment = START + timedelta(hours=i)
+        records.append(SnapshotRecord(f"{i:08x}", f"auto-{i}", moment.strftime("%Y-%m-%d %H:%M:%S")))
+    return records
+
+
+def kept_ids(plan):
+    return {record.id for record in plan.keep}
+
+
+def test_disabled_policy_keeps_everything():
+    records = hourly(10)
+    plan = evaluate(records, RetentionPolicy())
+    assert plan.prune == [] and len(plan.keep) == 10
+
+
+def test_keep_last():
+    records = hourly(10)
+    plan = evaluate(records, RetentionPolicy(keep_last=3))
+    assert [record.id for record in plan.keep] == [record.id for record in records[:3]]
+    assert plan.prune_ids() == [record.id for record in records[3:]]
+
+
+def test_keep_daily_keeps_newest_of_each_day():
+    # 24 por día durante 5 días
+    records = hourly(24 * 5)
+    plan = evaluate(records, RetentionPolicy(keep_daily=3))
+    kept = sorted(plan.keep, key=lambda record: record.time, reverse=True)
+    assert [record.time for record in kept] == ["2025-01-05 23:30:00", "2025-01-04 23:30:00",
+                                                "2025-01-03 23:30:00"]
+    assert all(plan.reasons[record.id] == ["daily"] for record in kept)
+
+
+def test_keep_weekly_and_monthly():
+    # Un snapshot por día durante 90 días, del 1 de enero al 31 de marzo
+    records = [SnapshotRecord(f"d{i}", "", (START + timedelta(days=i)).strftime("%Y-%m-%d %H:%M:%S"))
+               for i in reversed(range(90))]
+    weekly = evaluate(records, RetentionPolicy(keep_weekly=2))
+    # Domingo 30 de marzo (semana ISO 13) y el lunes 31 (semana 14)
+    assert sorted(record.time[:10] for record in weekly.keep) == ["2025-03-30", "2025-03-31"]
+    monthly = evaluate(records, RetentionPolicy(keep_monthly=12))
+    assert sorted(record.time[:10] for record in monthly.keep) == ["2025-01-31", "2025-02-28", "2025-03-31"]
+
+
+def test_rules_combine_and_record_reasons():
+    records = hourly(24 * 3)
+    plan = evaluate(records, RetentionPolicy(keep_last=2, keep_daily=2))
+    newest = records[0].id
+    assert plan.reasons[newest] == ["last", "daily"]
+    assert plan.reasons[records[1].id] == ["last"]
+    assert len(plan.keep) == 3
+
+
+def test_pinned_and_undated_are_never_pruned():
+    records = hourly(10) + [SnapshotRecord("sin-fecha", "", "ayer")]
+    pinned = records[-2].id
+    plan = evaluate(records, RetentionPolicy(keep_last=1), pinned=[pinned])
+    assert kept_ids(plan) == {records[0].id, pinned, "sin-fecha"}
+    assert plan.reasons[pinned] == ["pinned"]
+    assert plan.reasons["sin-fecha"] == ["unknown-time"]
+    # Los de fecha desconocida van al final
+    assert plan.keep[-1].id == "sin-fecha"
+
+
+def test_max_total_size_drops_oldest_but_not_newest_or_pinned():
+    records = hourly(10)
+    sizes = {record.id: 100 for record in records}
+    oldest = records[-1].id
+    plan = evaluate(records, RetentionPolicy(max_total_size=450), pinned=[oldest], sizes=sizes)
+    assert kept_ids(plan) == {records[0].id, records[1].id, records[2].id, oldest}
+    # Nunca se suelta el más reciente, aunque no quepa
+    plan = evaluate(records, RetentionPolicy(max_total_size=1), sizes=sizes)
+    assert kept_ids(plan) == {records[0].id}
+    # Sin tamaños la regla no elimina nada
+    assert evaluate(records, RetentionPolicy(max_total_size=1)).prune == []
+
+
+def test_max_total_size_applies_after_count_rules():
+    records = hourly(10)
+    sizes = {record.id: 100 for record in records}
+    plan = evaluate(records, RetentionPolicy(keep_last=5, max_total_size=250), sizes=sizes)
+    assert kept_ids(plan) == {record.id for record in records[:2]}
+
+
+def test_policy_from_dict_ignores_invalid_values():
+    policy = RetentionPolicy.from_dict({"keep_last": 3, "keep_daily": -1, "keep_weekly": "2",
+                                        "keep_monthly": True, "otra": 5})
+    assert policy.to_dict() == {"keep_last": 3, "keep_daily": 0, "keep_weekly": 0, "keep_monthly": 0,
+                                "max_total_size": 0}
+
+
+def listing_from_fake_cli(tmp_path, records):
+    """Listado de `records` leído de una CLI falsa, como lo recibe la interfaz"""
+    data = tmp_path / "listing.txt"
+    lines = ["ID        Name              Time                 Desc"]
+    lines += [f"{record.id:<10}{record.name:<18}{record.time:<21}d" for record in records]
+    data.write_text("\n".join(lines) + "\n")
+    tool = tmp_path / "deepin-immutable-ctl"
+    tool.write_text(f'#!/bin/sh\n[ "$1 $2" = "snapshot list" ] && exec cat {data}\nexit 1\n')
+    os.chmod(tool, 0o755)
+    output = subprocess.run([str(tool), "snapshot", "list"], capture_output=True, check=True).stdout
+    return parse_snapshot_list(output)
+
+
+def best_time(records, policy, sizes):
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        evaluate(records, policy, sizes=sizes)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def test_evaluate_scales_as_n_log_n(tmp_path):
+    policy = RetentionPolicy(keep_last=10, keep_daily=30, keep_weekly=12, keep_monthly=24,
+                             max_total_size=10 ** 6)
+    large = listing_from_fake_cli(tmp_path, hourly(80_000))
+    assert len(large) == 80_000
+    small = large[:5_000]
+    sizes = {record.id: 1000 for record in large}
+
+    plan = evaluate(large, policy, sizes=sizes)
+    assert len(plan.keep) + len(plan.prune) == 80_000
+    assert 0 < len(plan.keep) <= 1000
+
+    # 16 veces más snapshots: O(n log n) da ~21 veces más tiempo, O(n²) 256
+    ratio = best_time(large, policy, sizes) / best_time(small, policy, sizes)
+    assert ratio < 64
@@ -0,0 +1,94 @@
+"""Diferencias entre árboles (resources/treediff.py)"""
+import os
+
+import pytest
+
+from resources import treediff
+from resources.treediff import ADDED, MODIFIED, REMOVED, DiffEntry, diff_trees
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(data)
+    return path
+
+
+@pytest.fixture
+def trees(tmp_path):
+    """Dos árboles como dos despliegues de ostree: lo que no cambia son enlaces duros"""
+    old = tmp_path / "old"
+    new = tmp_path / "new"
+    for name in ("bin/shared", "lib/a/one", "lib/a/two"):
+        os.makedirs(os.path.dirname(new / name), exist_ok=True)
+        os.link(write(str(old / name), name), new / name)
+    write(str(old / "bin/same-size"), "aaaa")
+    write(str(new / "bin/same-size"), "bbbb")
+    write(str(old / "bin/equal"), "igual")
+    write(str(new / "bin/equal"), "igual")
+    write(str(old / "bin/grown"), "a")
+    write(str(new / "bin/grown"), "aa")
+    write(str(old / "bin/gone"), "x")
+    write(str(new / "share/doc/new"), "x")
+    write(str(old / "bin/mode"), "x")
+    write(str(new / "bin/mode"), "x")
+    os.chmod(new / "bin/mode", 0o755)
+    os.symlink("one", old / "bin/link")
+    os.symlink("two", new / "bin/link")
+    write(str(old / "bin/kind"), "x")
+    os.makedirs(new / "bin/kind")
+    return str(old), str(new)
+
+
+def test_diff_kinds(trees):
+    old, new = trees
+    entries = sorted(diff_trees(old, new, workers=1), key=lambda entry: entry.path)
+    assert entries == [
+        DiffEntry(REMOVED, "bin/gone"),
+        DiffEntry(MODIFIED, "bin/grown", "content"),
+        DiffEntry(MODIFIED, "bin/kind", "type"),
+        DiffEntry(MODIFIED, "bin/link", "target"),
+        DiffEntry(MODIFIED, "bin/mode", "metadata"),
+        DiffEntry(MODIFIED, "bin/same-size", "content"),
+        DiffEntry(ADDED, "share"),
+        DiffEntry(ADDED, "share/doc"),
+        DiffEntry(ADDED, "share/doc/new"),
+    ]
+
+
+def test_hard_links_are_not_read(trees, monkeypatch):
+    old, new = trees
+    compared = []
+    original = treediff.compare_files
+
+    def recording(old_root, new_root, paths):
+        compared.extend(paths)
+        return original(old_root, new_root, paths)
+
+    monkeypatch.setattr(treediff, "compare_files", recording)
+    list(diff_trees(old, new, workers=1))
+    # Solo los de mismo tamaño y distinto inodo llegan a leerse
+    assert sorted(compared) == ["bin/equal", "bin/same-size"]
+
+
+def test_shared_directories_are_not_walked(trees, monkeypatch):
+    old, _ = trees
+    listed = []
+    original = treediff.list_directory
+
+    def recording(path):
+        listed.append(path)
+        return original(path)
+
+    monkeypatch.setattr(treediff, "list_directory", recording)
+    # Contra sí mismo todos los subdirectorios tienen el mismo inodo: solo se leen las raíces
+    assert list(diff_trees(old, old, workers=1)) == []
+    assert listed == [os.path.join(old, ""), os.path.join(old, "")]
+
+
+def test_process_pool_gives_the_same_result(trees, monkeypatch):
+    old, new = trees
+    monkeypatch.setattr(treediff, "BATCH_SIZE", 1)
+    serial = sorted(diff_trees(old, new, workers=1), key=lambda entry: entry.path)
+    pooled = sorted(diff_trees(old, new, workers=2), key=lambda entry: entry.path)
+    assert pooled == serial
@@ -0,0 +1,48 @@
+"""Escritura atómica de las cachés en JSON (resources/cache.py)"""
+import json
+import os
+import threading
+
+import pytest
+
+from resources.cache import write_json
+
+
+def test_creates_directory_and_leaves_no_temporaries(tmp_path):
+    path = tmp_path / "nuevo" / "cache.json"
+    write_json(str(path), {"a": [1, 2]}, separators=(",", ":"))
+    assert path.read_text() == '{"a":[1,2]}'
+    assert os.listdir(path.parent) == ["cache.json"]
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "cache.json"
+    write_json(str(path), {"version": 1})
+    with pytest.raises(TypeError):
+        write_json(str(path), {"version": object()})
+    assert json.loads(path.read_text()) == {"version": 1}
+    assert os.listdir(tmp_path) == ["cache.json"]
+
+
+def test_concurrent_writers_do_not_share_a_temporary(tmp_path):
+    # Regresión: con un ".tmp" fijo, dos procesos guardando a la vez podían
+    # mezclar sus escrituras o fallar en os.replace
+    path = str(tmp_path / "cache.json")
+    errors = []
+
+    def writer(value):
+        try:
+            for _ in range(50):
+                write_json(path, {"value": value, "padding": "x" * 50000})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(value,)) for value in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert json.loads(open(path).read())["value"] in range(4)
+    assert os.listdir(tmp_path) == ["cache.json"]
+
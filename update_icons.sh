@@ -0,0 +1,8 @@
+#!/bin/bash
+# update_icons.sh
+
+# Compilar los iconos de resources/ en un único paquete binario de recursos de Qt.
+# Ejecutar de nuevo al añadir o cambiar un PNG (y añadirlo antes a icons.qrc).
+pyside6-rcc --binary resources/icons.qrc -o resources/icons.rcc
+
+echo "Paquete de iconos generado: resources/icons.rcc"